@@ -23,6 +23,12 @@ class DatabaseConfig:
     backup_directory: str = field(default_factory=lambda: os.getenv("DATABASE_BACKUP_DIRECTORY", "backups"))
     backup_schema: bool = field(default_factory=lambda: os.getenv("DATABASE_BACKUP_SCHEMA", "true").lower() == "true")
     backup_data: bool = field(default_factory=lambda: os.getenv("DATABASE_BACKUP_DATA", "false").lower() == "true")
+    pool_min_connections: int = field(default_factory=lambda: int(os.getenv("DATABASE_POOL_MIN_CONNECTIONS", "1")))
+    pool_max_connections: int = field(default_factory=lambda: int(os.getenv("DATABASE_POOL_MAX_CONNECTIONS", "10")))
+    pool_timeout: float = field(default_factory=lambda: float(os.getenv("DATABASE_POOL_TIMEOUT", "30")))  # seconds to wait for a free connection
+    pool_idle_timeout: float = field(default_factory=lambda: float(os.getenv("DATABASE_POOL_IDLE_TIMEOUT", "300")))  # seconds before idle connections above the minimum close
+    write_batch_size: int = field(default_factory=lambda: int(os.getenv("DATABASE_WRITE_BATCH_SIZE", "64")))  # statements per group commit
+    strict_routing: bool = field(default_factory=lambda: os.getenv("DATABASE_STRICT_ROUTING", "false").lower() == "true")
 
 @dataclass
 class LoggingConfig:
@@ -64,6 +70,33 @@ class ApplicationConfig:
     environment: str = field(default_factory=lambda: os.getenv("ENVIRONMENT", "development"))
     timezone: str = field(default_factory=lambda: os.getenv("TIMEZONE", "Europe/Rome"))
 
+@dataclass
+class PerformanceConfig:
+    """Performance tuning settings"""
+    orgchart_cache_enabled: bool = field(default_factory=lambda: os.getenv("ORGCHART_CACHE_ENABLED", "true").lower() == "true")
+    orgchart_cache_ttl: int = field(default_factory=lambda: int(os.getenv("ORGCHART_CACHE_TTL", "300")))  # seconds, 0 = no expiry
+    orgchart_cache_max_entries: int = field(default_factory=lambda: int(os.getenv("ORGCHART_CACHE_MAX_ENTRIES", "128")))
+    db_executor_workers: int = field(default_factory=lambda: int(os.getenv("DB_EXECUTOR_WORKERS", "10")))  # capped to the connection pool size
+    db_executor_max_pending: int = field(default_factory=lambda: int(os.getenv("DB_EXECUTOR_MAX_PENDING", "32")))
+    async_db_workers: int = field(default_factory=lambda: int(os.getenv("ASYNC_DB_WORKERS", "4")))
+    import_export_job_workers: int = field(default_factory=lambda: int(os.getenv("IMPORT_EXPORT_JOB_WORKERS", "2")))  # concurrent import/export jobs per process
+    export_stream_limit: int = field(default_factory=lambda: int(os.getenv("EXPORT_STREAM_LIMIT", "4")))  # streamed export downloads in progress per process
+    csv_parse_workers: int = field(default_factory=lambda: int(os.getenv("CSV_PARSE_WORKERS", "1")))  # processes for CSV import parsing, 0 = one per CPU, 1 = in-process
+    csv_parse_chunk_rows: int = field(default_factory=lambda: int(os.getenv("CSV_PARSE_CHUNK_ROWS", "5000")))
+    import_commit_interval: int = field(default_factory=lambda: int(os.getenv("IMPORT_COMMIT_INTERVAL", "10")))  # import batches per commit
+    import_plan_sample_size: int = field(default_factory=lambda: int(os.getenv("IMPORT_PLAN_SAMPLE_SIZE", "200")))  # records per entity type measured by the import planner
+    import_plan_batch_seconds: float = field(default_factory=lambda: float(os.getenv("IMPORT_PLAN_BATCH_SECONDS", "1.0")))  # planned time per import batch
+    audit_buffer_size: int = field(default_factory=lambda: int(os.getenv("AUDIT_BUFFER_SIZE", "500")))  # buffered audit data changes per write
+    audit_flush_interval: float = field(default_factory=lambda: float(os.getenv("AUDIT_FLUSH_INTERVAL", "2.0")))  # seconds between audit writes, 0 = on size and completion only
+    audit_retention_months: int = field(default_factory=lambda: int(os.getenv("AUDIT_RETENTION_MONTHS", "0")))  # months of audit data changes kept, 0 = all
+    error_log_queue_size: int = field(default_factory=lambda: int(os.getenv("ERROR_LOG_QUEUE_SIZE", "10000")))  # structured errors waiting for the log writer
+    error_record_inline_bytes: int = field(default_factory=lambda: int(os.getenv("ERROR_RECORD_INLINE_BYTES", "0")))  # larger record data saved once per line, 0 = always inline
+    error_sampling_min_records: int = field(default_factory=lambda: int(os.getenv("ERROR_SAMPLING_MIN_RECORDS", "100000")))  # imports from this size keep a sample of their errors, 0 = never
+    error_sample_first: int = field(default_factory=lambda: int(os.getenv("ERROR_SAMPLE_FIRST", "10")))  # first errors kept per error type and field when sampling
+    error_sample_reservoir: int = field(default_factory=lambda: int(os.getenv("ERROR_SAMPLE_RESERVOIR", "100")))  # random other errors kept per error type and field
+    query_stats_enabled: bool = field(default_factory=lambda: os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true")
+    slow_query_threshold_ms: float = field(default_factory=lambda: float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0")))  # 0 = disabled
+
 @dataclass
 class Settings:
     """Main configuration class combining all settings"""
@@ -72,6 +105,7 @@ class Settings:
     security: SecurityConfig = field(default_factory=SecurityConfig)
     server: ServerConfig = field(default_factory=ServerConfig)
     application: ApplicationConfig = field(default_factory=ApplicationConfig)
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
     
     def __post_init__(self):
         """Post-initialization validation and setup"""
@@ -102,6 +136,64 @@ class Settings:
                 raise ValueError("Secret key must be at least 32 characters in production")
             if not self.security.https_only:
                 print("WARNING: HTTPS is not enforced in production environment")
+        
+        # Validate performance settings
+        if self.performance.orgchart_cache_ttl < 0:
+            raise ValueError(f"Invalid orgchart cache TTL: {self.performance.orgchart_cache_ttl}. Must be >= 0")
+        if self.performance.orgchart_cache_max_entries < 1:
+            raise ValueError(f"Invalid orgchart cache size: {self.performance.orgchart_cache_max_entries}. Must be >= 1")
+        # Validate connection pool bounds
+        if not (0 <= self.database.pool_min_connections <= self.database.pool_max_connections):
+            raise ValueError(
+                f"Invalid connection pool bounds: min {self.database.pool_min_connections}, "
+                f"max {self.database.pool_max_connections}. Must satisfy 0 <= min <= max"
+            )
+        if self.database.pool_max_connections < 1:
+            raise ValueError(f"Invalid connection pool size: {self.database.pool_max_connections}. Must be >= 1")
+        if self.database.pool_timeout <= 0 or self.database.pool_idle_timeout < 0:
+            raise ValueError("Invalid connection pool timeouts: pool timeout must be > 0 and idle timeout >= 0")
+        if self.database.write_batch_size < 1:
+            raise ValueError(f"Invalid write batch size: {self.database.write_batch_size}. Must be >= 1")
+        
+        if self.performance.db_executor_workers < 1:
+            raise ValueError(f"Invalid database executor workers: {self.performance.db_executor_workers}. Must be >= 1")
+        if self.performance.db_executor_max_pending < 0:
+            raise ValueError(f"Invalid database executor queue size: {self.performance.db_executor_max_pending}. Must be >= 0")
+        if self.performance.async_db_workers < 1:
+            raise ValueError(f"Invalid async database workers: {self.performance.async_db_workers}. Must be >= 1")
+        if self.performance.import_export_job_workers < 1:
+            raise ValueError(f"Invalid import/export job workers: {self.performance.import_export_job_workers}. Must be >= 1")
+        if self.performance.export_stream_limit < 1:
+            raise ValueError(f"Invalid export stream limit: {self.performance.export_stream_limit}. Must be >= 1")
+        if self.performance.csv_parse_workers < 0:
+            raise ValueError(f"Invalid CSV parse workers: {self.performance.csv_parse_workers}. Must be >= 0")
+        if self.performance.csv_parse_chunk_rows < 1:
+            raise ValueError(f"Invalid CSV parse chunk size: {self.performance.csv_parse_chunk_rows}. Must be >= 1")
+        if self.performance.import_commit_interval < 1:
+            raise ValueError(f"Invalid import commit interval: {self.performance.import_commit_interval}. Must be >= 1")
+        if self.performance.import_plan_sample_size < 1:
+            raise ValueError(f"Invalid import plan sample size: {self.performance.import_plan_sample_size}. Must be >= 1")
+        if self.performance.import_plan_batch_seconds <= 0:
+            raise ValueError(f"Invalid import plan batch time: {self.performance.import_plan_batch_seconds}. Must be > 0")
+        if self.performance.audit_buffer_size < 1:
+            raise ValueError(f"Invalid audit buffer size: {self.performance.audit_buffer_size}. Must be >= 1")
+        if self.performance.audit_flush_interval < 0:
+            raise ValueError(f"Invalid audit flush interval: {self.performance.audit_flush_interval}. Must be >= 0")
+        if self.performance.audit_retention_months < 0:
+            raise ValueError(f"Invalid audit retention: {self.performance.audit_retention_months}. Must be >= 0")
+        if self.performance.error_log_queue_size < 1:
+            raise ValueError(f"Invalid error log queue size: {self.performance.error_log_queue_size}. Must be >= 1")
+        if self.performance.error_record_inline_bytes < 0:
+            raise ValueError(f"Invalid error record inline bytes: {self.performance.error_record_inline_bytes}. Must be >= 0")
+        if self.performance.error_sampling_min_records < 0:
+            raise ValueError(f"Invalid error sampling min records: {self.performance.error_sampling_min_records}. Must be >= 0")
+        if self.performance.error_sample_first < 0 or self.performance.error_sample_reservoir < 0:
+            raise ValueError(f"Invalid error sample sizes: {self.performance.error_sample_first}, "
+                             f"{self.performance.error_sample_reservoir}. Must be >= 0")
+        if self.performance.error_sample_first + self.performance.error_sample_reservoir < 1:
+            raise ValueError("Invalid error sample sizes: ERROR_SAMPLE_FIRST + ERROR_SAMPLE_RESERVOIR must be >= 1")
+        if self.performance.slow_query_threshold_ms < 0:
+            raise ValueError(f"Invalid slow query threshold: {self.performance.slow_query_threshold_ms}. Must be >= 0")
     
     def _ensure_directories(self):
         """Ensure required directories exist"""
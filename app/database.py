@@ -3,15 +3,23 @@ Database connection and initialization with singleton pattern and connection poo
 Enhanced with environment-based configuration
 """
 
+import asyncio
+import os
+import re
 import sqlite3
 import logging
 import threading
 from pathlib import Path
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Callable, Iterator
+from collections import deque
 from contextlib import contextmanager
-from queue import Queue, Empty
+from functools import lru_cache
+from queue import Queue
 import time
 
+from app.query_registry import get_query_registry
+from app.security import SecureDatabaseOperations
+
 logger = logging.getLogger(__name__)
 
 # Configuration will be loaded dynamically
@@ -19,9 +27,14 @@ DATABASE_PATH = None
 SCHEMA_PATH = Path("database/schema/orgchart_sqlite_schema.sql")
 MIGRATION_PATH = Path("")
 
-# Connection pool configuration
+# Connection pool configuration (defaults, overridden by settings)
+MIN_CONNECTIONS = 1
 MAX_CONNECTIONS = 10
 CONNECTION_TIMEOUT = 30
+IDLE_TIMEOUT = 300
+WRITE_BATCH_SIZE = 64
+FETCH_BATCH_SIZE = 500
+ASYNC_WORKERS = 4
 
 def _get_database_config():
     """Get database configuration from settings"""
@@ -40,7 +53,13 @@ def _get_database_config():
             'path': db_path,
             'enable_foreign_keys': settings.database.enable_foreign_keys,
             'backup_enabled': settings.database.backup_enabled,
-            'backup_directory': Path(settings.database.backup_directory)
+            'backup_directory': Path(settings.database.backup_directory),
+            'pool_min_connections': settings.database.pool_min_connections,
+            'pool_max_connections': settings.database.pool_max_connections,
+            'pool_timeout': settings.database.pool_timeout,
+            'pool_idle_timeout': settings.database.pool_idle_timeout,
+            'write_batch_size': settings.database.write_batch_size,
+            'strict_routing': settings.database.strict_routing
         }
     except ImportError:
         # Fallback for when config is not available
@@ -52,8 +71,271 @@ def _get_database_config():
             'backup_directory': Path("backups")
         }
 
+# Statements that modify the database (leading comments allowed)
+_WRITE_STATEMENT = re.compile(
+    r'^(?:\s|--[^\n]*\n|/\*.*?\*/)*'
+    r'(?:(?:INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER|BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE'
+    r'|VACUUM|REINDEX|ANALYZE|ATTACH|DETACH)\b'
+    r'|PRAGMA\s+[\w.]+\s*='
+    r'|WITH\b.*\b(?:INSERT|UPDATE|DELETE|REPLACE)\b)',
+    re.IGNORECASE | re.DOTALL
+)
+
+@lru_cache(maxsize=1024)
+def is_write_statement(query: str) -> bool:
+    """Whether the statement needs the writer connection"""
+    return _WRITE_STATEMENT.match(query) is not None
+
+class ReadOnlyViolationError(sqlite3.ProgrammingError):
+    """Raised in strict routing mode when a write statement is sent down the read path"""
+
+class _WriteJob:
+    """A statement waiting for the next group commit on the writer connection"""
+
+    __slots__ = ('query', 'params', 'cursor', 'error', 'done')
+
+    def __init__(self, query: str, params: Optional[tuple]):
+        self.query = query
+        self.params = params
+        self.cursor: Optional[sqlite3.Cursor] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+class ConnectionPool:
+    """
+    Lazily filled SQLite connection pool.
+
+    Connections are created on demand up to ``max_size`` and idle ones
+    above ``min_size`` are closed after ``idle_timeout`` seconds. Each
+    connection is validated on checkout, and a thread gets back the
+    connection it last returned when that one is idle. Connections
+    inherited across fork() are dropped, so every worker process opens its
+    own. When all connections are in use, checkout waits up to ``timeout``
+    seconds and then raises DatabaseBusyError.
+    """
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], min_size: int = MIN_CONNECTIONS,
+                 max_size: int = MAX_CONNECTIONS, timeout: float = CONNECTION_TIMEOUT,
+                 idle_timeout: float = IDLE_TIMEOUT):
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._idle: deque = deque()  # (connection, returned_at), most recently returned last
+        self._size = 0
+        self._waiting = 0
+        self._stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, float]:
+        return {
+            'checkouts': 0,
+            'affinity_hits': 0,
+            'waits': 0,
+            'wait_time_total_ms': 0.0,
+            'wait_time_max_ms': 0.0,
+            'exhausted': 0,
+            'created': 0,
+            'closed': 0,
+            'validation_failures': 0,
+        }
+
+    def _check_fork(self) -> None:
+        """Forget connections inherited from the parent process"""
+        if self._pid != os.getpid():
+            with self._cond:
+                if self._pid != os.getpid():
+                    # Closing handles opened by the parent is unsafe, just drop them
+                    self._idle.clear()
+                    self._size = 0
+                    self._waiting = 0
+                    self._stats = self._new_stats()
+                    self._local = threading.local()
+                    self._pid = os.getpid()
+                    logger.info(f"Connection pool reset after fork (pid {self._pid})")
+
+    def _take_idle(self) -> Optional[sqlite3.Connection]:
+        preferred = getattr(self._local, 'connection', None)
+        if preferred is not None:
+            for index, (conn, _) in enumerate(self._idle):
+                if conn is preferred:
+                    del self._idle[index]
+                    self._stats['affinity_hits'] += 1
+                    return conn
+        if self._idle:
+            return self._idle.pop()[0]
+        return None
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing connection: {e}")
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection that will not return to the pool"""
+        self._close(conn)
+        with self._cond:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_usable(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    def _create(self) -> sqlite3.Connection:
+        try:
+            conn = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a validated connection, creating one if below max_size"""
+        self._check_fork()
+        started = time.perf_counter()
+        waited = False
+
+        while True:
+            create = False
+            with self._cond:
+                while True:
+                    conn = self._take_idle()
+                    if conn is not None:
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                        break
+
+                    remaining = self.timeout - (time.perf_counter() - started)
+                    if remaining <= 0:
+                        self._stats['exhausted'] += 1
+                        logger.warning(f"Connection pool exhausted ({self.max_size} connections in use)")
+                        from app.db_executor import DatabaseBusyError
+                        raise DatabaseBusyError("Connection pool exhausted, retry later")
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if create:
+                conn = self._create()
+            elif not self._is_usable(conn):
+                with self._cond:
+                    self._stats['validation_failures'] += 1
+                logger.warning("Discarding broken pooled connection")
+                self._discard(conn)
+                continue
+
+            wait_ms = (time.perf_counter() - started) * 1000
+            with self._cond:
+                self._stats['checkouts'] += 1
+                if waited:
+                    self._stats['waits'] += 1
+                    self._stats['wait_time_total_ms'] += wait_ms
+                    self._stats['wait_time_max_ms'] = max(self._stats['wait_time_max_ms'], wait_ms)
+            return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool"""
+        if self._pid != os.getpid():
+            return
+
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding connection that failed to roll back: {e}")
+                self._discard(conn)
+                return
+
+        self._local.connection = conn
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            self._idle.append((conn, now))
+            # Shrink: close the longest idle connections above min_size
+            while (self._size - len(expired) > self.min_size and self._idle
+                   and now - self._idle[0][1] > self.idle_timeout):
+                expired.append(self._idle.popleft()[0])
+            self._size -= len(expired)
+            self._stats['closed'] += len(expired)
+            self._cond.notify()
+
+        for expired_conn in expired:
+            self._close(expired_conn)
+
+    def fill(self) -> None:
+        """Open connections up to min_size"""
+        self._check_fork()
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn = self._create()
+            with self._cond:
+                self._idle.appendleft((conn, time.monotonic()))
+                self._cond.notify()
+
+    def close_idle(self) -> int:
+        """Close every idle connection, returns how many were closed"""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._stats['closed'] += len(idle)
+
+        for conn in idle:
+            self._close(conn)
+        return len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size, usage and wait/exhaustion counters"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        stats['wait_time_total_ms'] = round(stats['wait_time_total_ms'], 2)
+        stats['wait_time_max_ms'] = round(stats['wait_time_max_ms'], 2)
+        stats['avg_wait_time_ms'] = round(stats['wait_time_total_ms'] / stats['waits'], 2) if stats['waits'] else 0.0
+        return stats
+
 class DatabaseManager:
-    """Singleton database manager with connection pooling and foreign key enforcement"""
+    """
+    Singleton database manager with foreign key enforcement.
+
+    Reads (fetch_one/fetch_all) use a pool of read-only connections. Writes go
+    through one writer connection: execute_query calls from concurrent threads
+    are queued and committed together in a single transaction (group commit),
+    and get_connection() gives exclusive, re-entrant access to the writer for
+    explicit transactions. Reads and writes issued while the current thread
+    holds the writer run on the writer, so they see its uncommitted changes.
+    """
     __bypass__: str = 'YOUSHALLPASS'
 
     _instance: Optional['DatabaseManager'] = None
@@ -73,17 +355,37 @@ class DatabaseManager:
         # Load configuration
         self.config = _get_database_config()
         self.db_path = self.config['path']
-        self._connection_pool = Queue(maxsize=MAX_CONNECTIONS)
+        self._connection_pool = ConnectionPool(
+            self._create_read_connection,
+            min_size=self.config.get('pool_min_connections', MIN_CONNECTIONS),
+            max_size=self.config.get('pool_max_connections', MAX_CONNECTIONS),
+            timeout=self.config.get('pool_timeout', CONNECTION_TIMEOUT),
+            idle_timeout=self.config.get('pool_idle_timeout', IDLE_TIMEOUT)
+        )
         self._pool_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+        self._writer_owner: Optional[int] = None
+        self._writer_depth = 0
+        self._writer_pid = os.getpid()
+        self._write_queue: deque = deque()
+        self._write_batch_size = self.config.get('write_batch_size', WRITE_BATCH_SIZE)
+        self.strict_routing = self.config.get('strict_routing', False)
+        self._write_stats = {'statements': 0, 'batches': 0, 'grouped_statements': 0, 'max_batch': 0, 'failed': 0}
+        self._aio: Optional['AsyncDatabaseManager'] = None
         self._initialized = False
         
         self.ensure_database_directory()
         self._initialize_connection_pool()
         self._initialized = True
         
-        logger.info(f"DatabaseManager initialized with connection pool (max: {MAX_CONNECTIONS})")
+        logger.info(
+            f"DatabaseManager initialized with connection pool "
+            f"(min: {self._connection_pool.min_size}, max: {self._connection_pool.max_size})"
+        )
         logger.info(f"Database path: {self.db_path}")
         logger.info(f"Foreign keys enabled: {self.config['enable_foreign_keys']}")
+        logger.info(f"Strict read/write routing: {self.strict_routing}")
         logger.info(f"Backup enabled: {self.config['backup_enabled']}")
     
     def ensure_database_directory(self):
@@ -96,12 +398,12 @@ class DatabaseManager:
             raise
     
     def _initialize_connection_pool(self):
-        """Initialize connection pool with pre-configured connections"""
+        """Open the writer and the minimum number of read connections, the rest are created on demand"""
         try:
-            for _ in range(MAX_CONNECTIONS):
-                conn = self._create_connection()
-                self._connection_pool.put(conn)
-            logger.info(f"Connection pool initialized with {MAX_CONNECTIONS} connections")
+            # The writer creates the database file and switches it to WAL before readers attach
+            self._writer = self._create_connection()
+            self._connection_pool.fill()
+            logger.info(f"Connection pool initialized with {self._connection_pool.min_size} connections")
         except Exception as e:
             logger.error(f"Failed to initialize connection pool: {e}")
             raise
@@ -132,28 +434,60 @@ class DatabaseManager:
             logger.error(f"Failed to create database connection: {e}")
             raise
 
-    def get_pool_status(self) -> Dict[str, int]:
+    def _create_read_connection(self) -> sqlite3.Connection:
+        """Create a read-only connection (mode=ro, query_only) for the read pool"""
+        try:
+            conn = sqlite3.connect(
+                f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=CONNECTION_TIMEOUT
+            )
+            conn.row_factory = sqlite3.Row
+            
+            if self.config['enable_foreign_keys']:
+                conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA query_only = ON")
+            conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+            conn.execute("PRAGMA temp_store = MEMORY")
+            
+            return conn
+        except Exception as e:
+            logger.error(f"Failed to create read-only database connection: {e}")
+            raise
+
+    @property
+    def aio(self) -> 'AsyncDatabaseManager':
+        """Async query API, backed by its own worker threads and connections"""
+        if self._aio is None:
+            with self._pool_lock:
+                if self._aio is None:
+                    self._aio = AsyncDatabaseManager(self, workers=_get_async_workers())
+        return self._aio
+
+    def get_pool_status(self) -> Dict[str, Any]:
         """Monitoring delle connessioni"""
+        stats = self._connection_pool.get_stats()
         return {
-            'active_connections': self._connection_pool.qsize(),
-            'max_connections': MAX_CONNECTIONS
+            'active_connections': stats['in_use'],
+            'idle_connections': stats['idle'],
+            'max_connections': stats['max_size'],
+            **stats,
+            'writer': {
+                **self._write_stats,
+                'queued': len(self._write_queue),
+                'busy': self._writer_owner is not None,
+            }
         }
 
     def _get_connection_from_pool(self) -> sqlite3.Connection:
         """Get a connection from the pool"""
-        try:
-            return self._connection_pool.get(timeout=CONNECTION_TIMEOUT)
-        except Empty:
-            logger.warning("Connection pool exhausted, creating new connection")
-            return self._create_connection()
+        return self._connection_pool.acquire()
     
     def _return_connection_to_pool(self, conn: sqlite3.Connection):
         """Return a connection to the pool"""
         try:
-            if self._connection_pool.qsize() < MAX_CONNECTIONS:
-                self._connection_pool.put(conn)
-            else:
-                conn.close()
+            self._connection_pool.release(conn)
         except Exception as e:
             logger.warning(f"Failed to return connection to pool: {e}")
             try:
@@ -161,9 +495,55 @@ class DatabaseManager:
             except:
                 pass
     
+    def _check_writer_fork(self) -> None:
+        """Forget the writer connection and lock inherited from the parent process"""
+        if self._writer_pid != os.getpid():
+            self._writer = None
+            self._writer_lock = threading.RLock()
+            self._writer_owner = None
+            self._writer_depth = 0
+            self._write_queue = deque()
+            self._writer_pid = os.getpid()
+
+    def holds_writer(self) -> bool:
+        """Whether the current thread is inside a get_connection() block"""
+        return self._writer_owner == threading.get_ident()
+
     @contextmanager
     def get_connection(self):
-        """Get database connection from pool with proper cleanup and transaction management"""
+        """
+        Exclusive access to the writer connection, for explicit transactions.
+        Re-entrant within a thread; the outermost block rolls back on error,
+        nested blocks leave the open transaction to it (use a savepoint to
+        undo only their own writes).
+        """
+        self._check_writer_fork()
+        with self._writer_lock:
+            conn = None
+            self._writer_depth += 1
+            self._writer_owner = threading.get_ident()
+            try:
+                if self._writer is None:
+                    self._writer = self._create_connection()
+                conn = self._writer
+                yield conn
+            except Exception as e:
+                if conn and self._writer_depth == 1:
+                    try:
+                        conn.rollback()
+                        logger.debug("Transaction rolled back due to error")
+                    except Exception as rollback_error:
+                        logger.error(f"Failed to rollback transaction: {rollback_error}")
+                logger.error(f"Database operation failed: {e}")
+                raise
+            finally:
+                self._writer_depth -= 1
+                if self._writer_depth == 0:
+                    self._writer_owner = None
+
+    @contextmanager
+    def get_read_connection(self):
+        """Get a read-only connection from the pool"""
         conn = None
         try:
             conn = self._get_connection_from_pool()
@@ -202,36 +582,142 @@ class DatabaseManager:
 
         return False
 
+    def _prepare_query(self, query: str, params: tuple = None) -> Optional[tuple]:
+        """Validate query safety (unless bypassed) and sanitize parameters"""
+        if not self._can_bypass_validate_query_safety(params):
+            # Validate query safety
+            if not SecureDatabaseOperations.validate_query_safety(query):
+                logger.error(f"Potentially unsafe query detected: {query[:100]}...")
+                raise ValueError("Unsafe query pattern detected")
+        else:
+            params = params[:-1]
+        
+        # Sanitize parameters
+        if params:
+            params = SecureDatabaseOperations.sanitize_sql_params(params)
+        return params
+    
+    @contextmanager
+    def _connection_for_read(self, query: str):
+        """Read-only pool connection, or the writer when the statement or the current thread needs it"""
+        if self.holds_writer():
+            with self.get_connection() as conn:
+                yield conn
+        elif is_write_statement(query):
+            if self.strict_routing:
+                logger.error(f"Write statement on the read path: {query[:100]}...")
+                raise ReadOnlyViolationError(f"Write statement sent to a read method: {query[:100]}")
+            logger.warning(f"Routing write statement from a read method to the writer: {query[:100]}...")
+            with self.get_connection() as conn:
+                was_in_transaction = conn.in_transaction
+                yield conn
+                if not was_in_transaction:
+                    conn.commit()
+        else:
+            with self.get_read_connection() as conn:
+                yield conn
+
+    @staticmethod
+    def _run_write(conn: sqlite3.Connection, query: str, params: Optional[tuple]) -> sqlite3.Cursor:
+        cursor = conn.cursor()
+        if params:
+            cursor.execute(query, params)
+            logger.debug(f"Executed query with params: {query[:100]}...")
+        else:
+            cursor.execute(query)
+            logger.debug(f"Executed query: {query[:100]}...")
+        return cursor
+
+    def _execute_write(self, query: str, params: Optional[tuple]) -> sqlite3.Cursor:
+        """Run an already validated write on the writer connection"""
+        if self.holds_writer():
+            # Part of the caller's get_connection() block: commit only if it has no open transaction
+            with self.get_connection() as conn:
+                was_in_transaction = conn.in_transaction
+                cursor = self._run_write(conn, query, params)
+                if not was_in_transaction:
+                    conn.commit()
+                return cursor
+
+        # Queue the statement; whichever thread gets the writer first commits everything queued
+        job = _WriteJob(query, params)
+        self._write_queue.append(job)
+        while not job.done:
+            with self.get_connection() as conn:
+                if not job.done:
+                    self._commit_write_batch(conn)
+        if job.error is not None:
+            raise job.error
+        return job.cursor
+
+    def _commit_write_batch(self, conn: sqlite3.Connection) -> None:
+        """Execute queued writes in one transaction, a savepoint per statement"""
+        batch = []
+        while self._write_queue and len(batch) < self._write_batch_size:
+            batch.append(self._write_queue.popleft())
+        if not batch:
+            return
+
+        try:
+            if len(batch) == 1:
+                job = batch[0]
+                try:
+                    job.cursor = self._run_write(conn, job.query, job.params)
+                    conn.commit()
+                except Exception as e:
+                    job.error = e
+                    conn.rollback()
+                return
+
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            try:
+                for job in batch:
+                    conn.execute("SAVEPOINT group_write")
+                    try:
+                        job.cursor = self._run_write(conn, job.query, job.params)
+                        conn.execute("RELEASE group_write")
+                    except Exception as e:
+                        job.error = e
+                        conn.execute("ROLLBACK TO group_write")
+                        conn.execute("RELEASE group_write")
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} statements failed: {e}")
+                try:
+                    conn.rollback()
+                except Exception as rollback_error:
+                    logger.error(f"Failed to rollback transaction: {rollback_error}")
+                for job in batch:
+                    if job.error is None:
+                        job.error, job.cursor = e, None
+        finally:
+            for job in batch:
+                job.done = True
+            self._write_stats['batches'] += 1
+            self._write_stats['statements'] += len(batch)
+            self._write_stats['failed'] += sum(1 for job in batch if job.error is not None)
+            if len(batch) > 1:
+                self._write_stats['grouped_statements'] += len(batch)
+            self._write_stats['max_batch'] = max(self._write_stats['max_batch'], len(batch))
+
     def execute_query(self, query: str, params: tuple = None) -> sqlite3.Cursor:
         """Execute a single query with proper error handling, logging, and security validation"""
+        registry = get_query_registry()
+        statement = None
         try:
-            # Security validation
-            from app.security import SecureDatabaseOperations
-            
-            if not self._can_bypass_validate_query_safety(params):
-                # Validate query safety
-                if not SecureDatabaseOperations.validate_query_safety(query):
-                    logger.error(f"Potentially unsafe query detected: {query[:100]}...")
-                    raise ValueError("Unsafe query pattern detected")
-            else:
-                params = params[:-1]
-
-            
-            # Sanitize parameters
-            if params:
-                params = SecureDatabaseOperations.sanitize_sql_params(params)
+            params = self._prepare_query(query, params)
+            if registry.enabled:
+                statement = registry.statement_name(query)
             
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                    logger.debug(f"Executed query with params: {query[:100]}...")
-                else:
-                    cursor.execute(query)
-                    logger.debug(f"Executed query: {query[:100]}...")
-                conn.commit()
-                return cursor
+            started = time.perf_counter()
+            cursor = self._execute_write(query, params)
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, cursor.rowcount)
+            return cursor
         except sqlite3.Error as e:
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, failed=True)
             logger.error(f"SQL execution failed - Query: {query[:100]}..., Error: {e}")
             raise
         except Exception as e:
@@ -240,23 +726,15 @@ class DatabaseManager:
     
     def fetch_one(self, query: str, params: tuple = None) -> Optional[sqlite3.Row]:
         """Fetch single row with error handling and security validation"""
+        registry = get_query_registry()
+        statement = None
         try:
-            # Security validation
-            from app.security import SecureDatabaseOperations
-            
-            if not self._can_bypass_validate_query_safety(params):
-                # Validate query safety
-                if not SecureDatabaseOperations.validate_query_safety(query):
-                    logger.error(f"Potentially unsafe query detected: {query[:100]}...")
-                    raise ValueError("Unsafe query pattern detected")
-            else:
-                params = params[:-1]
-            
-            # Sanitize parameters
-            if params:
-                params = SecureDatabaseOperations.sanitize_sql_params(params)
+            params = self._prepare_query(query, params)
+            if registry.enabled:
+                statement = registry.statement_name(query)
             
-            with self.get_connection() as conn:
+            started = time.perf_counter()
+            with self._connection_for_read(query) as conn:
                 cursor = conn.cursor()
                 if params:
                     cursor.execute(query, params)
@@ -265,9 +743,13 @@ class DatabaseManager:
                     cursor.execute(query)
                     logger.debug(f"Fetching one row: {query[:100]}...")
                 result = cursor.fetchone()
-                logger.debug(f"Fetch one result: {'Found' if result else 'Not found'}")
-                return result
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, int(result is not None))
+            logger.debug(f"Fetch one result: {'Found' if result else 'Not found'}")
+            return result
         except sqlite3.Error as e:
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, failed=True)
             logger.error(f"SQL fetch one failed - Query: {query[:100]}..., Error: {e}")
             raise
         except Exception as e:
@@ -276,23 +758,15 @@ class DatabaseManager:
     
     def fetch_all(self, query: str, params: tuple = None) -> List[sqlite3.Row]:
         """Fetch all rows with error handling and security validation"""
+        registry = get_query_registry()
+        statement = None
         try:
-            # Security validation
-            from app.security import SecureDatabaseOperations
+            params = self._prepare_query(query, params)
+            if registry.enabled:
+                statement = registry.statement_name(query)
             
-            if not self._can_bypass_validate_query_safety(params):
-                # Validate query safety
-                if not SecureDatabaseOperations.validate_query_safety(query):
-                    logger.error(f"Potentially unsafe query detected: {query[:100]}...")
-                    raise ValueError("Unsafe query pattern detected")
-            else:
-                params = params[:-1]
-            
-            # Sanitize parameters
-            if params:
-                params = SecureDatabaseOperations.sanitize_sql_params(params)
-            
-            with self.get_connection() as conn:
+            started = time.perf_counter()
+            with self._connection_for_read(query) as conn:
                 cursor = conn.cursor()
                 if params:
                     cursor.execute(query, params)
@@ -301,15 +775,66 @@ class DatabaseManager:
                     cursor.execute(query)
                     logger.debug(f"Fetching all rows: {query[:100]}...")
                 results = cursor.fetchall()
-                logger.debug(f"Fetch all results: {len(results)} rows")
-                return results
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, len(results))
+            logger.debug(f"Fetch all results: {len(results)} rows")
+            return results
         except sqlite3.Error as e:
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, failed=True)
             logger.error(f"SQL fetch all failed - Query: {query[:100]}..., Error: {e}")
             raise
         except Exception as e:
             logger.error(f"Unexpected error during fetch all: {e}")
             raise
     
+    def iter_rows(self, query: str, params: tuple = None,
+                  batch_size: int = FETCH_BATCH_SIZE) -> Iterator[sqlite3.Row]:
+        """
+        Iterate over the rows of a query, fetching `batch_size` rows at a time.
+
+        The connection stays checked out until the iterator is exhausted or
+        closed, so only one batch of rows is in memory at any point.
+        """
+        registry = get_query_registry()
+        statement = None
+        elapsed = 0.0
+        rows_read = 0
+        try:
+            params = self._prepare_query(query, params)
+            if registry.enabled:
+                statement = registry.statement_name(query)
+
+            with self._connection_for_read(query) as conn:
+                started = time.perf_counter()
+                cursor = conn.cursor()
+                cursor.arraysize = batch_size
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                logger.debug(f"Iterating rows: {query[:100]}...")
+                # Only time spent in SQLite counts, not the consumer's work between batches
+                while True:
+                    rows = cursor.fetchmany()
+                    elapsed += time.perf_counter() - started
+                    if not rows:
+                        break
+                    rows_read += len(rows)
+                    yield from rows
+                    started = time.perf_counter()
+            if statement:
+                registry.record(statement, query, elapsed * 1000, rows_read)
+            logger.debug(f"Iterated rows: {rows_read} rows")
+        except sqlite3.Error as e:
+            if statement:
+                registry.record(statement, query, elapsed * 1000, rows_read, failed=True)
+            logger.error(f"SQL row iteration failed - Query: {query[:100]}..., Error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during row iteration: {e}")
+            raise
+    
     def execute_script(self, script_path: Path) -> None:
         """Execute SQL script file with comprehensive error handling"""
         if not script_path.exists():
@@ -430,8 +955,9 @@ class DatabaseManager:
             info['foreign_keys_enabled'] = bool(fk_status and fk_status[0] == 1)
             
             # Get connection pool status
-            info['connection_pool_size'] = self._connection_pool.qsize()
-            info['max_connections'] = MAX_CONNECTIONS
+            pool_stats = self._connection_pool.get_stats()
+            info['connection_pool_size'] = pool_stats['size']
+            info['max_connections'] = pool_stats['max_size']
             
             return info
             
@@ -440,21 +966,17 @@ class DatabaseManager:
             return {'error': str(e)}
     
     def close_all_connections(self) -> None:
-        """Close all connections in the pool - useful for cleanup"""
+        """Close all idle connections in the pool and the writer if unused - useful for cleanup"""
         try:
-            closed_count = 0
-            while not self._connection_pool.empty():
+            closed_count = self._connection_pool.close_idle()
+            if self._writer is not None and self._writer_lock.acquire(blocking=False):
                 try:
-                    conn = self._connection_pool.get_nowait()
-                    conn.close()
+                    self._writer.close()
+                    self._writer = None
                     closed_count += 1
-                except Empty:
-                    break
-                except Exception as e:
-                    logger.warning(f"Error closing connection: {e}")
-            
+                finally:
+                    self._writer_lock.release()
             logger.info(f"Closed {closed_count} connections from pool")
-            
         except Exception as e:
             logger.error(f"Error during connection pool cleanup: {e}")
     
@@ -465,6 +987,170 @@ class DatabaseManager:
         except:
             pass
 
+def _get_async_workers() -> int:
+    """Get the number of async worker connections from settings"""
+    try:
+        from app.config import get_settings
+        return get_settings().performance.async_db_workers
+    except ImportError:
+        logger.warning("Configuration not available, using default async database workers")
+        return ASYNC_WORKERS
+
+def _resolve_future(future: asyncio.Future, result: Any = None, error: BaseException = None) -> None:
+    """Complete a future on its event loop unless the awaiting task gave up on it"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+class _ConnectionWorker(threading.Thread):
+    """Thread that owns one SQLite connection and runs queued jobs on it in order"""
+
+    def __init__(self, conn: sqlite3.Connection, name: str):
+        super().__init__(name=name, daemon=True)
+        self.conn = conn
+        self.jobs: Queue = Queue()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            loop, future, func = job
+            if future.cancelled():
+                continue
+
+            result, error = None, None
+            try:
+                result = func(self.conn)
+            except BaseException as e:
+                error = e
+                try:
+                    self.conn.rollback()
+                except Exception as rollback_error:
+                    logger.error(f"Failed to rollback transaction: {rollback_error}")
+
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, result, error)
+            except RuntimeError:
+                # Event loop closed while the job was running
+                logger.debug("Dropping async query result, event loop is closed")
+
+        try:
+            self.conn.close()
+        except Exception as e:
+            logger.warning(f"Error closing async worker connection: {e}")
+
+class AsyncDatabaseManager:
+    """
+    Async query API on top of DatabaseManager.
+
+    Each worker thread owns a dedicated connection and a request queue, so
+    awaiting coroutines never block the event loop and independent reads
+    can be gathered concurrently. Queries go through the same safety
+    validation and parameter sanitization as the sync API.
+    """
+
+    def __init__(self, manager: DatabaseManager, workers: int = ASYNC_WORKERS):
+        self.manager = manager
+        self.worker_count = workers
+        self._workers: List[_ConnectionWorker] = []
+        self._lock = threading.Lock()
+
+    def _start_workers(self) -> List[_ConnectionWorker]:
+        if not self._workers:
+            with self._lock:
+                if not self._workers:
+                    workers = []
+                    for index in range(self.worker_count):
+                        worker = _ConnectionWorker(self.manager._create_read_connection(), name=f"db-async-{index}")
+                        worker.start()
+                        workers.append(worker)
+                    self._workers = workers
+                    logger.info(f"Async database workers started ({self.worker_count})")
+        return self._workers
+
+    async def _submit(self, query: str, func: Callable[[sqlite3.Connection], Any],
+                      count_rows: Callable[[Any], int]) -> Any:
+        """Queue a job on the least loaded worker and await its result"""
+        registry = get_query_registry()
+        statement = registry.statement_name(query) if registry.enabled else None
+
+        def job(conn: sqlite3.Connection) -> Any:
+            started = time.perf_counter()
+            try:
+                result = func(conn)
+            except Exception:
+                if statement:
+                    registry.record(statement, query, (time.perf_counter() - started) * 1000, failed=True)
+                raise
+            if statement:
+                registry.record(statement, query, (time.perf_counter() - started) * 1000, count_rows(result))
+            return result
+
+        worker = min(self._start_workers(), key=lambda w: w.jobs.qsize())
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        worker.jobs.put((loop, future, job))
+        return await future
+
+    async def execute(self, query: str, params: tuple = None) -> sqlite3.Cursor:
+        """Execute and commit a single query (through the manager's writer)"""
+        params = self.manager._prepare_query(query, params)
+
+        def job(conn: sqlite3.Connection) -> sqlite3.Cursor:
+            return self.manager._execute_write(query, params)
+
+        try:
+            return await self._submit(query, job, lambda cursor: cursor.rowcount)
+        except sqlite3.Error as e:
+            logger.error(f"SQL execution failed - Query: {query[:100]}..., Error: {e}")
+            raise
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[sqlite3.Row]:
+        """Fetch single row"""
+        params = self.manager._prepare_query(query, params)
+
+        try:
+            return await self._submit(
+                query, lambda conn: conn.execute(query, params or ()).fetchone(), lambda row: int(row is not None)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"SQL fetch one failed - Query: {query[:100]}..., Error: {e}")
+            raise
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[sqlite3.Row]:
+        """Fetch all rows"""
+        params = self.manager._prepare_query(query, params)
+
+        try:
+            return await self._submit(query, lambda conn: conn.execute(query, params or ()).fetchall(), len)
+        except sqlite3.Error as e:
+            logger.error(f"SQL fetch all failed - Query: {query[:100]}..., Error: {e}")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker count and queued jobs per worker"""
+        return {
+            'workers': self.worker_count,
+            'started': bool(self._workers),
+            'queued': [worker.jobs.qsize() for worker in self._workers],
+        }
+
+    def close(self) -> None:
+        """Stop the workers after their queued jobs and close their connections"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=CONNECTION_TIMEOUT)
+        if workers:
+            logger.info(f"Async database workers stopped ({len(workers)})")
+
 # Global database manager instance - initialized lazily
 _db_manager: Optional[DatabaseManager] = None
 _manager_lock = threading.Lock()
@@ -509,6 +1195,8 @@ def cleanup_database() -> None:
         try:
             logger.info("Cleaning up database connections...")
             _db_manager.close_all_connections()
+            if _db_manager._aio is not None:
+                _db_manager._aio.close()
             logger.info("Database cleanup completed")
         except Exception as e:
             logger.error(f"Database cleanup failed: {e}")
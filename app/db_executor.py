@@ -0,0 +1,193 @@
+"""
+Thread pool execution layer for blocking database work called from async routes
+Keeps sqlite3 calls off the event loop, with bounded admission and timing
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-request database timing, set by DatabaseTimingMiddleware
+_request_db_timing: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "request_db_timing", default=None
+)
+
+
+class DatabaseBusyError(Exception):
+    """Raised when the database executor has no free slot for new work"""
+
+    def __init__(self, message: str = "Database is busy, retry later", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def start_request_timing() -> Dict[str, float]:
+    """Start collecting database timing for the current request context"""
+    timing = {'calls': 0, 'queue_ms': 0.0, 'exec_ms': 0.0}
+    _request_db_timing.set(timing)
+    return timing
+
+
+def get_request_timing() -> Optional[Dict[str, float]]:
+    """Get database timing collected so far for the current request"""
+    return _request_db_timing.get()
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread pool for service and DatabaseManager calls.
+
+    At most ``max_workers`` calls run at once (sized to the connection pool)
+    and up to ``max_pending`` more wait in the queue. Beyond that ``run``
+    fails fast with DatabaseBusyError instead of letting the backlog grow.
+    """
+
+    def __init__(self, max_workers: int = 10, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-exec")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'queue_time_total_ms': 0.0,
+            'queue_time_max_ms': 0.0,
+            'exec_time_total_ms': 0.0,
+            'exec_time_max_ms': 0.0,
+        }
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the pool and await its result"""
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._stats['rejected'] += 1
+            logger.warning(f"Database executor saturated, rejecting {getattr(func, '__qualname__', func)}")
+            raise DatabaseBusyError()
+
+        submitted_at = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def call():
+            started_at = time.perf_counter()
+            timings['queue_ms'] = (started_at - submitted_at) * 1000
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings['exec_ms'] = (time.perf_counter() - started_at) * 1000
+
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+            self._in_flight += 1
+
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, call)
+        except RuntimeError:
+            self._release()
+            raise
+        # The slot is held until the worker is done, even if the awaiting request is cancelled
+        future.add_done_callback(lambda _: self._release())
+
+        failed = False
+        try:
+            return await asyncio.wrap_future(future)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if 'exec_ms' in timings:
+                self._record(timings['queue_ms'], timings['exec_ms'], failed)
+
+    def _release(self) -> None:
+        with self._stats_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _record(self, queue_ms: float, exec_ms: float, failed: bool) -> None:
+        with self._stats_lock:
+            self._stats['failed' if failed else 'completed'] += 1
+            self._stats['queue_time_total_ms'] += queue_ms
+            self._stats['queue_time_max_ms'] = max(self._stats['queue_time_max_ms'], queue_ms)
+            self._stats['exec_time_total_ms'] += exec_ms
+            self._stats['exec_time_max_ms'] = max(self._stats['exec_time_max_ms'], exec_ms)
+
+        timing = _request_db_timing.get()
+        if timing is not None:
+            timing['calls'] += 1
+            timing['queue_ms'] += queue_ms
+            timing['exec_ms'] += exec_ms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor load and queue/execution timing statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = self._in_flight
+
+        finished = stats['completed'] + stats['failed']
+        stats['avg_queue_time_ms'] = round(stats['queue_time_total_ms'] / finished, 2) if finished else 0.0
+        stats['avg_exec_time_ms'] = round(stats['exec_time_total_ms'] / finished, 2) if finished else 0.0
+        for field_name in ('queue_time_total_ms', 'queue_time_max_ms', 'exec_time_total_ms', 'exec_time_max_ms'):
+            stats[field_name] = round(stats[field_name], 2)
+
+        stats.update({
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+        })
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+
+# Global executor instance
+_db_executor: Optional[DatabaseExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """Get the process-wide database executor"""
+    global _db_executor
+
+    if _db_executor is None:
+        with _executor_lock:
+            if _db_executor is None:
+                from app.database import MAX_CONNECTIONS
+                try:
+                    from app.config import get_settings
+                    settings = get_settings()
+                    performance = settings.performance
+                    _db_executor = DatabaseExecutor(
+                        max_workers=min(performance.db_executor_workers, settings.database.pool_max_connections),
+                        max_pending=performance.db_executor_max_pending
+                    )
+                except ImportError:
+                    logger.warning("Configuration not available, using default database executor settings")
+                    _db_executor = DatabaseExecutor(max_workers=MAX_CONNECTIONS)
+
+    return _db_executor
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the global executor (application shutdown)"""
+    global _db_executor
+
+    with _executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown(wait=True)
+            _db_executor = None
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking database work on the global executor"""
+    return await get_db_executor().run(func, *args, **kwargs)
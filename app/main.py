@@ -10,16 +10,21 @@ from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.database import init_database, cleanup_database
+from app.db_executor import DatabaseBusyError, shutdown_db_executor
+from app.services.import_export_jobs import get_job_store, shutdown_job_runner
+from app.services.audit_trail import get_audit_manager, shutdown_audit_manager
+from app.utils.error_handler import shutdown_error_logger
 from app.security import SecurityConfig, get_security_config
 
 from app.middleware.security import SecurityMiddleware, InputValidationMiddleware, SQLInjectionProtectionMiddleware
 from app.middleware.security_mini import MiniSecurityMiddleware
+from app.middleware.db_timing import DatabaseTimingMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.routes import (
@@ -78,9 +83,23 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    try:
+        get_job_store().recover_interrupted()
+    except Exception as e:
+        logger.error(f"Failed to recover interrupted import/export jobs: {e}")
+    
+    try:
+        get_audit_manager().run_data_change_maintenance()
+    except Exception as e:
+        logger.error(f"Failed to compact audit data changes: {e}")
+    
     yield
     
     logger.info(f"Shutting down {settings.application.title}")
+    shutdown_job_runner()
+    shutdown_audit_manager()
+    shutdown_error_logger()
+    shutdown_db_executor()
     try:
         cleanup_database()
         logger.info("Database cleanup completed")
@@ -137,6 +156,9 @@ if settings.security.cors_origins:
         allow_headers=["*"],
     )
 
+# Database queue/execution timing headers (Server-Timing)
+app.add_middleware(DatabaseTimingMiddleware)
+
 # Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -319,6 +341,15 @@ async def server_error_handler(request: Request, exc):
         status_code=500
     )
 
+@app.exception_handler(DatabaseBusyError)
+async def database_busy_handler(request: Request, exc: DatabaseBusyError):
+    logger.warning(f"Database busy, rejected {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,30 @@
+"""
+Database timing middleware
+Reports per-request database queueing and execution time as response headers
+"""
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db_executor import start_request_timing
+
+
+class DatabaseTimingMiddleware(BaseHTTPMiddleware):
+    """
+    Adds a Server-Timing header with the time the request's database calls
+    spent waiting for an executor thread (db-queue) and running (db-exec).
+    """
+
+    async def dispatch(self, request, call_next):
+        timing = start_request_timing()
+        response = await call_next(request)
+
+        if timing['calls']:
+            server_timing = (
+                f"db-queue;dur={timing['queue_ms']:.1f}, "
+                f"db-exec;dur={timing['exec_ms']:.1f}"
+            )
+            existing = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = f"{existing}, {server_timing}" if existing else server_timing
+            response.headers["X-DB-Calls"] = str(timing['calls'])
+
+        return response
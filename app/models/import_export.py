@@ -5,7 +5,7 @@ This module defines the core data structures used for importing and exporting
 organizational data, including configuration options, results, and validation models.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import date, datetime
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any, Union
@@ -122,6 +122,10 @@ class ImportExportValidationError(Exception):
         
         prefix = " - ".join(parts)
         return f"{prefix}: {self.message}" if prefix else self.message
+    
+    def __reduce__(self):
+        """Pickle by field values, exceptions otherwise only keep ``args``."""
+        return (self.__class__, tuple(getattr(self, f.name) for f in fields(self)))
 
 
 @dataclass
@@ -140,6 +144,11 @@ class ImportOptions:
     csv_delimiter: str = ","
     csv_quote_char: str = '"'
     max_errors: int = 1000
+    bulk_insert: bool = True  # insert new records of a batch with one executemany
+    commit_interval: Optional[int] = None  # batches per commit, IMPORT_COMMIT_INTERVAL if None
+    plan_batches: bool = False  # size batches from a dry-run plan made on a sample of the data
+    import_plan: Optional['ImportPlan'] = None  # plan to follow, e.g. the one from preview_import
+    sample_errors: Optional[bool] = None  # keep a sample of the line errors, None = from ERROR_SAMPLING_MIN_RECORDS
     
     def __post_init__(self):
         """Validate import options after initialization."""
@@ -153,6 +162,67 @@ class ImportOptions:
         invalid_entities = set(self.entity_types) - valid_entities
         if invalid_entities:
             raise ValueError(f"Invalid entity types: {invalid_entities}")
+        
+        if self.commit_interval is not None and self.commit_interval < 1:
+            raise ValueError("Commit interval must be at least 1 batch")
+
+
+@dataclass
+class EntityImportPlan:
+    """Measured cost and planned batching of one entity type of an import."""
+    entity_type: str
+    record_count: int
+    sample_size: int
+    batch_size: int
+    parse_seconds_per_record: float = 0.0
+    validate_seconds_per_record: float = 0.0
+    insert_seconds_per_record: float = 0.0  # including the existing-record lookup
+    bytes_per_record: int = 0  # working memory while a record is processed
+    conflict_count: int = 0  # records matching an existing one
+    
+    @property
+    def seconds_per_record(self) -> float:
+        """Total measured cost of one record."""
+        return self.parse_seconds_per_record + self.validate_seconds_per_record + self.insert_seconds_per_record
+    
+    @property
+    def estimated_seconds(self) -> float:
+        """Expected time to import all records of the entity type."""
+        return self.record_count * self.seconds_per_record
+    
+    @property
+    def batch_count(self) -> int:
+        """Number of batches the records are processed in."""
+        return -(-self.record_count // self.batch_size) if self.batch_size else 0
+
+
+@dataclass
+class ImportPlan:
+    """Dry-run plan of an import, measured on a sample of its records."""
+    entities: Dict[str, EntityImportPlan] = field(default_factory=dict)
+    processing_order: List[str] = field(default_factory=list)
+    baseline_memory_mb: float = 0.0  # process memory with the data parsed
+    
+    @property
+    def estimated_seconds(self) -> float:
+        """Expected runtime of the whole import."""
+        return sum(entity.estimated_seconds for entity in self.entities.values())
+    
+    @property
+    def predicted_peak_memory_mb(self) -> float:
+        """Process memory expected while the largest batch is processed."""
+        batch_bytes = max((entity.bytes_per_record * entity.batch_size for entity in self.entities.values()), default=0)
+        return self.baseline_memory_mb + batch_bytes / (1024 * 1024)
+    
+    @property
+    def total_conflicts(self) -> int:
+        """Records matching existing ones across all entity types."""
+        return sum(entity.conflict_count for entity in self.entities.values())
+    
+    def batch_size_for(self, entity_type: str, default: int) -> int:
+        """Planned batch size of an entity type, `default` if it was not planned."""
+        entity = self.entities.get(entity_type)
+        return entity.batch_size if entity else default
 
 
 @dataclass
@@ -279,6 +349,7 @@ class PreviewResult:
     dependency_order: List[str] = field(default_factory=list)
     foreign_key_mappings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     estimated_processing_time: float = 0.0
+    import_plan: Optional[ImportPlan] = None
     
     @property
     def total_records(self) -> int:
@@ -0,0 +1,239 @@
+"""
+Query registry with per-statement call counts and latency histograms
+Statements are fingerprinted by calling service method and normalized SQL
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Geometric latency buckets: 10us up to ~1 minute, 25% wide
+BUCKET_BASE_MS = 0.01
+BUCKET_GROWTH = 1.25
+BUCKET_COUNT = 72
+
+# Frames in these files issue queries on behalf of their caller
+_INTERNAL_FILES = frozenset(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in ('database.py', 'query_registry.py')
+)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _bucket_index(duration_ms: float) -> int:
+    if duration_ms <= BUCKET_BASE_MS:
+        return 0
+    index = int(math.log(duration_ms / BUCKET_BASE_MS, BUCKET_GROWTH)) + 1
+    return min(index, BUCKET_COUNT - 1)
+
+
+def _bucket_upper_ms(index: int) -> float:
+    return BUCKET_BASE_MS * BUCKET_GROWTH ** index
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace so formatting differences map to one statement"""
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(owner: str, query: str) -> str:
+    """Stable statement name, e.g. ``OrgchartService.get_complete_tree#1a2b3c4d``"""
+    digest = hashlib.sha1(normalize_sql(query).encode('utf-8')).hexdigest()[:8]
+    return f"{owner}#{digest}"
+
+
+# Statement owner per code object; one entry per query call site
+_owner_names: Dict[Any, str] = {}
+
+
+def _caller_name() -> str:
+    """Class and method of the first caller outside the database layer"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return 'unknown'
+
+    code = frame.f_code
+    name = _owner_names.get(code)
+    if name is None:
+        qualname = getattr(code, 'co_qualname', code.co_name)
+        if '.' in qualname:
+            name = qualname
+        else:
+            name = f"{frame.f_globals.get('__name__', '?')}.{qualname}"
+        _owner_names[code] = name
+    return name
+
+
+class _StatementStats:
+    """Counters and latency histogram for one statement, owned by one thread"""
+
+    __slots__ = ('calls', 'errors', 'rows', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+
+class QueryRegistry:
+    """
+    Per-statement query statistics.
+
+    Every thread records into its own statistics, so the hot path takes no
+    lock; ``snapshot`` merges the per-thread histograms when read. Latency
+    percentiles are reported as the upper bound of their histogram bucket.
+    """
+
+    def __init__(self, enabled: bool = True, slow_query_threshold_ms: float = 0):
+        self.enabled = enabled
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self._local = threading.local()
+        self._thread_stats: List[Dict[str, _StatementStats]] = []
+        self._statements: Dict[str, str] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def statement_name(self, query: str) -> str:
+        """Fingerprint of the query as issued from the current call site"""
+        return fingerprint(_caller_name(), query)
+
+    def _local_stats(self) -> Dict[str, _StatementStats]:
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            with self._lock:
+                local.generation = self._generation
+                local.stats = {}
+                self._thread_stats.append(local.stats)
+        return local.stats
+
+    def record(self, name: str, query: str, duration_ms: float, rows: int = 0, failed: bool = False) -> None:
+        """Record one execution of a statement"""
+        if not self.enabled:
+            return
+
+        # Statistics must never fail the query being measured
+        try:
+            stats = self._local_stats()
+            entry = stats.get(name)
+            if entry is None:
+                entry = stats[name] = _StatementStats()
+                self._statements.setdefault(name, normalize_sql(query)[:500])
+
+            entry.calls += 1
+            entry.rows += max(rows, 0)
+            entry.total_ms += duration_ms
+            if duration_ms > entry.max_ms:
+                entry.max_ms = duration_ms
+            entry.buckets[_bucket_index(duration_ms)] += 1
+            if failed:
+                entry.errors += 1
+
+            if self.slow_query_threshold_ms and duration_ms >= self.slow_query_threshold_ms:
+                logger.warning(f"Slow query {name} took {duration_ms:.1f}ms ({rows} rows): {normalize_sql(query)[:200]}")
+        except Exception as e:
+            logger.debug(f"Failed to record query statistics for {name}: {e}")
+
+    @staticmethod
+    def _percentile(buckets: List[int], calls: int, fraction: float) -> float:
+        target = math.ceil(calls * fraction)
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if seen >= target:
+                return round(_bucket_upper_ms(index), 3)
+        return round(_bucket_upper_ms(len(buckets) - 1), 3)
+
+    def snapshot(self, limit: Optional[int] = None, order_by: str = 'total_ms') -> Dict[str, Any]:
+        """Merged statistics per statement, slowest (by ``order_by``) first"""
+        with self._lock:
+            thread_stats = list(self._thread_stats)
+
+        merged: Dict[str, _StatementStats] = {}
+        for stats in thread_stats:
+            for name, entry in list(stats.items()):
+                total = merged.get(name)
+                if total is None:
+                    total = merged[name] = _StatementStats()
+                total.calls += entry.calls
+                total.errors += entry.errors
+                total.rows += entry.rows
+                total.total_ms += entry.total_ms
+                total.max_ms = max(total.max_ms, entry.max_ms)
+                total.buckets = [a + b for a, b in zip(total.buckets, entry.buckets)]
+
+        statements = []
+        for name, entry in merged.items():
+            if not entry.calls:
+                continue
+            statements.append({
+                'name': name,
+                'query': self._statements.get(name, ''),
+                'calls': entry.calls,
+                'errors': entry.errors,
+                'rows': entry.rows,
+                'total_ms': round(entry.total_ms, 3),
+                'avg_ms': round(entry.total_ms / entry.calls, 3),
+                'max_ms': round(entry.max_ms, 3),
+                'p50_ms': self._percentile(entry.buckets, entry.calls, 0.50),
+                'p95_ms': self._percentile(entry.buckets, entry.calls, 0.95),
+                'p99_ms': self._percentile(entry.buckets, entry.calls, 0.99),
+            })
+
+        if statements and order_by not in statements[0]:
+            order_by = 'total_ms'
+        statements.sort(key=lambda s: s[order_by], reverse=True)
+
+        return {
+            'enabled': self.enabled,
+            'slow_query_threshold_ms': self.slow_query_threshold_ms,
+            'statement_count': len(statements),
+            'statements': statements[:limit] if limit else statements,
+        }
+
+    def reset(self) -> None:
+        """Drop all collected statistics"""
+        with self._lock:
+            self._generation += 1
+            self._thread_stats = []
+            self._statements = {}
+
+
+# Global registry instance
+_query_registry: Optional[QueryRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_query_registry() -> QueryRegistry:
+    """Get the process-wide query registry"""
+    global _query_registry
+
+    if _query_registry is None:
+        with _registry_lock:
+            if _query_registry is None:
+                try:
+                    from app.config import get_settings
+                    performance = get_settings().performance
+                    _query_registry = QueryRegistry(
+                        enabled=performance.query_stats_enabled,
+                        slow_query_threshold_ms=performance.slow_query_threshold_ms
+                    )
+                except ImportError:
+                    logger.warning("Configuration not available, using default query registry settings")
+                    _query_registry = QueryRegistry()
+
+    return _query_registry
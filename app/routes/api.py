@@ -6,6 +6,7 @@ RESTful endpoints for all CRUD operations
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any
+import asyncio
 import logging
 from datetime import date
 from pydantic import BaseModel, Field
@@ -16,6 +17,7 @@ from app.services.job_title import JobTitleService
 from app.services.assignment import AssignmentService
 from app.services.orgchart import OrgchartService
 from app.models.base import ModelValidationException
+from app.db_executor import DatabaseBusyError, run_db
 from app.security_csfr import generate_csrf_token, validate_csrf_token, validate_csrf_token_flexible, add_csrf_to_context
 
 logger = logging.getLogger(__name__)
@@ -94,6 +96,16 @@ def handle_service_exception(e: Exception, operation: str) -> JSONResponse:
                 errors=[f"{err.field}: {err.message}" for err in e.errors]
             ).dict()
         )
+    elif isinstance(e, DatabaseBusyError):
+        return JSONResponse(
+            status_code=503,
+            content=ApiResponse(
+                success=False,
+                message=f"Database busy during {operation}, retry later",
+                errors=[str(e)]
+            ).dict(),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     else:
         logger.error(f"Error during {operation}: {e}")
         return JSONResponse(
@@ -126,9 +138,9 @@ async def api_list_units(
     """Get list of units with optional filters"""
     try:
         if search:
-            units = unit_service.search(search, ['name', 'short_name'])
+            units = await run_db(unit_service.search, search, ['name', 'short_name'])
         else:
-            units = unit_service.get_all()
+            units = await run_db(unit_service.get_all)
         
         # Apply filters
         if unit_type_id:
@@ -150,7 +162,7 @@ async def api_get_unit(
 ):
     """Get single unit by ID"""
     try:
-        unit = unit_service.get_by_id(unit_id)
+        unit = await run_db(unit_service.get_by_id, unit_id)
         if not unit:
             return JSONResponse(
                 status_code=404,
@@ -188,7 +200,7 @@ async def api_create_unit(
         )
         
         # Create unit
-        created_unit = unit_service.create(unit)
+        created_unit = await run_db(unit_service.create, unit)
         
         return JSONResponse(
             status_code=201,
@@ -209,7 +221,7 @@ async def api_update_unit(
     """Update existing unit"""
     try:
         # Get existing unit
-        existing_unit = unit_service.get_by_id(unit_id)
+        existing_unit = await run_db(unit_service.get_by_id, unit_id)
         if not existing_unit:
             return JSONResponse(
                 status_code=404,
@@ -228,7 +240,7 @@ async def api_update_unit(
         existing_unit.end_date = parse_date_string(unit_data.end_date)
         
         # Update unit
-        updated_unit = unit_service.update(existing_unit)
+        updated_unit = await run_db(unit_service.update, existing_unit)
         
         return ApiResponse(
             data=updated_unit.to_dict(),
@@ -245,7 +257,7 @@ async def api_delete_unit(
     """Delete unit"""
     try:
         # Check if unit can be deleted
-        can_delete, reason = unit_service.can_delete(unit_id)
+        can_delete, reason = await run_db(unit_service.can_delete, unit_id)
         if not can_delete:
             return JSONResponse(
                 status_code=400,
@@ -256,7 +268,7 @@ async def api_delete_unit(
             )
         
         # Delete unit
-        success = unit_service.delete(unit_id)
+        success = await run_db(unit_service.delete, unit_id)
         if not success:
             return JSONResponse(
                 status_code=500,
@@ -277,7 +289,7 @@ async def api_get_unit_hierarchy(
 ):
     """Get unit hierarchy (children tree)"""
     try:
-        children = unit_service.get_children(unit_id)
+        children = await run_db(unit_service.get_children, unit_id)
         return ApiResponse(
             data=[child.to_dict() for child in children],
             message=f"Found {len(children)} child units"
@@ -296,9 +308,9 @@ async def api_list_persons(
     """Get list of persons with optional filters"""
     try:
         if search:
-            persons = person_service.search(search, ['name', 'short_name', 'email'])
+            persons = await run_db(person_service.search, search, ['name', 'short_name', 'email'])
         else:
-            persons = person_service.get_all()
+            persons = await run_db(person_service.get_all)
         
         # Apply filters
         if has_assignments is not None:
@@ -321,7 +333,7 @@ async def api_get_person(
 ):
     """Get single person by ID"""
     try:
-        person = person_service.get_by_id(person_id)
+        person = await run_db(person_service.get_by_id, person_id)
         if not person:
             return JSONResponse(
                 status_code=404,
@@ -356,7 +368,7 @@ async def api_create_person(
         )
         
         # Create person
-        created_person = person_service.create(person)
+        created_person = await run_db(person_service.create, person)
         
         return JSONResponse(
             status_code=201,
@@ -377,7 +389,7 @@ async def api_update_person(
     """Update existing person"""
     try:
         # Get existing person
-        existing_person = person_service.get_by_id(person_id)
+        existing_person = await run_db(person_service.get_by_id, person_id)
         if not existing_person:
             return JSONResponse(
                 status_code=404,
@@ -393,7 +405,7 @@ async def api_update_person(
         existing_person.email = person_data.email
         
         # Update person
-        updated_person = person_service.update(existing_person)
+        updated_person = await run_db(person_service.update, existing_person)
         
         return ApiResponse(
             data=updated_person.to_dict(),
@@ -410,7 +422,7 @@ async def api_delete_person(
     """Delete person"""
     try:
         # Check if person can be deleted
-        can_delete, reason = person_service.can_delete(person_id)
+        can_delete, reason = await run_db(person_service.can_delete, person_id)
         if not can_delete:
             return JSONResponse(
                 status_code=400,
@@ -421,7 +433,7 @@ async def api_delete_person(
             )
         
         # Delete person
-        success = person_service.delete(person_id)
+        success = await run_db(person_service.delete, person_id)
         if not success:
             return JSONResponse(
                 status_code=500,
@@ -443,7 +455,7 @@ async def api_get_person_assignments(
 ):
     """Get assignments for person"""
     try:
-        assignments = assignment_service.get_assignments_by_person(person_id, current_only)
+        assignments = await run_db(assignment_service.get_assignments_by_person, person_id, current_only)
         return ApiResponse(
             data=[assignment.to_dict() for assignment in assignments],
             message=f"Found {len(assignments)} assignments"
@@ -461,9 +473,9 @@ async def api_list_job_titles(
     """Get list of job titles with optional filters"""
     try:
         if search:
-            job_titles = job_title_service.search(search, ['name', 'short_name'])
+            job_titles = await run_db(job_title_service.search, search, ['name', 'short_name'])
         else:
-            job_titles = job_title_service.get_all()
+            job_titles = await run_db(job_title_service.get_all)
         
         return ApiResponse(
             data=[job_title.to_dict() for job_title in job_titles],
@@ -479,7 +491,7 @@ async def api_get_job_title(
 ):
     """Get single job title by ID"""
     try:
-        job_title = job_title_service.get_by_id(job_title_id)
+        job_title = await run_db(job_title_service.get_by_id, job_title_id)
         if not job_title:
             return JSONResponse(
                 status_code=404,
@@ -515,11 +527,11 @@ async def api_create_job_title(
         )
         
         # Create job title
-        created_job_title = job_title_service.create(job_title)
+        created_job_title = await run_db(job_title_service.create, job_title)
         
         # Set assignable units if provided
         if job_title_data.assignable_unit_ids:
-            job_title_service.set_assignable_units(created_job_title.id, job_title_data.assignable_unit_ids)
+            await run_db(job_title_service.set_assignable_units, created_job_title.id, job_title_data.assignable_unit_ids)
         
         return JSONResponse(
             status_code=201,
@@ -544,9 +556,9 @@ async def api_list_assignments(
     """Get list of assignments with optional filters"""
     try:
         if current_only:
-            assignments = assignment_service.get_current_assignments()
+            assignments = await run_db(assignment_service.get_current_assignments)
         else:
-            assignments = assignment_service.get_full_history()
+            assignments = await run_db(assignment_service.get_full_history)
         
         # Apply filters
         if person_id:
@@ -570,7 +582,7 @@ async def api_get_assignment(
 ):
     """Get single assignment by ID"""
     try:
-        assignment = assignment_service.get_by_id(assignment_id)
+        assignment = await run_db(assignment_service.get_by_id, assignment_id)
         if not assignment:
             return JSONResponse(
                 status_code=404,
@@ -610,7 +622,7 @@ async def api_create_assignment(
         )
         
         # Create assignment (will handle versioning automatically)
-        created_assignment = assignment_service.create_or_update_assignment(assignment)
+        created_assignment = await run_db(assignment_service.create_or_update_assignment, assignment)
         
         return JSONResponse(
             status_code=201,
@@ -634,7 +646,7 @@ async def api_terminate_assignment(
         if termination_data.get("termination_date"):
             termination_date = parse_date_string(termination_data["termination_date"]) or date.today()
         
-        success = assignment_service.terminate_assignment(assignment_id, termination_date)
+        success = await run_db(assignment_service.terminate_assignment, assignment_id, termination_date)
         if not success:
             return JSONResponse(
                 status_code=500,
@@ -655,7 +667,7 @@ async def api_get_assignment_history(
 ):
     """Get version history for assignment"""
     try:
-        assignment = assignment_service.get_by_id(assignment_id)
+        assignment = await run_db(assignment_service.get_by_id, assignment_id)
         if not assignment:
             return JSONResponse(
                 status_code=404,
@@ -665,7 +677,8 @@ async def api_get_assignment_history(
                 ).dict()
             )
         
-        history = assignment_service.get_assignment_history(
+        history = await run_db(
+            assignment_service.get_assignment_history,
             assignment.person_id, assignment.unit_id, assignment.job_title_id
         )
         
@@ -687,9 +700,9 @@ async def api_get_orgchart_tree(
     """Get orgchart tree structure"""
     try:
         if unit_id:
-            tree_data = orgchart_service.get_subtree(unit_id, show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_subtree, unit_id, show_persons=show_persons)
         else:
-            tree_data = orgchart_service.get_complete_tree(show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_complete_tree, show_persons=show_persons)
         
         return ApiResponse(
             data=tree_data,
@@ -704,8 +717,8 @@ async def api_get_orgchart_statistics(
 ):
     """Get organizational statistics"""
     try:
-        overview = orgchart_service.get_organization_overview()
-        metrics = orgchart_service.get_organization_metrics()
+        overview = await run_db(orgchart_service.get_organization_overview)
+        metrics = await run_db(orgchart_service.get_organization_metrics)
         
         return ApiResponse(
             data={**overview, **metrics},
@@ -720,7 +733,7 @@ async def api_get_vacant_positions(
 ):
     """Get vacant positions"""
     try:
-        vacant_positions = orgchart_service.get_vacant_positions()
+        vacant_positions = await run_db(orgchart_service.get_vacant_positions)
         return ApiResponse(
             data=vacant_positions,
             message=f"Found {len(vacant_positions)} vacant positions"
@@ -744,15 +757,15 @@ async def api_global_search(
         results = {}
         
         if "units" in entity_types:
-            units = unit_service.search(query, ['name', 'short_name'])[:limit]
+            units = (await run_db(unit_service.search, query, ['name', 'short_name']))[:limit]
             results['units'] = [unit.to_dict() for unit in units]
         
         if "persons" in entity_types:
-            persons = person_service.search(query, ['name', 'short_name', 'email'])[:limit]
+            persons = (await run_db(person_service.search, query, ['name', 'short_name', 'email']))[:limit]
             results['persons'] = [person.to_dict() for person in persons]
         
         if "job_titles" in entity_types:
-            job_titles = job_title_service.search(query, ['name', 'short_name'])[:limit]
+            job_titles = (await run_db(job_title_service.search, query, ['name', 'short_name']))[:limit]
             results['job_titles'] = [jt.to_dict() for jt in job_titles]
         
         total_results = sum(len(results[key]) for key in results)
@@ -785,7 +798,7 @@ async def api_validate_assignment(
         )
         
         # Validate business rules
-        warnings = assignment_service.validate_assignment_rules(temp_assignment)
+        warnings = await run_db(assignment_service.validate_assignment_rules, temp_assignment)
         validation_errors = temp_assignment.validate()
         
         is_valid = len(validation_errors) == 0
@@ -826,15 +839,22 @@ async def api_get_global_stats(
 ):
     """Get global application statistics"""
     try:
+        # Independent reads, run concurrently on separate pooled connections
+        units, persons, job_titles, current_assignments, assignment_stats = await asyncio.gather(
+            run_db(unit_service.count),
+            run_db(person_service.count),
+            run_db(job_title_service.count),
+            run_db(assignment_service.get_current_assignments),
+            run_db(assignment_service.get_statistics)
+        )
         stats = {
-            'units': unit_service.count(),
-            'persons': person_service.count(),
-            'job_titles': job_title_service.count(),
-            'active_assignments': len(assignment_service.get_current_assignments())
+            'units': units,
+            'persons': persons,
+            'job_titles': job_titles,
+            'active_assignments': len(current_assignments)
         }
         
         # Get assignment statistics
-        assignment_stats = assignment_service.get_statistics()
         stats.update(assignment_stats)
         
         return ApiResponse(
@@ -3,6 +3,7 @@ Health check endpoints for Organigramma Web App
 Provides basic and detailed health status for monitoring and load balancers
 """
 
+import asyncio
 import os
 import sys
 import time
@@ -11,11 +12,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 
 from app.config import get_settings
 from app.database import DatabaseManager
+from app.db_executor import get_db_executor
+from app.query_registry import get_query_registry
+from app.services.orgchart_cache import get_orgchart_cache
 
 router = APIRouter(prefix="/api", tags=["health"])
 
@@ -50,9 +54,7 @@ async def detailed_health_check(db_manager: DatabaseManager = Depends(get_databa
     
     # Database connectivity check
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.execute("SELECT 1")
-            cursor.fetchone()
+        db_manager.fetch_one("SELECT 1")
         
         health_data["checks"]["database"] = {
             "status": "ok",
@@ -265,6 +267,50 @@ async def detailed_health_check(db_manager: DatabaseManager = Depends(get_databa
         }
         overall_status = "error"
     
+    # Org tree cache statistics
+    try:
+        health_data["checks"]["orgchart_cache"] = {
+            "status": "ok",
+            **get_orgchart_cache().get_stats()
+        }
+    except Exception as e:
+        health_data["checks"]["orgchart_cache"] = {
+            "status": "warning",
+            "message": f"Org tree cache check failed: {str(e)}"
+        }
+    
+    # Connection pool usage, waits and exhaustion
+    try:
+        pool_status = db_manager.get_pool_status()
+        pool_full = pool_status["in_use"] >= pool_status["max_size"]
+        health_data["checks"]["connection_pool"] = {
+            "status": "warning" if pool_full else "ok",
+            **pool_status
+        }
+        if pool_full and overall_status == "ok":
+            overall_status = "warning"
+    except Exception as e:
+        health_data["checks"]["connection_pool"] = {
+            "status": "warning",
+            "message": f"Connection pool check failed: {str(e)}"
+        }
+    
+    # Database executor load and queue/execution timing
+    try:
+        executor_stats = get_db_executor().get_stats()
+        saturated = executor_stats["in_flight"] >= executor_stats["max_workers"] + executor_stats["max_pending"]
+        health_data["checks"]["db_executor"] = {
+            "status": "warning" if saturated else "ok",
+            **executor_stats
+        }
+        if saturated and overall_status == "ok":
+            overall_status = "warning"
+    except Exception as e:
+        health_data["checks"]["db_executor"] = {
+            "status": "warning",
+            "message": f"Database executor check failed: {str(e)}"
+        }
+    
     # System information
     health_data["system"] = {
         "python_version": sys.version,
@@ -299,21 +345,20 @@ async def database_health_check(db_manager: DatabaseManager = Depends(get_databa
     try:
         start_time = time.time()
         
-        with db_manager.get_connection() as conn:
+        # Runs on the async workers, so probes still answer when the executor is saturated
+        _, table_rows, fk_status = await asyncio.gather(
             # Test basic query
-            cursor = conn.execute("SELECT 1")
-            cursor.fetchone()
-            
+            db_manager.aio.fetch_one("SELECT 1"),
             # Test table existence
-            cursor = conn.execute("""
+            db_manager.aio.fetch_all("""
                 SELECT name FROM sqlite_master 
                 WHERE type='table' AND name NOT LIKE 'sqlite_%'
-            """)
-            tables = [row[0] for row in cursor.fetchall()]
-            
+            """),
             # Test foreign key constraints
-            cursor = conn.execute("PRAGMA foreign_keys")
-            foreign_keys_enabled = cursor.fetchone()[0] == 1
+            db_manager.aio.fetch_one("PRAGMA foreign_keys")
+        )
+        tables = [row[0] for row in table_rows]
+        foreign_keys_enabled = fk_status[0] == 1
         
         response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
         
@@ -335,6 +380,20 @@ async def database_health_check(db_manager: DatabaseManager = Depends(get_databa
             }
         )
 
+@router.get("/health/queries")
+async def query_statistics(
+    limit: int = Query(50, ge=1, le=1000),
+    order_by: str = Query("total_ms", pattern="^(total_ms|avg_ms|max_ms|p95_ms|p99_ms|calls|rows|errors)$")
+):
+    """
+    Per-statement query statistics
+    Call count, rows returned and p50/p95/p99 latency for each fingerprinted statement
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        **get_query_registry().snapshot(limit=limit, order_by=order_by)
+    }
+
 @router.get("/health/ready")
 async def readiness_check(db_manager: DatabaseManager = Depends(get_database_manager)):
     """
@@ -343,8 +402,7 @@ async def readiness_check(db_manager: DatabaseManager = Depends(get_database_man
     """
     try:
         # Quick database connectivity check
-        with db_manager.get_connection() as conn:
-            conn.execute("SELECT 1").fetchone()
+        await db_manager.aio.fetch_one("SELECT 1")
         
         return {"status": "ready", "timestamp": datetime.utcnow().isoformat()}
     
@@ -10,17 +10,21 @@ import logging
 import os
 import tempfile
 import uuid
-import asyncio
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, List
 from datetime import datetime
 
-from fastapi import APIRouter, Request, Form, File, UploadFile, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Request, Form, File, UploadFile, Depends, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 
+from app.db_executor import DatabaseBusyError, run_db
 from app.services.import_export import ImportExportService, ImportExportException
+from app.services.import_export_jobs import (
+    JobContext, get_job_runner, get_job_store,
+    JOB_COMPLETED, JOB_COMPLETED_WITH_ERRORS, JOB_FAILED
+)
 from app.services.import_export_security import get_import_export_security_service
 from app.models.import_export import (
     ImportOptions, ExportOptions, FileFormat, ConflictResolutionStrategy,
@@ -36,9 +40,6 @@ templates = Jinja2Templates(directory="templates")
 # Security configuration
 security = HTTPBearer(auto_error=False)
 
-# Global storage for operation status (in production, use Redis or database)
-operation_status: Dict[str, Dict[str, Any]] = {}
-
 
 def get_import_export_service():
     """Dependency injection for ImportExportService."""
@@ -193,12 +194,12 @@ async def import_form(
 @router.post("/import/upload")
 async def upload_import_file(
     request: Request,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     entity_types: str = Form(...),
     conflict_resolution: str = Form("skip"),
     validate_only: bool = Form(False),
     batch_size: int = Form(100),
+    plan_batches: bool = Form(False),
     csrf_protection: bool = Depends(validate_csrf_token_flexible),
     import_export_service: ImportExportService = Depends(get_import_export_service)
 ):
@@ -270,35 +271,31 @@ async def upload_import_file(
             entity_types=entity_types_list,
             conflict_resolution=ConflictResolutionStrategy(conflict_resolution),
             validate_only=validate_only,
-            batch_size=batch_size
+            batch_size=batch_size,
+            plan_batches=plan_batches
         )
         
-        # Initialize operation status
-        operation_status[operation_id] = {
-            "status": "processing",
-            "progress": 0,
-            "message": "Inizializzazione importazione...",
-            "start_time": datetime.now().isoformat(),
-            "filename": file.filename,
-            "file_format": file_format.value,
-            "entity_types": entity_types_list,
-            "validate_only": validate_only,
-            "errors": [],
-            "warnings": [],
-            "results": None
-        }
+        # Record the job, visible to every worker
+        await run_db(
+            get_job_store().create, operation_id, "import",
+            message="Inizializzazione importazione...",
+            start_time=datetime.now().isoformat(),
+            filename=file.filename,
+            file_format=file_format.value,
+            entity_types=entity_types_list,
+            validate_only=validate_only,
+            plan_batches=plan_batches,
+            errors=[],
+            warnings=[],
+            results=None
+        )
         
-        # Start async processing
-        if validate_only:
-            background_tasks.add_task(
-                process_import_preview,
-                operation_id, temp_file_path, file_format, import_options, import_export_service
-            )
-        else:
-            background_tasks.add_task(
-                process_import_operation,
-                operation_id, temp_file_path, file_format, import_options, import_export_service
-            )
+        # Start processing on the job runner
+        process = process_import_preview if validate_only else process_import_operation
+        get_job_runner().submit(
+            operation_id,
+            lambda job: process(job, temp_file_path, file_format, import_options, import_export_service)
+        )
         
         # Return operation ID for status tracking with security headers
         security_service = get_import_export_security_service()
@@ -326,18 +323,41 @@ async def upload_import_file(
         raise HTTPException(status_code=500, detail="Errore interno del server")
 
 
-async def process_import_preview(
-    operation_id: str,
+def import_plan_summary(plan) -> Optional[dict]:
+    """JSON-ready summary of an ImportPlan for the job results"""
+    if plan is None:
+        return None
+    return {
+        "estimated_seconds": round(plan.estimated_seconds, 3),
+        "predicted_peak_memory_mb": round(plan.predicted_peak_memory_mb, 1),
+        "total_conflicts": plan.total_conflicts,
+        "entities": {
+            entity_type: {
+                "record_count": entity.record_count,
+                "sample_size": entity.sample_size,
+                "batch_size": entity.batch_size,
+                "batch_count": entity.batch_count,
+                "seconds_per_record": entity.seconds_per_record,
+                "estimated_seconds": round(entity.estimated_seconds, 3),
+                "conflict_count": entity.conflict_count
+            }
+            for entity_type, entity in plan.entities.items()
+        }
+    }
+
+
+def process_import_preview(
+    job: JobContext,
     file_path: str,
     file_format: FileFormat,
     options: ImportOptions,
     service: ImportExportService
 ):
     """
-    Background task for processing import preview.
+    Background job for processing import preview.
     
     Args:
-        operation_id: Unique operation identifier
+        job: Context of the running job
         file_path: Path to uploaded file
         file_format: Detected file format
         options: Import options
@@ -345,15 +365,14 @@ async def process_import_preview(
     """
     try:
         # Update status
-        operation_status[operation_id]["message"] = "Analisi file in corso..."
-        operation_status[operation_id]["progress"] = 10
+        job.update(message="Analisi file in corso...", progress=10)
         
         # Process preview
         preview_result = service.preview_import(file_path, file_format, options)
         
         # Update status with results
-        operation_status[operation_id].update({
-            "status": "completed" if preview_result.success else "completed_with_errors",
+        job.update(**{
+            "status": JOB_COMPLETED if preview_result.success else JOB_COMPLETED_WITH_ERRORS,
             "progress": 100,
             "message": "Anteprima completata",
             "results": {
@@ -362,7 +381,8 @@ async def process_import_preview(
                 "preview_data": preview_result.preview_data,
                 "dependency_order": preview_result.dependency_order,
                 "foreign_key_mappings": preview_result.foreign_key_mappings,
-                "estimated_processing_time": preview_result.estimated_processing_time
+                "estimated_processing_time": preview_result.estimated_processing_time,
+                "import_plan": import_plan_summary(preview_result.import_plan)
             },
             "errors": [str(error) for error in preview_result.validation_results 
                       if error.error_type in [ImportErrorType.FILE_FORMAT_ERROR, 
@@ -377,8 +397,8 @@ async def process_import_preview(
         
     except Exception as e:
         logger.error(f"Error in import preview processing: {e}")
-        operation_status[operation_id].update({
-            "status": "failed",
+        job.update(**{
+            "status": JOB_FAILED,
             "progress": 0,
             "message": f"Errore durante l'anteprima: {str(e)}",
             "errors": [str(e)],
@@ -390,18 +410,18 @@ async def process_import_preview(
         cleanup_temp_file(file_path)
 
 
-async def process_import_operation(
-    operation_id: str,
+def process_import_operation(
+    job: JobContext,
     file_path: str,
     file_format: FileFormat,
     options: ImportOptions,
     service: ImportExportService
 ):
     """
-    Background task for processing actual import operation.
+    Background job for processing actual import operation.
     
     Args:
-        operation_id: Unique operation identifier
+        job: Context of the running job
         file_path: Path to uploaded file
         file_format: Detected file format
         options: Import options
@@ -409,35 +429,43 @@ async def process_import_operation(
     """
     try:
         # Update status
-        operation_status[operation_id]["message"] = "Importazione in corso..."
-        operation_status[operation_id]["progress"] = 20
+        job.update(message="Importazione in corso...", progress=20)
         
-        # Process import (this would call the actual import method when implemented)
-        # For now, we'll simulate the process
-        await asyncio.sleep(2)  # Simulate processing time
+        # Progress is reported after every batch
+        service.progress_callback = lambda done, total: job.report_progress(
+            done, total, entity_records_processed=done, entity_total_records=total
+        )
+        import_result = service.import_data(file_path, file_format, options)
         
-        # TODO: Implement actual import processing when import_data method is available
-        # import_result = service.import_data(file_path, file_format, options)
+        if not import_result.success:
+            status, message = JOB_FAILED, "Importazione fallita"
+        elif import_result.errors:
+            status, message = JOB_COMPLETED_WITH_ERRORS, "Importazione completata con errori"
+        else:
+            status, message = JOB_COMPLETED, "Importazione completata con successo"
         
-        # Simulate successful import result
-        operation_status[operation_id].update({
-            "status": "completed",
+        job.update(**{
+            "status": status,
             "progress": 100,
-            "message": "Importazione completata con successo",
+            "message": message,
             "results": {
-                "success": True,
-                "records_processed": {"total": 100},
-                "records_created": {"total": 80},
-                "records_updated": {"total": 15},
-                "records_skipped": {"total": 5}
+                "success": import_result.success,
+                "total_records": import_result.total_processed,
+                "records_processed": {**import_result.records_processed, "total": import_result.total_processed},
+                "records_created": {**import_result.records_created, "total": import_result.total_created},
+                "records_updated": {**import_result.records_updated, "total": import_result.total_updated},
+                "records_skipped": {**import_result.records_skipped, "total": import_result.total_skipped},
+                "execution_time": import_result.execution_time
             },
+            "errors": [str(error) for error in import_result.errors],
+            "warnings": [str(warning) for warning in import_result.warnings],
             "end_time": datetime.now().isoformat()
         })
-        
+    
     except Exception as e:
         logger.error(f"Error in import operation processing: {e}")
-        operation_status[operation_id].update({
-            "status": "failed",
+        job.update(**{
+            "status": JOB_FAILED,
             "progress": 0,
             "message": f"Errore durante l'importazione: {str(e)}",
             "errors": [str(e)],
@@ -504,12 +532,12 @@ async def export_form(
 @router.post("/export/generate")
 async def generate_export(
     request: Request,
-    background_tasks: BackgroundTasks,
     entity_types: str = Form(...),
     export_format: str = Form("json"),
     include_historical: bool = Form(True),
     date_from: Optional[str] = Form(None),
     date_to: Optional[str] = Form(None),
+    stream: bool = Form(False),
     csrf_protection: bool = Depends(validate_csrf_token_flexible),
     import_export_service: ImportExportService = Depends(get_import_export_service)
 ):
@@ -520,6 +548,9 @@ async def generate_export(
     - Export configuration processing
     - Async file generation for large datasets
     - Download link generation
+    
+    With `stream` set the export is sent back directly as a chunked download,
+    generated while it is being sent, instead of as files to fetch later.
     """
     operation_id = str(uuid.uuid4())
     
@@ -567,6 +598,7 @@ async def generate_export(
             'include_historical': include_historical,
             'date_range': f"{date_from} to {date_to}" if date_range else None,
             'operation_id': operation_id,
+            'streamed': stream,
             'client_ip': get_client_ip(request)
         }, request)
         
@@ -577,25 +609,36 @@ async def generate_export(
             date_range=date_range
         )
         
-        # Initialize operation status
-        operation_status[operation_id] = {
-            "status": "processing",
-            "progress": 0,
-            "message": "Inizializzazione esportazione...",
-            "start_time": datetime.now().isoformat(),
-            "export_format": export_format,
-            "entity_types": entity_types_list,
-            "include_historical": include_historical,
-            "date_range": f"{date_from} to {date_to}" if date_range else None,
-            "errors": [],
-            "warnings": [],
-            "download_urls": []
-        }
+        if stream:
+            # Records flow from the database to the client without a file in between
+            export_stream = import_export_service.stream_export(FileFormat[export_format.upper()], export_options)
+            response = StreamingResponse(
+                export_stream.chunks,
+                media_type=export_stream.media_type,
+                headers={"Content-Disposition": f'attachment; filename="{export_stream.filename}"'}
+            )
+            for header, value in security_service.get_security_headers().items():
+                response.headers[header] = value
+            return response
+        
+        # Record the job, visible to every worker
+        await run_db(
+            get_job_store().create, operation_id, "export",
+            message="Inizializzazione esportazione...",
+            start_time=datetime.now().isoformat(),
+            export_format=export_format,
+            entity_types=entity_types_list,
+            include_historical=include_historical,
+            date_range=f"{date_from} to {date_to}" if date_range else None,
+            errors=[],
+            warnings=[],
+            download_urls=[]
+        )
         
-        # Start async export processing
-        background_tasks.add_task(
-            process_export_operation,
-            operation_id, export_format, export_options, import_export_service
+        # Start export processing on the job runner
+        get_job_runner().submit(
+            operation_id,
+            lambda job: process_export_operation(job, export_format, export_options, import_export_service)
         )
         
         # Return operation ID for status tracking with security headers
@@ -613,102 +656,31 @@ async def generate_export(
         
         return response
     
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error in export generation: {e}")
         raise HTTPException(status_code=500, detail="Errore interno del server")
 
 
-async def process_export_operation_old(
-    operation_id: str,
-    export_format: str,
-    options: ExportOptions,
-    service: ImportExportService
-):
-    """
-    Background task for processing export operation.
-    
-    Args:
-        operation_id: Unique operation identifier
-        export_format: Export format (json/csv)
-        options: Export options
-        service: Import/export service instance
-    """
-    try:
-        # Update status
-        operation_status[operation_id]["message"] = "Esportazione in corso..."
-        operation_status[operation_id]["progress"] = 20
-        
-        ##await asyncio.sleep(1)
-        export_result = service.export_data(FileFormat[export_format.upper()], options)
-        
-        # Simulate successful export result with download URLs
-        download_urls = []
-
-        if export_result.success:
-            for exported_file in export_result.exported_files:
-                download_urls.append({
-                    "filename": f"{Path(exported_file).name}",
-                    "url": f"/import-export/download/{operation_id}/{Path(exported_file).name}",
-                    "size": f"{export_result.file_sizes[exported_file]}"
-                })
-
-        # if export_format == "json":
-        #     download_urls.append({
-        #         "filename": f"export_{operation_id}.json",
-        #         "url": f"/import-export/download/{operation_id}/export.json",
-        #         "size": "2.5 MB"
-        #     })
-        # else:  # CSV
-        #     for entity_type in options.entity_types:
-        #         download_urls.append({
-        #             "filename": f"{entity_type}_{operation_id}.csv",
-        #             "url": f"/import-export/download/{operation_id}/{entity_type}.csv",
-        #             "size": "1.2 MB"
-        #         })
-        
-        operation_status[operation_id].update({
-            "status": "completed",
-            "progress": 100,
-            "message": "Esportazione completata con successo",
-            "exported_records": export_result.records_exported if export_result.records_exported else [],
-            "errors": export_result.errors if export_result.errors else [],
-            "warnings": export_result.warnings if export_result.warnings else [],
-            "download_urls": download_urls,
-            "end_time": datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"Error in export operation processing: {e}")
-        operation_status[operation_id].update({
-            "status": "failed",
-            "progress": 0,
-            "message": f"Errore durante l'esportazione: {str(e)}",
-            "errors": [str(e)],
-            "end_time": datetime.now().isoformat()
-        })
-
-
-async def process_export_operation(
-    operation_id: str,
+def process_export_operation(
+    job: JobContext,
     export_format: str,
     options: ExportOptions,
     service: ImportExportService
 ):
     """
-    Background task for processing export operation.
+    Background job for processing export operation.
     
     Args:
-        operation_id: Unique operation identifier
+        job: Context of the running job
         export_format: Export format (json/csv)
         options: Export options
         service: Import/export service instance
     """
     try:
         # Update status
-        operation_status[operation_id]["message"] = "Esportazione in corso..."
-        operation_status[operation_id]["progress"] = 20
+        job.update(message="Esportazione in corso...", progress=20)
         
         # Execute the export
         export_result = service.export_data(FileFormat[export_format.upper()], options)
@@ -723,15 +695,15 @@ async def process_export_operation(
                 
                 download_urls.append({
                     "filename": file_name,
-                    "url": f"/import-export/download/{operation_id}/{file_name}",
+                    "url": f"/import-export/download/{job.operation_id}/{file_name}",
                     "size": f"{file_size / 1024:.2f} KB" if file_size < 1024*1024 else f"{file_size / (1024*1024):.2f} MB",
                     "actual_size": f"{file_size}",
                     "actual_path": exported_file  # Store the actual path for retrieval
                 })
         
         # Store the complete export result and file mappings
-        operation_status[operation_id].update({
-            "status": "completed" if export_result.success else "failed",
+        job.update(**{
+            "status": JOB_COMPLETED if export_result.success else JOB_FAILED,
             "progress": 100,
             "message": "Esportazione completata con successo" if export_result.success else "Esportazione fallita",
             "exported_records": export_result.records_exported if export_result.records_exported else {},
@@ -744,8 +716,8 @@ async def process_export_operation(
         
     except Exception as e:
         logger.error(f"Error in export operation processing: {e}")
-        operation_status[operation_id].update({
-            "status": "failed",
+        job.update(**{
+            "status": JOB_FAILED,
             "progress": 0,
             "message": f"Errore durante l'esportazione: {str(e)}",
             "errors": [str(e)],
@@ -768,11 +740,10 @@ async def get_operation_status(operation_id: str):
         JSON response with operation status
     """
     try:
-        if operation_id not in operation_status:
+        status_info = await run_db(get_job_store().get, operation_id)
+        if status_info is None:
             raise HTTPException(status_code=404, detail="Operazione non trovata")
         
-        status_info = operation_status[operation_id]
-        
         return JSONResponse({
             "operation_id": operation_id,
             "status": status_info["status"],
@@ -805,11 +776,10 @@ async def operation_status_page(
     Implements Requirements 7.1, 7.2.
     """
     try:
-        if operation_id not in operation_status:
+        status_info = await run_db(get_job_store().get, operation_id)
+        if status_info is None:
             raise HTTPException(status_code=404, detail="Operazione non trovata")
         
-        status_info = operation_status[operation_id]
-        
         return templates.TemplateResponse(
             "import_export/status.html",
             {
@@ -849,10 +819,9 @@ async def download_export_file(operation_id: str, filename: str):
     """
     try:
         # Validate operation exists and is completed
-        if operation_id not in operation_status:
+        status_info = await run_db(get_job_store().get, operation_id)
+        if status_info is None:
             raise HTTPException(status_code=404, detail="Operazione non trovata")
-        
-        status_info = operation_status[operation_id]
         if status_info["status"] != "completed":
             raise HTTPException(status_code=400, detail="Operazione non completata")
         
@@ -921,8 +890,9 @@ async def operations_history(
     try:
         # Filter operations based on criteria
         filtered_operations = []
+        operations = await run_db(get_job_store().list)
         
-        for op_id, op_info in operation_status.items():
+        for op_id, op_info in operations.items():
             # Apply filters
             if operation_type and operation_type != "all":
                 op_type = "import" if op_info.get("filename") else "export"
@@ -1005,8 +975,9 @@ async def operations_statistics():
         JSON response with operation statistics
     """
     try:
+        operations = await run_db(get_job_store().list)
         stats = {
-            "total_operations": len(operation_status),
+            "total_operations": len(operations),
             "active_operations": 0,
             "completed_operations": 0,
             "failed_operations": 0,
@@ -1022,10 +993,10 @@ async def operations_statistics():
         today = datetime.now().date()
         processing_times = []
         
-        for op_id, op_info in operation_status.items():
+        for op_id, op_info in operations.items():
             # Count by status
             status = op_info.get("status", "unknown")
-            if status == "processing":
+            if status in ("queued", "processing"):
                 stats["active_operations"] += 1
             elif status in ["completed", "completed_with_errors"]:
                 stats["completed_operations"] += 1
@@ -1107,11 +1078,10 @@ async def get_operation_logs(operation_id: str):
         JSON response with detailed operation logs
     """
     try:
-        if operation_id not in operation_status:
+        operation_info = await run_db(get_job_store().get, operation_id)
+        if operation_info is None:
             raise HTTPException(status_code=404, detail="Operazione non trovata")
         
-        operation_info = operation_status[operation_id]
-        
         # Build detailed log information
         logs = {
             "operation_id": operation_id,
@@ -1210,11 +1180,10 @@ async def delete_operation(
         JSON response confirming deletion
     """
     try:
-        if operation_id not in operation_status:
+        operation_info = await run_db(get_job_store().get, operation_id)
+        if operation_info is None:
             raise HTTPException(status_code=404, detail="Operazione non trovata")
         
-        operation_info = operation_status[operation_id]
-        
         # Log deletion event
         log_security_event('OPERATION_DELETED', {
             'operation_id': operation_id,
@@ -1227,7 +1196,7 @@ async def delete_operation(
         # This would include temporary files and generated export files
         
         # Remove operation from status tracking
-        del operation_status[operation_id]
+        await run_db(get_job_store().delete, operation_id)
         
         return JSONResponse({
             "success": True,
@@ -1285,6 +1254,8 @@ async def import_export_health():
         JSON response with health status
     """
     try:
+        operations = await run_db(get_job_store().list)
+        
         # Check service dependencies
         health_status = {
             "status": "healthy",
@@ -1295,8 +1266,8 @@ async def import_export_health():
                 "database": "healthy"
             },
             "metrics": {
-                "active_operations": len([op for op in operation_status.values() if op.get("status") == "processing"]),
-                "total_operations": len(operation_status),
+                "active_operations": len([op for op in operations.values() if op.get("status") in ("queued", "processing")]),
+                "total_operations": len(operations),
                 "memory_usage": "normal",
                 "disk_space": "normal"
             }
@@ -1307,7 +1278,7 @@ async def import_export_health():
         one_hour_ago = datetime.now() - timedelta(hours=1)
         recent_failures = 0
         
-        for op_info in operation_status.values():
+        for op_info in operations.values():
             if op_info.get("status") == "failed":
                 start_time_str = op_info.get("start_time")
                 if start_time_str:
@@ -10,6 +10,7 @@ from app.services.orgchart import OrgchartService
 from app.services.unit import UnitService
 from app.services.assignment import AssignmentService
 from app.services.person import PersonService
+from app.db_executor import DatabaseBusyError, run_db
 from app.templates import templates
 
 logger = logging.getLogger(__name__)
@@ -40,13 +41,13 @@ async def orgchart_home(
     """Orgchart homepage with overview"""
     try:
         # Get organization overview
-        overview = orgchart_service.get_organization_overview()
+        overview = await run_db(orgchart_service.get_organization_overview)
         
         # Get key metrics
-        metrics = orgchart_service.get_organization_metrics()
+        metrics = await run_db(orgchart_service.get_organization_metrics)
         
         # Get recent changes
-        recent_changes = orgchart_service.get_recent_organizational_changes(limit=10)
+        recent_changes = await run_db(orgchart_service.get_recent_organizational_changes, limit=10)
         
         return templates.TemplateResponse(
             "orgchart/overview.html",
@@ -59,6 +60,8 @@ async def orgchart_home(
                 "page_icon": "diagram-3"
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading orgchart home: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -77,14 +80,14 @@ async def orgchart_tree(
     try:
         # Get tree structure
         if unit_id:
-            tree_data = orgchart_service.get_subtree(unit_id, show_persons=show_persons)
-            root_unit = orgchart_service.get_unit_with_details(unit_id)
+            tree_data = await run_db(orgchart_service.get_subtree, unit_id, show_persons=show_persons)
+            root_unit = await run_db(orgchart_service.get_unit_with_details, unit_id)
         else:
-            tree_data = orgchart_service.get_complete_tree(show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_complete_tree, show_persons=show_persons)
             root_unit = None
         
         # Get units without assignments (vacant positions)
-        vacant_positions = orgchart_service.get_vacant_positions() if show_vacant else []
+        vacant_positions = await run_db(orgchart_service.get_vacant_positions) if show_vacant else []
         
         # Get tree statistics
         tree_stats = orgchart_service.calculate_tree_statistics(tree_data)
@@ -92,7 +95,7 @@ async def orgchart_tree(
         # Get navigation breadcrumb for subtree
         breadcrumb_path = []
         if unit_id and root_unit:
-            breadcrumb_path = orgchart_service.get_unit_path(unit_id)
+            breadcrumb_path = await run_db(orgchart_service.get_unit_path, unit_id)
         
         breadcrumb = [
             {
@@ -127,6 +130,8 @@ async def orgchart_tree(
                 "breadcrumb": breadcrumb
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading orgchart tree: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -141,18 +146,18 @@ async def orgchart_unit_detail(
     """Detailed view of organizational unit in context"""
     try:
         # Get unit with full organizational context
-        unit_detail = orgchart_service.get_unit_organizational_context(unit_id)
+        unit_detail = await run_db(orgchart_service.get_unit_organizational_context, unit_id)
         if not unit_detail:
             raise HTTPException(status_code=404, detail="Unità non trovata")
         unit = unit_detail['unit']
         # Get unit performance metrics
-        performance_metrics = orgchart_service.get_unit_performance_metrics(unit_id)
+        performance_metrics = await run_db(orgchart_service.get_unit_performance_metrics, unit_id)
         
         # Get reporting relationships
-        reporting_structure = orgchart_service.get_reporting_relationships(unit_id)
+        reporting_structure = await run_db(orgchart_service.get_reporting_relationships, unit_id)
         
         # Get unit change history
-        change_history = orgchart_service.get_unit_change_history(unit_id, limit=20)
+        change_history = await run_db(orgchart_service.get_unit_change_history, unit_id, limit=20)
         
         context = {
             "request": request,
@@ -175,7 +180,7 @@ async def orgchart_unit_detail(
         )
 
         return result
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error loading unit detail {unit_id}: {e}")
@@ -191,13 +196,13 @@ async def orgchart_matrix_view(
     """Matrix view of organizational structure"""
     try:
         if view_type == "skills":
-            matrix_data = orgchart_service.get_skills_matrix()
+            matrix_data = await run_db(orgchart_service.get_skills_matrix)
             page_title = "Matrice Competenze"
         elif view_type == "workload":
-            matrix_data = orgchart_service.get_workload_matrix()
+            matrix_data = await run_db(orgchart_service.get_workload_matrix)
             page_title = "Matrice Carico di Lavoro"
         elif view_type == "hierarchy":
-            matrix_data = orgchart_service.get_hierarchy_matrix()
+            matrix_data = await run_db(orgchart_service.get_hierarchy_matrix)
             page_title = "Matrice Gerarchica"
         else:
             raise HTTPException(status_code=400, detail="Tipo di vista non valido")
@@ -216,7 +221,7 @@ async def orgchart_matrix_view(
                 ]
             }
         )
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error loading matrix view {view_type}: {e}")
@@ -231,16 +236,16 @@ async def orgchart_statistics(
     """Comprehensive organizational statistics"""
     try:
         # Get comprehensive statistics
-        org_statistics = orgchart_service.get_comprehensive_statistics()
+        org_statistics = await run_db(orgchart_service.get_comprehensive_statistics)
         
         # Get distribution analytics
-        distribution_data = orgchart_service.get_distribution_analytics()
+        distribution_data = await run_db(orgchart_service.get_distribution_analytics)
         
         # Get trend analysis
-        trend_data = orgchart_service.get_organizational_trends()
+        trend_data = await run_db(orgchart_service.get_organizational_trends)
         
         # Get efficiency metrics
-        efficiency_metrics = orgchart_service.get_efficiency_metrics()
+        efficiency_metrics = await run_db(orgchart_service.get_efficiency_metrics)
         
         return templates.TemplateResponse(
             "orgchart/statistics.html",
@@ -258,6 +263,8 @@ async def orgchart_statistics(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading orgchart statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -271,10 +278,10 @@ async def organizational_gap_analysis(
     """Organizational gap analysis"""
     try:
         # Get gap analysis
-        gap_analysis = orgchart_service.perform_gap_analysis()
+        gap_analysis = await run_db(orgchart_service.perform_gap_analysis)
         
         # Get recommendations
-        recommendations = orgchart_service.get_organizational_recommendations()
+        recommendations = await run_db(orgchart_service.get_organizational_recommendations)
         
         return templates.TemplateResponse(
             "orgchart/gap_analysis.html",
@@ -290,6 +297,8 @@ async def organizational_gap_analysis(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading gap analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -303,10 +312,10 @@ async def organizational_simulation(
     """Organizational change simulation interface"""
     try:
         # Get current state for simulation baseline
-        current_state = orgchart_service.get_simulation_baseline()
+        current_state = await run_db(orgchart_service.get_simulation_baseline)
         
         # Get predefined simulation scenarios
-        scenarios = orgchart_service.get_simulation_scenarios()
+        scenarios = await run_db(orgchart_service.get_simulation_scenarios)
         
         return templates.TemplateResponse(
             "orgchart/simulation.html",
@@ -322,6 +331,8 @@ async def organizational_simulation(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading simulation interface: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -335,7 +346,7 @@ async def span_of_control_report(
     """Span of control analysis report"""
     try:
         # Get span of control analysis
-        span_analysis = orgchart_service.analyze_span_of_control()
+        span_analysis = await run_db(orgchart_service.analyze_span_of_control)
         
         return templates.TemplateResponse(
             "orgchart/span_of_control.html",
@@ -351,6 +362,8 @@ async def span_of_control_report(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading span of control report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -364,7 +377,7 @@ async def organizational_health_report(
     """Organizational health assessment"""
     try:
         # Get health assessment
-        health_assessment = orgchart_service.assess_organizational_health()
+        health_assessment = await run_db(orgchart_service.assess_organizational_health)
         
         return templates.TemplateResponse(
             "orgchart/organizational_health.html",
@@ -380,6 +393,8 @@ async def organizational_health_report(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error loading organizational health report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -396,11 +411,13 @@ async def get_tree_data_api(
     """API endpoint for tree data (for dynamic loading)"""
     try:
         if unit_id:
-            tree_data = orgchart_service.get_subtree(unit_id, show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_subtree, unit_id, show_persons=show_persons)
         else:
-            tree_data = orgchart_service.get_complete_tree(show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_complete_tree, show_persons=show_persons)
         
         return JSONResponse(content={"tree_data": tree_data})
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error getting tree data via API: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -413,12 +430,12 @@ async def get_unit_details_api(
 ):
     """API endpoint for unit details"""
     try:
-        unit_details = orgchart_service.get_unit_with_details(unit_id)
+        unit_details = await run_db(orgchart_service.get_unit_with_details, unit_id)
         if not unit_details:
             raise HTTPException(status_code=404, detail="Unit not found")
         
         return JSONResponse(content=unit_details)
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error getting unit details via API: {e}")
@@ -436,8 +453,10 @@ async def search_units_api(
         if len(query) < 2:
             return JSONResponse(content={"results": []})
         
-        search_results = orgchart_service.search_organizational_units(query, limit=limit)
+        search_results = await run_db(orgchart_service.search_organizational_units, query, limit=limit)
         return JSONResponse(content={"results": search_results})
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error searching units via API: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -453,9 +472,11 @@ async def simulate_organizational_change(
         simulation_data = await request.json()
         
         # Perform simulation
-        simulation_result = orgchart_service.simulate_organizational_change(simulation_data)
+        simulation_result = await run_db(orgchart_service.simulate_organizational_change, simulation_data)
         
         return JSONResponse(content=simulation_result)
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error simulating organizational change: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -469,8 +490,10 @@ async def get_unit_performance_api(
 ):
     """API endpoint for unit performance metrics"""
     try:
-        performance_data = orgchart_service.get_unit_performance_metrics(unit_id, period=period)
+        performance_data = await run_db(orgchart_service.get_unit_performance_metrics, unit_id, period=period)
         return JSONResponse(content=performance_data)
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error getting performance metrics via API: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -490,9 +513,9 @@ async def export_orgchart(
         
         # Get tree data
         if unit_id:
-            tree_data = orgchart_service.get_subtree(unit_id, show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_subtree, unit_id, show_persons=show_persons)
         else:
-            tree_data = orgchart_service.get_complete_tree(show_persons=show_persons)
+            tree_data = await run_db(orgchart_service.get_complete_tree, show_persons=show_persons)
         
         # Generate export
         export_data = orgchart_service.generate_export(tree_data, format_type)
@@ -518,7 +541,7 @@ async def export_orgchart(
                 media_type="image/png",
                 headers={"Content-Disposition": "attachment; filename=organigramma.png"}
             )
-    except HTTPException:
+    except (HTTPException, DatabaseBusyError):
         raise
     except Exception as e:
         logger.error(f"Error exporting orgchart: {e}")
@@ -548,7 +571,7 @@ async def compare_organizational_structures(
             date2_parsed = date.fromisoformat(date2)
         
         # Get comparison data
-        comparison_data = orgchart_service.compare_organizational_structures(date1_parsed, date2_parsed)
+        comparison_data = await run_db(orgchart_service.compare_organizational_structures, date1_parsed, date2_parsed)
         
         return templates.TemplateResponse(
             "orgchart/comparison.html",
@@ -565,6 +588,8 @@ async def compare_organizational_structures(
                 ]
             }
         )
+    except DatabaseBusyError:
+        raise
     except Exception as e:
         logger.error(f"Error comparing organizational structures: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
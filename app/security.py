@@ -9,6 +9,7 @@ import html
 import secrets
 import hashlib
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from fastapi import Request, HTTPException, Depends
@@ -38,6 +39,23 @@ class InputValidator:
         'command_injection': re.compile(r'[;&|`$]')
     }
     
+    # Common SQL injection fragments, checked in addition to the SQL keywords
+    SQL_INJECTION_FRAGMENTS = [
+        "' OR '1'='1",
+        "' OR 1=1",
+        "'; DROP TABLE",
+        "UNION SELECT",
+        "' UNION SELECT",
+        "/*",
+        "*/"
+    ]
+    
+    # SQL keywords and injection fragments in a single case-insensitive pass
+    SQL_INJECTION_MATCHER = re.compile(
+        PATTERNS['sql_injection'].pattern + '|' + '|'.join(re.escape(fragment) for fragment in SQL_INJECTION_FRAGMENTS),
+        re.IGNORECASE
+    )
+    
     # Allowed HTML tags for rich text (if needed)
     ALLOWED_HTML_TAGS = ['b', 'i', 'u', 'em', 'strong', 'p', 'br']
     ALLOWED_HTML_ATTRIBUTES = {}
@@ -116,23 +134,8 @@ class InputValidator:
         if not input_str:
             return False
         
-        # Check for SQL keywords
-        if cls.PATTERNS['sql_injection'].search(input_str):
-            return True
-        
-        # Check for common SQL injection patterns
-        dangerous_patterns = [
-            "' OR '1'='1",
-            "' OR 1=1",
-            "'; DROP TABLE",
-            "UNION SELECT",
-            "' UNION SELECT",
-            "/*",
-            "*/"
-        ]
-        
-        input_upper = input_str.upper()
-        return any(pattern.upper() in input_upper for pattern in dangerous_patterns)
+        # Check for SQL keywords and common SQL injection patterns
+        return cls.SQL_INJECTION_MATCHER.search(input_str) is not None
     
     @classmethod
     def detect_xss(cls, input_str: str) -> bool:
@@ -374,36 +377,41 @@ class RateLimiter:
 class SecureDatabaseOperations:
     """Secure database operation helpers"""
     
+    # String concatenation patterns that might indicate SQL injection
+    UNSAFE_QUERY_MATCHER = re.compile(
+        '|'.join(re.escape(pattern) for pattern in [
+            "' +",
+            "\" +",
+            "CONCAT(",
+            "||"  # SQLite concatenation
+        ]),
+        re.IGNORECASE
+    )
+    
+    # Distinct query texts whose validation result is kept
+    QUERY_CACHE_SIZE = 1024
+    
     @staticmethod
     def sanitize_sql_params(params: tuple) -> tuple:
         """Sanitize SQL parameters"""
-        sanitized = []
+        matcher = InputValidator.SQL_INJECTION_MATCHER
         for param in params:
-            if isinstance(param, str):
-                # Check for SQL injection
-                if InputValidator.detect_sql_injection(param):
-                    raise SecurityValidationError([f"SQL injection detected in parameter: {param[:50]}..."])
-                sanitized.append(param)
-            else:
-                sanitized.append(param)
-        return tuple(sanitized)
+            # Check for SQL injection
+            if isinstance(param, str) and matcher.search(param):
+                raise SecurityValidationError([f"SQL injection detected in parameter: {param[:50]}..."])
+        return tuple(params)
     
     @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
     def validate_query_safety(query: str) -> bool:
-        """Validate that query is safe (uses parameterized queries)"""
-        # Check for string concatenation patterns that might indicate SQL injection
-        dangerous_patterns = [
-            "' +",
-            "\" +",
-            "CONCAT(",
-            "||"  # SQLite concatenation
-        ]
-        
-        query_upper = query.upper()
-        for pattern in dangerous_patterns:
-            if pattern.upper() in query_upper:
-                logger.warning(f"Potentially unsafe query pattern detected: {pattern}")
-                return False
+        """
+        Validate that query is safe (uses parameterized queries).
+        Results are cached by query text, services reuse the same static statements.
+        """
+        match = SecureDatabaseOperations.UNSAFE_QUERY_MATCHER.search(query)
+        if match:
+            logger.warning(f"Potentially unsafe query pattern detected: {match.group(0)}")
+            return False
         
         return True
 
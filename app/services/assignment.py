@@ -13,6 +13,8 @@ logger = logging.getLogger(__name__)
 class AssignmentService(BaseService):
     """Assignment service class with versioning support"""
     
+    invalidates_orgchart = True
+    
     def __init__(self):
         super().__init__(Assignment, "person_job_assignments")
 
@@ -75,6 +77,7 @@ class AssignmentService(BaseService):
             assignment.valid_to.isoformat() if assignment.valid_to else None,
             assignment.id
         ))
+        self._after_write()
         
         return assignment
 
@@ -350,6 +353,7 @@ class AssignmentService(BaseService):
                 
                 # Commit transaction
                 conn.execute("COMMIT")
+                self._after_write()
                 
                 logger.info(f"Created assignment {assignment.id} version {assignment.version}")
                 return assignment
@@ -417,6 +421,7 @@ class AssignmentService(BaseService):
                 query, 
                 (termination_date.isoformat(), assignment_id)
             )
+            self._after_write()
             
             success = cursor.rowcount > 0
             if success:
@@ -447,6 +452,7 @@ class AssignmentService(BaseService):
             termination_date.isoformat(),
             assignment_id
         ))
+        self._after_write()
         
         # Return updated assignment
         return self.get_by_id(assignment_id)
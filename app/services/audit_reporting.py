@@ -71,24 +71,24 @@ class DataChangeSummary:
     changes_by_operation: Dict[str, int] = field(default_factory=dict)
     most_active_entities: List[Tuple[str, int]] = field(default_factory=list)
     
-    def add_change(self, change_type: ChangeType, entity_type: str, operation_id: str):
-        """Add a data change to the summary."""
-        self.total_changes += 1
+    def add_change(self, change_type: ChangeType, entity_type: str, operation_id: str, count: int = 1):
+        """Add a data change (or `count` alike) to the summary."""
+        self.total_changes += count
         
         if change_type == ChangeType.CREATE:
-            self.creates += 1
+            self.creates += count
         elif change_type == ChangeType.UPDATE:
-            self.updates += 1
+            self.updates += count
         elif change_type == ChangeType.DELETE:
-            self.deletes += 1
+            self.deletes += count
         elif change_type == ChangeType.SKIP:
-            self.skips += 1
+            self.skips += count
         
         # Update entity counts
-        self.changes_by_entity[entity_type] = self.changes_by_entity.get(entity_type, 0) + 1
+        self.changes_by_entity[entity_type] = self.changes_by_entity.get(entity_type, 0) + count
         
         # Update operation counts
-        self.changes_by_operation[operation_id] = self.changes_by_operation.get(operation_id, 0) + 1
+        self.changes_by_operation[operation_id] = self.changes_by_operation.get(operation_id, 0) + count
     
     def finalize(self):
         """Finalize the summary by calculating derived statistics."""
@@ -154,65 +154,49 @@ class AuditReportingService:
         else:
             start_date, end_date = self._get_period_dates(period)
         
-        # Get operation history
-        operations = self.audit_manager.get_operation_history(
-            user_id=user_id,
-            operation_type=operation_type,
+        # Get operation rollups
+        rollups = self.audit_manager.get_operation_rollups(
             start_date=start_date,
             end_date=end_date,
-            limit=10000  # Large limit to get all operations
+            user_id=user_id,
+            operation_type=operation_type
         )
         
         # Initialize summary
         summary = OperationSummary()
-        summary.total_operations = len(operations)
         
         total_duration = 0.0
         duration_count = 0
         
-        for operation in operations:
+        for rollup in rollups:
+            count = rollup['operation_count']
+            summary.total_operations += count
+            
             # Count by status
-            status = operation.get('status', '')
+            status = rollup['status']
             if status == OperationStatus.COMPLETED.value:
-                summary.successful_operations += 1
+                summary.successful_operations += count
             elif status == OperationStatus.FAILED.value:
-                summary.failed_operations += 1
+                summary.failed_operations += count
             elif status == OperationStatus.CANCELLED.value:
-                summary.cancelled_operations += 1
+                summary.cancelled_operations += count
             
             # Count by type
-            op_type = operation.get('operation_type', 'unknown')
-            summary.operations_by_type[op_type] = summary.operations_by_type.get(op_type, 0) + 1
+            op_type = rollup['operation_type']
+            summary.operations_by_type[op_type] = summary.operations_by_type.get(op_type, 0) + count
             
             # Count by user
-            user = operation.get('user_id', 'unknown')
-            summary.operations_by_user[user] = summary.operations_by_user.get(user, 0) + 1
+            user = rollup['user_id']
+            summary.operations_by_user[user] = summary.operations_by_user.get(user, 0) + count
             
             # Aggregate record counts
-            records_processed = operation.get('records_processed', {})
-            records_created = operation.get('records_created', {})
-            records_updated = operation.get('records_updated', {})
-            records_skipped = operation.get('records_skipped', {})
-            
-            if isinstance(records_processed, dict):
-                summary.total_records_processed += sum(records_processed.values())
-            if isinstance(records_created, dict):
-                summary.total_records_created += sum(records_created.values())
-            if isinstance(records_updated, dict):
-                summary.total_records_updated += sum(records_updated.values())
-            if isinstance(records_skipped, dict):
-                summary.total_records_skipped += sum(records_skipped.values())
+            summary.total_records_processed += rollup['records_processed']
+            summary.total_records_created += rollup['records_created']
+            summary.total_records_updated += rollup['records_updated']
+            summary.total_records_skipped += rollup['records_skipped']
             
-            # Calculate average duration
-            if operation.get('start_time') and operation.get('end_time'):
-                try:
-                    start = datetime.fromisoformat(operation['start_time'].replace('Z', '+00:00'))
-                    end = datetime.fromisoformat(operation['end_time'].replace('Z', '+00:00'))
-                    duration = (end - start).total_seconds()
-                    total_duration += duration
-                    duration_count += 1
-                except (ValueError, TypeError):
-                    pass
+            total_duration += rollup['duration_sum']
+            duration_count += rollup['duration_count']
         
         # Calculate average duration
         if duration_count > 0:
@@ -236,42 +220,26 @@ class AuditReportingService:
         else:
             start_date, end_date = self._get_period_dates(period)
         
-        # Get operations in the period
-        operations = self.audit_manager.get_operation_history(
+        # Count the data changes of the operations in the period
+        change_counts = self.audit_manager.count_data_changes(
             start_date=start_date,
             end_date=end_date,
-            limit=10000
+            entity_type=entity_type
         )
         
         # Initialize summary
         summary = DataChangeSummary()
         
-        # Analyze data changes for each operation
-        for operation in operations:
-            operation_id = operation.get('operation_id')
-            if not operation_id:
-                continue
+        for change_count in change_counts:
+            change_type_str = change_count['change_type']
             
-            # Get detailed operation information including data changes
-            operation_details = self.audit_manager.get_operation_details(operation_id)
-            if not operation_details or 'data_changes' not in operation_details:
-                continue
-            
-            # Process data changes
-            for change in operation_details['data_changes']:
-                change_entity_type = change.get('entity_type')
-                change_type_str = change.get('change_type')
-                
-                # Filter by entity type if specified
-                if entity_type and change_entity_type != entity_type:
-                    continue
-                
-                # Convert string to enum
-                try:
-                    change_type = ChangeType(change_type_str)
-                    summary.add_change(change_type, change_entity_type, operation_id)
-                except ValueError:
-                    logger.warning(f"Unknown change type: {change_type_str}")
+            # Convert string to enum
+            try:
+                change_type = ChangeType(change_type_str)
+                summary.add_change(change_type, change_count['entity_type'],
+                                   change_count['operation_id'], change_count['change_count'])
+            except ValueError:
+                logger.warning(f"Unknown change type: {change_type_str}")
         
         # Finalize summary
         summary.finalize()
@@ -358,12 +326,11 @@ class AuditReportingService:
         else:
             start_date, end_date = self._get_period_dates(period)
         
-        # Get user operations
-        operations = self.audit_manager.get_operation_history(
-            user_id=user_id,
+        # Get user operation rollups
+        rollups = self.audit_manager.get_operation_rollups(
             start_date=start_date,
             end_date=end_date,
-            limit=1000
+            user_id=user_id
         )
         
         # Analyze user activity
@@ -371,7 +338,7 @@ class AuditReportingService:
             'user_id': user_id,
             'period_start': start_date.isoformat(),
             'period_end': end_date.isoformat(),
-            'total_operations': len(operations),
+            'total_operations': 0,
             'successful_operations': 0,
             'failed_operations': 0,
             'operations_by_type': {},
@@ -384,49 +351,37 @@ class AuditReportingService:
         total_duration = 0.0
         duration_count = 0
         
-        for operation in operations:
+        for rollup in rollups:
+            count = rollup['operation_count']
+            activity_report['total_operations'] += count
+            
             # Count by status
-            status = operation.get('status', '')
+            status = rollup['status']
             if status == OperationStatus.COMPLETED.value:
-                activity_report['successful_operations'] += 1
+                activity_report['successful_operations'] += count
             elif status == OperationStatus.FAILED.value:
-                activity_report['failed_operations'] += 1
+                activity_report['failed_operations'] += count
             
             # Count by type
-            op_type = operation.get('operation_type', 'unknown')
+            op_type = rollup['operation_type']
             activity_report['operations_by_type'][op_type] = \
-                activity_report['operations_by_type'].get(op_type, 0) + 1
+                activity_report['operations_by_type'].get(op_type, 0) + count
             
             # Count by day
-            start_time = operation.get('start_time', '')
-            if start_time:
-                try:
-                    op_date = datetime.fromisoformat(start_time.replace('Z', '+00:00')).date()
-                    day_key = op_date.isoformat()
-                    activity_report['operations_by_day'][day_key] = \
-                        activity_report['operations_by_day'].get(day_key, 0) + 1
-                except (ValueError, TypeError):
-                    pass
+            day_key = rollup['day']
+            activity_report['operations_by_day'][day_key] = \
+                activity_report['operations_by_day'].get(day_key, 0) + count
             
             # Track most recent activity
-            if not activity_report['most_recent_activity'] or start_time > activity_report['most_recent_activity']:
-                activity_report['most_recent_activity'] = start_time
+            last_start_time = rollup['last_start_time']
+            if not activity_report['most_recent_activity'] or last_start_time > activity_report['most_recent_activity']:
+                activity_report['most_recent_activity'] = last_start_time
             
             # Aggregate record counts
-            records_processed = operation.get('records_processed', {})
-            if isinstance(records_processed, dict):
-                activity_report['total_records_processed'] += sum(records_processed.values())
+            activity_report['total_records_processed'] += rollup['records_processed']
             
-            # Calculate duration
-            if operation.get('start_time') and operation.get('end_time'):
-                try:
-                    start = datetime.fromisoformat(operation['start_time'].replace('Z', '+00:00'))
-                    end = datetime.fromisoformat(operation['end_time'].replace('Z', '+00:00'))
-                    duration = (end - start).total_seconds()
-                    total_duration += duration
-                    duration_count += 1
-                except (ValueError, TypeError):
-                    pass
+            total_duration += rollup['duration_sum']
+            duration_count += rollup['duration_count']
         
         # Calculate average duration
         if duration_count > 0:
@@ -0,0 +1,162 @@
+"""
+Month partitions for compacted audit data changes
+
+Data changes are written to audit_data_changes. Once their month is over they
+are compacted into a table per month, audit_data_changes_YYYY_MM, which keeps
+the columns used to find changes and a zlib-compressed JSON payload holding
+only what the change did: the new values of a create, the old values of a
+delete, the changed fields of an update. Old months are dropped with their
+table instead of deleting rows one by one.
+"""
+
+import json
+import re
+import sqlite3
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+PARTITION_PREFIX = "audit_data_changes_"
+PARTITION_NAME = re.compile(r"^audit_data_changes_(\d{4})_(\d{2})$")
+
+# Columns kept as they are, the values become the payload
+PARTITION_COLUMNS = ('id', 'operation_id', 'entity_type', 'entity_id', 'change_type',
+                     'line_number', 'timestamp', 'created_at')
+
+
+def partition_month(timestamp: str) -> str:
+    """'YYYY_MM' partition month of an ISO timestamp"""
+    return f"{timestamp[:4]}_{timestamp[5:7]}"
+
+
+def partition_table(month: str) -> str:
+    """Table name of a 'YYYY_MM' partition month"""
+    return f"{PARTITION_PREFIX}{month}"
+
+
+def month_start(value: datetime, months_back: int = 0) -> datetime:
+    """First instant of the month of `value`, `months_back` months earlier"""
+    month_index = value.year * 12 + value.month - 1 - months_back
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def list_partitions(conn: sqlite3.Connection) -> List[str]:
+    """'YYYY_MM' months with a partition table, newest first"""
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+        (f"{PARTITION_PREFIX}%",)
+    )
+    months = []
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(f"{match.group(1)}_{match.group(2)}")
+    return sorted(months, reverse=True)
+
+
+def ensure_partition(conn: sqlite3.Connection, month: str) -> str:
+    """Create the partition table of a month if needed, returning its name"""
+    table = partition_table(month)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY,
+            operation_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            entity_id INTEGER,
+            change_type TEXT NOT NULL,
+            line_number INTEGER,
+            timestamp TEXT NOT NULL,
+            created_at TEXT,
+            payload BLOB       -- zlib-compressed JSON with the changed old/new values
+        )
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_operation_id ON {table} (operation_id)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_entity ON {table} (entity_type, entity_id)")
+    return table
+
+
+def _load_values(values: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Stored JSON values, {} when unreadable as the audit reads do"""
+    if not values:
+        return None
+    try:
+        return json.loads(values)
+    except json.JSONDecodeError:
+        return {}
+
+
+def encode_payload(change_type: str, old_values: Optional[str], new_values: Optional[str]) -> Optional[bytes]:
+    """Compressed diff-only payload of a data change's stored old and new values"""
+    old, new = _load_values(old_values), _load_values(new_values)
+    if change_type == 'update' and isinstance(old, dict) and isinstance(new, dict):
+        changed = [key for key in dict.fromkeys(list(old) + list(new)) if old.get(key) != new.get(key)]
+        old = {key: old[key] for key in changed if key in old}
+        new = {key: new[key] for key in changed if key in new}
+    payload = {key: values for key, values in (('old', old), ('new', new)) if values}
+    if not payload:
+        return None
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_payload(payload: Optional[bytes]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """(old values, new values) of a compacted data change"""
+    if not payload:
+        return None, None
+    values = json.loads(zlib.decompress(payload).decode('utf-8'))
+    return values.get('old'), values.get('new')
+
+
+def partition_row_to_change(row: sqlite3.Row) -> Dict[str, Any]:
+    """Data change dict of a partition row, shaped like an audit_data_changes row"""
+    change = {column: row[column] for column in PARTITION_COLUMNS}
+    change['old_values'], change['new_values'] = decode_payload(row['payload'])
+    return change
+
+
+def compact_data_changes(conn: sqlite3.Connection, before: datetime) -> Dict[str, int]:
+    """
+    Move the data changes timestamped before `before` from audit_data_changes
+    into their month partitions, in the connection's transaction.
+
+    Returns:
+        Number of data changes compacted by 'YYYY_MM' month
+    """
+    cutoff = before.isoformat()
+    cursor = conn.execute(
+        f"SELECT {', '.join(PARTITION_COLUMNS)}, old_values, new_values FROM audit_data_changes "
+        "WHERE timestamp < ? ORDER BY id",
+        (cutoff,)
+    )
+
+    compacted: Dict[str, int] = {}
+    while True:
+        rows = cursor.fetchmany(1000)
+        if not rows:
+            break
+        by_month: Dict[str, List[Tuple]] = {}
+        for row in rows:
+            by_month.setdefault(partition_month(row['timestamp']), []).append(
+                tuple(row[column] for column in PARTITION_COLUMNS)
+                + (encode_payload(row['change_type'], row['old_values'], row['new_values']),)
+            )
+        for month, month_rows in by_month.items():
+            table = ensure_partition(conn, month)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(PARTITION_COLUMNS)}, payload) "
+                f"VALUES ({', '.join('?' for _ in PARTITION_COLUMNS)}, ?)",
+                month_rows
+            )
+            compacted[month] = compacted.get(month, 0) + len(month_rows)
+
+    if compacted:
+        conn.execute("DELETE FROM audit_data_changes WHERE timestamp < ?", (cutoff,))
+    return compacted
+
+
+def drop_partitions_before(conn: sqlite3.Connection, before: datetime) -> List[str]:
+    """Drop the partitions of the months before the month of `before`, returning their months"""
+    first_kept = partition_month(month_start(before).isoformat())
+    dropped = [month for month in list_partitions(conn) if month < first_kept]
+    for month in dropped:
+        conn.execute(f"DROP TABLE IF EXISTS {partition_table(month)}")
+    return dropped
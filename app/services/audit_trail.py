@@ -6,14 +6,73 @@ data change tracking, and operation history for compliance and troubleshooting.
 """
 
 import json
+import logging
 import sqlite3
-from datetime import datetime
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field, asdict
 
 from ..database import get_db_manager
+from .audit_storage import (
+    compact_data_changes, drop_partitions_before, list_partitions, month_start,
+    partition_month, partition_row_to_change, partition_table
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_RETENTION_MONTHS = 0
+
+# Operation rollups: counts and sums per hour and per day of start time
+ROLLUP_BUCKETS = {
+    'hour': '%Y-%m-%dT%H:00:00',
+    'day': '%Y-%m-%dT00:00:00',
+}
+ROLLUP_KEYS = ('operation_type', 'user_id', 'status')
+ROLLUP_RECORD_COUNTS = ('records_processed', 'records_created', 'records_updated', 'records_skipped')
+ROLLUP_MEASURES = ('operation_count',) + ROLLUP_RECORD_COUNTS + ('duration_sum', 'duration_count')
+
+UPSERT_ROLLUP = f"""
+    INSERT INTO audit_operation_rollups
+    (granularity, bucket_start, {', '.join(ROLLUP_KEYS)}, {', '.join(ROLLUP_MEASURES)}, last_start_time)
+    VALUES (?, ?, {', '.join('?' for _ in ROLLUP_KEYS + ROLLUP_MEASURES)}, ?)
+    ON CONFLICT (granularity, bucket_start, {', '.join(ROLLUP_KEYS)}) DO UPDATE SET
+    {', '.join(f'{measure} = {measure} + excluded.{measure}' for measure in ROLLUP_MEASURES)},
+    last_start_time = MAX(last_start_time, excluded.last_start_time)
+"""
+
+INSERT_DATA_CHANGE = """
+    INSERT INTO audit_data_changes 
+    (operation_id, entity_type, entity_id, change_type, old_values, 
+     new_values, line_number, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _buffer_settings() -> Tuple[int, float]:
+    """Configured (buffered data changes per flush, seconds between flushes)"""
+    try:
+        from ..config import get_settings
+        performance = get_settings().performance
+        return performance.audit_buffer_size, performance.audit_flush_interval
+    except ImportError:
+        logger.warning("Configuration not available, using default audit buffer settings")
+        return DEFAULT_BUFFER_SIZE, DEFAULT_FLUSH_INTERVAL
+
+
+def _retention_months() -> int:
+    """Configured months of audit data changes kept, 0 = all"""
+    try:
+        from ..config import get_settings
+        return get_settings().performance.audit_retention_months
+    except ImportError:
+        logger.warning("Configuration not available, keeping all audit data changes")
+        return DEFAULT_RETENTION_MONTHS
 
 
 class OperationType(Enum):
@@ -132,14 +191,56 @@ class OperationRecord:
         return data
 
 
+class _AuditFlusher(threading.Thread):
+    """Thread writing the buffered data changes of an AuditTrailManager every flush interval"""
+    
+    def __init__(self, manager: 'AuditTrailManager'):
+        super().__init__(name="audit-flusher", daemon=True)
+        self.manager = manager
+        self.stopped = threading.Event()
+    
+    def run(self):
+        while not self.stopped.wait(self.manager.flush_interval):
+            try:
+                self.manager.flush_data_changes()
+            except Exception as e:
+                # Left in the buffer, written by the next flush
+                logger.error(f"Periodic audit flush failed: {e}")
+            
+            if self.manager.maintained_on != date.today():
+                try:
+                    self.manager.run_data_change_maintenance()
+                except Exception as e:
+                    logger.error(f"Audit data change maintenance failed: {e}")
+
+
 class AuditTrailManager:
-    """Manages audit trail and operation tracking for import/export operations."""
+    """
+    Manages audit trail and operation tracking for import/export operations.
+    
+    Data changes are buffered and written with one executemany per flush: when
+    `buffer_size` changes are waiting, every `flush_interval` seconds, when
+    their operation completes and on close(). Changes of an operation held by
+    an import transaction are only written by flush_data_changes(operation_id),
+    inside the transaction, and dropped with discard_data_changes() when it
+    rolls back.
+    
+    Data changes of past months are compacted into month partitions and
+    months beyond the retention are dropped (run_data_change_maintenance, at
+    startup and daily); the reads span audit_data_changes and the partitions.
+    """
     
     def __init__(self):
         """Initialize audit trail manager."""
         self.db_manager = get_db_manager()
         self._ensure_audit_tables()
         self.active_operations: Dict[str, OperationRecord] = {}
+        self.buffer_size, self.flush_interval = _buffer_settings()
+        self._pending_changes: Deque[Tuple] = deque()
+        self._held_changes: Dict[str, List[Tuple]] = {}
+        self._buffer_lock = threading.Lock()
+        self._flusher: Optional[_AuditFlusher] = None
+        self.maintained_on: Optional[date] = None
     
     def _ensure_audit_tables(self):
         """Ensure audit trail tables exist in the database."""
@@ -196,6 +297,41 @@ class AuditTrailManager:
         )
         """
         
+        # Each operation's share of the rollups, to move it when the operation changes
+        create_rollup_operations_table = """
+        CREATE TABLE IF NOT EXISTS audit_rollup_operations (
+            operation_id TEXT PRIMARY KEY,
+            operation_type TEXT NOT NULL,
+            user_id TEXT NOT NULL DEFAULT '',  -- '' for operations without user
+            status TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            records_processed INTEGER NOT NULL DEFAULT 0,
+            records_created INTEGER NOT NULL DEFAULT 0,
+            records_updated INTEGER NOT NULL DEFAULT 0,
+            records_skipped INTEGER NOT NULL DEFAULT 0,
+            duration REAL      -- seconds, NULL until the operation ends
+        )
+        """
+        
+        create_operation_rollups_table = """
+        CREATE TABLE IF NOT EXISTS audit_operation_rollups (
+            granularity TEXT NOT NULL,   -- 'hour' or 'day'
+            bucket_start TEXT NOT NULL,
+            operation_type TEXT NOT NULL,
+            user_id TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL,
+            operation_count INTEGER NOT NULL DEFAULT 0,
+            records_processed INTEGER NOT NULL DEFAULT 0,
+            records_created INTEGER NOT NULL DEFAULT 0,
+            records_updated INTEGER NOT NULL DEFAULT 0,
+            records_skipped INTEGER NOT NULL DEFAULT 0,
+            duration_sum REAL NOT NULL DEFAULT 0,
+            duration_count INTEGER NOT NULL DEFAULT 0,
+            last_start_time TEXT,
+            PRIMARY KEY (granularity, bucket_start, operation_type, user_id, status)
+        )
+        """
+        
         # Create indexes for better query performance
         create_indexes = [
             "CREATE INDEX IF NOT EXISTS idx_audit_operations_user_id ON audit_operations (user_id)",
@@ -203,7 +339,8 @@ class AuditTrailManager:
             "CREATE INDEX IF NOT EXISTS idx_audit_operations_status ON audit_operations (status)",
             "CREATE INDEX IF NOT EXISTS idx_audit_data_changes_operation_id ON audit_data_changes (operation_id)",
             "CREATE INDEX IF NOT EXISTS idx_audit_data_changes_entity_type ON audit_data_changes (entity_type)",
-            "CREATE INDEX IF NOT EXISTS idx_audit_operation_files_operation_id ON audit_operation_files (operation_id)"
+            "CREATE INDEX IF NOT EXISTS idx_audit_operation_files_operation_id ON audit_operation_files (operation_id)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_rollup_operations_start_time ON audit_rollup_operations (start_time)"
         ]
         
         try:
@@ -211,10 +348,17 @@ class AuditTrailManager:
                 conn.execute(create_operations_table)
                 conn.execute(create_data_changes_table)
                 conn.execute(create_operation_files_table)
+                conn.execute(create_rollup_operations_table)
+                conn.execute(create_operation_rollups_table)
                 
                 for index_sql in create_indexes:
                     conn.execute(index_sql)
                 
+                # Operations recorded before the rollups existed
+                if (conn.execute("SELECT 1 FROM audit_rollup_operations LIMIT 1").fetchone() is None
+                        and conn.execute("SELECT 1 FROM audit_operations LIMIT 1").fetchone() is not None):
+                    self._rebuild_operation_rollups(conn)
+                
                 conn.commit()
         
         except Exception as e:
@@ -309,8 +453,96 @@ class AuditTrailManager:
         if operation_id in self.active_operations:
             self.active_operations[operation_id].add_data_change(change)
         
-        # Save to database
-        self._save_data_change_to_db(operation_id, change)
+        # Buffer for the database
+        row = self._data_change_row(operation_id, change)
+        with self._buffer_lock:
+            held = self._held_changes.get(operation_id)
+            if held is not None:
+                held.append(row)
+                return
+            self._pending_changes.append(row)
+            flush_now = len(self._pending_changes) >= self.buffer_size
+            if self._flusher is None and self.flush_interval > 0:
+                self._flusher = _AuditFlusher(self)
+                self._flusher.start()
+        
+        if flush_now:
+            try:
+                self.flush_data_changes()
+            except Exception as e:
+                logger.error(f"Audit flush failed, {len(self._pending_changes)} data changes kept for retry: {e}")
+    
+    def hold_data_changes(self, operation_id: str):
+        """Keep the operation's data changes for flush_data_changes(operation_id), inside its transaction."""
+        with self._buffer_lock:
+            self._held_changes.setdefault(operation_id, [])
+    
+    def release_data_changes(self, operation_id: str):
+        """Stop holding the operation's data changes, buffering any left like other changes."""
+        with self._buffer_lock:
+            self._pending_changes.extend(self._held_changes.pop(operation_id, []))
+    
+    def discard_data_changes(self, operation_id: str) -> int:
+        """Drop the held data changes of an operation whose writes were rolled back."""
+        with self._buffer_lock:
+            held = self._held_changes.get(operation_id)
+            if not held:
+                return 0
+            discarded = len(held)
+            held.clear()
+            return discarded
+    
+    def flush_data_changes(self, operation_id: Optional[str] = None) -> int:
+        """
+        Write buffered data changes to the database in one transaction.
+        
+        With the id of a held operation only its held changes are written, on
+        the caller's connection so they are part of its open transaction.
+        Otherwise all changes not held are written; if that fails they stay
+        buffered for the next flush.
+        
+        Returns:
+            Number of data changes written
+        """
+        with self._buffer_lock:
+            held = self._held_changes.get(operation_id) if operation_id is not None else None
+            if held is not None:
+                rows, held[:] = list(held), []
+            else:
+                rows = list(self._pending_changes)
+                self._pending_changes.clear()
+        
+        if not rows:
+            return 0
+        
+        try:
+            self._save_data_changes_to_db(rows)
+        except Exception:
+            if held is None:
+                with self._buffer_lock:
+                    self._pending_changes.extendleft(reversed(rows))
+            raise
+        
+        return len(rows)
+    
+    def close(self):
+        """Stop the periodic flush and write every buffered data change (application shutdown)."""
+        with self._buffer_lock:
+            flusher, self._flusher = self._flusher, None
+            for operation_id in list(self._held_changes):
+                self._pending_changes.extend(self._held_changes.pop(operation_id))
+        
+        if flusher is not None:
+            flusher.stopped.set()
+            flusher.join()
+        
+        try:
+            written = self.flush_data_changes()
+        except Exception as e:
+            logger.error(f"Failed to write buffered audit data changes on shutdown: {e}")
+            return
+        if written:
+            logger.info(f"Wrote {written} buffered audit data changes on shutdown")
     
     def track_file(
         self,
@@ -342,6 +574,11 @@ class AuditTrailManager:
         
         operation = self.active_operations[operation_id]
         
+        try:
+            self.flush_data_changes()
+        except Exception as e:
+            logger.error(f"Failed to write data changes of operation {operation_id}: {e}")
+        
         if operation.status in [OperationStatus.STARTED, OperationStatus.IN_PROGRESS]:
             operation.status = OperationStatus.COMPLETED
         
@@ -393,7 +630,7 @@ class AuditTrailManager:
         params.append(limit)
         
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_read_connection() as conn:
                 cursor = conn.execute(query, params)
                 rows = cursor.fetchall()
                 
@@ -421,7 +658,8 @@ class AuditTrailManager:
         """Get detailed information about a specific operation."""
         
         try:
-            with self.db_manager.get_connection() as conn:
+            self.flush_data_changes()
+            with self.db_manager.get_read_connection() as conn:
                 # Get operation record
                 cursor = conn.execute(
                     "SELECT * FROM audit_operations WHERE operation_id = ?",
@@ -464,6 +702,18 @@ class AuditTrailManager:
                     
                     data_changes.append(change_data)
                 
+                # Compacted data changes, in the partitions of the months the operation ran
+                first_month = partition_month(operation_data['start_time'])
+                last_month = partition_month(operation_data['end_time'] or datetime.now().isoformat())
+                for month in list_partitions(conn):
+                    if first_month <= month <= last_month:
+                        cursor = conn.execute(
+                            f"SELECT * FROM {partition_table(month)} WHERE operation_id = ?",
+                            (operation_id,)
+                        )
+                        data_changes.extend(partition_row_to_change(row) for row in cursor.fetchall())
+                data_changes.sort(key=lambda change: change['timestamp'])
+                
                 operation_data['data_changes'] = data_changes
                 
                 # Get associated files
@@ -487,19 +737,19 @@ class AuditTrailManager:
     ) -> List[Dict[str, Any]]:
         """Get data changes for a specific entity."""
         
-        query = "SELECT * FROM audit_data_changes WHERE entity_type = ?"
+        condition = "entity_type = ?"
         params = [entity_type]
         
         if entity_id is not None:
-            query += " AND entity_id = ?"
+            condition += " AND entity_id = ?"
             params.append(entity_id)
         
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
+        query = f"SELECT * FROM audit_data_changes WHERE {condition} ORDER BY timestamp DESC LIMIT ?"
         
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.execute(query, params)
+            self.flush_data_changes()
+            with self.db_manager.get_read_connection() as conn:
+                cursor = conn.execute(query, params + [limit])
                 rows = cursor.fetchall()
                 
                 changes = []
@@ -516,6 +766,16 @@ class AuditTrailManager:
                     
                     changes.append(change_data)
                 
+                # Older changes from the partitions, newest month first
+                for month in list_partitions(conn):
+                    if len(changes) >= limit:
+                        break
+                    cursor = conn.execute(
+                        f"SELECT * FROM {partition_table(month)} WHERE {condition} ORDER BY timestamp DESC LIMIT ?",
+                        params + [limit - len(changes)]
+                    )
+                    changes.extend(partition_row_to_change(row) for row in cursor.fetchall())
+                
                 return changes
         
         except Exception as e:
@@ -553,6 +813,7 @@ class AuditTrailManager:
                     json.dumps(operation.records_skipped),
                     json.dumps(operation.metadata)
                 ))
+                self._update_operation_rollups(conn, operation)
                 conn.commit()
         
         except Exception as e:
@@ -582,35 +843,332 @@ class AuditTrailManager:
                     json.dumps(operation.metadata),
                     operation.operation_id
                 ))
+                self._update_operation_rollups(conn, operation)
                 conn.commit()
         
         except Exception as e:
             raise Exception(f"Failed to update operation {operation.operation_id} in database: {e}")
     
-    def _save_data_change_to_db(self, operation_id: str, change: DataChange):
-        """Save data change to database."""
+    def count_data_changes(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        entity_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Number of data changes by operation, entity type and change type for
+        the operations started between start_date and end_date (inclusive),
+        without reading the changed values.
+        
+        Returns:
+            Rows with operation_id, entity_type, change_type and change_count
+        """
+        condition = "o.start_time >= ? AND o.start_time <= ?"
+        params = [start_date.isoformat(), end_date.isoformat()]
+        if entity_type:
+            condition += " AND c.entity_type = ?"
+            params.append(entity_type)
+        
+        try:
+            self.flush_data_changes()
+            with self.db_manager.get_read_connection() as conn:
+                # Changes are made after their operation started
+                first_month = partition_month(start_date.isoformat())
+                tables = ['audit_data_changes'] + [
+                    partition_table(month) for month in list_partitions(conn) if month >= first_month
+                ]
+                
+                counts: Dict[Tuple[str, str, str], int] = {}
+                for table in tables:
+                    cursor = conn.execute(f"""
+                        SELECT c.operation_id, c.entity_type, c.change_type, COUNT(*) AS change_count
+                        FROM {table} c JOIN audit_operations o ON o.operation_id = c.operation_id
+                        WHERE {condition}
+                        GROUP BY c.operation_id, c.entity_type, c.change_type
+                    """, params)
+                    for row in cursor.fetchall():
+                        key = (row['operation_id'], row['entity_type'], row['change_type'])
+                        counts[key] = counts.get(key, 0) + row['change_count']
+        
+        except Exception as e:
+            raise Exception(f"Failed to count data changes: {e}")
+        
+        return [
+            {'operation_id': operation_id, 'entity_type': change_entity_type,
+             'change_type': change_type, 'change_count': change_count}
+            for (operation_id, change_entity_type, change_type), change_count in counts.items()
+        ]
+    
+    def compact_data_changes(self, before: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Move the data changes timestamped before `before` (by default the
+        start of the current month) into their month partitions, keeping only
+        the compressed changed values.
+        
+        Returns:
+            Number of data changes compacted by 'YYYY_MM' month
+        """
+        before = before or month_start(datetime.now())
         
         try:
+            self.flush_data_changes()
             with self.db_manager.get_connection() as conn:
-                conn.execute("""
-                    INSERT INTO audit_data_changes 
-                    (operation_id, entity_type, entity_id, change_type, old_values, 
-                     new_values, line_number, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    operation_id,
-                    change.entity_type,
-                    change.entity_id,
-                    change.change_type.value,
-                    json.dumps(change.old_values) if change.old_values else None,
-                    json.dumps(change.new_values) if change.new_values else None,
-                    change.line_number,
-                    change.timestamp.isoformat()
-                ))
+                compacted = compact_data_changes(conn, before)
+                conn.commit()
+        
+        except Exception as e:
+            raise Exception(f"Failed to compact data changes: {e}")
+        
+        for month, count in sorted(compacted.items()):
+            logger.info(f"Compacted {count} audit data changes into partition {month}")
+        return compacted
+    
+    def prune_data_changes(self, retention_months: Optional[int] = None) -> List[str]:
+        """
+        Drop the data changes older than the last `retention_months` months,
+        the current one included (by default AUDIT_RETENTION_MONTHS, 0 keeps
+        them all).
+        
+        Returns:
+            'YYYY_MM' months whose partitions were dropped
+        """
+        if retention_months is None:
+            retention_months = _retention_months()
+        if retention_months <= 0:
+            return []
+        cutoff = month_start(datetime.now(), retention_months - 1)
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                dropped = drop_partitions_before(conn, cutoff)
+                # Changes not compacted yet
+                conn.execute("DELETE FROM audit_data_changes WHERE timestamp < ?", (cutoff.isoformat(),))
+                conn.commit()
+        
+        except Exception as e:
+            raise Exception(f"Failed to prune data changes: {e}")
+        
+        if dropped:
+            logger.info(f"Dropped audit data change partitions {', '.join(sorted(dropped))}")
+        return dropped
+    
+    def run_data_change_maintenance(self):
+        """Compact the data changes of past months and drop those beyond the retention."""
+        self.maintained_on = date.today()
+        self.compact_data_changes()
+        self.prune_data_changes()
+    
+    def get_operation_rollups(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[str] = None,
+        operation_type: Optional[OperationType] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Operation counts and sums by day, operation type, user and status for
+        the operations started between start_date and end_date (inclusive).
+        
+        Whole days and hours of the range are read from the rollups, only the
+        partial hours at its ends from the per-operation rows.
+        
+        Returns:
+            Rows with day, operation_type, user_id (None without user), status,
+            operation_count, record totals, duration_sum, duration_count and
+            last_start_time
+        """
+        filters, filter_params = "", []
+        if user_id:
+            filters += " AND user_id = ?"
+            filter_params.append(user_id)
+        if operation_type:
+            filters += " AND operation_type = ?"
+            filter_params.append(operation_type.value)
+        
+        group_by = f"GROUP BY day, {', '.join(ROLLUP_KEYS)}"
+        operations_query = f"""
+            SELECT substr(start_time, 1, 10) AS day, {', '.join(ROLLUP_KEYS)}, COUNT(*) AS operation_count,
+                   {', '.join(f'SUM({count}) AS {count}' for count in ROLLUP_RECORD_COUNTS)},
+                   COALESCE(SUM(duration), 0) AS duration_sum, COUNT(duration) AS duration_count,
+                   MAX(start_time) AS last_start_time
+            FROM audit_rollup_operations WHERE start_time >= ? AND {{end_condition}}{filters} {group_by}
+        """
+        rollups_query = f"""
+            SELECT substr(bucket_start, 1, 10) AS day, {', '.join(ROLLUP_KEYS)},
+                   {', '.join(f'SUM({measure}) AS {measure}' for measure in ROLLUP_MEASURES)},
+                   MAX(last_start_time) AS last_start_time
+            FROM audit_operation_rollups
+            WHERE granularity = ? AND bucket_start >= ? AND bucket_start < ?{filters} {group_by}
+        """
+        
+        first_hour = start_date.replace(minute=0, second=0, microsecond=0)
+        if first_hour < start_date:
+            first_hour += timedelta(hours=1)
+        last_hour = end_date.replace(minute=0, second=0, microsecond=0)
+        
+        queries = []
+        if first_hour >= last_hour:
+            queries.append((operations_query.format(end_condition="start_time <= ?"),
+                            [start_date.isoformat(), end_date.isoformat()]))
+        else:
+            queries.append((operations_query.format(end_condition="start_time < ?"),
+                            [start_date.isoformat(), first_hour.isoformat()]))
+            queries.append((operations_query.format(end_condition="start_time <= ?"),
+                            [last_hour.isoformat(), end_date.isoformat()]))
+            
+            first_day = first_hour.replace(hour=0)
+            if first_day < first_hour:
+                first_day += timedelta(days=1)
+            last_day = last_hour.replace(hour=0)
+            if first_day < last_day:
+                hour_ranges = [(first_hour, first_day), (last_day, last_hour)]
+                queries.append((rollups_query, ['day', first_day.isoformat(), last_day.isoformat()]))
+            else:
+                hour_ranges = [(first_hour, last_hour)]
+            for range_start, range_end in hour_ranges:
+                if range_start < range_end:
+                    queries.append((rollups_query, ['hour', range_start.isoformat(), range_end.isoformat()]))
+        
+        try:
+            rows = []
+            for query, params in queries:
+                rows.extend(dict(row) for row in self.db_manager.fetch_all(query, params + filter_params))
+        except Exception as e:
+            raise Exception(f"Failed to get operation rollups: {e}")
+        
+        for row in rows:
+            row['user_id'] = row['user_id'] or None
+        return rows
+    
+    def rebuild_operation_rollups(self):
+        """Recompute the operation rollups from audit_operations."""
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                self._rebuild_operation_rollups(conn)
                 conn.commit()
         
         except Exception as e:
-            raise Exception(f"Failed to save data change to database: {e}")
+            raise Exception(f"Failed to rebuild operation rollups: {e}")
+    
+    def _rebuild_operation_rollups(self, conn: sqlite3.Connection):
+        """Recompute the operation rollups in the connection's transaction"""
+        conn.execute("DELETE FROM audit_rollup_operations")
+        conn.execute("DELETE FROM audit_operation_rollups")
+        
+        cursor = conn.execute(
+            f"SELECT operation_id, {', '.join(ROLLUP_KEYS)}, start_time, end_time, "
+            f"{', '.join(ROLLUP_RECORD_COUNTS)} FROM audit_operations"
+        )
+        rebuilt = 0
+        for row in cursor.fetchall():
+            counts = {}
+            for count in ROLLUP_RECORD_COUNTS:
+                try:
+                    values = json.loads(row[count]) if row[count] else {}
+                except json.JSONDecodeError:
+                    values = {}
+                counts[count] = sum(values.values()) if isinstance(values, dict) else 0
+            
+            try:
+                start_time = datetime.fromisoformat(row['start_time'])
+                end_time = datetime.fromisoformat(row['end_time']) if row['end_time'] else None
+            except (ValueError, TypeError):
+                logger.warning(f"Operation {row['operation_id']} left out of the rollups, invalid times")
+                continue
+            
+            self._store_rollup_contribution(conn, {
+                'operation_id': row['operation_id'],
+                'operation_type': row['operation_type'],
+                'user_id': row['user_id'] or '',
+                'status': row['status'],
+                'start_time': row['start_time'],
+                **counts,
+                'duration': (end_time - start_time).total_seconds() if end_time else None
+            })
+            rebuilt += 1
+        
+        logger.info(f"Rebuilt audit rollups from {rebuilt} operations")
+    
+    def _update_operation_rollups(self, conn: sqlite3.Connection, operation: OperationRecord):
+        """Move the operation's share of the rollups to its current state"""
+        previous = conn.execute(
+            "SELECT * FROM audit_rollup_operations WHERE operation_id = ?", (operation.operation_id,)
+        ).fetchone()
+        if previous is not None:
+            self._apply_rollup(conn, dict(previous), -1)
+        
+        self._store_rollup_contribution(conn, {
+            'operation_id': operation.operation_id,
+            'operation_type': operation.operation_type.value,
+            'user_id': operation.user_id or '',
+            'status': operation.status.value,
+            'start_time': operation.start_time.isoformat(),
+            'records_processed': operation.total_records_processed,
+            'records_created': operation.total_records_created,
+            'records_updated': operation.total_records_updated,
+            'records_skipped': sum(operation.records_skipped.values()),
+            'duration': operation.duration
+        })
+    
+    def _store_rollup_contribution(self, conn: sqlite3.Connection, contribution: Dict[str, Any]):
+        """Add an operation's share to the rollups and remember it"""
+        self._apply_rollup(conn, contribution, 1)
+        columns = list(contribution)
+        conn.execute(
+            f"INSERT OR REPLACE INTO audit_rollup_operations ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            [contribution[column] for column in columns]
+        )
+    
+    @staticmethod
+    def _apply_rollup(conn: sqlite3.Connection, contribution: Dict[str, Any], sign: int):
+        """Add (sign 1) or remove (sign -1) an operation's share in its hour and day rollups"""
+        start_time = datetime.fromisoformat(contribution['start_time'])
+        duration = contribution['duration']
+        measures = [1] + [contribution[count] for count in ROLLUP_RECORD_COUNTS] + [
+            duration or 0.0, 0 if duration is None else 1
+        ]
+        keys = [contribution[key] for key in ROLLUP_KEYS]
+        
+        for granularity, bucket_format in ROLLUP_BUCKETS.items():
+            bucket_start = start_time.strftime(bucket_format)
+            conn.execute(UPSERT_ROLLUP, [granularity, bucket_start, *keys,
+                                         *(sign * measure for measure in measures), contribution['start_time']])
+            if sign < 0:
+                conn.execute(
+                    f"DELETE FROM audit_operation_rollups WHERE granularity = ? AND bucket_start = ? "
+                    f"AND {' AND '.join(f'{key} = ?' for key in ROLLUP_KEYS)} AND operation_count <= 0",
+                    [granularity, bucket_start, *keys]
+                )
+    
+    @staticmethod
+    def _data_change_row(operation_id: str, change: DataChange) -> Tuple:
+        """audit_data_changes row of a data change, its values serialized as they are now (dates as text)"""
+        return (
+            operation_id,
+            change.entity_type,
+            change.entity_id,
+            change.change_type.value,
+            json.dumps(change.old_values, default=str) if change.old_values else None,
+            json.dumps(change.new_values, default=str) if change.new_values else None,
+            change.line_number,
+            change.timestamp.isoformat()
+        )
+    
+    def _save_data_changes_to_db(self, rows: List[Tuple]):
+        """Save data change rows to database."""
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                # Part of an import transaction: committed or rolled back with its batch
+                nested = conn.in_transaction
+                conn.executemany(INSERT_DATA_CHANGE, rows)
+                if not nested:
+                    conn.commit()
+        
+        except Exception as e:
+            raise Exception(f"Failed to save data changes to database: {e}")
 
 
 # Global audit trail manager instance
@@ -622,4 +1180,12 @@ def get_audit_manager() -> AuditTrailManager:
     global _audit_manager
     if _audit_manager is None:
         _audit_manager = AuditTrailManager()
-    return _audit_manager
\ No newline at end of file
+    return _audit_manager
+
+
+def shutdown_audit_manager():
+    """Write the buffered data changes of the global audit trail manager (application shutdown)."""
+    global _audit_manager
+    if _audit_manager is not None:
+        _audit_manager.close()
+        _audit_manager = None
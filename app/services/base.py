@@ -5,9 +5,10 @@ Base service class with common CRUD operations, search functionality, and valida
 import logging
 import re
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Type, TypeVar, Union
+from typing import Iterator, List, Optional, Dict, Any, Type, TypeVar, Union
 from app.database import get_db_manager
 from app.models.base import BaseModel, ModelValidationException, ValidationError
+from app.services.orgchart_cache import bump_data_generation
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -46,6 +47,9 @@ class BaseService(ABC):
     separate from route handlers as required by Requirement 7.2.
     """
     
+    # Set in services whose tables feed the cached org tree snapshots
+    invalidates_orgchart: bool = False
+    
     def __init__(self, model_class: Type[T], table_name: str):
         self.model_class = model_class
         self.table_name = table_name
@@ -110,6 +114,24 @@ class BaseService(ABC):
             logger.error(f"Error fetching all {self.table_name}: {e}")
             raise ServiceException(f"Failed to retrieve {self.table_name} records") from e
     
+    def iter_all(self) -> Iterator[T]:
+        """
+        Iterate over all records without loading them all at once.
+        
+        Rows are read from a database cursor in batches, for exports and other
+        consumers that handle one record at a time.
+        
+        Raises:
+            ServiceException: If database operation fails
+        """
+        try:
+            logger.debug(f"Iterating all records from {self.table_name}")
+            for row in self.db_manager.iter_rows(self.get_list_query()):
+                yield self.model_class.from_sqlite_row(row)
+        except Exception as e:
+            logger.error(f"Error iterating {self.table_name}: {e}")
+            raise ServiceException(f"Failed to retrieve {self.table_name} records") from e
+    
     def get_by_id(self, id: int) -> Optional[T]:
         """
         Get single record by ID.
@@ -174,6 +196,8 @@ class BaseService(ABC):
                 self.model_to_insert_params(model)
             )
             
+            self._after_write()
+            
             # Get created record with assigned ID
             if hasattr(model, 'id') and cursor.lastrowid:
                 model.id = cursor.lastrowid
@@ -239,6 +263,8 @@ class BaseService(ABC):
                 self.model_to_update_params(model)
             )
             
+            self._after_write()
+            
             # Return updated record
             updated_record = self.get_by_id(model.id)
             logger.info(f"Successfully updated {self.table_name} with id {model.id}")
@@ -278,6 +304,7 @@ class BaseService(ABC):
             
             # Delete record
             cursor = self.db_manager.execute_query(self.get_delete_query(), (id,))
+            self._after_write()
             
             success = cursor.rowcount > 0
             if success:
@@ -570,6 +597,11 @@ class BaseService(ABC):
         """
         pass
     
+    def _after_write(self) -> None:
+        """Invalidate cached org tree snapshots after a write to this service's table"""
+        if self.invalidates_orgchart:
+            bump_data_generation(self.table_name)
+    
     # Utility methods for common operations
     
     def bulk_create(self, models: List[T]) -> List[T]:
@@ -621,6 +653,7 @@ class BaseService(ABC):
                 
                 conn.commit()
             
+            self._after_write()
             logger.info(f"Successfully bulk created {len(created_models)} {self.table_name} records")
             return created_models
             
@@ -629,7 +662,41 @@ class BaseService(ABC):
         except Exception as e:
             logger.error(f"Error bulk creating {self.table_name}: {e}")
             raise ServiceException(f"Failed to bulk create {self.table_name}") from e
-    
+
+    def _insert_many(self, conn, models: List[T]) -> None:
+        """
+        Insert already validated models with a single executemany and set their ids.
+
+        Runs on the caller's writer connection and transaction, which must hold
+        the write lock: the new rows then get consecutive ids above the current
+        maximum and are read back in one query.
+
+        Args:
+            conn: Writer connection inside an open transaction
+            models: Model instances to insert, in order
+
+        Raises:
+            ServiceException: If the inserted rows cannot be matched to the models
+        """
+        if not models:
+            return
+
+        last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.table_name}").fetchone()[0]
+        conn.executemany(self.get_insert_query(), [self.model_to_insert_params(model) for model in models])
+        new_ids = [
+            row[0] for row in conn.execute(
+                f"SELECT id FROM {self.table_name} WHERE id > ? ORDER BY id", (last_id,)
+            )
+        ]
+
+        if len(new_ids) != len(models):
+            raise ServiceException(
+                f"Inserted {len(models)} {self.table_name} records but found {len(new_ids)} new ids"
+            )
+
+        for model, new_id in zip(models, new_ids):
+            model.id = new_id
+
     def get_by_field(self, field_name: str, value: Any) -> Optional[T]:
         """
         Get single record by field value.
@@ -19,6 +19,7 @@ from ..models.import_export import (
 )
 from ..models.entity_mappings import get_entity_mapping
 from ..database import get_db_manager
+from .record_index import ExistingRecordIndex, PRIMARY_KEY
 
 logger = logging.getLogger(__name__)
 
@@ -148,17 +149,10 @@ class ConflictDetector:
             table_name = entity_mapping.table_name
             
             # Query all records from the table
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT * FROM {table_name}")
-                rows = cursor.fetchall()
-                
-                # Convert rows to dictionaries
-                if rows:
-                    columns = [description[0] for description in cursor.description]
-                    return [dict(zip(columns, row)) for row in rows]
-                else:
-                    return []
+            rows = self.db_manager.fetch_all(f"SELECT * FROM {table_name}")
+            
+            # Convert rows to dictionaries
+            return [dict(row) for row in rows]
         
         except Exception as e:
             logger.error(f"Error getting existing records for {entity_type}: {e}")
@@ -171,14 +165,12 @@ class ConflictDetector:
         
         try:
             unique_combinations = self.unique_field_combinations.get(entity_type, [])
+            index = ExistingRecordIndex(unique_combinations, existing_records)
             
             for line_num, record in enumerate(records, 1):
                 # Check primary key conflicts
                 if 'id' in record and record['id'] is not None:
-                    existing_with_id = next(
-                        (existing for existing in existing_records if existing.get('id') == record['id']),
-                        None
-                    )
+                    existing_with_id = index.find(PRIMARY_KEY, record)
                     if existing_with_id:
                         conflicts.append(ConflictInfo(
                             conflict_type=ConflictType.DUPLICATE_PRIMARY_KEY,
@@ -193,28 +185,23 @@ class ConflictDetector:
                 
                 # Check unique field combination conflicts
                 for field_combination in unique_combinations:
-                    # Skip if any field in combination is missing or None
-                    if not all(field in record and record[field] is not None for field in field_combination):
-                        continue
-                    
-                    # Check if combination exists in database
-                    for existing in existing_records:
-                        if all(existing.get(field) == record[field] for field in field_combination):
-                            # Found a conflict
-                            field_name = '_'.join(field_combination)
-                            conflicting_value = tuple(record[field] for field in field_combination)
-                            
-                            conflicts.append(ConflictInfo(
-                                conflict_type=ConflictType.DUPLICATE_UNIQUE_FIELD,
-                                entity_type=entity_type,
-                                field_name=field_name,
-                                conflicting_value=conflicting_value,
-                                existing_record=existing,
-                                new_record=record,
-                                line_number=line_num,
-                                suggested_resolution=self._suggest_resolution_strategy(entity_type, field_combination)
-                            ))
-                            break  # Only report first conflict for this combination
+                    # Check if combination exists in database (missing or None fields never match)
+                    existing = index.find(field_combination, record)
+                    if existing is not None:
+                        # Found a conflict
+                        field_name = '_'.join(field_combination)
+                        conflicting_value = tuple(record[field] for field in field_combination)
+                        
+                        conflicts.append(ConflictInfo(
+                            conflict_type=ConflictType.DUPLICATE_UNIQUE_FIELD,
+                            entity_type=entity_type,
+                            field_name=field_name,
+                            conflicting_value=conflicting_value,
+                            existing_record=existing,
+                            new_record=record,
+                            line_number=line_num,
+                            suggested_resolution=self._suggest_resolution_strategy(entity_type, field_combination)
+                        ))
         
         except Exception as e:
             logger.error(f"Error detecting database conflicts for {entity_type}: {e}")
@@ -8,10 +8,12 @@ field processing like JSON aliases.
 
 import csv
 import json
+import logging
 import os
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, TextIO
-from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union, TextIO
+from dataclasses import dataclass, field
 from io import StringIO
 
 from ..models.import_export import (
@@ -21,6 +23,12 @@ from ..models.entity_mappings import (
     ENTITY_MAPPINGS, CSV_COLUMN_MAPPINGS, get_entity_mapping,
     parse_json_field, serialize_json_field
 )
+from .dependency_resolver import DependencyResolver
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk handed to a worker process when a large CSV is parsed in parallel
+DEFAULT_PARSE_CHUNK_ROWS = 5000
 
 
 @dataclass
@@ -34,20 +42,115 @@ class CSVParseResult:
     processed_rows: int
 
 
+@dataclass
+class CSVChunkResult:
+    """Converted rows of one chunk of a CSV file, as returned by a worker process."""
+    data: List[Dict[str, Any]] = field(default_factory=list)
+    data_lines: List[int] = field(default_factory=list)  # line number of each record in data
+    errors: List[ImportExportValidationError] = field(default_factory=list)
+    first_line: int = 0
+    total_rows: int = 0
+
+
+def _parse_settings() -> Tuple[int, int]:
+    """Configured (workers, rows per chunk) for parallel CSV parsing"""
+    try:
+        from ..config import get_settings
+        performance = get_settings().performance
+        workers, chunk_rows = performance.csv_parse_workers, performance.csv_parse_chunk_rows
+    except ImportError:
+        logger.warning("Configuration not available, using default CSV parsing settings")
+        workers, chunk_rows = 1, DEFAULT_PARSE_CHUNK_ROWS
+    
+    return workers or os.cpu_count() or 1, chunk_rows
+
+
+def _parse_entity_file(entity_type: str, file_path: str,
+                       options: Optional[ImportOptions]) -> CSVParseResult:
+    """Parse one entity file in a worker process (module level so it can be pickled)"""
+    return CSVProcessor(options, max_workers=1).parse_csv_file(file_path, entity_type)
+
+
+def _process_csv_rows(rows: List[Tuple[int, Dict[str, str]]], entity_type: str,
+                      options: Optional[ImportOptions]) -> CSVChunkResult:
+    """Convert and validate a chunk of rows in a worker process"""
+    return CSVProcessor(options, max_workers=1)._process_rows(entity_type, rows)
+
+
+def _merge_chunk_results(chunk_results: List[CSVChunkResult], max_errors: int):
+    """
+    Join chunk results in file order.
+    
+    Chunks are processed independently, so the error limit is applied here:
+    records after the row of the last error allowed are dropped, exactly as
+    if the file had been read in one pass.
+    
+    Returns:
+        Tuple of (data, errors, warnings, total_rows)
+    """
+    data = []
+    errors = []
+    total_rows = 0
+    
+    for chunk in chunk_results:
+        if len(errors) + len(chunk.errors) < max_errors:
+            data.extend(chunk.data)
+            errors.extend(chunk.errors)
+            total_rows += chunk.total_rows
+            continue
+        
+        last_error = chunk.errors[max_errors - len(errors) - 1]
+        stop_line = last_error.line_number
+        data.extend(record for record, line in zip(chunk.data, chunk.data_lines) if line < stop_line)
+        errors.extend(chunk.errors[:max_errors - len(errors)])
+        total_rows += stop_line - chunk.first_line + 1
+        
+        warning = ImportExportValidationError(
+            field="processing",
+            message="Maximum error limit reached, stopping processing",
+            error_type=ImportErrorType.FILE_FORMAT_ERROR,
+            entity_type=last_error.entity_type,
+            line_number=stop_line
+        )
+        return data, errors, [warning], total_rows
+    
+    return data, errors, [], total_rows
+
+
 class CSVProcessor:
     """Handles CSV file parsing and generation for import/export operations."""
     
-    def __init__(self, options: Optional[Union[ImportOptions, ExportOptions]] = None):
-        """Initialize CSV processor with options."""
+    def __init__(self, options: Optional[Union[ImportOptions, ExportOptions]] = None,
+                 max_workers: Optional[int] = None, chunk_rows: Optional[int] = None):
+        """
+        Initialize CSV processor with options.
+        
+        Args:
+            options: Import or export options
+            max_workers: Worker processes for parsing; configured value if None, 1 parses in-process
+            chunk_rows: Rows per chunk for parallel parsing; configured value if None
+        """
         self.options = options
         self.delimiter = getattr(options, 'csv_delimiter', ',') if options else ','
         self.quote_char = getattr(options, 'csv_quote_char', '"') if options else '"'
         self.encoding = getattr(options, 'encoding', 'utf-8') if options else 'utf-8'
+        self.max_errors = getattr(options, 'max_errors', 1000)
+        
+        if max_workers is None or chunk_rows is None:
+            configured_workers, configured_chunk_rows = _parse_settings()
+            max_workers = configured_workers if max_workers is None else max_workers
+            chunk_rows = configured_chunk_rows if chunk_rows is None else chunk_rows
+        self.max_workers = max_workers
+        self.chunk_rows = chunk_rows
     
     def parse_csv_file(self, file_path: str, entity_type: str) -> CSVParseResult:
         """
         Parse a single CSV file for a specific entity type.
         
+        Rows are converted and validated in a process pool, in chunks of
+        ``chunk_rows``, when the file has more rows than one chunk and more
+        than one worker is configured.
+        
         Args:
             file_path: Path to the CSV file
             entity_type: Type of entity (unit_types, units, etc.)
@@ -82,8 +185,6 @@ class CSVProcessor:
                 ))
                 return CSVParseResult(False, [], errors, warnings, 0, 0)
             
-            # Get entity mapping
-            entity_mapping = get_entity_mapping(entity_type)
             column_mapping = CSV_COLUMN_MAPPINGS.get(entity_type, {})
             
             with open(file_path, 'r', encoding=self.encoding, newline='') as csvfile:
@@ -110,42 +211,23 @@ class CSVProcessor:
                 if header_errors:
                     return CSVParseResult(False, [], errors, warnings, 0, 0)
                 
-                # Process rows
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                    total_rows += 1
-                    
-                    try:
-                        # Map column names to field names
-                        mapped_row = self._map_column_names(row, column_mapping)
-                        
-                        # Process and validate row data
-                        processed_row = self._process_row_data(
-                            mapped_row, entity_type, entity_mapping, row_num
-                        )
-                        
-                        if processed_row is not None:
-                            data.append(processed_row)
-                            processed_rows += 1
-                        
-                    except Exception as e:
-                        errors.append(ImportExportValidationError(
-                            field="row_data",
-                            message=f"Error processing row: {str(e)}",
-                            error_type=ImportErrorType.FILE_FORMAT_ERROR,
-                            entity_type=entity_type,
-                            line_number=row_num
-                        ))
-                        
-                        # Stop if too many errors
-                        if len(errors) >= getattr(self.options, 'max_errors', 1000):
-                            warnings.append(ImportExportValidationError(
-                                field="processing",
-                                message="Maximum error limit reached, stopping processing",
-                                error_type=ImportErrorType.FILE_FORMAT_ERROR,
-                                entity_type=entity_type,
-                                line_number=row_num
-                            ))
-                            break
+                # Process rows, starting at 2 (header is row 1)
+                rows = enumerate(reader, start=2)
+                first_chunk = list(islice(rows, self.chunk_rows))
+                if self.max_workers > 1 and len(first_chunk) == self.chunk_rows:
+                    chunks = [first_chunk]
+                    while chunk := list(islice(rows, self.chunk_rows)):
+                        chunks.append(chunk)
+                    chunk_results = self._process_chunks_parallel(entity_type, chunks)
+                else:
+                    chunk_results = [self._process_rows(entity_type, chain(first_chunk, rows))]
+            
+            data, chunk_errors, chunk_warnings, total_rows = _merge_chunk_results(
+                chunk_results, self.max_errors
+            )
+            errors.extend(chunk_errors)
+            warnings.extend(chunk_warnings)
+            processed_rows = len(data)
         
         except Exception as e:
             errors.append(ImportExportValidationError(
@@ -162,6 +244,10 @@ class CSVProcessor:
         """
         Parse multiple CSV files for different entity types.
         
+        Files are independent, so with more than one worker each file is
+        parsed and validated in its own process. Results are returned in
+        dependency order (DependencyResolver.get_processing_order).
+        
         Args:
             file_paths: Dictionary mapping entity_type to file_path
             
@@ -170,10 +256,93 @@ class CSVProcessor:
         """
         results = {}
         
+        if self.max_workers > 1 and len(file_paths) > 1:
+            parallel_processor = self._parallel_processor(len(file_paths))
+            try:
+                results = parallel_processor.process_entities_parallel(
+                    file_paths, _parse_entity_file, self.options
+                )
+            except Exception as e:
+                logger.warning(f"Parallel CSV parsing failed, parsing files one by one: {e}")
+                results = {}
+            finally:
+                parallel_processor.cleanup()
+        
         for entity_type, file_path in file_paths.items():
-            results[entity_type] = self.parse_csv_file(file_path, entity_type)
+            if entity_type not in results:
+                results[entity_type] = self.parse_csv_file(file_path, entity_type)
+        
+        # Merge in dependency order, unknown entity types last
+        processing_order = DependencyResolver().get_processing_order()
+        ordered_types = sorted(results, key=lambda entity_type: (
+            processing_order.index(entity_type) if entity_type in processing_order else len(processing_order)
+        ))
+        return {entity_type: results[entity_type] for entity_type in ordered_types}
+    
+    def _process_chunks_parallel(self, entity_type: str,
+                                 chunks: List[List[Tuple[int, Dict[str, str]]]]) -> List[CSVChunkResult]:
+        """Convert and validate row chunks in a process pool, keeping their order"""
+        parallel_processor = self._parallel_processor(len(chunks))
+        try:
+            return parallel_processor.process_batches_parallel(
+                chunks, _process_csv_rows, entity_type, self.options
+            )
+        finally:
+            parallel_processor.cleanup()
+    
+    def _parallel_processor(self, jobs: int):
+        """Process pool sized for `jobs` independent pieces of work"""
+        # Imported here: the performance module pulls in psutil, not needed for sequential parsing
+        from .import_export_performance import ParallelProcessor, PerformanceConfig
+        # Spawned, not forked: the server has threads (job runner, database
+        # workers) whose locks a forked child could inherit held
+        return ParallelProcessor(PerformanceConfig(
+            max_workers=min(self.max_workers, jobs), use_process_pool=True, process_start_method="spawn"
+        ))
+    
+    def _process_rows(self, entity_type: str,
+                      rows: Iterable[Tuple[int, Dict[str, str]]]) -> CSVChunkResult:
+        """
+        Convert and validate numbered rows of a CSV file.
         
-        return results
+        Stops after ``max_errors`` errors, like the whole file would.
+        """
+        entity_mapping = get_entity_mapping(entity_type)
+        column_mapping = CSV_COLUMN_MAPPINGS.get(entity_type, {})
+        result = CSVChunkResult()
+        
+        for row_num, row in rows:
+            if not result.total_rows:
+                result.first_line = row_num
+            result.total_rows += 1
+            
+            try:
+                # Map column names to field names
+                mapped_row = self._map_column_names(row, column_mapping)
+                
+                # Process and validate row data
+                processed_row = self._process_row_data(
+                    mapped_row, entity_type, entity_mapping, row_num
+                )
+                
+                if processed_row is not None:
+                    result.data.append(processed_row)
+                    result.data_lines.append(row_num)
+                
+            except Exception as e:
+                result.errors.append(ImportExportValidationError(
+                    field="row_data",
+                    message=f"Error processing row: {str(e)}",
+                    error_type=ImportErrorType.FILE_FORMAT_ERROR,
+                    entity_type=entity_type,
+                    line_number=row_num
+                ))
+                
+                # Stop if too many errors
+                if len(result.errors) >= self.max_errors:
+                    break
+        
+        return result
     
     def generate_csv_file(self, data: List[Dict[str, Any]], entity_type: str, 
                          output_path: str) -> bool:
@@ -235,6 +404,48 @@ class CSVProcessor:
             print(f"Error generating CSV file {output_path}: {str(e)}")
             return False
     
+    def iter_csv_chunks(self, records: Iterable[Dict[str, Any]], entity_type: str,
+                        entity_counts: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """
+        Generate the CSV file of an entity type row by row.
+        
+        Produces the same content as generate_csv_file while holding one
+        record at a time.
+        
+        Args:
+            records: Entity records, e.g. read from a database cursor
+            entity_type: Type of entity
+            entity_counts: Optional dictionary filled with the number of
+                records written for the entity type
+            
+        Yields:
+            The header line, then one chunk per record
+        """
+        entity_mapping = get_entity_mapping(entity_type)
+        buffer = StringIO()
+        writer = csv.DictWriter(
+            buffer,
+            fieldnames=list(entity_mapping.fields.keys()),
+            delimiter=self.delimiter,
+            quotechar=self.quote_char,
+            quoting=csv.QUOTE_MINIMAL
+        )
+        
+        writer.writeheader()
+        count = 0
+        for record in records:
+            writer.writerow(self._prepare_record_for_csv(record, entity_mapping))
+            count += 1
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if entity_counts is not None:
+            entity_counts[entity_type] = count
+        # Only the header is left over when there were no records
+        if buffer.tell():
+            yield buffer.getvalue()
+    
     def generate_csv_files(self, data: Dict[str, List[Dict[str, Any]]], 
                           output_dir: str, file_prefix: str = "") -> List[str]:
         """
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from ..models.entity_mappings import get_entity_mapping
+
 logger = logging.getLogger(__name__)
 
 
@@ -454,17 +456,31 @@ class ForeignKeyResolver:
     
     This class manages the resolution of foreign key references, including
     temporary ID mapping and validation of references before processing.
+    
+    Entity types loaded with preload_existing_entities are resolved against
+    in-memory maps of their ids and natural keys (name, short_name). Entity
+    types that were not preloaded keep the permissive behaviour of accepting
+    any positive id.
     """
     
-    def __init__(self, dependency_resolver: DependencyResolver):
+    # Columns usable as natural keys, in order of precedence
+    NATURAL_KEY_FIELDS = ('name', 'short_name')
+    
+    def __init__(self, dependency_resolver: DependencyResolver, db_manager=None):
         """
         Initialize the foreign key resolver.
         
         Args:
             dependency_resolver: The dependency resolver instance
+            db_manager: Database manager used to preload existing entities,
+                the application's one if None
         """
         self.dependency_resolver = dependency_resolver
+        self.db_manager = db_manager
         self._existing_entity_cache: Dict[str, Dict[Any, int]] = {}
+        self._natural_key_cache: Dict[str, Dict[str, int]] = {}
+        self._preloaded_entities: Set[str] = set()
+        self._lookup_stats: Dict[str, Dict[str, int]] = {}
     
     def resolve_foreign_keys(self, entity_type: str, record: Dict[str, Any], 
                            created_mappings: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
@@ -532,11 +548,10 @@ class ForeignKeyResolver:
         """
         target_entity = fk_mapping.target_entity
         
-        # If it's already an integer, check if it exists in database
-        if isinstance(value, int):
-            if self._validate_existing_id(target_entity, value):
-                return value
-            return None
+        # If it's already an integer, check if it exists in database,
+        # otherwise it may be the file id of a record created by this import
+        if isinstance(value, int) and self._validate_existing_id(target_entity, value):
+            return value
         
         # Convert to string for temporary ID lookup
         str_value = str(value)
@@ -553,12 +568,13 @@ class ForeignKeyResolver:
             return resolved_id
         
         # Try to parse as integer and validate
-        try:
-            int_value = int(str_value)
-            if self._validate_existing_id(target_entity, int_value):
-                return int_value
-        except (ValueError, TypeError):
-            pass
+        if not isinstance(value, int):
+            try:
+                int_value = int(str_value)
+                if self._validate_existing_id(target_entity, int_value):
+                    return int_value
+            except (ValueError, TypeError):
+                pass
         
         # Try to find by natural key (name, etc.)
         natural_key_id = self._resolve_by_natural_key(target_entity, str_value)
@@ -578,24 +594,15 @@ class ForeignKeyResolver:
         Returns:
             True if the ID exists, False otherwise
         """
-        # Use cache to avoid repeated database queries
-        if entity_type not in self._existing_entity_cache:
-            self._existing_entity_cache[entity_type] = {}
-        
-        if entity_id in self._existing_entity_cache[entity_type]:
-            return self._existing_entity_cache[entity_type][entity_id] is not None
-        
-        # This would need to be implemented with actual database access
-        # For now, we'll assume the ID exists if it's positive
-        # In a real implementation, this would query the database
-        exists = entity_id > 0
-        self._existing_entity_cache[entity_type][entity_id] = entity_id if exists else None
+        if entity_type in self._preloaded_entities:
+            return self._count_lookup(entity_type, entity_id in self._existing_entity_cache[entity_type])
         
-        return exists
+        # Not preloaded: assume the ID exists if it's positive
+        return entity_id > 0
     
     def _resolve_by_natural_key(self, entity_type: str, value: str) -> Optional[int]:
         """
-        Try to resolve a foreign key by natural key (name field).
+        Try to resolve a foreign key by natural key (name or short name).
         
         Args:
             entity_type: The entity type to search
@@ -604,10 +611,28 @@ class ForeignKeyResolver:
         Returns:
             The database ID if found, None otherwise
         """
-        # This would need to be implemented with actual database access
-        # For now, we'll return None to indicate not found
-        # In a real implementation, this would query the database by name
-        return None
+        if entity_type not in self._preloaded_entities:
+            return None
+        
+        entity_id = self._natural_key_cache[entity_type].get(value)
+        self._count_lookup(entity_type, entity_id is not None)
+        return entity_id
+    
+    def _count_lookup(self, entity_type: str, hit: bool) -> bool:
+        """Record a cache lookup for the statistics and return `hit`"""
+        stats = self._lookup_stats.setdefault(entity_type, {'hits': 0, 'misses': 0})
+        stats['hits' if hit else 'misses'] += 1
+        return hit
+    
+    def _reference_exists(self, entity_type: str, value: Any) -> bool:
+        """Whether an existing entity has `value` as id or natural key"""
+        try:
+            if self._validate_existing_id(entity_type, int(str(value))):
+                return True
+        except (ValueError, TypeError):
+            pass
+        
+        return self._resolve_by_natural_key(entity_type, str(value)) is not None
     
     def validate_foreign_key_references(self, entity_type: str, records: List[Dict[str, Any]], 
                                       available_entities: Dict[str, Set[Any]]) -> List[str]:
@@ -648,15 +673,9 @@ class ForeignKeyResolver:
                 if str_value in available_ids:
                     continue
                 
-                # Check if it's a valid integer ID that might exist in database
-                try:
-                    int_value = int(str_value)
-                    if int_value > 0:
-                        # Assume existing database IDs are valid for now
-                        # In real implementation, would validate against database
-                        continue
-                except (ValueError, TypeError):
-                    pass
+                # Check if it's the id or natural key of an existing record
+                if self._reference_exists(target_entity, source_value):
+                    continue
                 
                 # If we get here, the reference cannot be resolved
                 errors.append(
@@ -698,23 +717,113 @@ class ForeignKeyResolver:
     def clear_cache(self) -> None:
         """Clear the existing entity cache"""
         self._existing_entity_cache.clear()
+        self._natural_key_cache.clear()
+        self._preloaded_entities.clear()
+        self._lookup_stats.clear()
         logger.debug("Cleared foreign key resolver cache")
     
+    def get_referenced_entity_types(self, entity_types: List[str]) -> List[str]:
+        """
+        Get the entity types referenced by foreign keys of the given ones.
+        
+        Args:
+            entity_types: Entity types being imported
+            
+        Returns:
+            Referenced entity types, in first-seen order
+        """
+        referenced = {}
+        for entity_type in entity_types:
+            for fk_mapping in self.dependency_resolver.get_foreign_key_mappings(entity_type):
+                referenced[fk_mapping.target_entity] = None
+        return list(referenced)
+    
     def preload_existing_entities(self, entity_types: List[str]) -> None:
         """
         Preload existing entities from database to improve resolution performance.
         
+        Loads id and natural keys of each entity type with one query per
+        table. Entity types that cannot be loaded keep being resolved
+        without the database.
+        
         Args:
             entity_types: List of entity types to preload
         """
-        # This would be implemented with actual database access
-        # For now, we'll just initialize the cache
+        db_manager = self.db_manager
+        if db_manager is None:
+            from ..database import get_db_manager
+            db_manager = get_db_manager()
+        
         for entity_type in entity_types:
-            if entity_type not in self._existing_entity_cache:
-                self._existing_entity_cache[entity_type] = {}
+            self._existing_entity_cache.setdefault(entity_type, {})
+            
+            try:
+                entity_mapping = get_entity_mapping(entity_type)
+                key_fields = [
+                    field_name for field_name in self.NATURAL_KEY_FIELDS
+                    if field_name in entity_mapping.fields
+                ]
+                columns = ", ".join(['id', *key_fields])
+                rows = db_manager.iter_rows(
+                    f"SELECT {columns} FROM {entity_mapping.table_name} ORDER BY id"
+                )
+                
+                ids: Dict[Any, int] = {}
+                natural_keys: Dict[str, int] = {}
+                by_field: Dict[str, Dict[str, int]] = {field_name: {} for field_name in key_fields}
+                for row in rows:
+                    entity_id = row[0]
+                    ids[entity_id] = entity_id
+                    for position, field_name in enumerate(key_fields, start=1):
+                        if row[position]:
+                            by_field[field_name].setdefault(str(row[position]), entity_id)
+                
+                # Names take precedence over short names shared with another record
+                for field_name in reversed(key_fields):
+                    natural_keys.update(by_field[field_name])
+            
+            except Exception as e:
+                logger.warning(f"Could not preload existing {entity_type}, resolving without database: {e}")
+                self._preloaded_entities.discard(entity_type)
+                continue
+            
+            self._existing_entity_cache[entity_type] = ids
+            self._natural_key_cache[entity_type] = natural_keys
+            self._preloaded_entities.add(entity_type)
+            self._lookup_stats[entity_type] = {'hits': 0, 'misses': 0}
         
         logger.debug(f"Preloaded existing entities for types: {entity_types}")
     
+    def reload_entity(self, entity_type: str) -> None:
+        """
+        Reload a preloaded entity type, e.g. after writes to it were rolled back.
+        
+        Args:
+            entity_type: The entity type to reload
+        """
+        if entity_type in self._preloaded_entities:
+            self.preload_existing_entities([entity_type])
+    
+    def register_existing_entity(self, entity_type: str, entity_id: int,
+                                 record: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add a record created during the import to the preloaded entities.
+        
+        Args:
+            entity_type: The entity type of the record
+            entity_id: The database ID of the record
+            record: The record data, for its natural keys
+        """
+        if entity_type not in self._preloaded_entities:
+            return
+        
+        self._existing_entity_cache[entity_type][entity_id] = entity_id
+        natural_keys = self._natural_key_cache[entity_type]
+        for field_name in self.NATURAL_KEY_FIELDS:
+            value = (record or {}).get(field_name)
+            if value:
+                natural_keys.setdefault(str(value), entity_id)
+    
     def get_resolution_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about foreign key resolution operations.
@@ -727,10 +836,23 @@ class ForeignKeyResolver:
                 entity_type: len(cache) 
                 for entity_type, cache in self._existing_entity_cache.items()
             },
+            'cached_natural_keys': {
+                entity_type: len(cache)
+                for entity_type, cache in self._natural_key_cache.items()
+            },
+            'preloaded_entities': sorted(self._preloaded_entities),
+            'lookups': {
+                entity_type: {
+                    **counts,
+                    'hit_rate': counts['hits'] / (counts['hits'] + counts['misses'])
+                    if counts['hits'] + counts['misses'] else 0.0
+                }
+                for entity_type, counts in self._lookup_stats.items()
+            },
             'temporary_mappings': {
                 entity_type: len(mappings)
                 for entity_type, mappings in self.dependency_resolver._temporary_id_mappings.items()
             }
         }
         
-        return stats
\ No newline at end of file
+        return stats
@@ -18,19 +18,38 @@ from dataclasses import dataclass, field
 from ..models.import_export import ImportExportValidationError, ImportErrorType, ImportResult, ExportResult
 from ..utils.error_handler import (
     ErrorLogger, StructuredError, ErrorReport, ErrorSeverity, ErrorCategory,
-    get_error_logger
+    ErrorSample, TopKCounter, get_error_logger
 )
 from .audit_trail import get_audit_manager, OperationType, ChangeType
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SAMPLING_MIN_RECORDS = 100000
+DEFAULT_SAMPLE_FIRST = 10
+DEFAULT_SAMPLE_RESERVOIR = 100
+
+# Distinct error messages counted per entity type when sampling
+TOP_MESSAGES = 50
+
+
+def _sampling_settings() -> Tuple[int, int, int]:
+    """Configured (records from which errors are sampled, 0 = never; first errors kept; sampled errors kept)"""
+    try:
+        from ..config import get_settings
+        performance = get_settings().performance
+        return (performance.error_sampling_min_records, performance.error_sample_first,
+                performance.error_sample_reservoir)
+    except ImportError:
+        logger.warning("Configuration not available, using default error sampling settings")
+        return DEFAULT_SAMPLING_MIN_RECORDS, DEFAULT_SAMPLE_FIRST, DEFAULT_SAMPLE_RESERVOIR
+
 
 @dataclass
 class LineErrorSummary:
     """Summary of errors for a specific line in an import file."""
     line_number: int
     entity_type: str
-    record_data: Dict[str, Any]
+    record_data: Dict[str, Any]  # or {'record_ref': ...} when saved apart, see ErrorLogger.record_context
     errors: List[StructuredError] = field(default_factory=list)
     warnings: List[StructuredError] = field(default_factory=list)
     
@@ -53,7 +72,14 @@ class LineErrorSummary:
 
 @dataclass
 class EntityErrorSummary:
-    """Summary of errors for a specific entity type."""
+    """
+    Summary of errors for a specific entity type.
+    
+    The counts are exact. With sample sizes, line_errors keeps per error type
+    and field only the first `sample_first` lines and a random sample of
+    `sample_reservoir` others, and error messages are counted for the
+    TOP_MESSAGES most frequent only.
+    """
     entity_type: str
     total_records: int
     processed_records: int
@@ -62,10 +88,20 @@ class EntityErrorSummary:
     line_errors: Dict[int, LineErrorSummary] = field(default_factory=dict)
     field_error_counts: Dict[str, int] = field(default_factory=dict)
     error_type_counts: Dict[str, int] = field(default_factory=dict)
+    severity_counts: Dict[str, int] = field(default_factory=dict)
+    sample_first: int = 0
+    sample_reservoir: int = 0
+    samples: Dict[Tuple[str, Optional[str]], ErrorSample] = field(default_factory=dict, repr=False)
+    message_counts: TopKCounter = field(default_factory=lambda: TopKCounter(TOP_MESSAGES), repr=False)
+    
+    @property
+    def sampled(self) -> bool:
+        """Whether line_errors holds only a sample of the lines with errors"""
+        return self.sample_first > 0 or self.sample_reservoir > 0
     
     def add_line_error(self, line_error: LineErrorSummary):
         """Add a line error summary to this entity summary."""
-        self.line_errors[line_error.line_number] = line_error
+        self._keep_line_error(line_error)
         
         if line_error.has_critical_errors:
             self.failed_records += 1
@@ -82,6 +118,30 @@ class EntityErrorSummary:
             error_type = error.error_type.value
             self.error_type_counts[error_type] = \
                 self.error_type_counts.get(error_type, 0) + 1
+            
+            # Update severity counts
+            severity = error.severity.value
+            self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+            
+            if self.sampled:
+                self.message_counts.add(error.message)
+    
+    def _keep_line_error(self, line_error: LineErrorSummary):
+        """Keep the line error, or a sample of those of its error type and field"""
+        if not self.sampled:
+            self.line_errors[line_error.line_number] = line_error
+            return
+        
+        first_error = (line_error.errors + line_error.warnings or [None])[0]
+        bucket = (first_error.error_type.value, first_error.field_name) if first_error else ('', None)
+        if bucket not in self.samples:
+            self.samples[bucket] = ErrorSample(self.sample_first, self.sample_reservoir)
+        kept, evicted = self.samples[bucket].add(line_error)
+        
+        if evicted is not None:
+            self.line_errors.pop(evicted.line_number, None)
+        if kept:
+            self.line_errors[line_error.line_number] = line_error
     
     @property
     def success_rate(self) -> float:
@@ -99,6 +159,11 @@ class EntityErrorSummary:
     def most_problematic_fields(self) -> List[Tuple[str, int]]:
         """Get most problematic fields sorted by error count."""
         return sorted(self.field_error_counts.items(), key=lambda x: x[1], reverse=True)
+    
+    @property
+    def most_common_messages(self) -> List[Tuple[str, int]]:
+        """Most frequent error messages with their (upper bound) counts, when sampling."""
+        return self.message_counts.most_common()
 
 
 @dataclass
@@ -116,6 +181,13 @@ class ComprehensiveErrorReport:
     critical_errors: List[StructuredError] = field(default_factory=list)
     system_errors: List[StructuredError] = field(default_factory=list)
     file_errors: List[StructuredError] = field(default_factory=dict)
+    sample_first: int = 0
+    sample_reservoir: int = 0
+    
+    @property
+    def sampled(self) -> bool:
+        """Whether only a sample of the line errors is kept (the counts are exact)"""
+        return self.sample_first > 0 or self.sample_reservoir > 0
     
     @property
     def success_rate(self) -> float:
@@ -139,13 +211,8 @@ class ComprehensiveErrorReport:
         }
         
         for entity_summary in self.entity_summaries.values():
-            for line_error in entity_summary.line_errors.values():
-                for error in line_error.errors:
-                    severity_counts[error.severity.value] = \
-                        severity_counts.get(error.severity.value, 0) + 1
-                for warning in line_error.warnings:
-                    severity_counts[warning.severity.value] = \
-                        severity_counts.get(warning.severity.value, 0) + 1
+            for severity, count in entity_summary.severity_counts.items():
+                severity_counts[severity] = severity_counts.get(severity, 0) + count
         
         return severity_counts
     
@@ -219,21 +286,40 @@ class ErrorReportingService:
         self,
         operation_id: str,
         operation_type: str,
-        total_records: int = 0
+        total_records: int = 0,
+        sample_errors: Optional[bool] = None
     ) -> ComprehensiveErrorReport:
-        """Start comprehensive error tracking for an operation."""
+        """
+        Start comprehensive error tracking for an operation.
+        
+        With sample_errors (by default, from ERROR_SAMPLING_MIN_RECORDS
+        records) only a sample of the errors is kept, so error reporting
+        takes the same memory however many records fail; counts and
+        recommendations still cover every error.
+        """
+        min_records, sample_first, sample_reservoir = _sampling_settings()
+        if sample_errors is None:
+            sample_errors = min_records > 0 and total_records >= min_records
+        if not sample_errors:
+            sample_first = sample_reservoir = 0
         
         report = ComprehensiveErrorReport(
             operation_id=operation_id,
             operation_type=operation_type,
             start_time=datetime.now(),
-            total_records=total_records
+            total_records=total_records,
+            sample_first=sample_first,
+            sample_reservoir=sample_reservoir
         )
         
         self.active_reports[operation_id] = report
         
         # Also start error logging in the error logger
-        self.error_logger.create_error_report(operation_id, operation_type)
+        self.error_logger.create_error_report(operation_id, operation_type, sample_first, sample_reservoir)
+        
+        if report.sampled:
+            logger.info(f"Sampling errors of operation {operation_id}: first {sample_first} "
+                        f"and {sample_reservoir} more per error type and field")
         
         logger.info(f"Started comprehensive error tracking for operation {operation_id}")
         return report
@@ -261,16 +347,21 @@ class ErrorReportingService:
                 total_records=0,
                 processed_records=0,
                 failed_records=0,
-                warning_records=0
+                warning_records=0,
+                sample_first=report.sample_first,
+                sample_reservoir=report.sample_reservoir
             )
         
         entity_summary = report.entity_summaries[entity_type]
         
+        # Record data shared by the line's errors, saved once if large
+        record_context = self.error_logger.record_context(operation_id, line_number, entity_type, record_data)
+        
         # Create line error summary
         line_error = LineErrorSummary(
             line_number=line_number,
             entity_type=entity_type,
-            record_data=record_data
+            record_data=record_context.get('record_data', record_context)
         )
         
         # Convert validation errors to structured errors and log them
@@ -288,7 +379,7 @@ class ErrorReportingService:
                 record_id=record_data.get('id'),
                 line_number=line_number,
                 field_name=error.field,
-                context={'record_data': record_data},
+                context=record_context,
                 resolution_hint=self._generate_resolution_hint(error)
             )
             
@@ -406,6 +497,7 @@ class ErrorReportingService:
             'warning_records': report.warning_records,
             'success_rate': report.success_rate,
             'has_critical_issues': report.has_critical_issues,
+            'errors_sampled': report.sampled,
             'error_summary_by_severity': report.get_error_summary_by_severity(),
             'top_error_types': report.get_top_error_types(5),
             'recommendations': report.get_recommendations(),
@@ -490,6 +582,7 @@ class ErrorReportingService:
                 'warning_records': report.warning_records,
                 'success_rate': report.success_rate,
                 'has_critical_issues': report.has_critical_issues,
+                'errors_sampled': report.sampled,
                 'error_summary_by_severity': report.get_error_summary_by_severity(),
                 'top_error_types': report.get_top_error_types(),
                 'recommendations': report.get_recommendations(),
@@ -512,6 +605,7 @@ class ErrorReportingService:
                     'most_problematic_fields': entity_summary.most_problematic_fields,
                     'field_error_counts': entity_summary.field_error_counts,
                     'error_type_counts': entity_summary.error_type_counts,
+                    'most_common_messages': entity_summary.most_common_messages,
                     'line_errors': {
                         str(line_num): {
                             'line_number': line_error.line_number,
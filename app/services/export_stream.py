@@ -0,0 +1,188 @@
+"""
+Chunked output for streaming exports
+
+Export documents are produced as generators of text chunks (see
+JSONProcessor.iter_json_chunks and CSVProcessor.iter_csv_chunks). The helpers
+here turn those into byte chunks of a useful size for a file or an HTTP
+response, and pack several CSV files into a zip archive on the fly, so an
+export never has to exist in full in memory or on disk.
+"""
+
+import io
+import logging
+import threading
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from ..db_executor import DatabaseBusyError
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+DEFAULT_EXPORT_STREAM_LIMIT = 4
+
+
+@dataclass
+class ExportStream:
+    """A generated export ready to be sent as a download"""
+    filename: str
+    media_type: str
+    chunks: Iterator[bytes]
+
+
+def encode_chunks(chunks: Iterable[str], encoding: str = 'utf-8',
+                  chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode text chunks, joining small ones into pieces of about `chunk_size` bytes.
+
+    Args:
+        chunks: Text chunks in output order
+        encoding: Target encoding
+        chunk_size: Size at which buffered bytes are emitted
+
+    Yields:
+        Encoded chunks, none of them empty
+    """
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = chunk.encode(encoding)
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= chunk_size:
+            yield b''.join(pending)
+            pending = []
+            pending_size = 0
+
+    if pending_size:
+        yield b''.join(pending)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable output that keeps what was written until it is drained"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_chunks(members: Iterable[Tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """
+    Build a deflated zip archive while its members are being generated.
+
+    The archive is written to an unseekable sink, so sizes and checksums go
+    in data descriptors after each member instead of being patched into the
+    local headers.
+
+    Args:
+        members: (file name, byte chunks) pairs in archive order
+
+    Yields:
+        Consecutive chunks of the archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in members:
+            # Sizes are unknown up front, allow members over 2 GiB
+            with archive.open(name, 'w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+
+    data = sink.drain()
+    if data:
+        yield data
+
+
+class _GuardedChunks:
+    """Chunks of a download that give back its stream slot once they are done with"""
+
+    def __init__(self, chunks: Iterator[bytes], release: Callable[[], None]):
+        self._chunks = chunks
+        self._release: Optional[Callable[[], None]] = release
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            release, self._release = self._release, None
+        if release is None:
+            return
+        try:
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            release()
+
+    def __del__(self):
+        # A response dropped before it was sent never reaches the end of its chunks
+        self.close()
+
+
+class StreamLimiter:
+    """
+    Bound on the streamed downloads in progress.
+
+    A streamed export keeps a pooled read connection checked out while its
+    response is sent, so a few slow clients could otherwise hold the whole
+    pool. A slot is taken when the stream is created, before anything is
+    sent, and given back when its chunks are exhausted, closed or dropped.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def guard(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Take a slot for `chunks`, raising DatabaseBusyError when none is free"""
+        if not self._slots.acquire(blocking=False):
+            logger.warning(f"Export stream limit reached ({self.limit} downloads in progress)")
+            raise DatabaseBusyError(f"{self.limit} export downloads already in progress, retry later")
+        return _GuardedChunks(chunks, self._slots.release)
+
+
+_stream_limiter: Optional[StreamLimiter] = None
+_stream_limiter_lock = threading.Lock()
+
+
+def get_export_stream_limiter() -> StreamLimiter:
+    """Get the process-wide limit on streamed export downloads"""
+    global _stream_limiter
+
+    if _stream_limiter is None:
+        with _stream_limiter_lock:
+            if _stream_limiter is None:
+                try:
+                    from app.config import get_settings
+                    limit = get_settings().performance.export_stream_limit
+                except ImportError:
+                    logger.warning("Configuration not available, using default export stream limit")
+                    limit = DEFAULT_EXPORT_STREAM_LIMIT
+                _stream_limiter = StreamLimiter(limit)
+
+    return _stream_limiter
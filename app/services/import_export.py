@@ -11,16 +11,17 @@ import os
 import tempfile
 import time
 import uuid
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Any, Union, Tuple
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime
 
 from ..database import get_db_manager
 from ..models.import_export import (
     ImportOptions, ExportOptions, ImportResult, ExportResult, PreviewResult,
     ValidationResult, BatchResult, ImportExportValidationError, ImportErrorType,
-    FileFormat, ConflictResolutionStrategy
+    FileFormat, ConflictResolutionStrategy, ImportPlan
 )
 from ..models.entity_mappings import DEPENDENCY_ORDER, get_entity_mapping
 from ..utils.error_handler import (
@@ -34,10 +35,14 @@ from .import_export_security import get_import_export_security_service
 from .import_export_performance import get_import_export_performance_service
 from .csv_processor import CSVProcessor
 from .json_processor import JSONProcessor
+from .export_stream import ExportStream, encode_chunks, get_export_stream_limiter, zip_chunks
 from .dependency_resolver import DependencyResolver, ForeignKeyResolver
 from .validation_framework import ValidationFramework
 from .conflict_resolution import ConflictResolutionManager
+from .record_index import ExistingRecordIndex
+from .import_planner import ImportPlanner
 from .base import BaseService, ServiceException, ServiceValidationException
+from .orgchart_cache import bump_data_generation
 
 logger = logging.getLogger(__name__)
 
@@ -59,10 +64,21 @@ class TransactionRollbackError(ImportExportException):
 
 @dataclass
 class TransactionContext:
-    """Context for managing database transactions during import/export operations"""
+    """
+    Context for managing database transactions during import/export operations.
+    
+    While batches are pending, the writer connection is held in an open
+    transaction; it is released at every commit so other writers can go on.
+    """
     operation_id: str
     is_active: bool = True
     start_time: float = 0.0
+    commit_interval: Optional[int] = None  # batches per commit, None = commit only at the end
+    connection: Optional[Any] = None
+    writer: Optional[ExitStack] = None
+    pending_batches: int = 0
+    committed_batches: int = 0
+    rolled_back_batches: int = 0
     
     def __post_init__(self):
         """Initialize transaction start time"""
@@ -70,6 +86,22 @@ class TransactionContext:
             self.start_time = time.time()
 
 
+@dataclass
+class PendingCreate:
+    """New import record waiting for the bulk insert of its batch"""
+    line_number: int
+    record: Dict[str, Any]
+    resolved_record: Dict[str, Any]
+    model: Any
+    unique_keys: set = field(default_factory=set)
+    
+    @property
+    def mapping_key(self) -> Optional[str]:
+        """Key other records of the file use to refer to this one"""
+        key = self.record.get('temp_id', self.record.get('id'))
+        return str(key) if key is not None else None
+
+
 class ImportExportService:
     """
     Core service for managing import and export operations.
@@ -83,7 +115,7 @@ class ImportExportService:
         """Initialize the import/export service with required components."""
         self.db_manager = get_db_manager()
         self.dependency_resolver = DependencyResolver()
-        self.foreign_key_resolver = ForeignKeyResolver(self.dependency_resolver)
+        self.foreign_key_resolver = ForeignKeyResolver(self.dependency_resolver, self.db_manager)
         self.validation_framework = ValidationFramework()
         self.conflict_resolution_manager = ConflictResolutionManager()
         self.security_service = get_import_export_security_service()
@@ -92,6 +124,11 @@ class ImportExportService:
         self.audit_manager = get_audit_manager()
         self.error_reporting_service = get_error_reporting_service()
         self._transaction_contexts: Dict[str, TransactionContext] = {}
+        self._existing_record_indexes: Dict[str, ExistingRecordIndex] = {}
+        # Called with (records done, records total) after import batches, once committed
+        self.progress_callback: Optional[Callable[[int, int], None]] = None
+        self._progress = [0, 0]
+        self._progress_reported = 0
         
         logger.info("ImportExportService initialized with enhanced security, performance optimization, error handling and audit trail")
     
@@ -325,15 +362,18 @@ class ImportExportService:
         
         return errors
     
-    def create_transaction_context(self, operation_id: str) -> TransactionContext:
+    def create_transaction_context(self, operation_id: str,
+                                   commit_interval: Optional[int] = None) -> TransactionContext:
         """
         Create a new transaction context for import/export operations.
         
-        For this implementation, we'll use a simplified approach that works with
-        the existing database manager's transaction handling.
+        The database transaction starts with the first batch run through
+        _run_batch_in_savepoint; each batch gets a savepoint and every
+        `commit_interval` batches are committed.
         
         Args:
             operation_id: Unique identifier for the operation
+            commit_interval: Batches per commit, None to commit only in commit_transaction
             
         Returns:
             Transaction context for managing database operations
@@ -344,14 +384,16 @@ class ImportExportService:
         try:
             logger.debug(f"Creating transaction context for operation: {operation_id}")
             
-            # Create transaction context (simplified approach)
             context = TransactionContext(
                 operation_id=operation_id,
-                is_active=True
+                is_active=True,
+                commit_interval=commit_interval
             )
             
             # Store context for management
             self._transaction_contexts[operation_id] = context
+            # Audit rows are written with each batch and rolled back with it
+            self.audit_manager.hold_data_changes(operation_id)
             
             logger.info(f"Transaction context created for operation: {operation_id}")
             return context
@@ -377,12 +419,19 @@ class ImportExportService:
             
             logger.debug(f"Committing transaction for operation: {operation_id}")
             
+            self._commit_pending_batches(context)
+            self.audit_manager.release_data_changes(operation_id)
+            # Progress held back while the last batches were pending
+            self._report_progress()
+            
             # Mark transaction as committed
             context.is_active = False
             
             # Calculate transaction duration
             duration = time.time() - context.start_time
-            logger.info(f"Transaction committed for operation {operation_id} (duration: {duration:.2f}s)")
+            logger.info(f"Transaction committed for operation {operation_id} "
+                        f"({context.committed_batches} batches, {context.rolled_back_batches} rolled back, "
+                        f"duration: {duration:.2f}s)")
             
             # Clean up context
             del self._transaction_contexts[operation_id]
@@ -418,9 +467,22 @@ class ImportExportService:
             if context.is_active:
                 context.is_active = False
             
+            self.audit_manager.discard_data_changes(operation_id)
+            self.audit_manager.release_data_changes(operation_id)
+            
+            # Only batches not committed yet can be undone
+            if context.connection is not None:
+                try:
+                    context.connection.rollback()
+                    context.rolled_back_batches += context.pending_batches
+                    context.pending_batches = 0
+                finally:
+                    self._release_writer(context)
+            
             # Calculate transaction duration
             duration = time.time() - context.start_time
-            logger.info(f"Transaction rolled back for operation {operation_id} (duration: {duration:.2f}s)")
+            logger.info(f"Transaction rolled back for operation {operation_id} "
+                        f"({context.committed_batches} batches already committed, duration: {duration:.2f}s)")
             
             # Clean up context
             if operation_id in self._transaction_contexts:
@@ -430,6 +492,66 @@ class ImportExportService:
             logger.error(f"Failed to rollback transaction for {operation_id}: {e}")
             raise TransactionRollbackError(f"Transaction rollback failed: {str(e)}")
     
+    def _run_batch_in_savepoint(self, context: TransactionContext,
+                                process_batch: Callable[[], BatchResult]) -> BatchResult:
+        """
+        Run one import batch inside the operation's transaction, in a savepoint.
+        
+        A batch that fails is rolled back to its savepoint without touching
+        the other batches of the transaction. Pending batches are committed
+        once they reach the context's commit interval.
+        """
+        if context.connection is None:
+            context.writer = ExitStack()
+            context.connection = context.writer.enter_context(self.db_manager.get_connection())
+            if not context.connection.in_transaction:
+                context.connection.execute("BEGIN IMMEDIATE")
+        
+        conn = context.connection
+        conn.execute("SAVEPOINT import_batch")
+        try:
+            batch_result = process_batch()
+            if batch_result.success:
+                # The batch's audit rows, in one statement of its savepoint
+                self.audit_manager.flush_data_changes(context.operation_id)
+        except Exception:
+            conn.execute("ROLLBACK TO import_batch")
+            conn.execute("RELEASE import_batch")
+            self.audit_manager.discard_data_changes(context.operation_id)
+            context.rolled_back_batches += 1
+            raise
+        
+        if batch_result.success:
+            conn.execute("RELEASE import_batch")
+            context.pending_batches += 1
+            if context.commit_interval and context.pending_batches >= context.commit_interval:
+                self._commit_pending_batches(context)
+        else:
+            conn.execute("ROLLBACK TO import_batch")
+            conn.execute("RELEASE import_batch")
+            self.audit_manager.discard_data_changes(context.operation_id)
+            context.rolled_back_batches += 1
+        
+        return batch_result
+    
+    def _commit_pending_batches(self, context: TransactionContext) -> None:
+        """Commit the batches of the open transaction and release the writer"""
+        if context.connection is None:
+            return
+        try:
+            context.connection.commit()
+            context.committed_batches += context.pending_batches
+            context.pending_batches = 0
+        finally:
+            self._release_writer(context)
+    
+    @staticmethod
+    def _release_writer(context: TransactionContext) -> None:
+        """Give the writer connection back to the database manager"""
+        writer, context.writer, context.connection = context.writer, None, None
+        if writer is not None:
+            writer.close()
+    
     def cleanup_transaction_contexts(self) -> None:
         """Clean up any remaining transaction contexts (for error recovery)."""
         try:
@@ -878,7 +1000,10 @@ class ImportExportService:
             "exists": True,
             "is_active": context.is_active,
             "duration": time.time() - context.start_time,
-            "operation_id": context.operation_id
+            "operation_id": context.operation_id,
+            "pending_batches": context.pending_batches,
+            "committed_batches": context.committed_batches,
+            "rolled_back_batches": context.rolled_back_batches
         }
     
     def get_active_transactions(self) -> List[str]:
@@ -904,7 +1029,8 @@ class ImportExportService:
             options: Import configuration options
             
         Returns:
-            PreviewResult with preview data and validation information
+            PreviewResult with preview data and validation information, and
+            an import plan when options.plan_batches is set
         """
         import time
         
@@ -935,7 +1061,9 @@ class ImportExportService:
             
             # Step 2: Parse file data based on format
             logger.debug(f"Parsing {file_format.value} file for preview")
+            parse_start = time.time()
             parsed_data = self._parse_import_file(file_path, file_format, options)
+            parse_seconds = time.time() - parse_start
             
             # Step 2.5: Sanitize parsed data for security
             if parsed_data:
@@ -993,8 +1121,11 @@ class ImportExportService:
                     error_type=ImportErrorType.FOREIGN_KEY_VIOLATION
                 ))
             
-            # Step 6: Estimate processing time based on record count and complexity
+            # Step 6: Estimate processing time based on record count and complexity,
+            # and plan the import on a sample of the data when asked to
             result.estimated_processing_time = self._estimate_processing_time(parsed_data, options)
+            if options.plan_batches:
+                result.import_plan = self.plan_import(parsed_data, options, parse_seconds)
             
             # Step 7: Mark preview as successful if no critical errors
             critical_errors = [e for e in result.validation_results 
@@ -1127,6 +1258,26 @@ class ImportExportService:
             logger.error(f"Error building preview foreign key mappings: {e}")
             return {}
     
+    def plan_import(self, data: Dict[str, List[Dict[str, Any]]], options: ImportOptions,
+                    parse_seconds: float = 0.0) -> Optional[ImportPlan]:
+        """
+        Plan an import from a sample of its parsed data, without writing to the database.
+        
+        Args:
+            data: Parsed import data
+            options: Import options
+            parse_seconds: Time it took to parse the file
+            
+        Returns:
+            ImportPlan with measured batch sizes, runtime, peak memory and
+            conflict counts, or None if planning failed
+        """
+        try:
+            return ImportPlanner(self).plan(data, options, parse_seconds)
+        except Exception as e:
+            logger.warning(f"Could not plan import: {e}")
+            return None
+    
     def _estimate_total_records(self, file_path: str, file_format: FileFormat) -> int:
         """Estimate total number of records in the file for progress tracking."""
         try:
@@ -1236,7 +1387,7 @@ class ImportExportService:
         # Start comprehensive error tracking
         total_records = self._estimate_total_records(file_path, file_format)
         comprehensive_report = self.error_reporting_service.start_error_tracking(
-            operation_id, "import", total_records
+            operation_id, "import", total_records, sample_errors=options.sample_errors
         )
         
         audit_record = self.audit_manager.start_operation(
@@ -1312,7 +1463,9 @@ class ImportExportService:
             
             # Step 2: Parse file data based on format
             logger.debug(f"Parsing {file_format.value} file: {file_path}")
+            parse_start = time.time()
             parsed_data = self._parse_import_file(file_path, file_format, options)
+            parse_seconds = time.time() - parse_start
             
             if not parsed_data:
                 # Track file-level error in comprehensive reporting
@@ -1418,9 +1571,18 @@ class ImportExportService:
             if dependency_errors:
                 result.warnings.extend(dependency_errors)  # Treat as warnings since comprehensive validation already ran
             
+            # Batch sizes from a dry-run plan, measured now unless the caller has one
+            if options.plan_batches and options.import_plan is None:
+                import_plan = self.plan_import(parsed_data, options, parse_seconds)
+                if import_plan is not None:
+                    options = replace(options, import_plan=import_plan)
+            
             # Step 5: Create transaction context for import operation
             logger.debug(f"Creating transaction context for operation {operation_id}")
-            transaction_context = self.create_transaction_context(operation_id)
+            # Validation-only runs stay in one transaction so all of it can be rolled back
+            transaction_context = self.create_transaction_context(
+                operation_id, None if options.validate_only else self._commit_interval(options)
+            )
             
             try:
                 # Step 6: Process data in dependency order with batch processing and conflict resolution
@@ -1696,6 +1858,11 @@ class ImportExportService:
             
             # Validate foreign key references
             reference_map = self.foreign_key_resolver.build_reference_map(data)
+            self.foreign_key_resolver.preload_existing_entities(
+                self.foreign_key_resolver.get_referenced_entity_types(
+                    [entity_type for entity_type in data if entity_type in options.entity_types]
+                )
+            )
             
             for entity_type, records in data.items():
                 if entity_type in options.entity_types:
@@ -1747,6 +1914,14 @@ class ImportExportService:
             # Track created mappings for foreign key resolution
             created_mappings: Dict[str, Dict[str, int]] = {}
             
+            # Existing records are indexed afresh for every import
+            self._existing_record_indexes.clear()
+            self.foreign_key_resolver.preload_existing_entities(
+                self.foreign_key_resolver.get_referenced_entity_types(entity_types_to_process)
+            )
+            self._progress = [0, sum(len(data[entity_type]) for entity_type in entity_types_to_process)]
+            self._progress_reported = 0
+            
             # Process each entity type in dependency order
             for entity_type in entity_types_to_process:
                 records = data[entity_type]
@@ -1775,6 +1950,7 @@ class ImportExportService:
                 # Update record counts for skipped records
                 skipped_count = len(records) - len(resolved_records)
                 result.records_skipped[entity_type] += skipped_count
+                self._report_progress(skipped_count)
                 
                 if conflict_errors:
                     logger.error(f"Conflict resolution failed for {entity_type}: {len(conflict_errors)} errors")
@@ -1808,6 +1984,29 @@ class ImportExportService:
                 error_type=ImportErrorType.BUSINESS_RULE_VIOLATION
             ))
             return False
+        
+        finally:
+            # Batches may have been written even if a later one failed
+            bump_data_generation("import")
+    
+    def _report_progress(self, records_done: int = 0) -> None:
+        """
+        Count processed records and tell the progress callback, if any.
+        
+        While batches are pending in an open transaction the report waits for
+        their commit: the callback's writes would join the import transaction,
+        unseen by other connections and undone by a rollback.
+        """
+        self._progress[0] += records_done
+        if any(context.connection is not None for context in self._transaction_contexts.values()):
+            return
+        if self.progress_callback and self._progress[0] > self._progress_reported:
+            self._progress_reported = self._progress[0]
+            try:
+                self.progress_callback(*self._progress)
+            except Exception as e:
+                # Progress reporting must never fail the import
+                logger.warning(f"Progress callback failed: {e}")
     
     def _process_entity_batches(self, entity_type: str, records: List[Dict[str, Any]], 
                               options: ImportOptions, created_mappings: Dict[str, Dict[str, int]],
@@ -1826,7 +2025,8 @@ class ImportExportService:
             True if all batches processed successfully, False otherwise
         """
         try:
-            batch_size = options.batch_size
+            batch_size = (options.import_plan.batch_size_for(entity_type, options.batch_size)
+                          if options.import_plan else options.batch_size)
             total_records = len(records)
             
             logger.debug(f"Processing {total_records} {entity_type} records in batches of {batch_size}")
@@ -1843,20 +2043,41 @@ class ImportExportService:
                 logger.debug(f"Processing batch {batch_start//batch_size + 1} "
                            f"({batch_start+1}-{batch_end} of {total_records}) for {entity_type}")
                 
-                # Process this batch
-                batch_result = self._process_record_batch(
-                    entity_type, batch_records, options, created_mappings, operation_id
-                )
+                # Process this batch, in a savepoint of the operation's transaction if there is one
+                context = self._transaction_contexts.get(operation_id) if operation_id else None
+                in_savepoint = context is not None and context.is_active
+                if in_savepoint:
+                    mappings_before = dict(created_mappings[entity_type])
+                    batch_result = self._run_batch_in_savepoint(context, lambda: self._process_record_batch(
+                        entity_type, batch_records, options, created_mappings, operation_id
+                    ))
+                else:
+                    batch_result = self._process_record_batch(
+                        entity_type, batch_records, options, created_mappings, operation_id
+                    )
                 
-                # Update result counters
-                result.records_processed[entity_type] += batch_result.processed_count
-                result.records_created[entity_type] += batch_result.created_count
-                result.records_updated[entity_type] += batch_result.updated_count
-                result.records_skipped[entity_type] += batch_result.skipped_count
+                if in_savepoint and not batch_result.success:
+                    # Rolled back on its own: none of its records are imported, the run goes on
+                    self._forget_rolled_back_batch(entity_type, batch_result, created_mappings, mappings_before)
+                    result.records_skipped[entity_type] += len(batch_records)
+                    batch_result.warnings.append(ImportExportValidationError(
+                        field="batch_processing",
+                        message=f"Batch {batch_start//batch_size + 1} ({batch_start+1}-{batch_end}) "
+                                f"rolled back, {len(batch_records)} records not imported",
+                        error_type=ImportErrorType.BUSINESS_RULE_VIOLATION,
+                        entity_type=entity_type
+                    ))
+                else:
+                    # Update result counters
+                    result.records_processed[entity_type] += batch_result.processed_count
+                    result.records_created[entity_type] += batch_result.created_count
+                    result.records_updated[entity_type] += batch_result.updated_count
+                    result.records_skipped[entity_type] += batch_result.skipped_count
                 
                 # Collect errors and warnings
                 result.errors.extend(batch_result.errors)
                 result.warnings.extend(batch_result.warnings)
+                self._report_progress(len(batch_records))
                 
                 # Check if we should stop due to too many errors
                 if len(result.errors) >= options.max_errors:
@@ -1869,8 +2090,8 @@ class ImportExportService:
                     ))
                     return False
                 
-                # If batch failed completely, stop processing
-                if not batch_result.success:
+                # If batch failed completely and could not be rolled back alone, stop processing
+                if not batch_result.success and not in_savepoint:
                     logger.error(f"Batch processing failed for {entity_type}")
                     return False
             
@@ -1886,12 +2107,38 @@ class ImportExportService:
             ))
             return False
     
+    def _forget_rolled_back_batch(self, entity_type: str, batch_result: BatchResult,
+                                  created_mappings: Dict[str, Dict[str, int]],
+                                  mappings_before: Dict[str, int]) -> None:
+        """Drop what a rolled back batch left in the in-memory indexes and ID mappings"""
+        created_mappings[entity_type] = mappings_before
+        self._existing_record_indexes.pop(entity_type, None)
+        self.foreign_key_resolver.reload_entity(entity_type)
+        logger.warning(f"Rolled back batch of {entity_type}, "
+                       f"{batch_result.created_count} created records discarded")
+    
+    def _commit_interval(self, options: ImportOptions) -> int:
+        """Batches per commit: the import's own setting, else the configured one"""
+        if options.commit_interval is not None:
+            return options.commit_interval
+        try:
+            from ..config import get_settings
+            return get_settings().performance.import_commit_interval
+        except ImportError:
+            logger.warning("Configuration not available, using default import commit interval")
+            return 10
+    
     def _process_record_batch(self, entity_type: str, records: List[Dict[str, Any]], 
                             options: ImportOptions, created_mappings: Dict[str, Dict[str, int]],
                             operation_id: Optional[str] = None) -> BatchResult:
         """
         Process a single batch of records for an entity type.
         
+        New records are collected and inserted together by _flush_pending_creates;
+        records matching existing data go through _process_single_record. A record
+        that refers to, or collides with, a pending one flushes the pending records
+        first so it sees them as it would with per-record processing.
+        
         Args:
             entity_type: Type of entity being processed
             records: List of records in this batch
@@ -1902,21 +2149,37 @@ class ImportExportService:
             BatchResult with processing statistics and errors
         """
         batch_result = BatchResult(success=True)
+        pending: List[PendingCreate] = []
         
         try:
             logger.debug(f"Processing batch of {len(records)} {entity_type} records")
             
+            service = self._get_service_for_entity(entity_type) if options.bulk_insert else None
+            self_references = [
+                fk_mapping.source_field
+                for fk_mapping in self.dependency_resolver.get_foreign_key_mappings(entity_type)
+                if fk_mapping.target_entity == entity_type
+            ]
+            
             for record_index, record in enumerate(records):
+                # Calculate line number for error reporting (record_index is 0-based)
+                line_number = record_index + 1
+                
                 try:
+                    # Parents still waiting for their insert must have an id first
+                    if pending and any(
+                        str(record[source_field]) in {p.mapping_key for p in pending}
+                        for source_field in self_references if record.get(source_field) is not None
+                    ):
+                        self._flush_pending_creates(
+                            entity_type, service, pending, options, created_mappings, batch_result, operation_id
+                        )
+                    
                     # Resolve foreign key references
                     resolved_record = self.foreign_key_resolver.resolve_foreign_keys(
                         entity_type, record, created_mappings
                     )
                     
-                    # Process the record based on conflict resolution strategy
-                    # Calculate line number for error reporting (record_index is 0-based)
-                    line_number = record_index + 1
-                    
                     # Validate record before processing and track line-level errors
                     record_errors = self.validation_framework.validate_record(
                         entity_type, resolved_record, line_number
@@ -1940,58 +2203,42 @@ class ImportExportService:
                             batch_result.skipped_count += 1
                             continue
                     
+                    if service is not None:
+                        # Duplicates of a pending record are conflicts, not new records
+                        unique_keys = self._unique_keys(entity_type, resolved_record)
+                        if any(unique_keys & p.unique_keys for p in pending):
+                            self._flush_pending_creates(
+                                entity_type, service, pending, options, created_mappings, batch_result, operation_id
+                            )
+                        
+                        model = self._prepare_bulk_create(entity_type, resolved_record, service)
+                        if model is not None:
+                            pending.append(PendingCreate(
+                                line_number=line_number,
+                                record=record,
+                                resolved_record=resolved_record,
+                                model=model,
+                                unique_keys=unique_keys
+                            ))
+                            continue
+                    
                     processing_result = self._process_single_record(
                         entity_type, resolved_record, options, created_mappings,
                         operation_id, line_number
                     )
-                    
-                    # Update batch statistics
-                    batch_result.processed_count += 1
-                    
-                    if processing_result['action'] == 'created':
-                        batch_result.created_count += 1
-                        batch_result.created_ids.append(processing_result['id'])
-                        
-                        # Track mapping for foreign key resolution
-                        if 'temp_id' in record:
-                            created_mappings[entity_type][str(record['temp_id'])] = processing_result['id']
-                        elif 'id' in record:
-                            created_mappings[entity_type][str(record['id'])] = processing_result['id']
-                    
-                    elif processing_result['action'] == 'updated':
-                        batch_result.updated_count += 1
-                    
-                    elif processing_result['action'] == 'skipped':
-                        batch_result.skipped_count += 1
+                    self._count_processing_result(
+                        entity_type, record, processing_result, created_mappings, batch_result
+                    )
                 
                 except Exception as record_error:
-                    line_number = record_index + 1
-                    logger.error(f"Error processing record {line_number} in {entity_type}: {record_error}")
-                    
-                    # Track system error in comprehensive reporting
-                    if operation_id:
-                        self.error_reporting_service.track_system_error(
-                            operation_id, record_error, 
-                            context={
-                                'entity_type': entity_type,
-                                'line_number': line_number,
-                                'record_data': record
-                            }
-                        )
-                    
-                    batch_result.errors.append(ImportExportValidationError(
-                        field="record_processing",
-                        message=f"Failed to process record: {str(record_error)}",
-                        error_type=ImportErrorType.BUSINESS_RULE_VIOLATION,
-                        entity_type=entity_type,
-                        line_number=line_number
-                    ))
-                    
-                    # Continue processing other records unless it's a critical error
-                    if len(batch_result.errors) >= 10:  # Limit errors per batch
-                        logger.warning("Too many errors in batch, stopping batch processing")
-                        batch_result.success = False
+                    if not self._track_record_error(
+                        entity_type, record, line_number, record_error, batch_result, operation_id
+                    ):
                         break
+            
+            self._flush_pending_creates(
+                entity_type, service, pending, options, created_mappings, batch_result, operation_id
+            )
         
         except Exception as e:
             logger.error(f"Critical error in batch processing: {e}")
@@ -2005,6 +2252,184 @@ class ImportExportService:
         
         return batch_result
     
+    def _count_processing_result(self, entity_type: str, record: Dict[str, Any],
+                                 processing_result: Dict[str, Any],
+                                 created_mappings: Dict[str, Dict[str, int]],
+                                 batch_result: BatchResult) -> None:
+        """Add one processed record to the batch statistics and ID mappings"""
+        batch_result.processed_count += 1
+        
+        if processing_result['action'] == 'created':
+            batch_result.created_count += 1
+            batch_result.created_ids.append(processing_result['id'])
+            self.foreign_key_resolver.register_existing_entity(entity_type, processing_result['id'], record)
+            
+            # Track mapping for foreign key resolution
+            if 'temp_id' in record:
+                created_mappings[entity_type][str(record['temp_id'])] = processing_result['id']
+            elif 'id' in record:
+                created_mappings[entity_type][str(record['id'])] = processing_result['id']
+        
+        elif processing_result['action'] == 'updated':
+            batch_result.updated_count += 1
+        
+        elif processing_result['action'] == 'skipped':
+            batch_result.skipped_count += 1
+    
+    def _track_record_error(self, entity_type: str, record: Dict[str, Any], line_number: int,
+                            record_error: Exception, batch_result: BatchResult,
+                            operation_id: Optional[str] = None) -> bool:
+        """
+        Record a failed record in the batch result.
+        
+        Returns:
+            False once the batch has too many errors to continue
+        """
+        logger.error(f"Error processing record {line_number} in {entity_type}: {record_error}")
+        
+        # Track system error in comprehensive reporting
+        if operation_id:
+            self.error_reporting_service.track_system_error(
+                operation_id, record_error, 
+                context={
+                    'entity_type': entity_type,
+                    'line_number': line_number,
+                    'record_data': record
+                }
+            )
+        
+        batch_result.errors.append(ImportExportValidationError(
+            field="record_processing",
+            message=f"Failed to process record: {str(record_error)}",
+            error_type=ImportErrorType.BUSINESS_RULE_VIOLATION,
+            entity_type=entity_type,
+            line_number=line_number
+        ))
+        
+        # Continue processing other records unless it's a critical error
+        if len(batch_result.errors) >= 10:  # Limit errors per batch
+            logger.warning("Too many errors in batch, stopping batch processing")
+            batch_result.success = False
+            return False
+        return True
+    
+    def _unique_keys(self, entity_type: str, record: Dict[str, Any]) -> set:
+        """Values of the record's unique constraints, as used by _find_existing_record"""
+        keys = set()
+        for constraint_fields in get_entity_mapping(entity_type).unique_constraints:
+            values = tuple(record.get(field_name) for field_name in constraint_fields)
+            if all(value is not None for value in values):
+                keys.add((tuple(constraint_fields), values))
+        return keys
+    
+    def _prepare_bulk_create(self, entity_type: str, record: Dict[str, Any], service) -> Optional[Any]:
+        """
+        Build and validate the model for a new record as service.create would.
+        
+        Returns:
+            The model ready for insertion, or None when the record needs the
+            per-record path (it matches an existing record or fails validation,
+            which _process_single_record then reports)
+        """
+        try:
+            model = self._convert_dict_to_model(entity_type, record)
+            if self._find_existing_record(entity_type, record, service):
+                return None
+            
+            model.id = None
+            if entity_type == "assignments":
+                if getattr(model, 'version', None) is None:
+                    model.version = 1
+                if getattr(model, 'is_current', None) is None:
+                    model.is_current = True
+            
+            model.set_audit_fields(is_update=False)
+            errors = model.validate()
+            if any(error.level != error.__WARNING_LEVEL__ for error in errors):
+                return None
+            service._validate_for_create(model)
+            return model
+        
+        except Exception as e:
+            logger.debug(f"{entity_type} record left to per-record processing: {e}")
+            return None
+    
+    def _flush_pending_creates(self, entity_type: str, service, pending: List[PendingCreate],
+                               options: ImportOptions, created_mappings: Dict[str, Dict[str, int]],
+                               batch_result: BatchResult, operation_id: Optional[str] = None) -> None:
+        """
+        Insert the pending new records of a batch in one writer transaction.
+        
+        The rows go in with a single executemany and their ids are read back in
+        one query. If the bulk insert fails it is rolled back and every pending
+        record is processed on its own, so only the offending rows fail.
+        """
+        if not pending:
+            return
+        
+        rows = list(pending)
+        pending.clear()
+        
+        try:
+            with service.db_manager.get_connection() as conn:
+                nested = conn.in_transaction
+                conn.execute("SAVEPOINT bulk_insert" if nested else "BEGIN IMMEDIATE")
+                try:
+                    service._insert_many(conn, [row.model for row in rows])
+                except Exception:
+                    if nested:
+                        conn.execute("ROLLBACK TO bulk_insert")
+                        conn.execute("RELEASE bulk_insert")
+                    else:
+                        conn.rollback()
+                    raise
+                if nested:
+                    conn.execute("RELEASE bulk_insert")
+                else:
+                    conn.commit()
+            service._after_write()
+        
+        except Exception as e:
+            logger.warning(f"Bulk insert of {len(rows)} {entity_type} records failed, "
+                           f"processing them one by one: {e}")
+            for row in rows:
+                try:
+                    processing_result = self._process_single_record(
+                        entity_type, row.resolved_record, options, created_mappings,
+                        operation_id, row.line_number
+                    )
+                    self._count_processing_result(
+                        entity_type, row.record, processing_result, created_mappings, batch_result
+                    )
+                except Exception as record_error:
+                    if not self._track_record_error(
+                        entity_type, row.record, row.line_number, record_error, batch_result, operation_id
+                    ):
+                        break
+            return
+        
+        logger.debug(f"Bulk inserted {len(rows)} {entity_type} records")
+        for row in rows:
+            self._index_record(entity_type, row.model)
+            
+            # Track data change for audit trail
+            if operation_id:
+                self.audit_manager.track_data_change(
+                    operation_id=operation_id,
+                    entity_type=entity_type,
+                    change_type=ChangeType.CREATE,
+                    entity_id=row.model.id,
+                    new_values=row.model.__dict__,
+                    line_number=row.line_number
+                )
+            
+            self._count_processing_result(entity_type, row.record, {
+                'action': 'created',
+                'id': row.model.id,
+                'entity_type': entity_type,
+                'version': getattr(row.model, 'version', None)
+            }, created_mappings, batch_result)
+
     def _get_service_for_entity(self, entity_type: str):
         """
         Get the appropriate service instance for an entity type.
@@ -2107,6 +2532,9 @@ class ImportExportService:
         """
         Find existing record based on unique constraints.
         
+        Uses the import's ExistingRecordIndex for the entity type, loaded with
+        one service.get_all() on first use.
+        
         Args:
             entity_type: Type of entity
             record: Record data to check
@@ -2116,40 +2544,28 @@ class ImportExportService:
             Existing model instance if found, None otherwise
         """
         try:
-            from ..models.entity_mappings import get_entity_mapping
-            mapping = get_entity_mapping(entity_type)
+            index = self._existing_record_indexes.get(entity_type)
+            if index is None:
+                index = ExistingRecordIndex.for_entity(entity_type, service.get_all())
+                self._existing_record_indexes[entity_type] = index
+                logger.debug(f"Indexed {len(index)} existing {entity_type} records")
             
-            # Check unique constraints to find existing records
-            for constraint_fields in mapping.unique_constraints:
-                constraint_values = {}
-                has_all_fields = True
-                
-                for field_name in constraint_fields:
-                    if field_name in record and record[field_name] is not None:
-                        constraint_values[field_name] = record[field_name]
-                    else:
-                        has_all_fields = False
-                        break
-                
-                if has_all_fields and constraint_values:
-                    # Try to find existing record using this constraint
-                    # This is a simplified approach - in production, you'd have specific search methods
-                    all_records = service.get_all()
-                    for existing_record in all_records:
-                        match = True
-                        for field_name, value in constraint_values.items():
-                            if getattr(existing_record, field_name, None) != value:
-                                match = False
-                                break
-                        if match:
-                            return existing_record
-            
-            return None
+            return index.find_first(record, get_entity_mapping(entity_type).unique_constraints)
         
         except Exception as e:
             logger.error(f"Error finding existing record for {entity_type}: {e}")
             return None
     
+    def _index_record(self, entity_type: str, record: Any, replaces: Optional[Any] = None) -> None:
+        """Keep the existing-record index in step with a row this import wrote"""
+        index = self._existing_record_indexes.get(entity_type)
+        if index is None:
+            return
+        if replaces is not None:
+            index.replace(replaces, record)
+        else:
+            index.add(record)
+    
     def _process_single_record(self, entity_type: str, record: Dict[str, Any], 
                              options: ImportOptions, created_mappings: Dict[str, Dict[str, int]],
                              operation_id: Optional[str] = None, line_number: Optional[int] = None) -> Dict[str, Any]:
@@ -2225,6 +2641,7 @@ class ImportExportService:
                     # Update the existing record with new data
                     model.id = existing_record.id
                     updated_record = service.update(model)
+                    self._index_record(entity_type, updated_record, replaces=existing_record)
                     
                     # Track data change for audit trail
                     if operation_id:
@@ -2262,6 +2679,7 @@ class ImportExportService:
                         model.id = None  # Ensure new record is created
                         
                         created_record = service.create(model)
+                        self._index_record(entity_type, created_record)
                         
                         # Track data change for audit trail
                         if operation_id:
@@ -2290,6 +2708,7 @@ class ImportExportService:
                         
                         model.id = existing_record.id
                         updated_record = service.update(model)
+                        self._index_record(entity_type, updated_record, replaces=existing_record)
                         
                         # Track data change for audit trail
                         if operation_id:
@@ -2324,6 +2743,7 @@ class ImportExportService:
                         model.is_current = True
                 
                 created_record = service.create(model)
+                self._index_record(entity_type, created_record)
                 
                 # Track data change for audit trail
                 if operation_id:
@@ -2937,6 +3357,7 @@ class ImportExportService:
         - JSON export with structured data format
         - Dependency-aware export ordering
         - Comprehensive metadata inclusion
+        - Records written as they are read, in constant memory
         
         Args:
             options: Export configuration options
@@ -2958,39 +3379,21 @@ class ImportExportService:
             # Create transaction context
             transaction_context = self.create_transaction_context(operation_id)
             
-            # Collect data for export
-            export_data = {}
-            
-            # Process entities in dependency order
-            ordered_entities = self.dependency_resolver.get_processing_order(options.entity_types)
-            
-            for entity_type in ordered_entities:
-                logger.debug(f"Collecting {entity_type} data for JSON export")
-                
-                # Get service for entity type
-                service = self._get_service_for_entity(entity_type)
-                if not service:
-                    logger.warning(f"No service found for entity type: {entity_type}")
-                    continue
-                
-                # Collect records
-                records = self._collect_export_records(entity_type, service, options)
-                export_data[entity_type] = records
-                result.records_exported[entity_type] = len(records)
-            
-            # Generate JSON file using JSONProcessor
-            json_processor = JSONProcessor()
-            
             # Prepare output path
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{options.file_prefix}_{timestamp}.json"
-            output_path = os.path.join(options.output_directory or "exports", filename)
+            json_file_path = os.path.join(options.output_directory or "exports", filename)
             
             # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
             
-            # Generate JSON file
-            json_file_path = json_processor.generate_json_file(export_data, output_path)
+            # Write records to the file as they are read from the database
+            json_processor = JSONProcessor(options)
+            chunks = json_processor.iter_json_chunks(
+                self._iter_export_entities(options), options.include_metadata, result.records_exported
+            )
+            with open(json_file_path, 'w', encoding=json_processor.encoding) as jsonfile:
+                jsonfile.writelines(chunks)
             
             # Calculate file size
             file_size = os.path.getsize(json_file_path)
@@ -3047,6 +3450,7 @@ class ImportExportService:
         - CSV export with separate files per entity type
         - Dependency-aware export ordering
         - Proper CSV formatting and encoding
+        - Records written as they are read, in constant memory
         
         Args:
             options: Export configuration options
@@ -3068,36 +3472,21 @@ class ImportExportService:
             # Create transaction context
             transaction_context = self.create_transaction_context(operation_id)
             
-            # Collect data for export
-            export_data = {}
-            
-            # Process entities in dependency order
-            ordered_entities = self.dependency_resolver.get_processing_order(options.entity_types)
-            
-            for entity_type in ordered_entities:
-                logger.debug(f"Collecting {entity_type} data for CSV export")
-                
-                # Get service for entity type
-                service = self._get_service_for_entity(entity_type)
-                if not service:
-                    logger.warning(f"No service found for entity type: {entity_type}")
-                    continue
-                
-                # Collect records
-                records = self._collect_export_records(entity_type, service, options)
-                export_data[entity_type] = records
-                result.records_exported[entity_type] = len(records)
-            
-            # Generate CSV files using CSVProcessor
-            csv_processor = CSVProcessor()
-            
             # Prepare output directory
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_dir = os.path.join(options.output_directory or "exports", f"csv_export_{timestamp}")
             os.makedirs(output_dir, exist_ok=True)
             
-            # Generate CSV files (one per entity type)
-            csv_files = csv_processor.generate_csv_files(export_data, output_dir)
+            # Write one file per entity type as records are read from the database
+            csv_processor = CSVProcessor(options)
+            csv_files = []
+            for entity_type, records in self._iter_export_entities(options):
+                file_path = os.path.join(output_dir, get_entity_mapping(entity_type).csv_filename)
+                with open(file_path, 'w', encoding=csv_processor.encoding, newline='') as csvfile:
+                    csvfile.writelines(
+                        csv_processor.iter_csv_chunks(records, entity_type, result.records_exported)
+                    )
+                csv_files.append(file_path)
             
             # Calculate file sizes
             file_sizes = {}
@@ -3188,74 +3577,163 @@ class ImportExportService:
             entity_type: Type of entity to collect
             service: Service instance for the entity
             options: Export options
-            
+        
         Returns:
             List of records for export
         """
         try:
-            # Get all records from service
-            if hasattr(service, 'get_all'):
-                records = service.get_all()
-            elif hasattr(service, 'list_all'):
-                records = service.list_all()
-            else:
-                logger.warning(f"Service for {entity_type} does not have get_all or list_all method")
-                return []
-            
-            # Convert to dictionaries if needed
-            export_records = []
-            for record in records:
-                if hasattr(record, '__dict__'):
-                    # Convert dataclass or object to dict
-                    record_dict = record.__dict__.copy()
-                elif isinstance(record, dict):
-                    record_dict = record.copy()
-                else:
-                    logger.warning(f"Unknown record type for {entity_type}: {type(record)}")
-                    continue
-                
-                # Apply date range filter if specified
-                if options.date_range and entity_type == 'assignments':
-                    # Filter assignments by date range
-                    valid_from = record_dict.get('valid_from')
-                    valid_to = record_dict.get('valid_to')
-                    
-                    if valid_from:
-                        if isinstance(valid_from, str):
-                            valid_from = date.fromisoformat(valid_from)
-                        
-                        # Check if assignment overlaps with date range
-                        start_date, end_date = options.date_range
-                        if valid_to:
-                            if isinstance(valid_to, str):
-                                valid_to = date.fromisoformat(valid_to)
-                            # Assignment has end date - check overlap
-                            if valid_to < start_date or valid_from > end_date:
-                                continue
-                        else:
-                            # Assignment is current - check if it started before end date
-                            if valid_from > end_date:
-                                continue
-                
-                # Include historical data filter
-                if not options.include_historical and entity_type == 'assignments':
-                    # Only include current assignments
-                    if not record_dict.get('is_current', False):
-                        continue
-                
-                # Convert dates to strings for serialization
-                for key, value in record_dict.items():
-                    if isinstance(value, (date, datetime)):
-                        record_dict[key] = value.isoformat()
-                    elif value is None and not options.include_empty_fields:
-                        # Remove empty fields if not including them
-                        continue
-                
-                export_records.append(record_dict)
-            
+            export_records = list(self._iter_export_records(entity_type, service, options))
             logger.debug(f"Collected {len(export_records)} records for {entity_type}")
             return export_records
         
         except Exception as e:
             logger.error(f"Error collecting records for {entity_type}: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def _iter_export_entities(self, options: ExportOptions) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """
+        Yield (entity_type, records) pairs for an export in dependency order.
+        
+        Records are read lazily: the cursor of an entity type is only opened
+        when its records are iterated.
+        """
+        for entity_type in self.dependency_resolver.get_processing_order(options.entity_types):
+            service = self._get_service_for_entity(entity_type)
+            if not service:
+                logger.warning(f"No service found for entity type: {entity_type}")
+                continue
+            
+            logger.debug(f"Streaming {entity_type} data for export")
+            yield entity_type, self._iter_export_records(entity_type, service, options)
+    
+    def _iter_export_records(self, entity_type: str, service, options: ExportOptions) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the export records of an entity type, reading the table
+        through a database cursor.
+        
+        Args:
+            entity_type: Type of entity to export
+            service: Service instance for the entity
+            options: Export options
+        
+        Yields:
+            Filtered records ready for serialization
+        """
+        for record in service.iter_all():
+            record_dict = self._export_record_dict(entity_type, record, options)
+            if record_dict is not None:
+                yield record_dict
+    
+    def _export_record_dict(self, entity_type: str, record: Any,
+                            options: ExportOptions) -> Optional[Dict[str, Any]]:
+        """Convert a model to an export record, or None if the export filters exclude it"""
+        if hasattr(record, '__dict__'):
+            # Convert dataclass or object to dict
+            record_dict = record.__dict__.copy()
+        elif isinstance(record, dict):
+            record_dict = record.copy()
+        else:
+            logger.warning(f"Unknown record type for {entity_type}: {type(record)}")
+            return None
+        
+        # Apply date range filter if specified
+        if options.date_range and entity_type == 'assignments':
+            # Filter assignments by date range
+            valid_from = record_dict.get('valid_from')
+            valid_to = record_dict.get('valid_to')
+            
+            if valid_from:
+                if isinstance(valid_from, str):
+                    valid_from = date.fromisoformat(valid_from)
+                
+                # Check if assignment overlaps with date range
+                start_date, end_date = options.date_range
+                if valid_to:
+                    if isinstance(valid_to, str):
+                        valid_to = date.fromisoformat(valid_to)
+                    # Assignment has end date - check overlap
+                    if valid_to < start_date or valid_from > end_date:
+                        return None
+                else:
+                    # Assignment is current - check if it started before end date
+                    if valid_from > end_date:
+                        return None
+        
+        # Include historical data filter
+        if not options.include_historical and entity_type == 'assignments':
+            # Only include current assignments
+            if not record_dict.get('is_current', False):
+                return None
+        
+        # Convert dates to strings for serialization
+        for key, value in record_dict.items():
+            if isinstance(value, (date, datetime)):
+                record_dict[key] = value.isoformat()
+        
+        return record_dict
+    
+    def stream_export(self, export_format: FileFormat, options: ExportOptions) -> ExportStream:
+        """
+        Generate an export as a stream of byte chunks for a direct download.
+        
+        Nothing is staged on disk: records go from a database cursor through
+        the format writer to the returned iterator. JSON exports are a single
+        document; CSV exports are a single file for one entity type and a zip
+        archive with one file per entity type otherwise.
+        
+        Each stream holds a read connection until it is consumed, so only
+        EXPORT_STREAM_LIMIT of them can be in progress at once.
+        
+        Args:
+            export_format: Format for export (CSV or JSON)
+            options: Export configuration options
+        
+        Returns:
+            ExportStream with the download file name, media type and chunks
+        
+        Raises:
+            DatabaseBusyError: If the limit of streams in progress is reached
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        entities = self._iter_export_entities(options)
+        
+        if export_format == FileFormat.JSON:
+            json_processor = JSONProcessor(options)
+            chunks = encode_chunks(
+                json_processor.iter_json_chunks(entities, options.include_metadata), json_processor.encoding
+            )
+            return ExportStream(f"{options.file_prefix}_{timestamp}.json", "application/json",
+                                self._logged_export_chunks(chunks))
+        
+        csv_processor = CSVProcessor(options)
+        if len(options.entity_types) == 1:
+            entity_type = options.entity_types[0]
+            service = self._get_service_for_entity(entity_type)
+            if not service:
+                # Skipped like in a multi-entity export: the file has no records
+                logger.warning(f"No service found for entity type: {entity_type}")
+            records = self._iter_export_records(entity_type, service, options) if service else iter(())
+            chunks = encode_chunks(csv_processor.iter_csv_chunks(records, entity_type), csv_processor.encoding)
+            return ExportStream(f"{options.file_prefix}_{get_entity_mapping(entity_type).csv_filename}",
+                                f"text/csv; charset={csv_processor.encoding}",
+                                self._logged_export_chunks(chunks))
+        
+        members = (
+            (get_entity_mapping(entity_type).csv_filename,
+             encode_chunks(csv_processor.iter_csv_chunks(records, entity_type), csv_processor.encoding))
+            for entity_type, records in entities
+        )
+        return ExportStream(f"{options.file_prefix}_{timestamp}.zip", "application/zip",
+                            self._logged_export_chunks(zip_chunks(members)))
+    
+    def _logged_export_chunks(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass chunks through in a stream slot, logging a failure that cuts a download short"""
+        return get_export_stream_limiter().guard(self._log_export_failure(chunks))
+    
+    @staticmethod
+    def _log_export_failure(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        try:
+            yield from chunks
+        except Exception as e:
+            logger.error(f"Streaming export failed: {e}")
+            raise
@@ -0,0 +1,297 @@
+"""
+Background jobs for import/export operations
+
+Imports and exports run on a bounded thread pool in the worker process that
+accepted the request. Their status, progress and results are kept in the
+import_export_jobs table next to the audit trail, so any worker can answer a
+status request and the history survives restarts.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from ..database import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Job statuses, as shown by the status endpoints
+JOB_QUEUED = "queued"
+JOB_PROCESSING = "processing"
+JOB_COMPLETED = "completed"
+JOB_COMPLETED_WITH_ERRORS = "completed_with_errors"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_PROCESSING)
+
+# Fields stored in their own columns, everything else goes in `details`
+_COLUMNS = ('operation_type', 'status', 'progress', 'message')
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this id is still running"""
+    if os.name == 'nt':
+        # Signal 0 is CTRL_C_EVENT on Windows, only the current process can be checked
+        return pid == os.getpid()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ImportExportJobStore:
+    """Import/export job state in the import_export_jobs table"""
+
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager or get_db_manager()
+        self._ensure_jobs_table()
+
+    def _ensure_jobs_table(self):
+        """Ensure the jobs table exists in the database."""
+        create_jobs_table = """
+        CREATE TABLE IF NOT EXISTS import_export_jobs (
+            operation_id TEXT PRIMARY KEY,
+            operation_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            details TEXT NOT NULL DEFAULT '{}',  -- JSON object
+            worker_pid INTEGER,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+
+        try:
+            with self.db_manager.get_connection() as conn:
+                conn.execute(create_jobs_table)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_import_export_jobs_status ON import_export_jobs (status)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_import_export_jobs_created_at ON import_export_jobs (created_at)")
+                conn.commit()
+
+        except Exception as e:
+            raise Exception(f"Failed to create import/export jobs table: {e}")
+
+    def _write(self, query: str, params: tuple) -> int:
+        """
+        Run a statement on the writer, returning the number of changed rows.
+
+        Job details hold free text such as error messages, so they are bound
+        directly like the audit trail's JSON columns instead of going through
+        the parameter checks of execute_query.
+        """
+        with self.db_manager.get_connection() as conn:
+            was_in_transaction = conn.in_transaction
+            rowcount = conn.execute(query, params).rowcount
+            if not was_in_transaction:
+                conn.commit()
+            return rowcount
+
+    @staticmethod
+    def _row_to_job(row) -> Dict[str, Any]:
+        job = json.loads(row['details'])
+        job.update({column: row[column] for column in _COLUMNS})
+        return job
+
+    def create(self, operation_id: str, operation_type: str, **fields) -> Dict[str, Any]:
+        """Record a new job; `fields` may set status, progress, message and any detail"""
+        now = datetime.now().isoformat()
+        job = {'status': JOB_QUEUED, 'progress': 0, 'message': "", **fields, 'operation_type': operation_type}
+        details = {key: value for key, value in job.items() if key not in _COLUMNS}
+
+        self._write(
+            """
+            INSERT INTO import_export_jobs
+                (operation_id, operation_type, status, progress, message, details, worker_pid, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (operation_id, operation_type, job['status'], job['progress'], job['message'],
+             json.dumps(details, default=str), os.getpid(), now, now)
+        )
+        return job
+
+    def update(self, operation_id: str, **fields) -> None:
+        """Change some fields of a job, keeping the others"""
+        with self.db_manager.get_connection() as conn:
+            # The writer is held for the read and the write, so concurrent updates do not lose fields
+            was_in_transaction = conn.in_transaction
+            row = conn.execute(
+                "SELECT details FROM import_export_jobs WHERE operation_id = ?", (operation_id,)
+            ).fetchone()
+            if row is None:
+                logger.warning(f"Update for unknown import/export job {operation_id}")
+                return
+
+            details = json.loads(row['details'])
+            details.update({key: value for key, value in fields.items() if key not in _COLUMNS})
+            assignments = [f"{column} = ?" for column in _COLUMNS if column in fields]
+            params = [fields[column] for column in _COLUMNS if column in fields]
+
+            conn.execute(
+                f"UPDATE import_export_jobs SET {', '.join(assignments + ['details = ?', 'updated_at = ?'])} "
+                "WHERE operation_id = ?",
+                (*params, json.dumps(details, default=str), datetime.now().isoformat(), operation_id)
+            )
+            if not was_in_transaction:
+                conn.commit()
+
+    def get(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        """A job's fields, or None if there is no such job"""
+        row = self.db_manager.fetch_one(
+            "SELECT * FROM import_export_jobs WHERE operation_id = ?", (operation_id,)
+        )
+        return self._row_to_job(row) if row else None
+
+    def list(self) -> Dict[str, Dict[str, Any]]:
+        """All jobs by operation id, oldest first"""
+        rows = self.db_manager.fetch_all("SELECT * FROM import_export_jobs ORDER BY created_at")
+        return {row['operation_id']: self._row_to_job(row) for row in rows}
+
+    def delete(self, operation_id: str) -> bool:
+        """Remove a job, returning whether it existed"""
+        return self._write("DELETE FROM import_export_jobs WHERE operation_id = ?", (operation_id,)) > 0
+
+    def recover_interrupted(self) -> int:
+        """
+        Mark jobs whose worker process is gone as failed.
+
+        Called at startup: a queued or running job of a process that no longer
+        runs, or of an earlier process with this id, will never finish.
+        """
+        placeholders = ', '.join('?' for _ in ACTIVE_JOB_STATUSES)
+        rows = self.db_manager.fetch_all(
+            f"SELECT operation_id, worker_pid FROM import_export_jobs WHERE status IN ({placeholders})",
+            ACTIVE_JOB_STATUSES
+        )
+
+        interrupted = 0
+        for row in rows:
+            pid = row['worker_pid']
+            if pid and pid != os.getpid() and _process_alive(pid):
+                continue
+            self.update(row['operation_id'], status=JOB_FAILED, progress=0,
+                        message="Operazione interrotta dal riavvio del server",
+                        errors=["Operazione interrotta dal riavvio del server"],
+                        end_time=datetime.now().isoformat())
+            interrupted += 1
+
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted import/export jobs as failed")
+        return interrupted
+
+
+class JobContext:
+    """Handle given to a running job for reporting its progress"""
+
+    def __init__(self, store: ImportExportJobStore, operation_id: str):
+        self.store = store
+        self.operation_id = operation_id
+        self._progress = None
+
+    def update(self, **fields) -> None:
+        """Change fields of the job"""
+        if 'progress' in fields:
+            self._progress = fields['progress']
+        self.store.update(self.operation_id, **fields)
+
+    def report_progress(self, done: int, total: int, start: int = 20, end: int = 95, **fields) -> None:
+        """
+        Map `done` of `total` units of work to a percentage between `start`
+        and `end`, storing it with any other `fields` of the job.
+        """
+        progress = end if total <= 0 else start + (end - start) * min(done, total) // total
+        self.update(progress=progress, **fields)
+
+
+class ImportExportJobRunner:
+    """
+    Bounded thread pool for import/export jobs.
+
+    At most ``max_workers`` jobs run at once; further jobs stay queued, with
+    status ``queued``, until a worker is free.
+    """
+
+    def __init__(self, store: ImportExportJobStore, max_workers: int = 2):
+        self.store = store
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-export-job")
+
+    def submit(self, operation_id: str, work: Callable[[JobContext], None]) -> Future:
+        """
+        Run `work` for a job created in the store.
+
+        `work` records its own results through the context; an exception it
+        raises marks the job as failed.
+        """
+        return self._executor.submit(self._run, operation_id, work)
+
+    def _run(self, operation_id: str, work: Callable[[JobContext], None]) -> None:
+        context = JobContext(self.store, operation_id)
+        try:
+            context.update(status=JOB_PROCESSING)
+            work(context)
+        except Exception as e:
+            logger.error(f"Import/export job {operation_id} failed: {e}")
+            try:
+                context.update(status=JOB_FAILED, progress=0,
+                               message=f"Errore durante l'elaborazione: {str(e)}",
+                               errors=[str(e)], end_time=datetime.now().isoformat())
+            except Exception as store_error:
+                logger.error(f"Failed to record failure of job {operation_id}: {store_error}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs, optionally waiting for running ones"""
+        self._executor.shutdown(wait=wait)
+
+
+# Global instances
+_job_store: Optional[ImportExportJobStore] = None
+_job_runner: Optional[ImportExportJobRunner] = None
+_jobs_lock = threading.Lock()
+
+
+def get_job_store() -> ImportExportJobStore:
+    """Get the process-wide import/export job store"""
+    global _job_store
+
+    if _job_store is None:
+        with _jobs_lock:
+            if _job_store is None:
+                _job_store = ImportExportJobStore()
+
+    return _job_store
+
+
+def get_job_runner() -> ImportExportJobRunner:
+    """Get the process-wide import/export job runner"""
+    global _job_runner
+
+    store = get_job_store()
+    if _job_runner is None:
+        with _jobs_lock:
+            if _job_runner is None:
+                try:
+                    from app.config import get_settings
+                    max_workers = get_settings().performance.import_export_job_workers
+                except ImportError:
+                    logger.warning("Configuration not available, using default import/export job settings")
+                    max_workers = 2
+                _job_runner = ImportExportJobRunner(store, max_workers=max_workers)
+
+    return _job_runner
+
+
+def shutdown_job_runner() -> None:
+    """Shut down the global job runner (application shutdown)"""
+    global _job_runner
+
+    with _jobs_lock:
+        if _job_runner is not None:
+            _job_runner.shutdown(wait=True)
+            _job_runner = None
@@ -10,6 +10,7 @@ Implements Requirements 1.1, 2.1, 5.1, 5.2 performance optimizations.
 """
 
 import logging
+import multiprocessing
 import os
 import asyncio
 import threading
@@ -46,6 +47,7 @@ class PerformanceConfig:
     # Parallel processing
     max_workers: int = 4  # Maximum number of worker threads/processes
     use_process_pool: bool = False  # Use process pool for CPU-intensive tasks
+    process_start_method: Optional[str] = None  # multiprocessing start method of the pool, None = platform default
     parallel_threshold: int = 1000  # Use parallel processing for datasets larger than this
     
     # Performance monitoring
@@ -160,23 +162,22 @@ class StreamingProcessor:
             raise
     
     def stream_json_records(self, file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
-        """Stream JSON records by entity type"""
-        import json
+        """Stream JSON records by entity type, decoding one record at a time"""
+        from .json_stream import IncrementalJSONReader
         
         try:
             with open(file_path, 'r', encoding='utf-8', buffering=self.config.read_buffer_size) as f:
-                data = json.load(f)
+                reader = IncrementalJSONReader(f, chunk_size=max(self.config.read_buffer_size, 64 * 1024))
                 
-                # Stream each entity type's records
-                for entity_type, records in data.items():
-                    if entity_type == 'metadata':
+                for entity_type, record, record_num in reader.items():
+                    # Metadata and other plain values are not records
+                    if entity_type == 'metadata' or record_num is None:
                         continue
                     
-                    if isinstance(records, list):
-                        for record_num, record in enumerate(records):
-                            # Add line number for error reporting
-                            record['_line_number'] = record_num + 1
-                            yield entity_type, record
+                    if isinstance(record, dict):
+                        # Add line number for error reporting
+                        record['_line_number'] = record_num + 1
+                    yield entity_type, record
         
         except Exception as e:
             logger.error(f"Error streaming JSON file {file_path}: {e}")
@@ -282,7 +283,9 @@ class ParallelProcessor:
         """Get appropriate executor for parallel processing"""
         if self.executor is None:
             if self.config.use_process_pool:
-                self.executor = ProcessPoolExecutor(max_workers=self.config.max_workers)
+                mp_context = (multiprocessing.get_context(self.config.process_start_method)
+                              if self.config.process_start_method else None)
+                self.executor = ProcessPoolExecutor(max_workers=self.config.max_workers, mp_context=mp_context)
             else:
                 self.executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
         return self.executor
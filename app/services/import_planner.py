@@ -0,0 +1,251 @@
+"""
+Dry-run planner for imports
+
+Measures what one record of each entity type costs to parse, validate and
+insert on a sample of the parsed data, the insert against a scratch in-memory
+copy of the database schema, so nothing is written. Memory per record is
+estimated from the size of the sampled records, not traced: tracing is
+process-wide and would count the allocations of other threads. The measurements become an
+ImportPlan: batch sizes, expected runtime, predicted peak memory and the number
+of records matching existing ones, which import_data can then follow.
+"""
+
+import json
+import logging
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.entity_mappings import get_entity_mapping
+from ..models.import_export import EntityImportPlan, ImportOptions, ImportPlan
+from .record_index import ExistingRecordIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_SIZE = 200
+DEFAULT_BATCH_SECONDS = 1.0
+
+SCHEMA_QUERY = """
+    SELECT type, name, sql FROM sqlite_master
+    WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' AND type IN ('table', 'index', 'trigger')
+    ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END
+"""
+
+
+def _plan_settings() -> Tuple[int, float]:
+    """Configured (sample size, target seconds per batch) for import planning"""
+    try:
+        from ..config import get_settings
+        performance = get_settings().performance
+        return performance.import_plan_sample_size, performance.import_plan_batch_seconds
+    except ImportError:
+        logger.warning("Configuration not available, using default import planning settings")
+        return DEFAULT_SAMPLE_SIZE, DEFAULT_BATCH_SECONDS
+
+
+def _deep_sizeof(value: Any) -> int:
+    """Bytes taken by a parsed value and the containers and values inside it"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(key) + _deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_deep_sizeof(item) for item in value)
+    return size
+
+
+def _sql_value(value: Any) -> Any:
+    """Value as SQLite stores it on import"""
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+class ImportPlanner:
+    """
+    Plans an import of parsed data for an ImportExportService.
+
+    The service's own validation framework, foreign key resolver and
+    performance settings are used, so the sample runs the same code as the
+    import would.
+    """
+
+    def __init__(self, import_service, sample_size: Optional[int] = None,
+                 batch_seconds: Optional[float] = None):
+        self.import_service = import_service
+        configured_sample_size, configured_batch_seconds = _plan_settings()
+        self.sample_size = sample_size or configured_sample_size
+        self.batch_seconds = batch_seconds or configured_batch_seconds
+
+    def plan(self, data: Dict[str, List[Dict[str, Any]]], options: ImportOptions,
+             parse_seconds: float = 0.0) -> ImportPlan:
+        """
+        Plan the import of `data`.
+
+        Args:
+            data: Parsed import data by entity type
+            options: Import options
+            parse_seconds: Time it took to parse the file, spread over its records
+
+        Returns:
+            ImportPlan for the entity types of `data` selected by the options
+        """
+        service = self.import_service
+        entity_types = [
+            entity_type for entity_type in service.dependency_resolver.get_processing_order()
+            if entity_type in data and entity_type in options.entity_types
+        ]
+        total_records = sum(len(data[entity_type]) for entity_type in entity_types)
+        parse_seconds_per_record = parse_seconds / total_records if total_records else 0.0
+
+        plan = ImportPlan(
+            processing_order=entity_types,
+            baseline_memory_mb=service.performance_service.memory_manager.get_memory_usage_mb()
+        )
+        service.foreign_key_resolver.preload_existing_entities(
+            service.foreign_key_resolver.get_referenced_entity_types(entity_types)
+        )
+
+        scratch = self._scratch_database()
+        try:
+            for entity_type in entity_types:
+                plan.entities[entity_type] = self._plan_entity(
+                    entity_type, data[entity_type], options, parse_seconds_per_record,
+                    scratch, plan.baseline_memory_mb
+                )
+        finally:
+            scratch.close()
+
+        logger.info(f"Import plan: {total_records} records in about {plan.estimated_seconds:.1f}s, "
+                    f"peak memory {plan.predicted_peak_memory_mb:.0f}MB, {plan.total_conflicts} conflicts")
+        return plan
+
+    def _plan_entity(self, entity_type: str, records: List[Dict[str, Any]], options: ImportOptions,
+                     parse_seconds_per_record: float, scratch: sqlite3.Connection,
+                     baseline_memory_mb: float) -> EntityImportPlan:
+        """Measure one entity type on a sample of its records and size its batches"""
+        sample = self._sample(records)
+        resolved_sample = [self._resolve(entity_type, record) for record in sample]
+
+        validate_seconds = self._time_validation(entity_type, resolved_sample, options)
+        insert_seconds = self._time_insert(scratch, entity_type, resolved_sample)
+        conflict_count, lookup_seconds = self._count_conflicts(entity_type, records)
+
+        entity_plan = EntityImportPlan(
+            entity_type=entity_type,
+            record_count=len(records),
+            sample_size=len(sample),
+            batch_size=options.batch_size,
+            parse_seconds_per_record=parse_seconds_per_record,
+            validate_seconds_per_record=validate_seconds / len(sample) if sample else 0.0,
+            insert_seconds_per_record=(insert_seconds / len(sample) if sample else 0.0)
+                                      + (lookup_seconds / len(records) if records else 0.0),
+            bytes_per_record=self._record_bytes(resolved_sample),
+            conflict_count=conflict_count
+        )
+        entity_plan.batch_size = self._batch_size(entity_plan, baseline_memory_mb)
+        return entity_plan
+
+    def _sample(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Records spread evenly over the file, at most sample_size of them"""
+        step = max(1, len(records) // self.sample_size)
+        return records[::step][:self.sample_size]
+
+    def _resolve(self, entity_type: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Record with the foreign keys that already exist resolved, as the import sees it"""
+        try:
+            return self.import_service.foreign_key_resolver.resolve_foreign_keys(entity_type, record, {})
+        except Exception:
+            # References to records the import itself creates are resolved later
+            return record
+
+    def _validate(self, entity_type: str, records: List[Dict[str, Any]], options: ImportOptions) -> None:
+        """Run the validation the import runs on `records`"""
+        framework = self.import_service.validation_framework
+        if not options.skip_validation:
+            framework.validate_records_batch(entity_type, records)
+        for line_number, record in enumerate(records, 1):
+            framework.validate_record(entity_type, record, line_number)
+
+    def _time_validation(self, entity_type: str, records: List[Dict[str, Any]],
+                         options: ImportOptions) -> float:
+        """Seconds spent validating `records`"""
+        start = time.perf_counter()
+        self._validate(entity_type, records, options)
+        return time.perf_counter() - start
+
+    def _record_bytes(self, records: List[Dict[str, Any]]) -> int:
+        """Average bytes a batch holds per record: the resolved record and its row of SQL values"""
+        if not records:
+            return 0
+        total = sum(
+            _deep_sizeof(record) + _deep_sizeof(tuple(_sql_value(value) for value in record.values()))
+            for record in records
+        )
+        return total // len(records)
+
+    def _scratch_database(self) -> sqlite3.Connection:
+        """In-memory database with the tables, indexes and triggers of the real one"""
+        scratch = sqlite3.connect(":memory:")
+        for row in self.import_service.db_manager.fetch_all(SCHEMA_QUERY):
+            try:
+                scratch.execute(row['sql'])
+            except sqlite3.Error as e:
+                logger.debug(f"Schema object {row['name']} not copied to the planning database: {e}")
+        return scratch
+
+    def _time_insert(self, scratch: sqlite3.Connection, entity_type: str,
+                     records: List[Dict[str, Any]]) -> float:
+        """Seconds spent inserting `records` into the scratch database in one transaction"""
+        table_name = get_entity_mapping(entity_type).table_name
+        table_columns = {row[1] for row in scratch.execute(f"PRAGMA table_info({table_name})")}
+        columns = [column for column in dict.fromkeys(
+            field_name for record in records for field_name in record
+        ) if column in table_columns and column != 'id']
+        if not records or not columns:
+            return 0.0
+
+        query = (f"INSERT OR IGNORE INTO {table_name} ({', '.join(columns)}) "
+                 f"VALUES ({', '.join('?' for _ in columns)})")
+        start = time.perf_counter()
+        try:
+            scratch.executemany(query, [tuple(_sql_value(record.get(column)) for column in columns)
+                                        for record in records])
+            scratch.commit()
+        except sqlite3.Error as e:
+            scratch.rollback()
+            logger.debug(f"Planning insert into {table_name} failed: {e}")
+        return time.perf_counter() - start
+
+    def _count_conflicts(self, entity_type: str, records: List[Dict[str, Any]]) -> Tuple[int, float]:
+        """(records matching an existing one, seconds spent looking them up) over all records"""
+        try:
+            entity_service = self.import_service._get_service_for_entity(entity_type)
+            start = time.perf_counter()
+            index = ExistingRecordIndex.for_entity(entity_type, entity_service.get_all())
+            unique_constraints = get_entity_mapping(entity_type).unique_constraints
+            conflicts = sum(1 for record in records if index.find_first(record, unique_constraints) is not None)
+            return conflicts, time.perf_counter() - start
+        except Exception as e:
+            logger.warning(f"Could not count conflicting {entity_type} records: {e}")
+            return 0, 0.0
+
+    def _batch_size(self, entity_plan: EntityImportPlan, baseline_memory_mb: float) -> int:
+        """
+        Records per batch: enough to fill batch_seconds, within the configured
+        batch size bounds and the memory left under the configured limit.
+        """
+        config = self.import_service.performance_service.config
+        if entity_plan.seconds_per_record > 0:
+            batch_size = int(self.batch_seconds / entity_plan.seconds_per_record)
+        else:
+            batch_size = config.max_batch_size
+        batch_size = max(config.min_batch_size, min(config.max_batch_size, batch_size))
+
+        if entity_plan.bytes_per_record:
+            memory_left = (config.max_memory_usage_mb - baseline_memory_mb) * 1024 * 1024
+            batch_size = min(batch_size, max(config.min_batch_size, int(memory_left // entity_plan.bytes_per_record)))
+
+        return max(1, min(batch_size, entity_plan.record_count))
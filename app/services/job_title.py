@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 class JobTitleService(BaseService):
     """Job Title service class"""
     
+    invalidates_orgchart = True
+    
     def __init__(self):
         super().__init__(JobTitle, "job_titles")
     
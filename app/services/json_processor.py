@@ -9,7 +9,7 @@ metadata handling, and proper date/datetime serialization.
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from datetime import date, datetime
 
@@ -20,6 +20,7 @@ from ..models.entity_mappings import (
     ENTITY_MAPPINGS, DEPENDENCY_ORDER, get_entity_mapping,
     parse_json_field, serialize_json_field
 )
+from .json_stream import IncrementalJSONReader, JSONStructureError
 
 
 @dataclass
@@ -71,53 +72,34 @@ class JSONProcessor:
                 ))
                 return JSONParseResult(False, {}, errors, warnings, {}, 0, 0)
             
-            # Read and parse JSON file
+            # Read the file incrementally, one record at a time
+            entity_data: Dict[str, List[Dict[str, Any]]] = {}
+            stopped_entities = set()
+            
             with open(file_path, 'r', encoding=self.encoding) as jsonfile:
                 try:
-                    json_data = json.load(jsonfile)
-                except json.JSONDecodeError as e:
-                    errors.append(ImportExportValidationError(
-                        field="json_format",
-                        message=f"Invalid JSON format: {str(e)}",
-                        error_type=ImportErrorType.FILE_FORMAT_ERROR,
-                        line_number=getattr(e, 'lineno', None)
-                    ))
-                    return JSONParseResult(False, {}, errors, warnings, {}, 0, 0)
-            
-            # Validate JSON structure
-            if not isinstance(json_data, dict):
-                errors.append(ImportExportValidationError(
-                    field="json_structure",
-                    message="JSON file must contain a root object",
-                    error_type=ImportErrorType.FILE_FORMAT_ERROR
-                ))
-                return JSONParseResult(False, {}, errors, warnings, {}, 0, 0)
-            
-            # Extract metadata if present
-            metadata = json_data.get('metadata', {})
-            
-            # Process each entity type
-            for entity_type in DEPENDENCY_ORDER:
-                if entity_type in json_data:
-                    entity_data = json_data[entity_type]
-                    
-                    if not isinstance(entity_data, list):
-                        errors.append(ImportExportValidationError(
-                            field=entity_type,
-                            message=f"Entity data for {entity_type} must be a list",
-                            error_type=ImportErrorType.FILE_FORMAT_ERROR,
-                            entity_type=entity_type
-                        ))
-                        continue
-                    
-                    # Process entity records
-                    processed_entity_data = []
-                    entity_mapping = get_entity_mapping(entity_type)
-                    
-                    for record_index, record in enumerate(entity_data):
+                    for key, value, record_index in IncrementalJSONReader(jsonfile).items():
+                        if key == 'metadata' and record_index is None:
+                            metadata = value
+                            continue
+                        if key not in DEPENDENCY_ORDER:
+                            continue
+                        
+                        entity_type = key
+                        if record_index is None:
+                            errors.append(ImportExportValidationError(
+                                field=entity_type,
+                                message=f"Entity data for {entity_type} must be a list",
+                                error_type=ImportErrorType.FILE_FORMAT_ERROR,
+                                entity_type=entity_type
+                            ))
+                            continue
+                        
+                        if entity_type in stopped_entities:
+                            continue
                         total_records += 1
                         
-                        if not isinstance(record, dict):
+                        if not isinstance(value, dict):
                             errors.append(ImportExportValidationError(
                                 field="record_structure",
                                 message=f"Record must be an object",
@@ -130,11 +112,11 @@ class JSONProcessor:
                         try:
                             # Process and validate record data
                             processed_record = self._process_record_data(
-                                record, entity_type, entity_mapping, record_index + 1
+                                value, entity_type, get_entity_mapping(entity_type), record_index + 1
                             )
                             
                             if processed_record is not None:
-                                processed_entity_data.append(processed_record)
+                                entity_data.setdefault(entity_type, []).append(processed_record)
                                 processed_records += 1
                         
                         except Exception as e:
@@ -155,10 +137,30 @@ class JSONProcessor:
                                     entity_type=entity_type,
                                     line_number=record_index + 1
                                 ))
-                                break
-                    
-                    if processed_entity_data:
-                        data[entity_type] = processed_entity_data
+                                stopped_entities.add(entity_type)
+                
+                except JSONStructureError as e:
+                    errors.append(ImportExportValidationError(
+                        field="json_structure",
+                        message=str(e),
+                        error_type=ImportErrorType.FILE_FORMAT_ERROR
+                    ))
+                    return JSONParseResult(False, {}, errors, warnings, {}, 0, 0)
+                
+                except json.JSONDecodeError as e:
+                    errors.append(ImportExportValidationError(
+                        field="json_format",
+                        message=f"Invalid JSON format: {str(e)}",
+                        error_type=ImportErrorType.FILE_FORMAT_ERROR,
+                        line_number=getattr(e, 'lineno', None)
+                    ))
+                    return JSONParseResult(False, {}, errors, warnings, {}, 0, 0)
+            
+            # Entity types in dependency order, whatever their order in the file
+            data = {
+                entity_type: entity_data[entity_type]
+                for entity_type in DEPENDENCY_ORDER if entity_type in entity_data
+            }
         
         except Exception as e:
             errors.append(ImportExportValidationError(
@@ -208,6 +210,64 @@ class JSONProcessor:
             print(f"Error generating JSON file {output_path}: {str(e)}")
             return False
     
+    def iter_json_chunks(self, entity_records: Iterable[Tuple[str, Iterable[Dict[str, Any]]]],
+                         include_metadata: bool = True,
+                         entity_counts: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """
+        Generate a JSON export document piece by piece.
+        
+        Produces the same formatting as generate_json_file while holding one
+        record at a time. Record counts are only known once every entity has
+        been written, so the metadata object comes last instead of first.
+        
+        Args:
+            entity_records: (entity_type, records) pairs in output order
+            include_metadata: Whether to include metadata in the output
+            entity_counts: Optional dictionary filled with the number of
+                records written per entity type
+            
+        Yields:
+            Consecutive text chunks of the document
+        """
+        counts = entity_counts if entity_counts is not None else {}
+        pretty = self.json_indent is not None
+        newline = '\n' if pretty else ''
+        member_indent = ' ' * self.json_indent if pretty else ''
+        record_indent = member_indent * 2
+        key_separator = ': ' if self.json_indent else ':'
+        
+        def dumps(value: Any, indent: str) -> str:
+            text = json.dumps(
+                value,
+                indent=self.json_indent,
+                ensure_ascii=False,
+                default=self._json_serializer,
+                separators=(',', key_separator)
+            )
+            # Newlines inside strings are escaped, so every newline is layout
+            return text.replace('\n', '\n' + indent) if pretty else text
+        
+        members = 0
+        yield '{'
+        for entity_type, records in entity_records:
+            entity_mapping = get_entity_mapping(entity_type)
+            counts[entity_type] = 0
+            
+            yield f"{',' if members else ''}{newline}{member_indent}{json.dumps(entity_type)}{key_separator}["
+            members += 1
+            for record in records:
+                json_record = self._prepare_record_for_json(record, entity_mapping)
+                yield f"{',' if counts[entity_type] else ''}{newline}{record_indent}{dumps(json_record, record_indent)}"
+                counts[entity_type] += 1
+            yield f"{newline}{member_indent}]" if counts[entity_type] else ']'
+        
+        if include_metadata:
+            metadata = self._metadata_for_counts(counts)
+            yield f"{',' if members else ''}{newline}{member_indent}\"metadata\"{key_separator}{dumps(metadata, member_indent)}"
+            members += 1
+        
+        yield f"{newline}}}" if members else '}'
+    
     def _build_structured_json(self, data: Dict[str, List[Dict[str, Any]]], 
                               include_metadata: bool) -> Dict[str, Any]:
         """Build properly structured JSON with metadata and relationship information."""
@@ -424,22 +484,25 @@ class JSONProcessor:
     
     def _generate_metadata(self, data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
         """Generate metadata for the JSON export."""
+        return self._metadata_for_counts({
+            entity_type: len(records) for entity_type, records in data.items()
+        })
+    
+    def _metadata_for_counts(self, entity_counts: Dict[str, int]) -> Dict[str, Any]:
+        """Generate metadata for the JSON export from the record count per entity type."""
         from datetime import datetime
         
         # Calculate relationship information
-        relationship_info = self._calculate_relationship_info(data)
+        relationship_info = self._calculate_relationship_info(entity_counts)
         
         metadata = {
             "export_timestamp": datetime.now().isoformat(),
             "version": "1.0",
             "format": "json",
-            "total_records": sum(len(records) for records in data.values()),
-            "entity_counts": {
-                entity_type: len(records) 
-                for entity_type, records in data.items()
-            },
+            "total_records": sum(entity_counts.values()),
+            "entity_counts": dict(entity_counts),
             "dependency_order": DEPENDENCY_ORDER,
-            "exported_entities": list(data.keys()),
+            "exported_entities": list(entity_counts.keys()),
             "relationships": relationship_info,
             "export_options": {
                 "encoding": self.encoding,
@@ -450,18 +513,18 @@ class JSONProcessor:
         
         return metadata
     
-    def _calculate_relationship_info(self, data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    def _calculate_relationship_info(self, entity_counts: Dict[str, int]) -> Dict[str, Any]:
         """Calculate relationship information for metadata."""
         relationships = {}
         
-        for entity_type, records in data.items():
+        for entity_type, record_count in entity_counts.items():
             if entity_type in ENTITY_MAPPINGS:
                 entity_mapping = get_entity_mapping(entity_type)
                 if entity_mapping.foreign_keys:
                     relationships[entity_type] = {
                         "foreign_keys": entity_mapping.foreign_keys,
                         "dependencies": entity_mapping.dependencies,
-                        "record_count": len(records)
+                        "record_count": record_count
                     }
         
         return relationships
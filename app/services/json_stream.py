@@ -0,0 +1,157 @@
+"""
+Incremental reader for JSON import files
+
+Import files are a root object mapping entity types to arrays of records
+(``{"units": [...], "persons": [...], "metadata": {...}}``). The reader walks
+that structure and decodes one array element at a time, so memory is bounded
+by the largest single record instead of the whole document.
+"""
+
+import json
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JSONStructureError(ValueError):
+    """Raised when the document is valid JSON so far but not a root object"""
+    pass
+
+
+class IncrementalJSONReader:
+    """
+    Pull reader over a text file holding one JSON root object.
+
+    Each value is decoded by ``json.JSONDecoder.raw_decode`` from a buffer that
+    is refilled as needed; consumed input is dropped on every refill.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = 64 * 1024):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        # Position of the buffer start in the file, for error messages
+        self._consumed_chars = 0
+        self._consumed_lines = 0
+        self._consumed_columns = 0
+
+    def items(self) -> Iterator[Tuple[str, Any, Optional[int]]]:
+        """
+        Walk the root object.
+
+        Yields:
+            (key, element, index) for every element of a top-level array and
+            (key, value, None) for any other top-level value
+
+        Raises:
+            json.JSONDecodeError: On invalid JSON
+            JSONStructureError: If the root value is not an object
+        """
+        if self._peek() != '{':
+            raise JSONStructureError("JSON file must contain a root object")
+        self._pos += 1
+
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                if not isinstance(key, str):
+                    self._error("Expecting property name enclosed in double quotes")
+                self._expect(':')
+
+                if self._peek() == '[':
+                    self._pos += 1
+                    if self._peek() == ']':
+                        self._pos += 1
+                    else:
+                        index = 0
+                        while True:
+                            yield key, self._value(), index
+                            index += 1
+                            if self._expect(',]') == ']':
+                                break
+                else:
+                    yield key, self._value(), None
+
+                if self._expect(',}') == '}':
+                    break
+
+        if self._peek():
+            self._error("Extra data")
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was consumed"""
+        if self._eof:
+            return False
+
+        # Read at least as much as is pending so a long value is retried a logarithmic number of times
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+
+        consumed = self._buffer[:self._pos]
+        last_newline = consumed.rfind('\n')
+        self._consumed_chars += len(consumed)
+        self._consumed_lines += consumed.count('\n')
+        if last_newline == -1:
+            self._consumed_columns += len(consumed)
+        else:
+            self._consumed_columns = len(consumed) - last_newline - 1
+
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, '' at the end of input"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, expected: str) -> str:
+        """Consume one of the expected punctuation characters"""
+        char = self._peek()
+        if not char or char not in expected:
+            self._error(f"Expecting {' or '.join(repr(c) for c in expected)} delimiter")
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """Decode the next complete value, reading more input while it is cut off"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise self._with_file_position(e)
+
+            # A number ending at the buffer end may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._pos = end
+            return value
+
+    def _with_file_position(self, error: json.JSONDecodeError) -> json.JSONDecodeError:
+        """Turn a position in the buffer into a position in the file"""
+        if error.lineno == 1:
+            error.colno += self._consumed_columns
+        error.lineno += self._consumed_lines
+        error.pos += self._consumed_chars
+        error.args = (f"{error.msg}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def _error(self, message: str):
+        raise self._with_file_position(json.JSONDecodeError(message, self._buffer, self._pos))
+
@@ -10,6 +10,8 @@ from app.models.unit import Unit
 from app.models.person import Person
 from app.models.assignment import Assignment
 from app.models.job_title import JobTitle
+from app.services.orgchart_tree import OrgTreeBuilder
+from app.services.orgchart_cache import get_orgchart_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,8 @@ class OrgchartService:
     
     def __init__(self):
         self.db_manager = get_db_manager()
+        self.tree_builder = OrgTreeBuilder(self.db_manager)
+        self.tree_cache = get_orgchart_cache()
     
     def get_organization_overview(self) -> Dict[str, Any]:
         """Get high-level organization overview"""
@@ -42,22 +46,14 @@ class OrgchartService:
                 "SELECT COUNT(*) as count FROM person_job_assignments WHERE is_current = 1"
             )['count']
             
-            # Organizational depth
+            # Organizational depth: deepest unit below a root
             depth_query = """
-            WITH RECURSIVE unit_depth AS (
-                SELECT id, name, parent_unit_id, 0 as depth
-                FROM units 
-                WHERE parent_unit_id IS NULL OR parent_unit_id = -1
-                
-                UNION ALL
-                
-                SELECT u.id, u.name, u.parent_unit_id, ud.depth + 1
-                FROM units u
-                JOIN unit_depth ud ON u.parent_unit_id = ud.id
-            )
-            SELECT MAX(depth) as max_depth FROM unit_depth
+            SELECT MAX(c.depth) as depth
+            FROM units r
+            JOIN unit_closure c ON c.ancestor_id = r.id
+            WHERE r.parent_unit_id IS NULL OR r.parent_unit_id = -1
             """
-            overview['organizational_depth'] = self.db_manager.fetch_one(depth_query)['max_depth'] or 0
+            overview['organizational_depth'] = self.db_manager.fetch_one(depth_query)['depth'] or 0
             
             # Span of control (average direct reports)
             span_query = """
@@ -138,74 +134,11 @@ class OrgchartService:
     def get_complete_tree(self, show_persons: bool = True) -> List[Dict[str, Any]]:
         """Get complete organizational tree structure"""
         try:
-            # Get hierarchical structure
-            tree_query = """
-            WITH RECURSIVE unit_tree AS (
-                SELECT id, name, short_name, unit_type_id, parent_unit_id, 
-                       0 as level,
-                       CAST(id AS TEXT) as path
-                FROM units 
-                WHERE parent_unit_id IS NULL OR parent_unit_id = -1
-                
-                UNION ALL
-                
-                SELECT u.id, u.name, u.short_name, u.unit_type_id, u.parent_unit_id, ut.level + 1,
-                       ut.path || '/' || CAST(u.id AS TEXT)
-                FROM units u
-                JOIN unit_tree ut ON u.parent_unit_id = ut.id
-            )
-            SELECT ut.*, 
-                   COUNT(DISTINCT pja.person_id) as person_count,
-                   COUNT(DISTINCT child_units.id) as children_count
-            FROM unit_tree ut
-            LEFT JOIN person_job_assignments pja ON ut.id = pja.unit_id AND pja.is_current = 1
-            LEFT JOIN units child_units ON child_units.parent_unit_id = ut.id
-            GROUP BY ut.id, ut.name, ut.short_name, ut.unit_type_id, ut.parent_unit_id, ut.level, ut.path
-            ORDER BY ut.path
-            """
-            ##tree_query = "select id, name, short_name, unit_type_id, parent_unit_id, level, path from get_complete_tree order by path"
-            units = self.db_manager.fetch_all(tree_query, ('YOUSHALLPASS',))
-            
-            # Build tree structure
-            tree_nodes = {}
-            root_nodes = []
-            
-            for unit_row in units:
-                node = {
-                    'id': unit_row['id'],
-                    'name': unit_row['name'],
-                    'short_name': unit_row['short_name'],
-                    'unit_type_id': unit_row['unit_type_id'],
-                    'level': unit_row['level'],
-                    'person_count': unit_row['person_count'],
-                    'children_count': unit_row['children_count'],
-                    'children': [],
-                    'persons': [] if show_persons else None
-                }
-                
-                # Add persons if requested
-                if show_persons:
-                    persons_query = """
-                    SELECT p.id, p.name, p.short_name, jt.name as job_title_name,
-                           pja.is_ad_interim, pja.is_unit_boss, pja.percentage
-                    FROM person_job_assignments pja
-                    JOIN persons p ON pja.person_id = p.id
-                    JOIN job_titles jt ON pja.job_title_id = jt.id
-                    WHERE pja.unit_id = ? AND pja.is_current = 1
-                    ORDER BY p.name
-                    """
-                    persons = self.db_manager.fetch_all(persons_query, (unit_row['id'],))
-                    node['persons'] = [dict(person) for person in persons]
-                
-                tree_nodes[unit_row['id']] = node
-                
-                if unit_row['parent_unit_id'] is None or unit_row['parent_unit_id'] == -1:
-                    root_nodes.append(node)
-                else:
-                    if unit_row['parent_unit_id'] in tree_nodes:
-                        tree_nodes[unit_row['parent_unit_id']]['children'].append(node)
-            
-            return root_nodes
+            # Fresh top-level list; the nodes themselves are shared read-only snapshots
+            return list(self.tree_cache.get_or_build(
+                ('tree', None, show_persons),
+                lambda: self.tree_builder.build_complete_tree(show_persons=show_persons)
+            ))
             
         except Exception as e:
             logger.error(f"Error getting complete tree: {e}")
@@ -214,76 +147,10 @@ class OrgchartService:
     def get_subtree(self, root_unit_id: int, show_persons: bool = True) -> List[Dict[str, Any]]:
         """Get subtree starting from specific unit"""
         try:
-            # Get subtree structure
-            subtree_query = """
-            WITH RECURSIVE unit_subtree AS (
-                SELECT id, name, short_name, unit_type_id, parent_unit_id, 0 as level,
-                       CAST(id AS TEXT) as path
-                FROM units 
-                WHERE id = ?
-                
-                UNION ALL
-                
-                SELECT u.id, u.name, u.short_name, u.unit_type_id, u.parent_unit_id, us.level + 1,
-                       us.path || '/' || CAST(u.id AS TEXT)
-                FROM units u
-                JOIN unit_subtree us ON u.parent_unit_id = us.id
-            )
-            SELECT us.*, 
-                   COUNT(DISTINCT pja.person_id) as person_count,
-                   COUNT(DISTINCT child_units.id) as children_count
-            FROM unit_subtree us
-            LEFT JOIN person_job_assignments pja ON us.id = pja.unit_id AND pja.is_current = 1
-            LEFT JOIN units child_units ON child_units.parent_unit_id = us.id
-            GROUP BY us.id, us.name, us.short_name, us.unit_type_id, us.parent_unit_id, us.level, us.path
-            ORDER BY us.path
-            """
-            
-            units = self.db_manager.fetch_all(subtree_query, (root_unit_id, 'YOUSHALLPASS'))
-            
-            if not units:
-                return []
-            
-            # Build tree structure (similar to complete tree but starting from root_unit_id)
-            tree_nodes = {}
-            root_node = None
-            
-            for unit_row in units:
-                node = {
-                    'id': unit_row['id'],
-                    'name': unit_row['name'],
-                    'short_name': unit_row['short_name'],
-                    'unit_type_id': unit_row['unit_type_id'],
-                    'level': unit_row['level'],
-                    'person_count': unit_row['person_count'],
-                    'children_count': unit_row['children_count'],
-                    'children': [],
-                    'persons': [] if show_persons else None
-                }
-                
-                # Add persons if requested
-                if show_persons:
-                    persons_query = """
-                    SELECT p.id, p.name, p.short_name, jt.name as job_title_name,
-                           pja.is_ad_interim, pja.is_unit_boss, pja.percentage
-                    FROM person_job_assignments pja
-                    JOIN persons p ON pja.person_id = p.id
-                    JOIN job_titles jt ON pja.job_title_id = jt.id
-                    WHERE pja.unit_id = ? AND pja.is_current = 1
-                    ORDER BY p.name
-                    """
-                    persons = self.db_manager.fetch_all(persons_query, (unit_row['id'],))
-                    node['persons'] = [dict(person) for person in persons]
-                
-                tree_nodes[unit_row['id']] = node
-                
-                if unit_row['id'] == root_unit_id:
-                    root_node = node
-                else:
-                    if unit_row['parent_unit_id'] in tree_nodes:
-                        tree_nodes[unit_row['parent_unit_id']]['children'].append(node)
-            
-            return [root_node] if root_node else []
+            return list(self.tree_cache.get_or_build(
+                ('tree', root_unit_id, show_persons),
+                lambda: self.tree_builder.build_subtree(root_unit_id, show_persons=show_persons)
+            ))
             
         except Exception as e:
             logger.error(f"Error getting subtree for unit {root_unit_id}: {e}")
@@ -431,20 +298,14 @@ class OrgchartService:
         """Get breadcrumb path to unit"""
         try:
             path_query = """
-            WITH RECURSIVE unit_path AS (
-                SELECT id, name, parent_unit_id, 0 as level
-                FROM units WHERE id = ?
-                
-                UNION ALL
-                
-                SELECT u.id, u.name, u.parent_unit_id, up.level + 1
-                FROM units u
-                JOIN unit_path up ON u.id = up.parent_unit_id
-            )
-            SELECT id, name FROM unit_path WHERE level > 0 ORDER BY level DESC
+            SELECT u.id, u.name
+            FROM unit_closure c
+            JOIN units u ON u.id = c.ancestor_id
+            WHERE c.descendant_id = ? AND c.depth > 0
+            ORDER BY c.depth DESC
             """
             
-            path_rows = self.db_manager.fetch_all(path_query, (unit_id, 'YOUSHALLPASS',))
+            path_rows = self.db_manager.fetch_all(path_query, (unit_id,))
             return [{'id': row['id'], 'name': row['name']} for row in path_rows]
             
         except Exception as e:
@@ -656,21 +517,15 @@ class OrgchartService:
         """Get hierarchy matrix view"""
         try:
             hierarchy_query = """
-            WITH RECURSIVE unit_hierarchy AS (
-                SELECT id,
-                    name,
-                    parent_unit_id,
-                    0 as level
-                FROM units WHERE parent_unit_id IS NULL OR parent_unit_id = -1
-                
-                UNION ALL
-                
+            WITH unit_hierarchy AS (
                 SELECT u.id,
                     u.name,
                     u.parent_unit_id,
-                    uh.level + 1
-                FROM units u
-                JOIN unit_hierarchy uh ON u.parent_unit_id = uh.id
+                    c.depth as level
+                FROM units r
+                JOIN unit_closure c ON c.ancestor_id = r.id
+                JOIN units u ON u.id = c.descendant_id
+                WHERE r.parent_unit_id IS NULL OR r.parent_unit_id = -1
             )
             SELECT uh.*,
                 COUNT(DISTINCT pja.person_id) as person_count,
@@ -0,0 +1,179 @@
+"""
+Versioned in-process cache for built org trees
+
+Snapshots are keyed by a data generation counter that every write to the
+organizational data bumps (see ``bump_data_generation``). A lookup whose
+generation no longer matches is a miss and triggers a rebuild. The counter
+is per process: other gunicorn workers pick up changes when their entries
+reach the configured TTL.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def get_data_generation() -> int:
+    """Get the current organizational data generation"""
+    return _generation
+
+
+def bump_data_generation(source: str = "") -> int:
+    """Mark organizational data as changed, invalidating all cached snapshots"""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        generation = _generation
+    logger.debug(f"Org data generation bumped to {generation} by {source or 'unknown'}")
+    return generation
+
+
+class FrozenDict(dict):
+    """Read-only dict used for shared tree nodes (still JSON/template friendly)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached org tree nodes are read-only; copy() before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class OrgTreeCache:
+    """
+    LRU of immutable snapshots keyed by (key, data generation).
+
+    Values are frozen on insert and shared by every caller; a stale
+    generation or an expired TTL makes the entry a miss.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 300, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'rebuilds': 0,
+            'evictions': 0,
+            'rebuild_time_total_ms': 0.0,
+            'rebuild_time_max_ms': 0.0,
+            'last_rebuild_time_ms': 0.0,
+        }
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached snapshot for key, building and storing it on a miss"""
+        if not self.enabled:
+            return build()
+
+        generation = get_data_generation()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['generation'] == generation and not self._is_expired(entry, now):
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry['value']
+            self._stats['misses'] += 1
+
+        # Build outside the lock; the generation read above is stored with the
+        # value so a write racing with the build leaves the entry already stale.
+        start_time = time.perf_counter()
+        value = freeze(build())
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        with self._lock:
+            self._entries[key] = {'value': value, 'generation': generation, 'built_at': now}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+            self._stats['rebuilds'] += 1
+            self._stats['rebuild_time_total_ms'] += elapsed_ms
+            self._stats['rebuild_time_max_ms'] = max(self._stats['rebuild_time_max_ms'], elapsed_ms)
+            self._stats['last_rebuild_time_ms'] = elapsed_ms
+
+        logger.debug(f"Org tree cache rebuilt {key!r} in {elapsed_ms:.1f}ms (generation {generation})")
+        return value
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry['built_at'] > self.ttl_seconds
+
+    def clear(self) -> None:
+        """Drop all cached snapshots"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss and rebuild timing statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['avg_rebuild_time_ms'] = (
+            round(stats['rebuild_time_total_ms'] / stats['rebuilds'], 2) if stats['rebuilds'] else 0.0
+        )
+        for field_name in ('rebuild_time_total_ms', 'rebuild_time_max_ms', 'last_rebuild_time_ms'):
+            stats[field_name] = round(stats[field_name], 2)
+
+        stats.update({
+            'enabled': self.enabled,
+            'generation': get_data_generation(),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+        })
+        return stats
+
+
+# Global cache instance
+_orgchart_cache: Optional[OrgTreeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_orgchart_cache() -> OrgTreeCache:
+    """Get the process-wide org tree cache"""
+    global _orgchart_cache
+
+    if _orgchart_cache is None:
+        with _cache_lock:
+            if _orgchart_cache is None:
+                try:
+                    from app.config import get_settings
+                    performance = get_settings().performance
+                    _orgchart_cache = OrgTreeCache(
+                        max_entries=performance.orgchart_cache_max_entries,
+                        ttl_seconds=performance.orgchart_cache_ttl,
+                        enabled=performance.orgchart_cache_enabled
+                    )
+                except ImportError:
+                    logger.warning("Configuration not available, using default org tree cache settings")
+                    _orgchart_cache = OrgTreeCache()
+
+    return _orgchart_cache
@@ -0,0 +1,177 @@
+"""
+Org tree builder: assembles the organizational tree from bulk queries
+"""
+
+import logging
+from collections import defaultdict
+from typing import List, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class OrgTreeBuilder:
+    """
+    Builds the organizational tree with a constant number of queries.
+
+    Units (with their current person counts) are loaded in one query and,
+    when requested, all current assignments in a second one. Both result
+    sets are stitched together in memory by unit id, replacing the former
+    per-unit persons lookup. Subtrees only load the units below their root,
+    found through the unit_closure table.
+    """
+
+    UNITS_QUERY = """
+    SELECT u.id, u.name, u.short_name, u.unit_type_id, u.parent_unit_id,
+           COALESCE(pc.person_count, 0) as person_count
+    FROM units u
+    LEFT JOIN (
+        SELECT unit_id, COUNT(DISTINCT person_id) as person_count
+        FROM person_job_assignments
+        WHERE is_current = 1
+        GROUP BY unit_id
+    ) pc ON pc.unit_id = u.id
+    """
+
+    # Only the units below the root, through the closure table
+    SUBTREE_UNITS_QUERY = """
+    SELECT u.id, u.name, u.short_name, u.unit_type_id, u.parent_unit_id,
+           COALESCE(pc.person_count, 0) as person_count
+    FROM unit_closure c
+    JOIN units u ON u.id = c.descendant_id
+    LEFT JOIN (
+        SELECT pja.unit_id, COUNT(DISTINCT pja.person_id) as person_count
+        FROM unit_closure sc
+        JOIN person_job_assignments pja ON pja.unit_id = sc.descendant_id AND pja.is_current = 1
+        WHERE sc.ancestor_id = ?
+        GROUP BY pja.unit_id
+    ) pc ON pc.unit_id = u.id
+    WHERE c.ancestor_id = ?
+    """
+
+    PERSONS_QUERY = """
+    SELECT pja.unit_id as unit_id,
+           p.id, p.name, p.short_name, jt.name as job_title_name,
+           pja.is_ad_interim, pja.is_unit_boss, pja.percentage
+    FROM person_job_assignments pja
+    JOIN persons p ON pja.person_id = p.id
+    JOIN job_titles jt ON pja.job_title_id = jt.id
+    WHERE pja.is_current = 1
+    ORDER BY pja.unit_id, p.name
+    """
+
+    SUBTREE_PERSONS_QUERY = """
+    SELECT pja.unit_id as unit_id,
+           p.id, p.name, p.short_name, jt.name as job_title_name,
+           pja.is_ad_interim, pja.is_unit_boss, pja.percentage
+    FROM unit_closure c
+    JOIN person_job_assignments pja ON pja.unit_id = c.descendant_id AND pja.is_current = 1
+    JOIN persons p ON pja.person_id = p.id
+    JOIN job_titles jt ON pja.job_title_id = jt.id
+    WHERE c.ancestor_id = ?
+    ORDER BY pja.unit_id, p.name
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.last_query_count = 0
+
+    def build_complete_tree(self, show_persons: bool = True) -> List[Dict[str, Any]]:
+        """Build the complete tree starting from all root units"""
+        units, persons_by_unit = self._load(show_persons)
+        children_by_parent = self._index_children(units)
+
+        roots = children_by_parent.get(None, [])
+        return [self._build_node(unit, 0, children_by_parent, persons_by_unit, show_persons)
+                for unit in roots]
+
+    def build_subtree(self, root_unit_id: int, show_persons: bool = True) -> List[Dict[str, Any]]:
+        """Build the subtree rooted at the given unit (empty list if it does not exist)"""
+        units, persons_by_unit = self._load(show_persons, root_unit_id)
+        root = next((unit for unit in units if unit['id'] == root_unit_id), None)
+        if root is None:
+            return []
+
+        children_by_parent = self._index_children(units)
+        return [self._build_node(root, 0, children_by_parent, persons_by_unit, show_persons)]
+
+    def _load(self, show_persons: bool, root_unit_id: Optional[int] = None):
+        """Load units and, optionally, current assignments grouped by unit id (all, or one subtree)"""
+        self.last_query_count = 0
+
+        if root_unit_id is None:
+            units = self._fetch_all(self.UNITS_QUERY)
+        else:
+            units = self._fetch_all(self.SUBTREE_UNITS_QUERY, (root_unit_id, root_unit_id))
+        units = [dict(row) for row in units]
+
+        persons_by_unit: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        if show_persons:
+            if root_unit_id is None:
+                rows = self._fetch_all(self.PERSONS_QUERY)
+            else:
+                rows = self._fetch_all(self.SUBTREE_PERSONS_QUERY, (root_unit_id,))
+            for row in rows:
+                person = dict(row)
+                persons_by_unit[person.pop('unit_id')].append(person)
+
+        logger.debug(f"Org tree loaded {len(units)} units with {self.last_query_count} queries")
+        return units, persons_by_unit
+
+    def _fetch_all(self, query: str, params: tuple = None):
+        self.last_query_count += 1
+        return self.db_manager.fetch_all(query, params)
+
+    @staticmethod
+    def _index_children(units: List[Dict[str, Any]]) -> Dict[Optional[int], List[Dict[str, Any]]]:
+        """
+        Group units by parent id (roots under None).
+
+        Siblings are sorted by the text form of their id, which matches the
+        ``ORDER BY path`` ordering of the former recursive query.
+        """
+        children_by_parent: Dict[Optional[int], List[Dict[str, Any]]] = defaultdict(list)
+        for unit in units:
+            parent_id = unit['parent_unit_id']
+            if parent_id == -1:
+                parent_id = None
+            children_by_parent[parent_id].append(unit)
+
+        for siblings in children_by_parent.values():
+            siblings.sort(key=lambda unit: str(unit['id']))
+        return children_by_parent
+
+    def _build_node(self, root: Dict[str, Any], root_level: int,
+                    children_by_parent: Dict[Optional[int], List[Dict[str, Any]]],
+                    persons_by_unit: Dict[int, List[Dict[str, Any]]],
+                    show_persons: bool) -> Dict[str, Any]:
+        """Build a node and its descendants iteratively (deep hierarchies don't hit recursion limits)"""
+        visited = set()
+
+        def make_node(unit: Dict[str, Any], level: int) -> Dict[str, Any]:
+            visited.add(unit['id'])
+            return {
+                'id': unit['id'],
+                'name': unit['name'],
+                'short_name': unit['short_name'],
+                'unit_type_id': unit['unit_type_id'],
+                'level': level,
+                'person_count': unit['person_count'],
+                'children_count': len(children_by_parent.get(unit['id'], [])),
+                'children': [],
+                'persons': [dict(person) for person in persons_by_unit.get(unit['id'], [])]
+                           if show_persons else None
+            }
+
+        root_node = make_node(root, root_level)
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            for child in children_by_parent.get(node['id'], []):
+                # Guard against cycles in parent_unit_id
+                if child['id'] in visited:
+                    continue
+                child_node = make_node(child, node['level'] + 1)
+                node['children'].append(child_node)
+                stack.append(child_node)
+
+        return root_node
@@ -15,6 +15,8 @@ logger = logging.getLogger(__name__)
 class PersonService(BaseService):
     """Person service class"""
     
+    invalidates_orgchart = True
+    
     def __init__(self):
         super().__init__(Person, "persons")
     
@@ -577,6 +579,7 @@ class PersonService(BaseService):
                 conn.execute("DELETE FROM persons WHERE id = ?", (source_person_id,))
                 
                 conn.commit()
+                self._after_write()
                 logger.info(f"Successfully merged person {source_person_id} into {target_person_id}")
                 return True
                 
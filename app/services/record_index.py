@@ -0,0 +1,105 @@
+"""
+Hash index of existing records for import conflict detection
+
+Built once per entity type from a single query and kept up to date while an
+import creates or updates rows, so matching an incoming record against the
+database is a dictionary lookup per unique constraint instead of a scan.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.entity_mappings import get_entity_mapping
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_KEY = ('id',)
+
+
+class ExistingRecordIndex:
+    """
+    Existing records of one entity type keyed on the primary key and on each
+    unique field combination.
+
+    Records may be table rows (dictionaries) or model instances. A key is only
+    indexed when none of its fields is None; when two records share a key the
+    first one added wins, as the first match of a scan would.
+    """
+
+    def __init__(self, combinations: Sequence[Sequence[str]], records: Iterable[Any] = ()):
+        self._records: Dict[int, Any] = {}
+        self._keys: Dict[Tuple[str, ...], Dict[Tuple, Any]] = {}
+        for combination in [PRIMARY_KEY, *combinations]:
+            self._keys.setdefault(tuple(combination), {})
+
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def for_entity(cls, entity_type: str, records: Iterable[Any] = ()) -> 'ExistingRecordIndex':
+        """Index on the unique constraints declared in the entity mapping"""
+        return cls(get_entity_mapping(entity_type).unique_constraints, records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _key(record: Any, combination: Tuple[str, ...]) -> Optional[Tuple]:
+        """Values of the combination's fields, or None if one is missing or unhashable"""
+        if isinstance(record, dict):
+            values = tuple(record.get(field_name) for field_name in combination)
+        else:
+            values = tuple(getattr(record, field_name, None) for field_name in combination)
+
+        if any(value is None for value in values):
+            return None
+        try:
+            hash(values)
+        except TypeError:
+            return None
+        return values
+
+    def add(self, record: Any) -> None:
+        """Index a record, e.g. one just created by the import"""
+        self._records[id(record)] = record
+        for combination, keys in self._keys.items():
+            key = self._key(record, combination)
+            if key is not None:
+                keys.setdefault(key, record)
+
+    def remove(self, record: Any) -> None:
+        """Drop a record and the keys that point to it"""
+        if self._records.pop(id(record), None) is None:
+            return
+        for combination, keys in self._keys.items():
+            key = self._key(record, combination)
+            if key is not None and keys.get(key) is record:
+                del keys[key]
+
+    def replace(self, old_record: Any, new_record: Any) -> None:
+        """Re-index a record whose values changed"""
+        self.remove(old_record)
+        self.add(new_record)
+
+    def find(self, combination: Sequence[str], record: Dict[str, Any]) -> Optional[Any]:
+        """Existing record with the same values as `record` for the combination's fields"""
+        combination = tuple(combination)
+        keys = self._keys.get(combination)
+        if keys is None:
+            # Combinations not declared up front are indexed on first use
+            keys = self._keys[combination] = {}
+            for existing in self._records.values():
+                key = self._key(existing, combination)
+                if key is not None:
+                    keys.setdefault(key, existing)
+
+        key = self._key(record, combination)
+        return keys.get(key) if key is not None else None
+
+    def find_first(self, record: Dict[str, Any], combinations: List[Sequence[str]]) -> Optional[Any]:
+        """First existing record matching `record` on any of the combinations, in order"""
+        for combination in combinations:
+            existing = self.find(combination, record)
+            if existing is not None:
+                return existing
+        return None
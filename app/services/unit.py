@@ -3,8 +3,11 @@ Unit service for business logic
 """
 
 import logging
+import sqlite3
+from contextlib import contextmanager
 from typing import List, Optional, Dict, Any
-from app.services.base import BaseService
+from app.services.base import BaseService, ServiceException
+from app.services.unit_closure import UnitClosure
 from app.services.unit_type import UnitTypeService
 from app.models.unit import Unit
 from app.models.assignment import Assignment
@@ -16,8 +19,11 @@ logger = logging.getLogger(__name__)
 class UnitService(BaseService):
     """Unit service class"""
     
+    invalidates_orgchart = True
+    
     def __init__(self):
         super().__init__(Unit, "units")
+        self.closure = UnitClosure(self.db_manager)
     
     def get_list_query(self) -> str:
         """Get query for listing all units with computed fields"""
@@ -99,6 +105,63 @@ class UnitService(BaseService):
             unit.id
         )
     
+    @contextmanager
+    def _hierarchy_transaction(self):
+        """Writer transaction covering a units write and its unit_closure rows"""
+        with self.db_manager.get_connection() as conn:
+            nested = conn.in_transaction
+            conn.execute("SAVEPOINT unit_hierarchy" if nested else "BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception as e:
+                if nested:
+                    # Undo only this write, the caller's transaction goes on
+                    conn.execute("ROLLBACK TO unit_hierarchy")
+                    conn.execute("RELEASE unit_hierarchy")
+                else:
+                    conn.rollback()
+                if isinstance(e, sqlite3.Error):
+                    logger.error(f"Error updating unit hierarchy: {e}")
+                    raise ServiceException("Failed to update unit hierarchy") from e
+                raise
+            if nested:
+                conn.execute("RELEASE unit_hierarchy")
+            else:
+                conn.commit()
+                # Trees cached while the transaction was open were built from the old hierarchy
+                self._after_write()
+    
+    def create(self, unit: Unit) -> Unit:
+        """Create unit and link it into the closure table"""
+        with self._hierarchy_transaction() as conn:
+            created = super().create(unit)
+            if created and created.id:
+                self.closure.add_unit(conn, created.id, created.parent_unit_id)
+        return created
+    
+    def update(self, unit: Unit) -> Unit:
+        """Update unit, moving its subtree in the closure table when the parent changes"""
+        with self._hierarchy_transaction() as conn:
+            existing = self.get_by_id(unit.id) if unit.id else None
+            updated = super().update(unit)
+            if existing and UnitClosure._parent(existing.parent_unit_id) != UnitClosure._parent(unit.parent_unit_id):
+                self.closure.move_subtree(conn, unit.id, unit.parent_unit_id)
+        return updated
+    
+    def _insert_many(self, conn, units: List[Unit]) -> None:
+        """Insert units in one statement and link them into the closure table"""
+        super()._insert_many(conn, units)
+        for unit in units:
+            self.closure.add_unit(conn, unit.id, unit.parent_unit_id)
+
+    def delete(self, id: int) -> bool:
+        """Delete unit and its closure rows"""
+        with self._hierarchy_transaction() as conn:
+            deleted = super().delete(id)
+            if deleted:
+                self.closure.remove_unit(conn, id)
+        return deleted
+    
     def get_root_units(self) -> List[Unit]:
         """Get all root units (no parent)"""
         try:
@@ -250,12 +313,6 @@ class UnitService(BaseService):
             if unit_id:
                 # Exclude self and descendants
                 query = """
-                WITH RECURSIVE descendants AS (
-                    SELECT id FROM units WHERE id = ?
-                    UNION ALL
-                    SELECT u.id FROM units u
-                    JOIN descendants d ON u.parent_unit_id = d.id
-                )
                 SELECT u.*,
                        ut.name unit_type,
                        ut.short_name unit_type_short,
@@ -264,7 +321,7 @@ class UnitService(BaseService):
                 FROM units u
                 LEFT JOIN units p ON u.parent_unit_id = p.id
                 LEFT JOIN unit_types ut ON u.unit_type_id = ut.id
-                WHERE u.id NOT IN (SELECT id FROM descendants)
+                WHERE u.id NOT IN (SELECT descendant_id FROM unit_closure WHERE ancestor_id = ?)
                 ORDER BY ut.short_name, u.name
                 """
                 rows = self.db_manager.fetch_all(query, (unit_id,))
@@ -341,6 +398,10 @@ class UnitService(BaseService):
                 from app.services.base import ServiceValidationException
                 raise ServiceValidationException("Unit cannot be its own parent")
             
+            if self.closure.is_descendant(unit.parent_unit_id, unit.id):
+                from app.services.base import ServiceValidationException
+                raise ServiceValidationException("Unit cannot be moved below one of its own descendants")
+            
             parent = self.get_by_id(unit.parent_unit_id)
             if not parent:
                 from app.services.base import ServiceValidationException
@@ -0,0 +1,157 @@
+"""
+Unit hierarchy closure table: one row per (ancestor, descendant) pair
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UnitClosure:
+    """
+    Maintains ``unit_closure(ancestor_id, descendant_id, depth)``.
+
+    Every unit has a depth 0 row for itself and one row for each of its
+    ancestors. Incremental changes take the writer connection so they join
+    the caller's transaction; ``rebuild`` recomputes the whole table from
+    ``units.parent_unit_id`` in one pass and ``check`` compares the stored
+    rows with that result.
+    """
+
+    # Walks up from every unit; the depth bound stops on parent_unit_id cycles
+    EXPECTED_CTE = """
+    WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM units
+        UNION ALL
+        SELECT p.id, c.descendant_id, c.depth + 1
+        FROM closure c
+        JOIN units u ON u.id = c.ancestor_id
+        JOIN units p ON p.id = u.parent_unit_id
+        WHERE c.depth < (SELECT COUNT(*) FROM units)
+    ),
+    expected AS (
+        SELECT ancestor_id, descendant_id, MIN(depth) AS depth
+        FROM closure
+        GROUP BY ancestor_id, descendant_id
+    )
+    """
+
+    EXPECTED_QUERY = EXPECTED_CTE + "SELECT ancestor_id, descendant_id, depth FROM expected"
+
+    DIFF_QUERY = EXPECTED_CTE + """
+    SELECT
+        (SELECT COUNT(*) FROM (
+            SELECT ancestor_id, descendant_id, depth FROM expected
+            EXCEPT
+            SELECT ancestor_id, descendant_id, depth FROM unit_closure
+        )) AS missing_rows,
+        (SELECT COUNT(*) FROM (
+            SELECT ancestor_id, descendant_id, depth FROM unit_closure
+            EXCEPT
+            SELECT ancestor_id, descendant_id, depth FROM expected
+        )) AS unexpected_rows
+    """
+
+    # Links every node of the subtree rooted at the 2nd parameter below the 1st
+    ATTACH_QUERY = """
+    INSERT OR IGNORE INTO unit_closure (ancestor_id, descendant_id, depth)
+    SELECT sup.ancestor_id, sub.descendant_id, sup.depth + sub.depth + 1
+    FROM unit_closure sup, unit_closure sub
+    WHERE sup.descendant_id = ? AND sub.ancestor_id = ?
+    """
+
+    # Drops the links between the subtree rooted at the unit and its ancestors
+    DETACH_QUERY = """
+    DELETE FROM unit_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM unit_closure WHERE ancestor_id = ?)
+      AND ancestor_id NOT IN (SELECT descendant_id FROM unit_closure WHERE ancestor_id = ?)
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    @staticmethod
+    def _parent(parent_unit_id: Optional[int]) -> Optional[int]:
+        """Parent id, or None for root units (NULL or -1)"""
+        if not parent_unit_id or parent_unit_id == -1:
+            return None
+        return parent_unit_id
+
+    @classmethod
+    def add_unit(cls, conn: sqlite3.Connection, unit_id: int, parent_unit_id: Optional[int]) -> None:
+        """Add a new unit below its parent"""
+        conn.execute(
+            "INSERT OR IGNORE INTO unit_closure (ancestor_id, descendant_id, depth) VALUES (?, ?, 0)",
+            (unit_id, unit_id)
+        )
+        parent_id = cls._parent(parent_unit_id)
+        if parent_id is not None and parent_id != unit_id:
+            conn.execute(cls.ATTACH_QUERY, (parent_id, unit_id))
+
+        # Children stored before their parent (imports in file order) hang below it now
+        children = conn.execute(
+            "SELECT id FROM units WHERE parent_unit_id = ? AND id != ?", (unit_id, unit_id)
+        ).fetchall()
+        for child in children:
+            conn.execute(cls.ATTACH_QUERY, (unit_id, child[0]))
+
+    @classmethod
+    def move_subtree(cls, conn: sqlite3.Connection, unit_id: int, new_parent_unit_id: Optional[int]) -> None:
+        """Move a unit, with all its descendants, below a new parent"""
+        conn.execute(cls.DETACH_QUERY, (unit_id, unit_id))
+        parent_id = cls._parent(new_parent_unit_id)
+        if parent_id is not None:
+            conn.execute(cls.ATTACH_QUERY, (parent_id, unit_id))
+
+    @classmethod
+    def remove_unit(cls, conn: sqlite3.Connection, unit_id: int) -> None:
+        """Remove a unit; any remaining children become separate subtrees"""
+        conn.execute(cls.DETACH_QUERY, (unit_id, unit_id))
+        conn.execute("DELETE FROM unit_closure WHERE ancestor_id = ? OR descendant_id = ?", (unit_id, unit_id))
+
+    @classmethod
+    def rebuild(cls, conn: sqlite3.Connection) -> int:
+        """Recompute the whole table from units, returns the number of rows"""
+        conn.execute("DELETE FROM unit_closure")
+        cursor = conn.execute(
+            f"INSERT INTO unit_closure (ancestor_id, descendant_id, depth) {cls.EXPECTED_QUERY}"
+        )
+        return cursor.rowcount
+
+    def is_descendant(self, unit_id: int, ancestor_id: int) -> bool:
+        """Whether unit_id lies in the subtree rooted at ancestor_id (itself included)"""
+        row = self.db_manager.fetch_one(
+            "SELECT 1 FROM unit_closure WHERE ancestor_id = ? AND descendant_id = ?",
+            (ancestor_id, unit_id)
+        )
+        return row is not None
+
+    def check(self, repair: bool = False) -> Dict[str, Any]:
+        """
+        Compare unit_closure with the hierarchy in units.
+
+        Args:
+            repair: Rebuild the table when it is inconsistent
+
+        Returns:
+            Dictionary with missing/unexpected row counts and whether it was rebuilt
+        """
+        with self.db_manager.get_connection() as conn:
+            missing, unexpected = conn.execute(self.DIFF_QUERY).fetchone()
+
+            result = {
+                'consistent': missing == 0 and unexpected == 0,
+                'missing_rows': missing,
+                'unexpected_rows': unexpected,
+                'rebuilt': False
+            }
+
+            if repair and not result['consistent']:
+                logger.warning(f"unit_closure inconsistent ({missing} missing, {unexpected} unexpected rows), rebuilding")
+                result['rows'] = self.rebuild(conn)
+                conn.commit()
+                result['rebuilt'] = True
+
+        return result
@@ -13,6 +13,8 @@ logger = logging.getLogger(__name__)
 class UnitTypeService(BaseService):
     """Service for managing unit types"""
 
+    invalidates_orgchart = True
+
     def __init__(self):
         super().__init__(UnitType, "unit_types")
 
@@ -159,6 +161,7 @@ class UnitTypeService(BaseService):
                 )
                 unit_type.id = cursor.lastrowid
                 conn.commit()
+                self._after_write()
 
                 logger.info(f"Created unit type: {unit_type.name} (ID: {unit_type.id})")
                 return self.get_by_id(unit_type.id)
@@ -186,6 +189,7 @@ class UnitTypeService(BaseService):
                     self.model_to_update_params(unit_type)
                 )
                 conn.commit()
+                self._after_write()
 
                 logger.info(f"Updated unit type: {unit_type.name} (ID: {unit_type.id})")
                 return self.get_by_id(unit_type.id)
@@ -198,19 +202,17 @@ class UnitTypeService(BaseService):
         """Check if unit type can be deleted"""
         try:
             db_manager = DatabaseManager()
-            with db_manager.get_connection() as conn:
-                # Check if unit type has associated units
-                cursor = conn.execute(
-                    "SELECT COUNT(*) as count FROM units WHERE unit_type_id = ?",
-                    (unit_type_id,)
-                )
-                result = cursor.fetchone()
-                units_count = result['count'] if result else 0
+            # Check if unit type has associated units
+            result = db_manager.fetch_one(
+                "SELECT COUNT(*) as count FROM units WHERE unit_type_id = ?",
+                (unit_type_id,)
+            )
+            units_count = result['count'] if result else 0
 
-                if units_count > 0:
-                    return False, f"Cannot delete unit type: {units_count} units are using this type"
+            if units_count > 0:
+                return False, f"Cannot delete unit type: {units_count} units are using this type"
 
-                return True, ""
+            return True, ""
 
         except Exception as e:
             logger.error(f"Error checking if unit type {unit_type_id} can be deleted: {e}")
@@ -220,15 +222,14 @@ class UnitTypeService(BaseService):
         """Get all units of a specific type"""
         try:
             db_manager = DatabaseManager()
-            with db_manager.get_connection() as conn:
-                cursor = conn.execute("""
-                    SELECT u.*
-                    FROM units u
-                    WHERE u.unit_type_id = ?
-                    ORDER BY u.name
-                """, (unit_type_id,))
-                from app.models.unit import Unit
-                return [Unit.from_sqlite_row(row) for row in cursor.fetchall()]
+            rows = db_manager.fetch_all("""
+                SELECT u.*
+                FROM units u
+                WHERE u.unit_type_id = ?
+                ORDER BY u.name
+            """, (unit_type_id,))
+            from app.models.unit import Unit
+            return [Unit.from_sqlite_row(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Error getting units for type {unit_type_id}: {e}")
@@ -238,32 +239,31 @@ class UnitTypeService(BaseService):
         """Get unit type statistics"""
         try:
             db_manager = DatabaseManager()
-            with db_manager.get_connection() as conn:
-                # Get unit type counts
-                cursor = conn.execute("""
-                    SELECT ut.name, ut.id, COUNT(u.id) as units_count
-                    FROM unit_types ut
-                    LEFT JOIN units u ON ut.id = u.unit_type_id
-                    GROUP BY ut.id, ut.name
-                    ORDER BY units_count DESC
-                """)
-
-                type_stats = []
-                total_units = 0
-                for row in cursor.fetchall():
-                    units_count = row['units_count']
-                    total_units += units_count
-                    type_stats.append({
-                        'id': row['id'],
-                        'name': row['name'],
-                        'units_count': units_count
-                    })
-
-                return {
-                    'total_types': len(type_stats),
-                    'total_units': total_units,
-                    'type_distribution': type_stats
-                }
+            # Get unit type counts
+            rows = db_manager.fetch_all("""
+                SELECT ut.name, ut.id, COUNT(u.id) as units_count
+                FROM unit_types ut
+                LEFT JOIN units u ON ut.id = u.unit_type_id
+                GROUP BY ut.id, ut.name
+                ORDER BY units_count DESC
+            """)
+
+            type_stats = []
+            total_units = 0
+            for row in rows:
+                units_count = row['units_count']
+                total_units += units_count
+                type_stats.append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'units_count': units_count
+                })
+
+            return {
+                'total_types': len(type_stats),
+                'total_units': total_units,
+                'type_distribution': type_stats
+            }
 
         except Exception as e:
             logger.error(f"Error getting unit type statistics: {e}")
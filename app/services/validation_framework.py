@@ -12,8 +12,8 @@ import logging
 import re
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Optional, Any, Union, Callable, Set
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Union, Callable, Set, Sequence, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 from ..models.base import ValidationError as BaseValidationError
@@ -81,6 +81,29 @@ class BusinessRule:
     validator: Callable[[Dict[str, Any]], Optional[str]]
     severity: ValidationSeverity = ValidationSeverity.ERROR
     applies_to_entities: Optional[Set[str]] = None
+    # Same check over a whole batch, one message (or None) per record
+    batch_validator: Optional[Callable[[List[Dict[str, Any]]], List[Optional[str]]]] = None
+
+
+def validate_distinct_values(validator: Callable[[Dict[str, Any]], Optional[str]],
+                             fields: Sequence[str]) -> Callable[[List[Dict[str, Any]]], List[Optional[str]]]:
+    """
+    Batch form of a record validator that only reads `fields`.
+    
+    The validator runs once per distinct combination of the fields' values,
+    records sharing one get the same message.
+    """
+    def validate_batch(records: List[Dict[str, Any]]) -> List[Optional[str]]:
+        messages = {}
+        results = []
+        for record in records:
+            key = tuple((type(value), value) for value in (record.get(field_name) for field_name in fields))
+            if key not in messages:
+                messages[key] = validator(record)
+            results.append(messages[key])
+        return results
+    
+    return validate_batch
 
 
 class ValidationFramework:
@@ -485,6 +508,7 @@ class ValidationFramework:
             name="date_range_validation",
             description="Start date must be before end date",
             validator=validate_date_range,
+            batch_validator=validate_distinct_values(validate_date_range, ('start_date', 'end_date')),
             applies_to_entities={'units', 'job_titles', 'assignments'}
         ))
         
@@ -512,6 +536,7 @@ class ValidationFramework:
             name="assignment_validity_validation",
             description="Assignment validity period must be valid",
             validator=validate_assignment_validity,
+            batch_validator=validate_distinct_values(validate_assignment_validity, ('valid_from', 'valid_to')),
             applies_to_entities={'assignments'}
         ))
         
@@ -534,6 +559,7 @@ class ValidationFramework:
             name="percentage_range_validation",
             description="Percentage must be between 0.0 and 1.0",
             validator=validate_percentage_range,
+            batch_validator=validate_distinct_values(validate_percentage_range, ('percentage',)),
             applies_to_entities={'assignments'}
         ))
         
@@ -746,14 +772,22 @@ class ValidationFramework:
         return errors
     
     def validate_records_batch(self, entity_type: str, records: List[Dict[str, Any]], 
-                             start_line: int = 1) -> List[ImportExportValidationError]:
+                             start_line: int = 1, columnar: bool = True) -> List[ImportExportValidationError]:
         """
         Validate a batch of records.
         
+        In columnar mode the batch is transposed into one column per field and
+        each field rule is applied to the whole column, validating every
+        distinct value once; business rules run over the whole batch. The
+        errors, their order and line numbers are the same as validating each
+        record with validate_record. Field custom validators are assumed to
+        depend on the value only.
+        
         Args:
             entity_type: Type of entity being validated
             records: List of records to validate
             start_line: Starting line number for error reporting
+            columnar: Validate column by column instead of record by record
             
         Returns:
             List of validation errors
@@ -761,6 +795,9 @@ class ValidationFramework:
         errors = []
         
         try:
+            if columnar:
+                return self._validate_records_columnar(entity_type, records, start_line)
+            
             for i, record in enumerate(records):
                 line_number = start_line + i
                 record_errors = self.validate_record(entity_type, record, line_number)
@@ -777,6 +814,122 @@ class ValidationFramework:
         
         return errors
     
+    def _validate_records_columnar(self, entity_type: str, records: List[Dict[str, Any]],
+                                   start_line: int) -> List[ImportExportValidationError]:
+        """Columnar implementation of validate_records_batch"""
+        entity_rules = self.field_rules.get(entity_type, {})
+        
+        # Transpose the batch into (row, value) columns of the fields with a rule
+        columns: Dict[str, List[Tuple[int, Any]]] = {}
+        for row, record in enumerate(records):
+            for field_name, value in record.items():
+                if field_name in entity_rules:
+                    columns.setdefault(field_name, []).append((row, value))
+        
+        field_errors = {
+            field_name: self._validate_column(entity_type, entity_rules[field_name], column)
+            for field_name, column in columns.items()
+        }
+        rule_results = [
+            (rule, self._apply_business_rule_batch(rule, entity_type, records))
+            for rule in self.get_business_rules(entity_type)
+        ]
+        required_fields = [field_name for field_name, field_rule in entity_rules.items() if field_rule.required]
+        
+        # Assemble per record, in the order validate_record reports errors
+        errors = []
+        for row, record in enumerate(records):
+            line_number = start_line + row
+            
+            for field_name in record:
+                for error in field_errors.get(field_name, {}).get(row, ()):
+                    errors.append(replace(error, line_number=line_number) if line_number else replace(error))
+            
+            for field_name in required_fields:
+                if field_name not in record:
+                    errors.append(ImportExportValidationError(
+                        field=field_name,
+                        message=f"Required field '{field_name}' is missing from record",
+                        error_type=ImportErrorType.MISSING_REQUIRED_FIELD,
+                        entity_type=entity_type,
+                        line_number=line_number
+                    ))
+            
+            for rule, results in rule_results:
+                message, failure = results[row]
+                if failure is not None:
+                    errors.append(ImportExportValidationError(
+                        field=rule.name,
+                        message=f"Business rule validation failed: {str(failure)}",
+                        error_type=ImportErrorType.BUSINESS_RULE_VIOLATION,
+                        entity_type=entity_type,
+                        line_number=line_number
+                    ))
+                elif message:
+                    errors.append(ImportExportValidationError(
+                        field=rule.name,
+                        message=message,
+                        error_type=ImportErrorType.BUSINESS_RULE_VIOLATION,
+                        entity_type=entity_type,
+                        line_number=line_number
+                    ))
+        
+        return errors
+    
+    def _validate_column(self, entity_type: str, field_rule: FieldValidationRule,
+                         column: List[Tuple[int, Any]]) -> Dict[int, List[ImportExportValidationError]]:
+        """
+        Validate a column of (row, value) pairs against a field rule.
+        
+        Returns:
+            Errors by row, for the rows with errors; rows with the same value
+            share the same error objects
+        """
+        field_name = field_rule.field_name
+        skip_empty = field_rule.nullable and not field_rule.required
+        errors_by_row = {}
+        errors_by_value = {}
+        
+        for row, value in column:
+            # Empty values of optional fields are always valid
+            if skip_empty and (value is None or value == ''):
+                continue
+            
+            try:
+                key = (type(value), value)
+                value_errors = errors_by_value.get(key)
+                if value_errors is None:
+                    value_errors = errors_by_value[key] = self.validate_field_value(entity_type, field_name, value)
+            except TypeError:
+                # Unhashable values (lists, dicts) are validated one by one
+                value_errors = self.validate_field_value(entity_type, field_name, value)
+            
+            if value_errors:
+                errors_by_row[row] = value_errors
+        
+        return errors_by_row
+    
+    def _apply_business_rule_batch(self, rule: BusinessRule, entity_type: str,
+                                   records: List[Dict[str, Any]]) -> List[Tuple[Optional[str], Optional[Exception]]]:
+        """(message, exception) of a business rule for each record of a batch"""
+        if rule.batch_validator is not None:
+            try:
+                messages = rule.batch_validator(records)
+                if len(messages) == len(records):
+                    return [(message, None) for message in messages]
+            except Exception as e:
+                # Run it record by record so failures are reported on their own line
+                logger.debug(f"Batch form of business rule '{rule.name}' failed, applying it per record: {e}")
+        
+        results = []
+        for record in records:
+            try:
+                results.append((rule.validator(record), None))
+            except Exception as e:
+                logger.error(f"Business rule '{rule.name}' failed for {entity_type}: {e}")
+                results.append((None, e))
+        return results
+    
     def validate_foreign_key_constraints(self, entity_type: str, records: List[Dict[str, Any]], 
                                        reference_map: Dict[str, Set[Any]]) -> List[ImportExportValidationError]:
         """
@@ -7,15 +7,37 @@ and error categorization with severity levels for comprehensive error tracking.
 
 import logging
 import json
+import queue
+import random
+import threading
 import traceback
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Generic, List, Optional, Any, Tuple, TypeVar, Union
 from dataclasses import dataclass, field, asdict
 
 from ..models.import_export import ImportExportValidationError, ImportErrorType
 
+DEFAULT_ERROR_LOG_QUEUE_SIZE = 10000
+DEFAULT_ERROR_RECORD_INLINE_BYTES = 0
+
+# Lines appended per open of a structured error file
+WRITE_BATCH_SIZE = 1000
+
+T = TypeVar('T')
+
+
+def _error_log_settings() -> Tuple[int, int]:
+    """Configured (queued structured error lines, largest record data kept inline in bytes, 0 = all)"""
+    try:
+        from ..config import get_settings
+        performance = get_settings().performance
+        return performance.error_log_queue_size, performance.error_record_inline_bytes
+    except ImportError:
+        logging.getLogger(__name__).warning("Configuration not available, using default error log settings")
+        return DEFAULT_ERROR_LOG_QUEUE_SIZE, DEFAULT_ERROR_RECORD_INLINE_BYTES
+
 
 class ErrorSeverity(Enum):
     """Error severity levels for categorization."""
@@ -79,6 +101,76 @@ class StructuredError:
         )
 
 
+class ErrorSample(Generic[T]):
+    """
+    Bounded sample of the items of one error bucket: the first `first` items
+    and a uniform reservoir sample of `reservoir_size` of the others.
+    """
+    
+    def __init__(self, first: int, reservoir_size: int, rng: Optional[random.Random] = None):
+        self.first_limit = first
+        self.reservoir_size = reservoir_size
+        self.rng = rng or random.Random()
+        self.first: List[T] = []
+        self.reservoir: List[T] = []
+        self.seen = 0
+    
+    def add(self, item: T) -> Tuple[bool, Optional[T]]:
+        """Offer an item, returning (kept, item it replaced in the sample)"""
+        self.seen += 1
+        if len(self.first) < self.first_limit:
+            self.first.append(item)
+            return True, None
+        
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(item)
+            return True, None
+        
+        index = self.rng.randrange(self.seen - len(self.first))
+        if index < self.reservoir_size:
+            evicted, self.reservoir[index] = self.reservoir[index], item
+            return True, evicted
+        return False, None
+    
+    @property
+    def items(self) -> List[T]:
+        """Items kept, the first ones then the sample"""
+        return self.first + self.reservoir
+
+
+class TopKCounter:
+    """
+    Approximate counts of the `capacity` most frequent keys (Space-Saving).
+    
+    A new key replaces the least counted one and inherits its count, so the
+    counts are upper bounds that are exact while fewer keys than the capacity
+    have been seen.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+    
+    def add(self, key: str, count: int = 1):
+        """Count a key"""
+        if key not in self.counts and len(self.counts) >= self.capacity:
+            least = min(self.counts, key=self.counts.get)
+            self.counts[key] = self.counts.pop(least)
+        self.counts[key] = self.counts.get(key, 0) + count
+    
+    def most_common(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Keys by decreasing count"""
+        return sorted(self.counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+
+def _remove_item(items: List[Any], item: Any):
+    """Remove an item from a list by identity"""
+    for index, candidate in enumerate(items):
+        if candidate is item:
+            del items[index]
+            return
+
+
 @dataclass
 class ErrorReport:
     """Comprehensive error report for operations."""
@@ -93,10 +185,21 @@ class ErrorReport:
     errors_by_entity: Dict[str, int] = field(default_factory=dict)
     line_errors: Dict[int, List[StructuredError]] = field(default_factory=dict)
     structured_errors: List[StructuredError] = field(default_factory=list)
+    # With a sample size, only a sample of the errors is kept per entity, error type and field
+    sample_first: int = 0
+    sample_reservoir: int = 0
+    samples: Dict[Tuple, ErrorSample] = field(default_factory=dict, repr=False)
+    
+    @property
+    def sampled(self) -> bool:
+        """Whether only a sample of the errors is kept (the counters are exact)"""
+        return self.sample_first > 0 or self.sample_reservoir > 0
     
     def add_error(self, error: StructuredError):
         """Add a structured error to the report."""
-        self.structured_errors.append(error)
+        kept = self._keep_error(error)
+        if kept:
+            self.structured_errors.append(error)
         
         # Update counters
         if error.severity in [ErrorSeverity.CRITICAL, ErrorSeverity.ERROR]:
@@ -117,11 +220,30 @@ class ErrorReport:
             self.errors_by_entity[error.entity_type] = self.errors_by_entity.get(error.entity_type, 0) + 1
         
         # Update line-specific errors
-        if error.line_number:
+        if error.line_number and kept:
             if error.line_number not in self.line_errors:
                 self.line_errors[error.line_number] = []
             self.line_errors[error.line_number].append(error)
     
+    def _keep_error(self, error: StructuredError) -> bool:
+        """Whether to keep the error, dropping the one it replaces in its sample"""
+        if not self.sampled:
+            return True
+        
+        bucket = (error.entity_type, error.error_type.value, error.field_name)
+        if bucket not in self.samples:
+            self.samples[bucket] = ErrorSample(self.sample_first, self.sample_reservoir)
+        kept, evicted = self.samples[bucket].add(error)
+        
+        if evicted is not None:
+            _remove_item(self.structured_errors, evicted)
+            line_errors = self.line_errors.get(evicted.line_number)
+            if line_errors is not None:
+                _remove_item(line_errors, evicted)
+                if not line_errors:
+                    del self.line_errors[evicted.line_number]
+        return kept
+    
     def get_errors_by_line(self, line_number: int) -> List[StructuredError]:
         """Get all errors for a specific line number."""
         return self.line_errors.get(line_number, [])
@@ -147,17 +269,73 @@ class ErrorReport:
             'errors_by_category': self.errors_by_category,
             'errors_by_entity': self.errors_by_entity,
             'line_errors': {str(k): [e.to_dict() for e in v] for k, v in self.line_errors.items()},
-            'structured_errors': [error.to_dict() for error in self.structured_errors]
+            'structured_errors': [error.to_dict() for error in self.structured_errors],
+            'errors_sampled': self.sampled
         }
 
 
+class _StructuredErrorWriter(threading.Thread):
+    """
+    Thread appending queued lines to the structured error files.
+    
+    The queue is bounded, so a flood of errors waits for the disk instead of
+    piling up in memory; the lines waiting are appended together, with one
+    open per file.
+    """
+    
+    def __init__(self, error_logger: 'ErrorLogger', queue_size: int):
+        super().__init__(name="structured-error-writer", daemon=True)
+        self.error_logger = error_logger
+        self.queue: "queue.Queue[Optional[Tuple[Path, str]]]" = queue.Queue(maxsize=queue_size)
+    
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            
+            if batch[-1] is None:
+                return
+    
+    def _write(self, items: List[Tuple[Path, str]]):
+        """Append the serialized lines to their files"""
+        lines_by_file: Dict[Path, List[str]] = {}
+        for path, line in items:
+            lines_by_file.setdefault(path, []).append(line)
+        
+        for path, lines in lines_by_file.items():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+            except Exception as e:
+                self.error_logger.logger.error(f"Failed to save {len(lines)} structured errors to {path}: {e}")
+
+
 class ErrorLogger:
-    """Enhanced error logger with structured logging capabilities."""
+    """
+    Enhanced error logger with structured logging capabilities.
+    
+    Structured errors are appended to the daily JSONL file by a background
+    writer; flush_structured_errors() waits until those queued are written.
+    """
     
     def __init__(self, log_directory: str = "logs"):
         """Initialize error logger with specified log directory."""
         self.log_directory = Path(log_directory)
         self.log_directory.mkdir(exist_ok=True)
+        self.queue_size, self.record_inline_bytes = _error_log_settings()
+        self._writer: Optional[_StructuredErrorWriter] = None
+        self._writer_lock = threading.Lock()
         
         # Set up structured logger
         self.logger = logging.getLogger("import_export_errors")
@@ -186,12 +364,26 @@ class ErrorLogger:
         
         self.error_reports: Dict[str, ErrorReport] = {}
     
-    def create_error_report(self, operation_id: str, operation_type: str) -> ErrorReport:
-        """Create a new error report for an operation."""
+    def create_error_report(
+        self,
+        operation_id: str,
+        operation_type: str,
+        sample_first: int = 0,
+        sample_reservoir: int = 0
+    ) -> ErrorReport:
+        """
+        Create a new error report for an operation.
+        
+        With sample sizes the report keeps, per entity, error type and field,
+        only the first `sample_first` errors and a random sample of
+        `sample_reservoir` others; its counts stay exact.
+        """
         report = ErrorReport(
             operation_id=operation_id,
             operation_type=operation_type,
-            start_time=datetime.now()
+            start_time=datetime.now(),
+            sample_first=sample_first,
+            sample_reservoir=sample_reservoir
         )
         self.error_reports[operation_id] = report
         
@@ -282,7 +474,7 @@ class ErrorLogger:
         
         context = {}
         if record_data:
-            context['record_data'] = record_data
+            context = self.record_context(operation_id, line_number, entity_type, record_data)
         
         return self.log_structured_error(
             operation_id=operation_id,
@@ -306,6 +498,9 @@ class ErrorLogger:
         report = self.error_reports[operation_id]
         report.end_time = datetime.now()
         
+        # The structured error files are complete with the report
+        self.flush_structured_errors()
+        
         # Save report to file
         report_file = self.log_directory / f"error_report_{operation_id}.json"
         try:
@@ -322,6 +517,61 @@ class ErrorLogger:
         """Get error report for an operation."""
         return self.error_reports.get(operation_id)
     
+    def store_record_data(
+        self,
+        operation_id: str,
+        line_number: int,
+        entity_type: str,
+        record_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Save the data of an import record once, in the operation's error
+        records file, for its errors to refer to instead of carrying a copy.
+        
+        Returns:
+            Reference to the saved record data: {'record_ref': {'file', 'line_number'}}
+        """
+        records_file = self.log_directory / "error_records" / f"error_records_{operation_id}.jsonl"
+        self._append(records_file, {
+            'line_number': line_number,
+            'entity_type': entity_type,
+            'record_data': record_data
+        })
+        return {'record_ref': {'file': str(records_file), 'line_number': line_number}}
+    
+    def record_context(
+        self,
+        operation_id: str,
+        line_number: int,
+        entity_type: str,
+        record_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Error context with the data of an import record: the data itself, or a
+        reference to it saved by store_record_data() when it is larger than
+        ERROR_RECORD_INLINE_BYTES.
+        """
+        if self.record_inline_bytes > 0:
+            size = len(json.dumps(record_data, default=str))
+            if size > self.record_inline_bytes:
+                return self.store_record_data(operation_id, line_number, entity_type, record_data)
+        return {'record_data': record_data}
+    
+    def flush_structured_errors(self):
+        """Wait until the queued structured errors are written."""
+        writer = self._writer
+        if writer is not None:
+            writer.queue.join()
+    
+    def close(self):
+        """Write the queued structured errors and stop the writer (application shutdown)."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                writer.queue.put(None)
+        if writer is not None:
+            writer.join()
+    
     def _format_log_message(self, error: StructuredError) -> str:
         """Format structured error for standard logging."""
         parts = [f"[{error.operation_id}]"]
@@ -346,17 +596,31 @@ class ErrorLogger:
         return " ".join(parts)
     
     def _save_structured_error_to_file(self, error: StructuredError):
-        """Save individual structured error to JSON file."""
+        """Queue a structured error for the JSONL file of its day (one JSON object per line)."""
+        error_file = self.log_directory / f"structured_errors_{error.timestamp.strftime('%Y%m%d')}.jsonl"
+        self._append(error_file, error)
+    
+    def _append(self, path: Path, item: Any):
+        """
+        Queue an item for the writer, waiting while the queue is full.
+        
+        The item, a StructuredError or a JSON-ready dict, is serialized here so
+        the line written is the error as logged, even if the caller later
+        changes the record data or context it refers to.
+        """
         try:
-            error_file = self.log_directory / f"structured_errors_{datetime.now().strftime('%Y%m%d')}.jsonl"
-            
-            # Append to JSONL file (one JSON object per line)
-            with open(error_file, 'a', encoding='utf-8') as f:
-                json.dump(error.to_dict(), f, ensure_ascii=False)
-                f.write('\n')
-        
+            data = item.to_dict() if isinstance(item, StructuredError) else item
+            line = json.dumps(data, ensure_ascii=False) + '\n'
         except Exception as e:
             self.logger.error(f"Failed to save structured error to file: {e}")
+            return
+        
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _StructuredErrorWriter(self, self.queue_size)
+                self._writer.start()
+            # Queued under the lock, so close() cannot stop the writer in between
+            self._writer.queue.put((path, line))
 
 
 # Global error logger instance
@@ -371,6 +635,12 @@ def get_error_logger() -> ErrorLogger:
     return _error_logger
 
 
+def shutdown_error_logger():
+    """Write the queued structured errors of the global error logger (application shutdown)."""
+    if _error_logger is not None:
+        _error_logger.close()
+
+
 def log_import_error(
     operation_id: str,
     message: str,
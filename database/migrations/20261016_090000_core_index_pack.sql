@@ -0,0 +1,38 @@
+-- Migration: Core index pack
+-- Description: Secondary indexes for the hot join and filter columns of units and person_job_assignments
+-- Created: 2026-10-16T09:00:00
+-- Version: 20261016_090000_core_index_pack
+
+-- =============================================================================
+-- UP MIGRATION
+-- =============================================================================
+
+-- Units: hierarchy traversal (children, siblings, span of control) and type lookups
+CREATE INDEX IF NOT EXISTS idx_units_parent_unit_id ON units(parent_unit_id);
+CREATE INDEX IF NOT EXISTS idx_units_unit_type_id ON units(unit_type_id);
+
+-- Assignments: version history and next-version lookups by combination.
+-- Not UNIQUE on purpose, existing databases may hold duplicate versions.
+CREATE INDEX IF NOT EXISTS idx_pja_person_unit_job_version
+    ON person_job_assignments(person_id, unit_id, job_title_id, version);
+
+-- Assignments: all versions by unit / job title (unit views, FK checks on delete)
+CREATE INDEX IF NOT EXISTS idx_pja_unit_id ON person_job_assignments(unit_id);
+CREATE INDEX IF NOT EXISTS idx_pja_job_title_id ON person_job_assignments(job_title_id);
+
+-- Current assignments only (partial): person counts per unit, vacancy checks,
+-- org tree persons and per-person workload. Covering for the aggregates.
+CREATE INDEX IF NOT EXISTS idx_pja_current_unit
+    ON person_job_assignments(unit_id, person_id) WHERE is_current = 1;
+CREATE INDEX IF NOT EXISTS idx_pja_current_person
+    ON person_job_assignments(person_id, percentage) WHERE is_current = 1;
+
+-- =============================================================================
+-- ROLLBACK MIGRATION
+-- DROP INDEX IF EXISTS idx_pja_current_person;
+-- DROP INDEX IF EXISTS idx_pja_current_unit;
+-- DROP INDEX IF EXISTS idx_pja_job_title_id;
+-- DROP INDEX IF EXISTS idx_pja_unit_id;
+-- DROP INDEX IF EXISTS idx_pja_person_unit_job_version;
+-- DROP INDEX IF EXISTS idx_units_unit_type_id;
+-- DROP INDEX IF EXISTS idx_units_parent_unit_id;
@@ -0,0 +1,138 @@
+-- Migration: Unit closure table
+-- Description: Materialized ancestor/descendant pairs of the unit hierarchy, backfilled from units; hierarchy views read from it
+-- Created: 2026-10-16T10:00:00
+-- Version: 20261016_100000_unit_closure
+
+-- =============================================================================
+-- UP MIGRATION
+-- =============================================================================
+
+-- Table: unit_closure (ancestor/descendant pairs of the unit hierarchy, maintained by UnitService)
+CREATE TABLE IF NOT EXISTS unit_closure (
+  ancestor_id INTEGER NOT NULL,
+  descendant_id INTEGER NOT NULL,
+  depth INTEGER NOT NULL,
+
+  PRIMARY KEY (ancestor_id, descendant_id),
+  FOREIGN KEY (ancestor_id) REFERENCES units (id) ON DELETE CASCADE,
+  FOREIGN KEY (descendant_id) REFERENCES units (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Index: unit_closure by descendant (ancestor paths)
+CREATE INDEX IF NOT EXISTS idx_unit_closure_descendant ON unit_closure (descendant_id, depth);
+
+-- =============================================================================
+-- DATA MIGRATION
+-- =============================================================================
+
+-- Backfill from units.parent_unit_id (same rows as UnitClosure.rebuild)
+DELETE FROM unit_closure;
+INSERT INTO unit_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM units
+        UNION ALL
+        SELECT p.id, c.descendant_id, c.depth + 1
+        FROM closure c
+        JOIN units u ON u.id = c.ancestor_id
+        JOIN units p ON p.id = u.parent_unit_id
+        WHERE c.depth < (SELECT COUNT(*) FROM units)
+    )
+    SELECT ancestor_id, descendant_id, MIN(depth) AS depth
+    FROM closure
+    GROUP BY ancestor_id, descendant_id;
+
+-- Hierarchy views: levels and paths from the closure table instead of recursive CTEs
+DROP VIEW IF EXISTS get_complete_tree;
+CREATE VIEW get_complete_tree AS WITH unit_tree AS
+(
+SELECT u.id,
+   u.unit_name AS name,
+   u.unit_short_name AS short_name,
+   u.unit_type_id,
+   u.parent_unit_id,
+   c.depth AS level,
+   (SELECT group_concat(a.id, '/')
+      FROM (SELECT ac.ancestor_id AS id
+              FROM unit_closure ac
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS path,
+   (SELECT group_concat(ifnull(a.unit_short_name, a.unit_name), ' > ')
+      FROM (SELECT au.unit_short_name, au.unit_name
+              FROM unit_closure ac
+              JOIN units_types au ON au.id = ac.ancestor_id
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS short_path,
+   (SELECT group_concat(a.unit_name, ' > ')
+      FROM (SELECT au.unit_name
+              FROM unit_closure ac
+              JOIN units_types au ON au.id = ac.ancestor_id
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS full_path
+FROM units_types r
+ JOIN
+ unit_closure c ON c.ancestor_id = r.id
+ JOIN
+ units_types u ON u.id = c.descendant_id
+WHERE r.parent_unit_id IS NULL OR
+  r.parent_unit_id = -1
+)
+SELECT ut.*,
+ COUNT(DISTINCT pja.person_id) AS person_count,
+ COUNT(DISTINCT child_units.id) AS children_count
+FROM unit_tree ut
+LEFT JOIN
+person_job_assignments pja ON ut.id = pja.unit_id AND
+                             pja.is_current = 1
+LEFT JOIN
+units child_units ON child_units.parent_unit_id = ut.id
+GROUP BY ut.id,
+   ut.name,
+   ut.short_name,
+   ut.unit_type_id,
+   ut.parent_unit_id,
+   ut.level,
+   ut.path
+  ORDER BY ut.path;
+
+DROP VIEW IF EXISTS units_hierarchy;
+CREATE VIEW units_hierarchy AS SELECT u.id,
+       u.unit_name name,
+       u.unit_short_name AS short_name,
+       u.unit_type,
+       u.unit_type_short,
+       u.parent_unit_id,
+       c.depth AS level,
+       (SELECT group_concat(a.id, '/')
+          FROM (SELECT ac.ancestor_id AS id
+                  FROM unit_closure ac
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS path,
+       (SELECT group_concat(ifnull(a.unit_short_name, a.unit_name), ' > ')
+          FROM (SELECT au.unit_short_name, au.unit_name
+                  FROM unit_closure ac
+                  JOIN units_types au ON au.id = ac.ancestor_id
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS short_path,
+       (SELECT group_concat(a.unit_name, ' > ')
+          FROM (SELECT au.unit_name
+                  FROM unit_closure ac
+                  JOIN units_types au ON au.id = ac.ancestor_id
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS full_path
+  FROM units_types r
+       JOIN
+       unit_closure c ON c.ancestor_id = r.id
+       JOIN
+       units_types u ON u.id = c.descendant_id
+ WHERE r.parent_unit_id IS NULL OR
+       r.parent_unit_id = -1
+ ORDER BY path;
+
+-- =============================================================================
+-- ROLLBACK MIGRATION
+-- DROP VIEW IF EXISTS units_hierarchy;
+-- DROP VIEW IF EXISTS get_complete_tree;
+-- CREATE VIEW units_hierarchy AS WITH RECURSIVE unit_tree AS ( SELECT id, unit_name name, unit_short_name AS short_name, unit_type, unit_type_short, parent_unit_id, 0 AS level, CAST (id AS TEXT) AS path, ifnull(unit_short_name, unit_name) AS short_path, unit_name AS full_path FROM units_types WHERE parent_unit_id IS NULL OR parent_unit_id = -1 UNION ALL SELECT u.id, u.unit_name, u.unit_short_name, u.unit_type, u.unit_type_short, u.parent_unit_id, ut.level + 1, ut.path || '/' || CAST (u.id AS TEXT), ut.short_path || ' > ' || ifnull(u.unit_short_name, u.unit_name), ut.full_path || ' > ' || u.unit_name FROM units_types u JOIN unit_tree ut ON u.parent_unit_id = ut.id ) SELECT * FROM unit_tree ORDER BY path;
+-- CREATE VIEW get_complete_tree AS WITH RECURSIVE unit_tree AS ( SELECT u.id, u.unit_name AS name, u.unit_short_name AS short_name, u.unit_type_id, u.parent_unit_id, 0 AS level, CAST (u.id AS TEXT) AS path, ifnull(unit_short_name,unit_name) AS short_path, unit_name AS full_path FROM units_types u WHERE u.parent_unit_id IS NULL OR u.parent_unit_id = -1 UNION ALL SELECT u.id, u.unit_name AS name, u.unit_short_name AS short_name, u.unit_type_id, u.parent_unit_id, ut.level + 1, ut.path || '/' || CAST (u.id AS TEXT), ut.short_path || ' > ' || ifnull(u.unit_short_name,u.unit_name), ut.full_path || ' > ' || u.unit_name FROM units_types u JOIN unit_tree ut ON u.parent_unit_id = ut.id ) SELECT ut.*, COUNT(DISTINCT pja.person_id) AS person_count, COUNT(DISTINCT child_units.id) AS children_count FROM unit_tree ut LEFT JOIN person_job_assignments pja ON ut.id = pja.unit_id AND pja.is_current = 1 LEFT JOIN units child_units ON child_units.parent_unit_id = ut.id GROUP BY ut.id, ut.name, ut.short_name, ut.unit_type_id, ut.parent_unit_id, ut.level, ut.path ORDER BY ut.path;
+-- DROP INDEX IF EXISTS idx_unit_closure_descendant;
+-- DROP TABLE IF EXISTS unit_closure;
@@ -94,6 +94,20 @@ CREATE TABLE IF NOT EXISTS units (
   FOREIGN KEY (parent_unit_id) REFERENCES units (id)
 );
 
+-- Table: unit_closure (ancestor/descendant pairs of the unit hierarchy, maintained by UnitService)
+CREATE TABLE IF NOT EXISTS unit_closure (
+  ancestor_id INTEGER NOT NULL,
+  descendant_id INTEGER NOT NULL,
+  depth INTEGER NOT NULL,
+
+  PRIMARY KEY (ancestor_id, descendant_id),
+  FOREIGN KEY (ancestor_id) REFERENCES units (id) ON DELETE CASCADE,
+  FOREIGN KEY (descendant_id) REFERENCES units (id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Index: unit_closure by descendant (ancestor paths)
+CREATE INDEX IF NOT EXISTS idx_unit_closure_descendant ON unit_closure (descendant_id, depth);
+
 -- View: assignment_history
 CREATE VIEW IF NOT EXISTS assignment_history AS SELECT p.id AS person_id,
        p.name AS person_name,
@@ -152,33 +166,38 @@ FROM person_job_assignments pja
  WHERE pja.is_current = 1;
 
 -- View: get_complete_tree
-CREATE VIEW IF NOT EXISTS get_complete_tree AS WITH RECURSIVE unit_tree AS
+CREATE VIEW IF NOT EXISTS get_complete_tree AS WITH unit_tree AS
 (
 SELECT u.id,
    u.unit_name AS name,
    u.unit_short_name AS short_name,
    u.unit_type_id,
    u.parent_unit_id,
-   0 AS level,
-   CAST (u.id AS TEXT) AS path,
-   ifnull(unit_short_name,unit_name) AS short_path,
-   unit_name AS full_path
-FROM units_types u
-WHERE u.parent_unit_id IS NULL OR
-  u.parent_unit_id = -1
-UNION ALL
-SELECT u.id,
-   u.unit_name AS name,
-   u.unit_short_name AS short_name,
-   u.unit_type_id,
-   u.parent_unit_id,
-   ut.level + 1,
-   ut.path || '/' || CAST (u.id AS TEXT),
-   ut.short_path || ' > ' || ifnull(u.unit_short_name,u.unit_name),
-   ut.full_path || ' > ' || u.unit_name
-FROM units_types u
+   c.depth AS level,
+   (SELECT group_concat(a.id, '/')
+      FROM (SELECT ac.ancestor_id AS id
+              FROM unit_closure ac
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS path,
+   (SELECT group_concat(ifnull(a.unit_short_name, a.unit_name), ' > ')
+      FROM (SELECT au.unit_short_name, au.unit_name
+              FROM unit_closure ac
+              JOIN units_types au ON au.id = ac.ancestor_id
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS short_path,
+   (SELECT group_concat(a.unit_name, ' > ')
+      FROM (SELECT au.unit_name
+              FROM unit_closure ac
+              JOIN units_types au ON au.id = ac.ancestor_id
+             WHERE ac.descendant_id = u.id
+             ORDER BY ac.depth DESC) a) AS full_path
+FROM units_types r
+ JOIN
+ unit_closure c ON c.ancestor_id = r.id
  JOIN
- unit_tree ut ON u.parent_unit_id = ut.id
+ units_types u ON u.id = c.descendant_id
+WHERE r.parent_unit_id IS NULL OR
+  r.parent_unit_id = -1
 )
 SELECT ut.*,
  COUNT(DISTINCT pja.person_id) AS person_count,
@@ -225,37 +244,37 @@ ORDER BY u.unit_type_id,
    u.name;
 
 -- View: units_hierarchy
-CREATE VIEW IF NOT EXISTS units_hierarchy AS WITH RECURSIVE unit_tree AS (-- Nodi radice (parent_unit_id = -1 o NULL)
-    SELECT id,
-           unit_name name,
-           unit_short_name AS short_name,
-           unit_type,
-           unit_type_short,
-           parent_unit_id,
-           0 AS level,
-           CAST (id AS TEXT) AS path,
-           ifnull(unit_short_name, unit_name) AS short_path,
-           unit_name AS full_path
-      FROM units_types
-     WHERE parent_unit_id IS NULL OR
-           parent_unit_id = -1
-    UNION ALL-- Nodi figli
-    SELECT u.id,
-           u.unit_name,
-           u.unit_short_name,
-           u.unit_type,
-           u.unit_type_short,
-           u.parent_unit_id,
-           ut.level + 1,
-           ut.path || '/' || CAST (u.id AS TEXT),
-           ut.short_path || ' > ' || ifnull(u.unit_short_name, u.unit_name),
-           ut.full_path || ' > ' || u.unit_name
-      FROM units_types u
-           JOIN
-           unit_tree ut ON u.parent_unit_id = ut.id
-)
-SELECT *
-  FROM unit_tree
+CREATE VIEW IF NOT EXISTS units_hierarchy AS SELECT u.id,
+       u.unit_name name,
+       u.unit_short_name AS short_name,
+       u.unit_type,
+       u.unit_type_short,
+       u.parent_unit_id,
+       c.depth AS level,
+       (SELECT group_concat(a.id, '/')
+          FROM (SELECT ac.ancestor_id AS id
+                  FROM unit_closure ac
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS path,
+       (SELECT group_concat(ifnull(a.unit_short_name, a.unit_name), ' > ')
+          FROM (SELECT au.unit_short_name, au.unit_name
+                  FROM unit_closure ac
+                  JOIN units_types au ON au.id = ac.ancestor_id
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS short_path,
+       (SELECT group_concat(a.unit_name, ' > ')
+          FROM (SELECT au.unit_name
+                  FROM unit_closure ac
+                  JOIN units_types au ON au.id = ac.ancestor_id
+                 WHERE ac.descendant_id = u.id
+                 ORDER BY ac.depth DESC) a) AS full_path
+  FROM units_types r
+       JOIN
+       unit_closure c ON c.ancestor_id = r.id
+       JOIN
+       units_types u ON u.id = c.descendant_id
+ WHERE r.parent_unit_id IS NULL OR
+       r.parent_unit_id = -1
  ORDER BY path;
 
 -- View: units_hierarchy_stats
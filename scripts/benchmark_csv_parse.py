@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for parallel CSV import parsing
+Generates CSV files and times CSVProcessor with 1 to N worker processes, for
+one large file split into chunks and for several entity files at once.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.import_export import ImportOptions
+from app.services.csv_processor import CSVProcessor
+
+ENTITY_TYPES = ['unit_types', 'job_titles', 'persons']
+
+
+def generate_records(entity_type: str, rows: int) -> list:
+    """Synthetic records for an entity type"""
+    if entity_type == 'persons':
+        return [
+            {'id': i, 'name': f"Persona {i}", 'short_name': f"P{i}", 'email': f"persona{i}@example.com",
+             'first_name': "Nome", 'last_name': f"Cognome {i}", 'registration_no': f"EMP{i:07d}"}
+            for i in range(1, rows + 1)
+        ]
+
+    start = date(2020, 1, 1)
+    records = []
+    for i in range(1, rows + 1):
+        record = {'id': i, 'name': f"{entity_type} {i}", 'short_name': f"S{i}",
+                  'aliases': [{'value': f"Alias {i}", 'lang': "it-IT"}]}
+        if entity_type == 'job_titles':
+            record['start_date'] = start + timedelta(days=i % 1000)
+        else:
+            record['level'] = i % 10 + 1
+        records.append(record)
+    return records
+
+
+def time_parse(workers: int, chunk_rows: int, parse) -> float:
+    """Seconds taken by `parse` on a processor with `workers` processes"""
+    processor = CSVProcessor(ImportOptions(entity_types=ENTITY_TYPES), max_workers=workers, chunk_rows=chunk_rows)
+    start = time.perf_counter()
+    parse(processor)
+    return time.perf_counter() - start
+
+
+def run_benchmark(rows: int, max_workers: int, chunk_rows: int) -> None:
+    """Print parse times and speedups for 1..max_workers processes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        writer = CSVProcessor(max_workers=1)
+        files = {}
+        for entity_type in ENTITY_TYPES:
+            files[entity_type] = os.path.join(temp_dir, f"{entity_type}.csv")
+            writer.generate_csv_file(generate_records(entity_type, rows), entity_type, files[entity_type])
+
+        scenarios = [
+            (f"one file, {rows} rows", lambda processor: processor.parse_csv_file(files['persons'], 'persons')),
+            (f"{len(files)} files, {rows} rows each", lambda processor: processor.parse_csv_files(files)),
+        ]
+
+        print(f"CPUs available: {os.cpu_count()}, rows per chunk: {chunk_rows}")
+        for title, parse in scenarios:
+            print(f"\n{title}")
+            baseline = None
+            for workers in range(1, max_workers + 1):
+                elapsed = time_parse(workers, chunk_rows, parse)
+                baseline = baseline or elapsed
+                print(f"  {workers:2d} worker(s): {elapsed:7.2f}s  speedup {baseline / elapsed:4.2f}x")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Time CSV import parsing with 1 to N worker processes")
+    parser.add_argument('--rows', type=int, default=100000, help="Rows per generated file")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Largest number of processes")
+    parser.add_argument('--chunk-rows', type=int, default=5000, help="Rows per chunk for a single file")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.workers, args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
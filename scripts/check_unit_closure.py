@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Consistency check for the unit_closure table
+Compares the stored ancestor/descendant rows with units.parent_unit_id and
+optionally rebuilds the table in one pass.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import get_db_manager
+from app.services.unit_closure import UnitClosure
+
+
+def check_unit_closure(repair: bool = False) -> bool:
+    """Check (and optionally repair) unit_closure"""
+    try:
+        result = UnitClosure(get_db_manager()).check(repair=repair)
+    except Exception as e:
+        print(f"❌ unit_closure check failed: {e}")
+        return False
+
+    if result['consistent']:
+        print("✅ unit_closure is consistent with units")
+        return True
+
+    print(f"⚠️  unit_closure is inconsistent: {result['missing_rows']} missing, "
+          f"{result['unexpected_rows']} unexpected rows")
+    if result['rebuilt']:
+        print(f"✅ unit_closure rebuilt with {result['rows']} rows")
+        return True
+
+    print("💡 Run with --repair to rebuild it")
+    return False
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Check the unit_closure table against units")
+    parser.add_argument('--repair', action='store_true', help="Rebuild unit_closure when inconsistent")
+    args = parser.parse_args()
+
+    success = check_unit_closure(repair=args.repair)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
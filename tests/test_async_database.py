@@ -0,0 +1,86 @@
+"""
+Tests for the async query API backed by per-connection worker threads.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from app.database import AsyncDatabaseManager
+
+
+@pytest.fixture
+def aio(file_db_manager):
+    aio = AsyncDatabaseManager(file_db_manager, workers=2)
+    yield aio
+    aio.close()
+
+
+class TestAsyncDatabaseManager:
+    """Test async fetch/execute on the worker threads"""
+
+    def test_fetch_all_and_fetch_one(self, aio):
+        async def main():
+            return (
+                await aio.fetch_all("SELECT name FROM items ORDER BY id"),
+                await aio.fetch_one("SELECT name FROM items WHERE id = ?", (2,)),
+                await aio.fetch_one("SELECT name FROM items WHERE id = ?", (99,)),
+            )
+
+        rows, row, missing = asyncio.run(main())
+        assert [r['name'] for r in rows] == ["a", "b", "c"]
+        assert row['name'] == "b"
+        assert missing is None
+
+    def test_concurrent_reads_use_worker_threads(self, aio):
+        async def main():
+            loop_thread = threading.get_ident()
+            results = await asyncio.gather(*[
+                aio.fetch_one("SELECT COUNT(*) AS n FROM items") for _ in range(8)
+            ])
+            return loop_thread, results
+
+        loop_thread, results = asyncio.run(main())
+        assert [r['n'] for r in results] == [3] * 8
+        assert aio.get_stats()['started']
+        assert all(worker.ident != loop_thread for worker in aio._workers)
+
+    def test_execute_commits(self, aio, file_db_manager):
+        cursor = asyncio.run(aio.execute("INSERT INTO items (name) VALUES (?)", ("d",)))
+
+        assert cursor.lastrowid == 4
+        # Visible to the sync API on a different connection
+        assert file_db_manager.fetch_one("SELECT name FROM items WHERE id = 4")['name'] == "d"
+
+    def test_errors_propagate(self, aio):
+        with pytest.raises(ValueError, match="Unsafe query"):
+            asyncio.run(aio.fetch_all("SELECT name || 'x' FROM items"))
+
+        with pytest.raises(Exception, match="no such table"):
+            asyncio.run(aio.fetch_all("SELECT * FROM missing"))
+
+        # The worker survives a failed job
+        assert asyncio.run(aio.fetch_one("SELECT 1"))[0] == 1
+
+    def test_close_stops_workers(self, aio):
+        asyncio.run(aio.fetch_one("SELECT 1"))
+        workers = list(aio._workers)
+
+        aio.close()
+
+        assert not any(worker.is_alive() for worker in workers)
+        assert aio.get_stats()['queued'] == []
+
+    def test_manager_exposes_lazy_async_api(self, file_db_manager):
+        with patch('app.database._get_async_workers', return_value=1):
+            aio = file_db_manager.aio
+        try:
+            assert file_db_manager.aio is aio
+            assert not aio.get_stats()['started']
+            assert asyncio.run(aio.fetch_one("SELECT COUNT(*) FROM items"))[0] == 3
+            # Sync API keeps working alongside
+            assert len(file_db_manager.fetch_all("SELECT * FROM items")) == 3
+        finally:
+            aio.close()
@@ -0,0 +1,152 @@
+"""
+Tests for audit reports read from the operation rollups and data change partitions.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.services.audit_reporting import AuditReportingService, ReportPeriod
+from app.services.audit_trail import AuditTrailManager, ChangeType, OperationRecord, OperationStatus, OperationType
+
+BASE_TIME = datetime(2026, 3, 2, 9, 0, 0)
+
+
+@pytest.fixture
+def audit_manager(file_db_manager):
+    with patch('app.services.audit_trail.get_db_manager', return_value=file_db_manager):
+        manager = AuditTrailManager()
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def reporting_service(audit_manager):
+    with patch('app.services.audit_reporting.get_audit_manager', return_value=audit_manager):
+        return AuditReportingService()
+
+
+def record_operations(manager):
+    """Operations every 7 hours 13 minutes over about 10 days, some updated after they were saved"""
+    operations = []
+    for i in range(35):
+        start_time = BASE_TIME + timedelta(hours=7 * i, minutes=13 * i)
+        operation = OperationRecord(
+            operation_id=f"operation-{i}",
+            operation_type=OperationType.IMPORT if i % 3 else OperationType.EXPORT,
+            status=OperationStatus.IN_PROGRESS,
+            user_id=None if i % 4 == 0 else f"user-{i % 2}",
+            start_time=start_time,
+            records_processed={"persons": i, "units": 1}
+        )
+        manager._save_operation_to_db(operation)
+
+        if i % 5:
+            operation.status = OperationStatus.FAILED if i % 5 == 1 else OperationStatus.COMPLETED
+            operation.end_time = start_time + timedelta(seconds=i + 1)
+            operation.records_created = {"persons": i // 2}
+            operation.records_updated = {"units": 1}
+            operation.records_skipped = {"persons": i % 3}
+            manager._update_operation_in_db(operation)
+        operations.append(operation)
+    return operations
+
+
+def expected_summary(operations, start_date, end_date, user_id=None):
+    selected = [operation for operation in operations
+                if start_date <= operation.start_time <= end_date
+                and (user_id is None or operation.user_id == user_id)]
+    durations = [operation.duration for operation in selected if operation.duration is not None]
+    by_user = {}
+    for operation in selected:
+        by_user[operation.user_id] = by_user.get(operation.user_id, 0) + 1
+    return {
+        'total_operations': len(selected),
+        'successful_operations': sum(1 for o in selected if o.status == OperationStatus.COMPLETED),
+        'failed_operations': sum(1 for o in selected if o.status == OperationStatus.FAILED),
+        'operations_by_user': by_user,
+        'total_records_processed': sum(o.total_records_processed for o in selected),
+        'total_records_created': sum(o.total_records_created for o in selected),
+        'total_records_updated': sum(o.total_records_updated for o in selected),
+        'total_records_skipped': sum(sum(o.records_skipped.values()) for o in selected),
+        'average_duration': sum(durations) / len(durations) if durations else 0.0,
+    }
+
+
+PERIODS = [
+    # Partial hours, whole hours and whole days
+    (BASE_TIME + timedelta(minutes=30), BASE_TIME + timedelta(days=8, hours=5, minutes=20)),
+    # Within a day
+    (BASE_TIME + timedelta(hours=1, minutes=5), BASE_TIME + timedelta(hours=20, minutes=59)),
+    # Within an hour
+    (BASE_TIME + timedelta(days=1, hours=5, minutes=20), BASE_TIME + timedelta(days=1, hours=5, minutes=40)),
+    # On bucket boundaries
+    (BASE_TIME.replace(hour=0), BASE_TIME + timedelta(days=12)),
+]
+
+
+class TestAuditRollups:
+    """Test reports against the operations they summarize"""
+
+    @pytest.mark.parametrize("start_date,end_date", PERIODS)
+    def test_operation_summary_matches_operations(self, audit_manager, reporting_service, start_date, end_date):
+        operations = record_operations(audit_manager)
+
+        summary = reporting_service.generate_operation_summary(
+            ReportPeriod.CUSTOM, start_date=start_date, end_date=end_date
+        )
+
+        expected = expected_summary(operations, start_date, end_date)
+        assert {key: getattr(summary, key) for key in expected if key != 'average_duration'} == \
+            {key: value for key, value in expected.items() if key != 'average_duration'}
+        assert summary.average_duration == pytest.approx(expected['average_duration'])
+
+    def test_user_activity_report(self, audit_manager, reporting_service):
+        operations = record_operations(audit_manager)
+        start_date, end_date = PERIODS[0]
+
+        report = reporting_service.get_user_activity_report(
+            "user-1", ReportPeriod.CUSTOM, start_date=start_date, end_date=end_date
+        )
+
+        selected = [o for o in operations if o.user_id == "user-1" and start_date <= o.start_time <= end_date]
+        assert report['total_operations'] == len(selected)
+        assert report['total_records_processed'] == sum(o.total_records_processed for o in selected)
+        assert report['most_recent_activity'] == max(o.start_time for o in selected).isoformat()
+        by_day = {}
+        for operation in selected:
+            day = operation.start_time.date().isoformat()
+            by_day[day] = by_day.get(day, 0) + 1
+        assert report['operations_by_day'] == by_day
+
+    def test_rollups_rebuilt_for_existing_operations(self, audit_manager, file_db_manager):
+        operations = record_operations(audit_manager)
+        file_db_manager.execute_query("DELETE FROM audit_rollup_operations")
+        file_db_manager.execute_query("DELETE FROM audit_operation_rollups")
+
+        with patch('app.services.audit_trail.get_db_manager', return_value=file_db_manager):
+            rebuilt_manager = AuditTrailManager()
+        with patch('app.services.audit_reporting.get_audit_manager', return_value=rebuilt_manager):
+            summary = AuditReportingService().generate_operation_summary(
+                ReportPeriod.CUSTOM, start_date=PERIODS[3][0], end_date=PERIODS[3][1]
+            )
+
+        assert summary.total_operations == len(operations)
+        assert summary.total_records_skipped == expected_summary(operations, *PERIODS[3])['total_records_skipped']
+
+    def test_data_change_summary_spans_partitions(self, audit_manager, reporting_service):
+        audit_manager.start_operation("operation", OperationType.IMPORT)
+        for i in range(4):
+            audit_manager.track_data_change("operation", "persons", ChangeType.CREATE, entity_id=i + 1,
+                                            new_values={"id": i + 1})
+        assert sum(audit_manager.compact_data_changes(before=datetime.now() + timedelta(days=1)).values()) == 4
+        audit_manager.track_data_change("operation", "units", ChangeType.UPDATE, entity_id=1,
+                                        old_values={"name": "A"}, new_values={"name": "B"})
+        audit_manager.complete_operation("operation")
+
+        summary = reporting_service.generate_data_change_summary(ReportPeriod.LAST_24_HOURS)
+
+        assert (summary.total_changes, summary.creates, summary.updates) == (5, 4, 1)
+        assert summary.most_active_entities == [("persons", 4), ("units", 1)]
+        assert summary.changes_by_operation == {"operation": 5}
@@ -0,0 +1,165 @@
+"""
+Tests for the buffered writes and month partitions of audit trail data changes.
+"""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.services.audit_storage import month_start, partition_month
+from app.services.audit_trail import AuditTrailManager, ChangeType, OperationType
+
+
+@pytest.fixture
+def audit_manager(file_db_manager):
+    """AuditTrailManager on file_db_manager writing every 3 changes, without periodic flush"""
+    with patch('app.services.audit_trail.get_db_manager', return_value=file_db_manager), \
+         patch('app.services.audit_trail._buffer_settings', return_value=(3, 0)):
+        manager = AuditTrailManager()
+    manager.start_operation("operation", OperationType.IMPORT)
+    yield manager
+    manager.close()
+
+
+def track(manager, count, operation_id="operation"):
+    for i in range(count):
+        manager.track_data_change(operation_id, "persons", ChangeType.CREATE, entity_id=i + 1,
+                                  new_values={"id": i + 1, "name": f"Person {i + 1}"}, line_number=i + 1)
+
+
+def saved_changes(manager):
+    return manager.db_manager.fetch_one("SELECT COUNT(*) FROM audit_data_changes")[0]
+
+
+class TestAuditBuffer:
+    """Test buffering, flush triggers and transactional holds of data changes"""
+
+    def test_changes_written_together_on_buffer_size(self, audit_manager):
+        track(audit_manager, 2)
+        assert saved_changes(audit_manager) == 0
+
+        track(audit_manager, 1)
+        assert saved_changes(audit_manager) == 3
+
+    def test_complete_operation_writes_pending_changes(self, audit_manager):
+        track(audit_manager, 2)
+
+        completed = audit_manager.complete_operation("operation")
+
+        assert completed.records_created == {"persons": 2}
+        assert saved_changes(audit_manager) == 2
+        changes = audit_manager.get_data_changes_for_entity("persons", 2)
+        assert changes[0]['new_values'] == {"id": 2, "name": "Person 2"}
+
+    def test_reads_include_buffered_changes(self, audit_manager):
+        track(audit_manager, 1)
+
+        details = audit_manager.get_operation_details("operation")
+
+        assert len(details['data_changes']) == 1
+
+    def test_held_changes_follow_the_transaction(self, audit_manager):
+        audit_manager.hold_data_changes("operation")
+        track(audit_manager, 5)
+        assert saved_changes(audit_manager) == 0
+
+        with audit_manager.db_manager.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            assert audit_manager.flush_data_changes("operation") == 5
+            conn.rollback()
+        audit_manager.discard_data_changes("operation")
+
+        track(audit_manager, 2)
+        audit_manager.discard_data_changes("operation")
+        track(audit_manager, 1)
+        audit_manager.release_data_changes("operation")
+        audit_manager.flush_data_changes()
+
+        assert saved_changes(audit_manager) == 1
+
+    def test_failed_flush_keeps_changes(self, audit_manager):
+        track(audit_manager, 2)
+
+        with patch.object(audit_manager, '_save_data_changes_to_db', side_effect=Exception("disk full")):
+            with pytest.raises(Exception):
+                audit_manager.flush_data_changes()
+
+        assert audit_manager.flush_data_changes() == 2
+        lines = [row[0] for row in audit_manager.db_manager.fetch_all(
+            "SELECT line_number FROM audit_data_changes ORDER BY id")]
+        assert lines == [1, 2]
+
+    def test_close_writes_pending_and_held_changes(self, audit_manager):
+        track(audit_manager, 1)
+        audit_manager.hold_data_changes("operation")
+        track(audit_manager, 1)
+
+        audit_manager.close()
+
+        assert saved_changes(audit_manager) == 2
+
+    def test_periodic_flush(self, audit_manager):
+        audit_manager.flush_interval = 0.01
+        track(audit_manager, 1)
+
+        deadline = time.time() + 5
+        while saved_changes(audit_manager) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert saved_changes(audit_manager) == 1
+
+
+class TestAuditPartitions:
+    """Test compaction of data changes into month partitions and their retention"""
+
+    def test_compacted_changes_are_still_read(self, audit_manager):
+        track(audit_manager, 3)
+        audit_manager.track_data_change("operation", "persons", ChangeType.UPDATE, entity_id=2,
+                                        old_values={"id": 2, "name": "Person 2", "email": None},
+                                        new_values={"id": 2, "name": "Person Two", "email": None})
+        before = audit_manager.get_operation_details("operation")['data_changes']
+
+        compacted = audit_manager.compact_data_changes(before=datetime.now() + timedelta(days=1))
+
+        assert sum(compacted.values()) == 4
+        assert saved_changes(audit_manager) == 0
+        after = audit_manager.get_operation_details("operation")['data_changes']
+        assert [(c['id'], c['change_type'], c['line_number']) for c in after] == \
+            [(c['id'], c['change_type'], c['line_number']) for c in before]
+        assert after[0]['new_values'] == {"id": 1, "name": "Person 1"}
+
+        changes = audit_manager.get_data_changes_for_entity("persons", 2)
+        assert [change['change_type'] for change in changes] == ["update", "create"]
+        assert (changes[0]['old_values'], changes[0]['new_values']) == \
+            ({"name": "Person 2"}, {"name": "Person Two"})
+
+    def test_entity_changes_span_hot_table_and_partitions(self, audit_manager):
+        track(audit_manager, 2)
+        audit_manager.compact_data_changes(before=datetime.now() + timedelta(days=1))
+        track(audit_manager, 2)
+
+        changes = audit_manager.get_data_changes_for_entity("persons", 1)
+
+        assert len(changes) == 2
+        assert len(audit_manager.get_data_changes_for_entity("persons", 1, limit=1)) == 1
+
+    def test_prune_drops_months_beyond_retention(self, audit_manager):
+        track(audit_manager, 3)
+        audit_manager.flush_data_changes()
+        db_manager = audit_manager.db_manager
+        db_manager.execute_query("UPDATE audit_data_changes SET timestamp = ? WHERE line_number = 1",
+                                 (month_start(datetime.now(), 3).isoformat(),))
+        db_manager.execute_query("UPDATE audit_data_changes SET timestamp = ? WHERE line_number = 2",
+                                 (month_start(datetime.now(), 1).isoformat(),))
+
+        audit_manager.run_data_change_maintenance()
+        assert saved_changes(audit_manager) == 1
+        assert len(audit_manager.get_data_changes_for_entity("persons")) == 3
+
+        with patch('app.services.audit_trail._retention_months', return_value=2):
+            dropped = audit_manager.prune_data_changes()
+
+        assert dropped == [partition_month(month_start(datetime.now(), 3).isoformat())]
+        assert [change['line_number'] for change in audit_manager.get_data_changes_for_entity("persons")] == [3, 2]
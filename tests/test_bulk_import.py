@@ -0,0 +1,240 @@
+"""
+Tests for the set-based insert of new records during imports.
+"""
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.models.import_export import ConflictResolutionStrategy, ImportOptions, ImportResult
+from app.services.audit_trail import AuditTrailManager, ChangeType, OperationType
+from app.services.import_export import ImportExportService
+from app.services.import_export_jobs import ImportExportJobStore, JobContext
+from app.services.job_title import JobTitleService
+from app.services.unit import UnitService
+from app.services.unit_closure import UnitClosure
+from tests.conftest import SchemaDatabaseManager
+
+
+def job_title_records(count, start=1):
+    return [
+        {'id': i, 'name': f"Job {i}", 'short_name': f"J{i}"}
+        for i in range(start, start + count)
+    ]
+
+
+def inserted_statements(db_manager):
+    return [query for query in db_manager.queries if query.lstrip().upper().startswith("INSERT")]
+
+
+def process(service, entity_type, records, **options):
+    created_mappings = {entity_type: {}}
+    result = service._process_record_batch(
+        entity_type, records, ImportOptions(entity_types=[entity_type], **options),
+        created_mappings, "operation"
+    )
+    return result, created_mappings
+
+
+class TestBulkImport:
+    """Test grouping of new records into one insert per batch"""
+
+    def test_new_records_inserted_together(self, import_service, schema_db_manager):
+        with patch.object(JobTitleService, '_insert_many', autospec=True,
+                          side_effect=JobTitleService._insert_many) as insert_many:
+            result, created_mappings = process(import_service, "job_titles", job_title_records(30))
+
+        assert insert_many.call_count == 1
+        assert result.success and result.errors == []
+        assert (result.processed_count, result.created_count) == (30, 30)
+        assert result.created_ids == list(range(1, 31))
+        assert created_mappings["job_titles"]["30"] == 30
+        assert inserted_statements(schema_db_manager) == []
+
+        names = schema_db_manager.conn.execute("SELECT name FROM job_titles ORDER BY id").fetchall()
+        assert [row[0] for row in names] == [f"Job {i}" for i in range(1, 31)]
+
+        audit_calls = import_service.audit_manager.track_data_change.call_args_list
+        assert len(audit_calls) == 30
+        assert audit_calls[0].kwargs['change_type'] == ChangeType.CREATE
+        assert audit_calls[0].kwargs['entity_id'] == 1
+        assert audit_calls[0].kwargs['line_number'] == 1
+
+    def test_duplicate_of_pending_record_is_a_conflict(self, import_service, schema_db_manager):
+        records = job_title_records(2) + [{'id': 3, 'name': "Job 1", 'short_name': "J3"}]
+
+        result, _ = process(import_service, "job_titles", records,
+                            conflict_resolution=ConflictResolutionStrategy.SKIP)
+
+        assert (result.created_count, result.skipped_count) == (2, 1)
+        assert schema_db_manager.conn.execute("SELECT COUNT(*) FROM job_titles").fetchone()[0] == 2
+
+    def test_units_below_parents_of_the_same_batch(self, import_service, schema_db_manager):
+        conn = schema_db_manager.conn
+        conn.execute("INSERT INTO unit_types (id, name, short_name) VALUES (1, 'Direzione', 'DIR')")
+        conn.commit()
+        records = [
+            {'id': 1, 'name': "Root", 'short_name': "R", 'unit_type_id': 1},
+            {'id': 2, 'name': "Left", 'short_name': "L", 'unit_type_id': 1, 'parent_unit_id': 1},
+            {'id': 3, 'name': "Right", 'short_name': "RI", 'unit_type_id': 1, 'parent_unit_id': 1},
+            {'id': 4, 'name': "Leaf", 'short_name': "LE", 'unit_type_id': 1, 'parent_unit_id': 2},
+        ]
+
+        with patch.object(UnitService, '_insert_many', autospec=True,
+                          side_effect=UnitService._insert_many) as insert_many:
+            result, _ = process(import_service, "units", records)
+
+        # Children wait for their parent's insert: [Root], [Left, Right], [Leaf]
+        assert [len(call.args[2]) for call in insert_many.call_args_list] == [1, 2, 1]
+        assert result.created_count == 4
+        parents = conn.execute("SELECT id, parent_unit_id FROM units ORDER BY id").fetchall()
+        assert [tuple(row) for row in parents] == [(1, None), (2, 1), (3, 1), (4, 2)]
+        assert UnitClosure(schema_db_manager).check()['consistent']
+
+    def test_failed_bulk_insert_falls_back_to_single_records(self, import_service, schema_db_manager):
+        with patch.object(JobTitleService, '_insert_many',
+                          side_effect=sqlite3.IntegrityError("constraint failed")):
+            result, created_mappings = process(import_service, "job_titles", job_title_records(3))
+
+        assert result.created_count == 3 and result.errors == []
+        assert len(inserted_statements(schema_db_manager)) == 3
+        assert sorted(created_mappings["job_titles"]) == ["1", "2", "3"]
+
+    def test_bulk_insert_disabled(self, import_service, schema_db_manager):
+        result, _ = process(import_service, "job_titles", job_title_records(3), bulk_insert=False)
+
+        assert result.created_count == 3
+        assert len(inserted_statements(schema_db_manager)) == 3
+
+    def test_with_database_manager(self, file_db_manager):
+        with file_db_manager.get_connection() as conn:
+            conn.executescript(SchemaDatabaseManager.SCHEMA_PATH.read_text(encoding="utf-8"))
+
+        with patch('app.services.base.get_db_manager', return_value=file_db_manager), \
+             patch('app.services.import_export.get_db_manager', return_value=file_db_manager):
+            service = ImportExportService()
+            service.audit_manager = Mock()
+            result, _ = process(service, "job_titles", job_title_records(20))
+
+        assert result.created_count == 20
+        assert file_db_manager.fetch_one("SELECT COUNT(*) AS n FROM job_titles")['n'] == 20
+        with file_db_manager.get_connection() as conn:
+            assert not conn.in_transaction
+
+
+class TestImportTransactions:
+    """Test savepoints per batch and chunked commits of an import"""
+
+    @pytest.fixture
+    def service(self, file_db_manager):
+        with file_db_manager.get_connection() as conn:
+            conn.executescript(SchemaDatabaseManager.SCHEMA_PATH.read_text(encoding="utf-8"))
+
+        with patch('app.services.base.get_db_manager', return_value=file_db_manager), \
+             patch('app.services.import_export.get_db_manager', return_value=file_db_manager):
+            service = ImportExportService()
+            service.audit_manager = Mock()
+            service.error_reporting_service = Mock()
+            yield service
+
+    @staticmethod
+    def run_batches(service, records, commit_interval, failing_batches=()):
+        """Import job titles two per batch, failing the given batches (1-based)"""
+        options = ImportOptions(entity_types=["job_titles"], batch_size=2, commit_interval=commit_interval)
+        result = ImportResult(success=False)
+        for counter in (result.records_processed, result.records_created,
+                        result.records_updated, result.records_skipped):
+            counter["job_titles"] = 0
+        context = service.create_transaction_context("operation", commit_interval)
+        process_batch = service._process_record_batch
+        calls = []
+
+        def failing_process_batch(*args, **kwargs):
+            calls.append(1)
+            batch_result = process_batch(*args, **kwargs)
+            if len(calls) in failing_batches:
+                batch_result.success = False
+            return batch_result
+
+        with patch.object(service, '_process_record_batch', side_effect=failing_process_batch):
+            success = service._process_entity_batches(
+                "job_titles", records, options, {}, result, "operation"
+            )
+        return success, result, context
+
+    @staticmethod
+    def job_title_names(db_manager):
+        return [row['name'] for row in db_manager.fetch_all("SELECT name FROM job_titles ORDER BY id")]
+
+    def test_failed_batch_rolled_back_alone(self, service, file_db_manager):
+        success, result, context = self.run_batches(service, job_title_records(6), 10, failing_batches={2})
+        service.commit_transaction("operation")
+
+        assert success
+        assert self.job_title_names(file_db_manager) == ["Job 1", "Job 2", "Job 5", "Job 6"]
+        assert result.records_created["job_titles"] == 4
+        assert result.records_skipped["job_titles"] == 2
+        assert any("rolled back" in warning.message for warning in result.warnings)
+        assert (context.committed_batches, context.rolled_back_batches) == (2, 1)
+
+    def test_commit_interval(self, service, file_db_manager):
+        _, _, context = self.run_batches(service, job_title_records(6), 2)
+
+        # Batches 1-2 are committed, batch 3 is still pending and holds the writer
+        assert (context.committed_batches, context.pending_batches) == (2, 1)
+        assert context.connection is not None
+
+        service.rollback_transaction("operation")
+
+        assert self.job_title_names(file_db_manager) == ["Job 1", "Job 2", "Job 3", "Job 4"]
+        with file_db_manager.get_connection() as conn:
+            assert not conn.in_transaction
+        assert not file_db_manager.holds_writer()
+
+    def test_whole_run_rolled_back_without_commit_interval(self, service, file_db_manager):
+        self.run_batches(service, job_title_records(6), None)
+        service.rollback_transaction("operation")
+
+        assert self.job_title_names(file_db_manager) == []
+
+    def test_audit_rows_follow_their_batch(self, service, file_db_manager):
+        with patch('app.services.audit_trail.get_db_manager', return_value=file_db_manager), \
+             patch('app.services.audit_trail._buffer_settings', return_value=(1000, 0)):
+            service.audit_manager = AuditTrailManager()
+        service.audit_manager.start_operation("operation", OperationType.IMPORT)
+
+        self.run_batches(service, job_title_records(6), 10, failing_batches={2})
+        service.commit_transaction("operation")
+
+        rows = file_db_manager.fetch_all("SELECT new_values FROM audit_data_changes ORDER BY id")
+        assert [json.loads(row['new_values'])['name'] for row in rows] == ["Job 1", "Job 2", "Job 5", "Job 6"]
+        service.audit_manager.close()
+
+    def test_job_progress_visible_from_other_threads(self, service, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("operation", "import")
+        job = JobContext(store, "operation")
+        reports = []
+
+        def report_progress(done, total):
+            job.report_progress(done, total)
+            # What a /status request served by another thread reads
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                seen = executor.submit(lambda: store.get("operation")['progress']).result(timeout=10)
+            reports.append((done, job._progress, seen))
+
+        service.progress_callback = report_progress
+        service._progress = [0, 10]
+        self.run_batches(service, job_title_records(10), 2)
+        service.rollback_transaction("operation")
+
+        # Batches 1-4 reported once committed; batch 5, rolled back, never was
+        assert reports == [(4, 50, 50), (8, 80, 80)]
+        assert store.get("operation")['progress'] == 80
+
+    def test_commit_interval_must_be_positive(self):
+        with pytest.raises(ValueError):
+            ImportOptions(entity_types=["job_titles"], commit_interval=0)
@@ -0,0 +1,158 @@
+"""
+Tests for the lazily filled, validated SQLite connection pool.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.database import ConnectionPool
+from app.db_executor import DatabaseBusyError
+
+
+def make_pool(**kwargs):
+    factory_calls = []
+
+    def factory():
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        factory_calls.append(conn)
+        return conn
+
+    pool = ConnectionPool(factory, **kwargs)
+    return pool, factory_calls
+
+
+class TestConnectionPool:
+    """Test connection creation, reuse and limits"""
+
+    def test_connections_created_on_demand(self):
+        pool, created = make_pool(min_size=0, max_size=3)
+        assert pool.get_stats()['size'] == 0
+
+        first = pool.acquire()
+        second = pool.acquire()
+        assert len(created) == 2
+        assert pool.get_stats()['in_use'] == 2
+
+        pool.release(first)
+        pool.release(second)
+        assert pool.acquire() in (first, second)
+        assert len(created) == 2
+
+    def test_fill_opens_minimum(self):
+        pool, created = make_pool(min_size=2, max_size=5)
+        pool.fill()
+
+        assert len(created) == 2
+        assert pool.get_stats()['idle'] == 2
+
+    def test_thread_gets_back_its_connection(self):
+        pool, _ = make_pool(min_size=0, max_size=3)
+        mine = pool.acquire()
+        other = pool.acquire()
+        pool.release(mine)
+        pool.release(other)
+
+        # LIFO would hand out `other`, affinity prefers the one this thread returned last
+        pool._local.connection = mine
+        assert pool.acquire() is mine
+        assert pool.get_stats()['affinity_hits'] >= 1
+
+    def test_broken_connection_replaced_on_checkout(self):
+        pool, created = make_pool(min_size=0, max_size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+
+        replacement = pool.acquire()
+
+        assert replacement is not conn
+        assert replacement.execute("SELECT 1").fetchone()[0] == 1
+        stats = pool.get_stats()
+        assert stats['validation_failures'] == 1
+        assert stats['size'] == 1
+
+    def test_exhaustion_raises_busy(self):
+        pool, _ = make_pool(min_size=0, max_size=1, timeout=0.05)
+        pool.acquire()
+
+        with pytest.raises(DatabaseBusyError):
+            pool.acquire()
+
+        stats = pool.get_stats()
+        assert stats['exhausted'] == 1
+        assert stats['size'] == 1
+
+    def test_waiter_gets_released_connection(self):
+        pool, created = make_pool(min_size=0, max_size=1, timeout=5)
+        conn = pool.acquire()
+        acquired = []
+
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        pool.release(conn)
+        waiter.join(timeout=5)
+
+        assert acquired == [conn]
+        assert len(created) == 1
+        stats = pool.get_stats()
+        assert stats['waits'] == 1
+        assert stats['wait_time_max_ms'] > 0
+
+    def test_idle_connections_above_minimum_close(self):
+        pool, _ = make_pool(min_size=1, max_size=3, idle_timeout=0)
+        connections = [pool.acquire() for _ in range(3)]
+        time.sleep(0.01)
+        for conn in connections:
+            pool.release(conn)
+
+        stats = pool.get_stats()
+        assert stats['size'] == 1
+        assert stats['closed'] == 2
+
+    def test_open_transaction_rolled_back_on_release(self):
+        pool, _ = make_pool(min_size=0, max_size=1)
+        conn = pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+
+        pool.release(conn)
+
+        assert not conn.in_transaction
+        assert pool.acquire().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_inherited_connections_dropped_after_fork(self):
+        pool, created = make_pool(min_size=1, max_size=2)
+        pool.fill()
+        inherited = pool._idle[0][0]
+
+        pool._pid = -1  # as seen from a forked child
+        conn = pool.acquire()
+
+        assert conn is not inherited
+        assert len(created) == 2
+        assert pool.get_stats()['size'] == 1
+
+
+class TestDatabaseManagerPool:
+    """Test DatabaseManager on top of the pool"""
+
+    def test_opens_minimum_and_reports_status(self, file_db_manager):
+        status = file_db_manager.get_pool_status()
+        assert status['size'] == 1
+        assert status['max_connections'] == 10
+        assert status['active_connections'] == 0
+
+        with file_db_manager.get_read_connection():
+            with file_db_manager.get_read_connection():
+                assert file_db_manager.get_pool_status()['active_connections'] == 2
+
+        status = file_db_manager.get_pool_status()
+        assert status['size'] == 2
+        assert status['idle_connections'] == 2
+        assert status['checkouts'] >= 2
@@ -335,6 +335,69 @@ class TestCSVProcessor:
         assert filename == "backup_20240101_unit_types.csv"
         assert os.path.exists(generated_files[0])
 
+    def _write_unit_types_csv(self, rows, bad_rows=()):
+        """Write a unit types CSV with `rows` rows, truncated on `bad_rows`."""
+        csv_file = os.path.join(self.temp_dir, "unit_types.csv")
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write("id,name,short_name,aliases,level,theme_id\n")
+            for i in range(1, rows + 1):
+                if i in bad_rows:
+                    f.write(f'{i},"Unit {i}"\n')
+                else:
+                    f.write(f'{i},"Unit {i}","U{i}","[]",{i % 5 + 1},\n')
+        return csv_file
+
+    def test_parse_csv_file_in_parallel_chunks(self):
+        """Test chunked parsing in a process pool matches sequential parsing."""
+        csv_file = self._write_unit_types_csv(25, bad_rows={7, 19})
+
+        sequential = CSVProcessor(max_workers=1).parse_csv_file(csv_file, "unit_types")
+        parallel = CSVProcessor(max_workers=2, chunk_rows=4).parse_csv_file(csv_file, "unit_types")
+
+        assert parallel.data == sequential.data
+        assert parallel.total_rows == sequential.total_rows == 25
+        assert parallel.processed_rows == sequential.processed_rows
+        assert [e.line_number for e in parallel.errors] == [e.line_number for e in sequential.errors]
+
+    def test_parse_csv_file_in_parallel_chunks_error_limit(self):
+        """Test the error limit stops parallel parsing at the same row as sequential parsing."""
+        csv_file = self._write_unit_types_csv(30, bad_rows={3, 9, 14, 22})
+        options = ImportOptions(entity_types=["unit_types"], max_errors=3)
+
+        sequential = CSVProcessor(options, max_workers=1).parse_csv_file(csv_file, "unit_types")
+        parallel = CSVProcessor(options, max_workers=2, chunk_rows=5).parse_csv_file(csv_file, "unit_types")
+
+        assert len(parallel.errors) == 3
+        assert parallel.data == sequential.data
+        assert parallel.total_rows == sequential.total_rows
+        assert [w.line_number for w in parallel.warnings] == [w.line_number for w in sequential.warnings]
+
+    def test_parse_csv_files_parallel_dependency_order(self):
+        """Test files parsed in parallel are returned in dependency order."""
+        data = {
+            'persons': [{'id': 1, 'name': 'Mario Rossi', 'short_name': 'MR'}],
+            'unit_types': [{'id': 1, 'name': 'Test', 'short_name': 'T', 'aliases': [], 'level': 1}],
+        }
+        file_paths = {
+            entity_type: os.path.join(self.temp_dir, f"{entity_type}.csv") for entity_type in data
+        }
+        for entity_type, records in data.items():
+            self.processor.generate_csv_file(records, entity_type, file_paths[entity_type])
+
+        results = CSVProcessor(max_workers=2).parse_csv_files(file_paths)
+
+        assert list(results) == ['unit_types', 'persons']
+        assert all(result.success for result in results.values())
+        assert results['persons'].data[0]['name'] == 'Mario Rossi'
+
+    def test_process_pool_not_forked(self):
+        """Test the process pool spawns its workers instead of forking the server."""
+        parallel_processor = CSVProcessor(max_workers=2)._parallel_processor(2)
+        try:
+            assert parallel_processor.get_executor()._mp_context.get_start_method() == "spawn"
+        finally:
+            parallel_processor.cleanup()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Tests for the thread pool database execution layer.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db_executor import (
+    DatabaseExecutor, DatabaseBusyError, start_request_timing, get_request_timing
+)
+from app.middleware.db_timing import DatabaseTimingMiddleware
+from app.routes.api import handle_service_exception
+
+
+@pytest.fixture
+def executor():
+    executor = DatabaseExecutor(max_workers=2, max_pending=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestDatabaseExecutor:
+    """Test dispatching blocking work to the pool"""
+
+    def test_runs_off_event_loop_thread(self, executor):
+        async def main():
+            return threading.get_ident(), await executor.run(threading.get_ident)
+
+        loop_thread, worker_thread = asyncio.run(main())
+        assert loop_thread != worker_thread
+
+    def test_passes_arguments_and_returns_result(self, executor):
+        result = asyncio.run(executor.run(lambda a, b=0: a + b, 2, b=3))
+
+        assert result == 5
+        stats = executor.get_stats()
+        assert stats['submitted'] == 1
+        assert stats['completed'] == 1
+        assert stats['in_flight'] == 0
+
+    def test_propagates_exceptions(self, executor):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(executor.run(fail))
+        assert executor.get_stats()['failed'] == 1
+
+    def test_rejects_when_saturated(self, executor):
+        release = threading.Event()
+
+        async def main():
+            # 2 running + 1 queued fill every slot
+            blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            try:
+                with pytest.raises(DatabaseBusyError):
+                    await executor.run(lambda: None)
+            finally:
+                release.set()
+                await asyncio.gather(*blocked)
+
+        asyncio.run(main())
+        stats = executor.get_stats()
+        assert stats['rejected'] == 1
+        assert stats['completed'] == 3
+        assert stats['queue_time_max_ms'] > 0
+
+    def test_records_request_timing(self, executor):
+        async def main():
+            timing = start_request_timing()
+            await executor.run(lambda: None)
+            await executor.run(lambda: None)
+            return timing
+
+        timing = asyncio.run(main())
+        assert timing['calls'] == 2
+        assert timing['exec_ms'] >= 0
+        assert get_request_timing() is None
+
+
+class TestDatabaseExecutorHttp:
+    """Test timing headers and saturation responses"""
+
+    def test_server_timing_header(self, executor):
+        app = FastAPI()
+        app.add_middleware(DatabaseTimingMiddleware)
+
+        @app.get("/work")
+        async def work():
+            return {"value": await executor.run(lambda: 42)}
+
+        @app.get("/no-db")
+        async def no_db():
+            return {}
+
+        client = TestClient(app)
+        response = client.get("/work")
+        assert response.json() == {"value": 42}
+        assert "db-queue;dur=" in response.headers["Server-Timing"]
+        assert "db-exec;dur=" in response.headers["Server-Timing"]
+        assert response.headers["X-DB-Calls"] == "1"
+
+        assert "Server-Timing" not in client.get("/no-db").headers
+
+    def test_busy_maps_to_503(self):
+        response = handle_service_exception(DatabaseBusyError(retry_after=2), "getting orgchart tree")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
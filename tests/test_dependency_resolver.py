@@ -348,6 +348,81 @@ class TestForeignKeyResolver:
         assert stats['temporary_mappings']['units'] == 1
 
 
+class TestForeignKeyResolverPreload:
+    """Test cases for ForeignKeyResolver with existing entities preloaded"""
+    
+    @pytest.fixture
+    def fk_resolver(self, schema_db_manager):
+        """Resolver preloaded from a database with two persons and a unit type"""
+        conn = schema_db_manager.conn
+        conn.executemany(
+            "INSERT INTO persons (id, name, short_name) VALUES (?, ?, ?)",
+            [(1, 'Mario Rossi', 'M.Rossi'), (2, 'Anna Bianchi', None)]
+        )
+        conn.execute("INSERT INTO unit_types (id, name, short_name) VALUES (5, 'Direzione', 'DIR')")
+        conn.commit()
+        
+        resolver = ForeignKeyResolver(DependencyResolver(), schema_db_manager)
+        resolver.preload_existing_entities(['persons', 'unit_types'])
+        return resolver
+    
+    def test_preload_uses_one_query_per_table(self, fk_resolver, schema_db_manager):
+        """Test preloading runs a single query for each entity type"""
+        assert len(schema_db_manager.queries) == 2
+        stats = fk_resolver.get_resolution_statistics()
+        assert stats['preloaded_entities'] == ['persons', 'unit_types']
+        assert stats['cached_entities']['persons'] == 2
+        assert stats['cached_natural_keys']['persons'] == 3
+    
+    def test_resolve_existing_ids_and_natural_keys(self, fk_resolver, schema_db_manager):
+        """Test ids and names resolve in memory, unknown ids do not"""
+        queries = len(schema_db_manager.queries)
+        
+        assert fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 'DIR'}, {})['unit_type_id'] == 5
+        assert fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 'Direzione'}, {})['unit_type_id'] == 5
+        assert fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 5}, {})['unit_type_id'] == 5
+        with pytest.raises(DependencyError):
+            fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 7}, {})
+        
+        assert len(schema_db_manager.queries) == queries
+        lookups = fk_resolver.get_resolution_statistics()['lookups']['unit_types']
+        assert lookups['hits'] == 3
+        assert lookups['misses'] >= 1
+    
+    def test_integer_id_of_created_record(self, fk_resolver):
+        """Test an id missing from the database resolves through created mappings"""
+        resolved = fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 7}, {'unit_types': {'7': 12}})
+        
+        assert resolved['unit_type_id'] == 12
+    
+    def test_register_existing_entity(self, fk_resolver):
+        """Test records created by the import become resolvable"""
+        fk_resolver.register_existing_entity('unit_types', 12, {'name': 'Ufficio', 'short_name': 'UFF'})
+        
+        assert fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 'UFF'}, {})['unit_type_id'] == 12
+        assert fk_resolver.resolve_foreign_keys('units', {'unit_type_id': 12}, {})['unit_type_id'] == 12
+    
+    def test_validate_foreign_key_references_against_database(self, fk_resolver):
+        """Test references are checked against preloaded persons"""
+        records = [
+            {'person_id': 1, 'unit_id': 'unit1', 'job_title_id': 'job1'},
+            {'person_id': 'Anna Bianchi', 'unit_id': 'unit1', 'job_title_id': 'job1'},
+            {'person_id': 99, 'unit_id': 'unit1', 'job_title_id': 'job1'}
+        ]
+        available_entities = {'units': {'unit1'}, 'job_titles': {'job1'}}
+        
+        errors = fk_resolver.validate_foreign_key_references('assignments', records, available_entities)
+        
+        assert len(errors) == 1
+        assert "Record 3" in errors[0] and "person_id" in errors[0]
+    
+    def test_get_referenced_entity_types(self, fk_resolver):
+        """Test referenced entity types follow the foreign key mappings"""
+        referenced = fk_resolver.get_referenced_entity_types(['units', 'assignments'])
+        
+        assert set(referenced) == {'unit_types', 'units', 'persons', 'job_titles'}
+
+
 class TestEntityDependency:
     """Test cases for EntityDependency dataclass"""
     
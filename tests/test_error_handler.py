@@ -0,0 +1,200 @@
+"""
+Tests for the background writer and the sampling mode of structured import errors.
+"""
+
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.models.import_export import ImportErrorType, ImportExportValidationError
+from app.services.error_reporting import ErrorReportingService
+from app.utils.error_handler import (
+    ErrorCategory, ErrorLogger, ErrorSample, ErrorSeverity, TopKCounter, _StructuredErrorWriter
+)
+
+
+def make_logger(tmp_path, queue_size=100, record_inline_bytes=0):
+    with patch('app.utils.error_handler._error_log_settings', return_value=(queue_size, record_inline_bytes)):
+        return ErrorLogger(log_directory=str(tmp_path))
+
+
+def log_errors(error_logger, count, severity=ErrorSeverity.INFO):
+    return [
+        error_logger.log_structured_error(
+            operation_id="operation", severity=severity, category=ErrorCategory.DATA_VALIDATION,
+            error_type=ImportErrorType.INVALID_DATA_TYPE, message=f"Error {i}", line_number=i + 1
+        )
+        for i in range(count)
+    ]
+
+
+def make_reporting_service(error_logger):
+    with patch('app.services.error_reporting.get_error_logger', return_value=error_logger), \
+         patch('app.services.error_reporting.get_audit_manager', return_value=Mock()):
+        return ErrorReportingService()
+
+
+VALIDATION_ERRORS = [
+    ImportExportValidationError(field="name", message="Too long", error_type=ImportErrorType.INVALID_DATA_TYPE),
+    ImportExportValidationError(field="email", message="Invalid", error_type=ImportErrorType.INVALID_DATA_TYPE),
+]
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def error_logger(tmp_path):
+    error_logger = make_logger(tmp_path)
+    yield error_logger
+    error_logger.close()
+
+
+class TestStructuredErrorWriter:
+    """Test queued writes of structured errors and record data saved apart"""
+
+    def test_errors_written_in_order_after_flush(self, error_logger, tmp_path):
+        errors = log_errors(error_logger, 25)
+
+        error_logger.flush_structured_errors()
+
+        error_file = tmp_path / f"structured_errors_{errors[0].timestamp.strftime('%Y%m%d')}.jsonl"
+        assert [line['line_number'] for line in read_lines(error_file)] == list(range(1, 26))
+
+    def test_error_written_as_logged(self, error_logger, tmp_path):
+        record_data = {"id": 3, "name": "Before"}
+        context = {'record_data': record_data}
+        release = threading.Event()
+        write = _StructuredErrorWriter._write
+
+        def held_write(writer, items):
+            release.wait(5)
+            write(writer, items)
+
+        with patch.object(_StructuredErrorWriter, '_write', held_write):
+            error = error_logger.log_structured_error(
+                operation_id="operation", severity=ErrorSeverity.ERROR, category=ErrorCategory.DATA_VALIDATION,
+                error_type=ImportErrorType.INVALID_DATA_TYPE, message="Error", line_number=1, context=context
+            )
+            # The caller reuses its dicts while the line is still queued
+            record_data["name"] = "After"
+            context['extra'] = True
+            release.set()
+            error_logger.flush_structured_errors()
+
+        error_file = tmp_path / f"structured_errors_{error.timestamp.strftime('%Y%m%d')}.jsonl"
+        [line] = read_lines(error_file)
+        assert line['context'] == {'record_data': {"id": 3, "name": "Before"}}
+
+    def test_bounded_queue_writes_everything(self, tmp_path):
+        error_logger = make_logger(tmp_path, queue_size=2)
+        errors = log_errors(error_logger, 50)
+
+        error_logger.close()
+
+        assert error_logger.queue_size == 2
+        error_file = tmp_path / f"structured_errors_{errors[0].timestamp.strftime('%Y%m%d')}.jsonl"
+        assert len(read_lines(error_file)) == 50
+
+    def test_finalized_report_has_its_errors_on_disk(self, error_logger, tmp_path):
+        error_logger.create_error_report("operation", "import")
+        errors = log_errors(error_logger, 3)
+
+        error_logger.finalize_error_report("operation")
+
+        error_file = tmp_path / f"structured_errors_{errors[0].timestamp.strftime('%Y%m%d')}.jsonl"
+        assert len(read_lines(error_file)) == 3
+
+    def test_large_record_data_saved_once(self, tmp_path):
+        error_logger = make_logger(tmp_path, record_inline_bytes=100)
+        service = make_reporting_service(error_logger)
+        service.start_error_tracking("operation", "import")
+
+        service.track_line_error("operation", 7, "persons", {"id": 3, "name": "x" * 500}, VALIDATION_ERRORS)
+        service.track_line_error("operation", 8, "persons", {"id": 4, "name": "Short"}, VALIDATION_ERRORS)
+        report = service.finalize_error_report("operation")
+        error_logger.close()
+
+        line_errors = report.entity_summaries["persons"].line_errors
+        reference = line_errors[7].record_data
+        assert reference == {'record_ref': {'file': str(tmp_path / "error_records" / "error_records_operation.jsonl"),
+                                            'line_number': 7}}
+        assert [error.context for error in line_errors[7].errors] == [reference, reference]
+        assert line_errors[7].errors[0].record_id == 3
+        assert line_errors[8].record_data == {"id": 4, "name": "Short"}
+
+        saved = read_lines(tmp_path / "error_records" / "error_records_operation.jsonl")
+        assert saved == [{'line_number': 7, 'entity_type': "persons", 'record_data': {"id": 3, "name": "x" * 500}}]
+
+
+class TestErrorSampling:
+    """Test bounded error samples with exact counts"""
+
+    def test_sample_keeps_first_items_and_bounded_reservoir(self):
+        sample = ErrorSample(first=3, reservoir_size=5)
+        kept = set(range(3))
+        for item in range(3):
+            sample.add(item)
+        for item in range(3, 1000):
+            added, evicted = sample.add(item)
+            if added:
+                kept.add(item)
+            kept.discard(evicted)
+
+        assert sample.first == [0, 1, 2]
+        assert len(sample.reservoir) == 5
+        assert set(sample.items) == kept
+        assert sample.seen == 1000
+
+    def test_top_k_counter_keeps_frequent_keys(self):
+        counter = TopKCounter(capacity=3)
+        for i in range(200):
+            counter.add("frequent")
+            counter.add(f"rare {i}")
+
+        assert len(counter.counts) == 3
+        assert counter.most_common(1) == [("frequent", 200)]
+
+    def test_error_report_sample_with_exact_counters(self, error_logger):
+        report = error_logger.create_error_report("operation", "import", sample_first=2, sample_reservoir=3)
+
+        log_errors(error_logger, 500, severity=ErrorSeverity.ERROR)
+
+        assert report.total_errors == 500
+        assert report.errors_by_entity == {}
+        assert len(report.structured_errors) == 5
+        assert [error.line_number for error in report.structured_errors[:2]] == [1, 2]
+        assert sorted(report.line_errors) == sorted(error.line_number for error in report.structured_errors)
+
+    def test_sampled_report_keeps_counts_and_recommendations(self, error_logger):
+        service = make_reporting_service(error_logger)
+        with patch('app.services.error_reporting._sampling_settings', return_value=(1000, 2, 3)):
+            report = service.start_error_tracking("operation", "import", total_records=5000)
+        assert report.sampled
+
+        for line_number in range(1, 2001):
+            service.track_line_error("operation", line_number, "persons", {"id": line_number}, VALIDATION_ERRORS)
+
+        persons = report.entity_summaries["persons"]
+        assert len(persons.line_errors) == 5
+        assert {1, 2} <= set(persons.line_errors)
+        assert persons.failed_records == report.failed_records == 2000
+        assert persons.field_error_counts == {"name": 2000, "email": 2000}
+        assert report.get_error_summary_by_severity()[ErrorSeverity.ERROR.value] == 4000
+        assert persons.most_common_messages == [("Too long", 2000), ("Invalid", 2000)]
+        assert any("4000" in recommendation for recommendation in report.get_recommendations())
+        assert len(error_logger.get_error_report("operation").structured_errors) == 10
+
+    def test_small_imports_keep_every_error(self, error_logger):
+        service = make_reporting_service(error_logger)
+        with patch('app.services.error_reporting._sampling_settings', return_value=(1000, 2, 3)):
+            report = service.start_error_tracking("operation", "import", total_records=10)
+
+        for line_number in range(1, 21):
+            service.track_line_error("operation", line_number, "persons", {"id": line_number}, VALIDATION_ERRORS)
+
+        assert not report.sampled
+        assert len(report.entity_summaries["persons"].line_errors) == 20
@@ -0,0 +1,183 @@
+"""
+Tests for import/export jobs run on a worker pool with status kept in SQLite.
+"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.models.import_export import FileFormat, ImportOptions, ImportResult
+from app.routes import import_export as import_export_routes
+from app.services.import_export_jobs import (
+    ImportExportJobRunner, ImportExportJobStore, JobContext,
+    JOB_COMPLETED, JOB_FAILED, JOB_PROCESSING, JOB_QUEUED
+)
+
+
+def job_title_records(count):
+    return [{'id': i, 'name': f"Job {i}", 'short_name': f"J{i}"} for i in range(1, count + 1)]
+
+
+class TestJobStore:
+    """Test job state persisted in the import_export_jobs table"""
+
+    def test_job_created_queued(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+
+        store.create("op-1", "import", filename="people.csv", entity_types=["persons"])
+
+        job = store.get("op-1")
+        assert job['status'] == JOB_QUEUED and job['progress'] == 0
+        assert job['operation_type'] == "import"
+        assert job['filename'] == "people.csv" and job['entity_types'] == ["persons"]
+
+    def test_update_keeps_other_fields(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("op-1", "export", export_format="csv")
+
+        store.update("op-1", status=JOB_FAILED, errors=["Valore non valido: 'x'; DROP TABLE persons"])
+
+        job = store.get("op-1")
+        assert job['status'] == JOB_FAILED
+        assert job['export_format'] == "csv"
+        assert job['errors'] == ["Valore non valido: 'x'; DROP TABLE persons"]
+
+    def test_state_survives_a_new_store(self, file_db_manager):
+        ImportExportJobStore(file_db_manager).create("op-1", "import", message="In coda")
+
+        store = ImportExportJobStore(file_db_manager)
+
+        assert store.get("op-1")['message'] == "In coda"
+        assert list(store.list()) == ["op-1"]
+        assert store.delete("op-1") is True
+        assert store.delete("op-1") is False
+        assert store.get("op-1") is None
+
+    def test_interrupted_jobs_marked_failed(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("running", "import", status=JOB_PROCESSING)
+        store.create("done", "export", status=JOB_COMPLETED)
+
+        # Jobs recorded under this pid belong to an earlier run of the server
+        assert store.recover_interrupted() == 1
+
+        assert store.get("running")['status'] == JOB_FAILED
+        assert store.get("running")['errors'] == ["Operazione interrotta dal riavvio del server"]
+        assert store.get("done")['status'] == JOB_COMPLETED
+
+    def test_jobs_of_live_workers_left_alone(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("running", "import", status=JOB_PROCESSING)
+        file_db_manager.execute_query("UPDATE import_export_jobs SET worker_pid = ?", (os.getppid(),))
+
+        assert store.recover_interrupted() == 0
+        assert store.get("running")['status'] == JOB_PROCESSING
+
+
+class TestJobRunner:
+    """Test jobs executed on the bounded pool"""
+
+    def test_job_runs_to_completion(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        runner = ImportExportJobRunner(store, max_workers=1)
+        store.create("op-1", "export")
+        seen = []
+
+        def work(job):
+            seen.append(store.get(job.operation_id)['status'])
+            job.update(status=JOB_COMPLETED, progress=100)
+
+        runner.submit("op-1", work).result(timeout=10)
+        runner.shutdown()
+
+        assert seen == [JOB_PROCESSING]
+        assert store.get("op-1")['status'] == JOB_COMPLETED
+
+    def test_exception_marks_job_failed(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        runner = ImportExportJobRunner(store, max_workers=1)
+        store.create("op-1", "import")
+
+        def work(job):
+            raise RuntimeError("disco pieno")
+
+        runner.submit("op-1", work).result(timeout=10)
+        runner.shutdown()
+
+        job = store.get("op-1")
+        assert job['status'] == JOB_FAILED
+        assert job['errors'] == ["disco pieno"]
+
+    def test_progress_mapped_between_bounds(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("op-1", "import")
+        job = JobContext(store, "op-1")
+
+        job.report_progress(50, 100, entity_records_processed=50)
+
+        assert store.get("op-1")['progress'] == 57
+        assert store.get("op-1")['entity_records_processed'] == 50
+
+
+class TestImportJob:
+    """Test the import job driving the import service"""
+
+    def test_progress_reported_per_batch(self, import_service):
+        reports = []
+        import_service.progress_callback = lambda done, total: reports.append((done, total))
+        options = ImportOptions(entity_types=["job_titles"], batch_size=10)
+        result = ImportResult(success=True)
+
+        assert import_service._process_import_data_batched(
+            {"job_titles": job_title_records(25)}, options, "operation", result
+        )
+
+        assert reports == [(10, 25), (20, 25), (25, 25)]
+        assert result.records_created == {"job_titles": 25}
+
+    def test_import_results_stored(self, file_db_manager):
+        store = ImportExportJobStore(file_db_manager)
+        store.create("op-1", "import", filename="job_titles.csv")
+        service = Mock()
+        service.import_data.return_value = ImportResult(
+            success=True, records_processed={"job_titles": 3}, records_created={"job_titles": 2},
+            records_updated={"job_titles": 1}, records_skipped={"job_titles": 0}
+        )
+
+        with patch.object(import_export_routes, 'cleanup_temp_file') as cleanup:
+            import_export_routes.process_import_operation(
+                JobContext(store, "op-1"), "/tmp/job_titles.csv", FileFormat.CSV,
+                ImportOptions(entity_types=["job_titles"]), service
+            )
+
+        job = store.get("op-1")
+        assert job['status'] == JOB_COMPLETED and job['progress'] == 100
+        assert job['results']['records_created'] == {"job_titles": 2, "total": 2}
+        assert job['results']['records_processed']['total'] == 3
+        assert callable(service.progress_callback)
+        cleanup.assert_called_once_with("/tmp/job_titles.csv")
+
+    def test_upload_plans_batches_when_asked(self):
+        service = Mock()
+        service.detect_file_format.return_value = FileFormat.CSV
+        runner = Mock()
+        upload = Mock(filename="job_titles.csv", content_type="text/csv", size=100)
+
+        with patch.object(import_export_routes, 'validate_upload_file'), \
+             patch.object(import_export_routes, 'log_security_event'), \
+             patch.object(import_export_routes, 'get_client_ip'), \
+             patch.object(import_export_routes, 'get_import_export_security_service') as security_service, \
+             patch.object(import_export_routes, 'save_upload_file', AsyncMock(return_value="/tmp/job_titles.csv")), \
+             patch.object(import_export_routes, 'run_db', AsyncMock()), \
+             patch.object(import_export_routes, 'get_job_runner', return_value=runner), \
+             patch.object(import_export_routes, 'process_import_operation') as process:
+            security_service.return_value.get_security_headers.return_value = {}
+            asyncio.run(import_export_routes.upload_import_file(
+                Mock(), upload, "job_titles", conflict_resolution="skip", validate_only=False,
+                batch_size=100, plan_batches=True, csrf_protection=True, import_export_service=service
+            ))
+            operation_id, work = runner.submit.call_args.args
+            work(Mock())
+
+        options = process.call_args.args[3]
+        assert options.plan_batches and options.import_plan is None
@@ -0,0 +1,107 @@
+"""
+Tests for the dry-run import planner.
+"""
+
+from unittest.mock import patch
+
+from app.models.import_export import BatchResult, EntityImportPlan, ImportOptions, ImportPlan, ImportResult
+from app.services.import_planner import ImportPlanner
+
+
+def job_title_records(count, start=1):
+    return [
+        {'id': i, 'name': f"Job {i}", 'short_name': f"J{i}"}
+        for i in range(start, start + count)
+    ]
+
+
+class TestImportPlanner:
+    """Test plans measured on a sample of the import data"""
+
+    def test_plan_measures_sample_without_writing(self, import_service, schema_db_manager):
+        data = {"job_titles": job_title_records(50), "persons": []}
+        options = ImportOptions(entity_types=["job_titles", "persons"])
+
+        plan = ImportPlanner(import_service, sample_size=10).plan(data, options, parse_seconds=0.5)
+
+        assert plan.processing_order == ["job_titles", "persons"]
+        job_titles = plan.entities["job_titles"]
+        assert (job_titles.record_count, job_titles.sample_size) == (50, 10)
+        assert job_titles.parse_seconds_per_record == 0.01
+        assert job_titles.validate_seconds_per_record > 0
+        assert job_titles.insert_seconds_per_record > 0
+        assert 1 <= job_titles.batch_size <= 50
+        assert plan.estimated_seconds >= 0.5
+        assert plan.predicted_peak_memory_mb >= plan.baseline_memory_mb
+        assert plan.entities["persons"].record_count == 0
+
+        assert schema_db_manager.conn.execute("SELECT COUNT(*) FROM job_titles").fetchone()[0] == 0
+        assert not any(query.lstrip().upper().startswith("INSERT") for query in schema_db_manager.queries)
+
+    def test_plan_counts_conflicts_with_existing_records(self, import_service, schema_db_manager):
+        schema_db_manager.conn.execute("INSERT INTO job_titles (name, short_name) VALUES ('Job 2', 'J2')")
+        schema_db_manager.conn.commit()
+
+        plan = ImportPlanner(import_service).plan(
+            {"job_titles": job_title_records(5, start=10) + [{'name': "Job 2", 'short_name': "X"}]},
+            ImportOptions(entity_types=["job_titles"])
+        )
+
+        assert plan.total_conflicts == 1
+
+    def test_batch_size_fills_target_time_within_bounds(self, import_service):
+        planner = ImportPlanner(import_service, batch_seconds=1.0)
+        config = import_service.performance_service.config
+
+        fast = EntityImportPlan("job_titles", record_count=100000, sample_size=10, batch_size=100,
+                                insert_seconds_per_record=1e-6)
+        slow = EntityImportPlan("job_titles", record_count=100000, sample_size=10, batch_size=100,
+                                insert_seconds_per_record=0.02)
+        few = EntityImportPlan("job_titles", record_count=3, sample_size=3, batch_size=100,
+                               insert_seconds_per_record=0.02)
+
+        assert planner._batch_size(fast, 0.0) == config.max_batch_size
+        assert planner._batch_size(slow, 0.0) == 50
+        assert planner._batch_size(few, 0.0) == 3
+
+    def test_preview_includes_plan_when_asked(self, import_service, tmp_path):
+        file_path = tmp_path / "job_titles.csv"
+        file_path.write_text("id,name,short_name\n1,Job 1,J1\n2,Job 2,J2\n", encoding="utf-8")
+        file_format = import_service.detect_file_format(str(file_path))
+
+        with patch('app.services.csv_processor._parse_settings', return_value=(1, 5000)):
+            planned = import_service.preview_import(
+                str(file_path), file_format, ImportOptions(entity_types=["job_titles"], plan_batches=True)
+            )
+            with patch.object(ImportPlanner, 'plan') as plan:
+                unplanned = import_service.preview_import(
+                    str(file_path), file_format, ImportOptions(entity_types=["job_titles"])
+                )
+
+        assert planned.import_plan.entities["job_titles"].record_count == 2
+        assert unplanned.import_plan is None
+        plan.assert_not_called()
+
+    def test_record_size_estimated_from_sample(self, import_service):
+        planner = ImportPlanner(import_service)
+        small = [{'name': "Job", 'short_name': "J"}] * 10
+        large = [{'name': "Job " * 500, 'short_name': "J", 'aliases': [{'value': "x" * 1000}]}] * 10
+
+        small_bytes, large_bytes = planner._record_bytes(small), planner._record_bytes(large)
+
+        # The name, and the aliases both as parsed and as the JSON stored
+        assert 0 < small_bytes < 2000 + 2 * 1000 < large_bytes
+
+    def test_import_follows_plan_batch_sizes(self, import_service):
+        plan = ImportPlan(entities={
+            "job_titles": EntityImportPlan("job_titles", record_count=7, sample_size=7, batch_size=3)
+        })
+        options = ImportOptions(entity_types=["job_titles"], batch_size=100, import_plan=plan)
+        result = ImportResult(success=False, records_processed={"job_titles": 0}, records_created={"job_titles": 0},
+                              records_updated={"job_titles": 0}, records_skipped={"job_titles": 0})
+
+        with patch.object(import_service, '_process_record_batch',
+                          return_value=BatchResult(success=True)) as process_batch:
+            assert import_service._process_entity_batches("job_titles", job_title_records(7), options, {}, result)
+
+        assert [len(call.args[1]) for call in process_batch.call_args_list] == [3, 3, 1]
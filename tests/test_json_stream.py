@@ -0,0 +1,75 @@
+"""
+Tests for the incremental JSON import reader.
+"""
+
+import io
+import json
+
+import pytest
+
+from app.services.json_stream import IncrementalJSONReader, JSONStructureError
+
+
+DOCUMENT = {
+    "metadata": {"version": "1.0", "counts": [1, 2]},
+    "units": [{"id": i, "name": f"Unit \"{i}\" é", "ratio": 1234.5e-3, "active": i % 2 == 0, "end_date": None}
+              for i in range(50)],
+    "job_titles": [],
+    "persons": [{"id": 1, "aliases": ["a", "b"]}, "not a record"],
+}
+
+
+def read_all(text, chunk_size):
+    return list(IncrementalJSONReader(io.StringIO(text), chunk_size).items())
+
+
+class TestIncrementalJSONReader:
+    """Test the walk over the root object at any chunk size"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 16, 64 * 1024])
+    def test_yields_array_elements_and_plain_values(self, chunk_size):
+        items = read_all(json.dumps(DOCUMENT, indent=2), chunk_size)
+
+        assert items[0] == ("metadata", DOCUMENT["metadata"], None)
+        assert [value for key, value, _ in items if key == "units"] == DOCUMENT["units"]
+        assert [index for key, _, index in items if key == "units"] == list(range(50))
+        assert not any(key == "job_titles" for key, _, _ in items)
+        assert items[-1] == ("persons", "not a record", 1)
+
+    def test_number_split_across_chunks(self):
+        assert read_all('{"a": [123456789, 2]}', 9) == [("a", 123456789, 0), ("a", 2, 1)]
+
+    def test_empty_object(self):
+        assert read_all(' { } ', 1) == []
+
+    def test_root_must_be_object(self):
+        with pytest.raises(JSONStructureError):
+            read_all('[{"id": 1}]', 4)
+
+    @pytest.mark.parametrize("text", [
+        '{"a": [1, 2}',
+        '{"a": [1,\n\n2,,3]}',
+        '{"a": tru}',
+        '{"a": 1} extra',
+        '{"a" 1}',
+        '{"a": [1, 2]',
+    ])
+    def test_errors_report_file_position(self, text):
+        with pytest.raises(json.JSONDecodeError) as small_chunks:
+            read_all(text, 2)
+        with pytest.raises(json.JSONDecodeError) as one_chunk:
+            read_all(text, 1024)
+
+        assert (small_chunks.value.lineno, small_chunks.value.colno, small_chunks.value.pos) == \
+            (one_chunk.value.lineno, one_chunk.value.colno, one_chunk.value.pos)
+        if text.startswith('{"a": [1,\n'):
+            assert (one_chunk.value.lineno, one_chunk.value.colno) == (3, 3)
+
+    def test_memory_bounded_by_record(self):
+        text = json.dumps({"persons": [{"id": i, "name": "x" * 100} for i in range(2000)]})
+        reader = IncrementalJSONReader(io.StringIO(text), 256)
+        buffer_sizes = []
+        for _ in reader.items():
+            buffer_sizes.append(len(reader._buffer))
+
+        assert max(buffer_sizes) < 1024
@@ -0,0 +1,150 @@
+"""
+Tests for the versioned org tree snapshot cache.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.models.unit_type import UnitType
+from app.services.assignment import AssignmentService
+from app.services.orgchart import OrgchartService
+from app.services.unit_type import UnitTypeService
+from app.services.orgchart_cache import (
+    OrgTreeCache, FrozenDict, freeze, get_data_generation, bump_data_generation
+)
+from tests.test_orgchart_tree import populate_hierarchy
+
+
+class Builder:
+    """Counting build callable"""
+
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value if value is not None else [{'id': 1, 'children': []}]
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class TestOrgTreeCache:
+    """Test cache hits, invalidation and eviction"""
+
+    def test_hit_after_first_build(self):
+        cache = OrgTreeCache()
+        build = Builder()
+
+        first = cache.get_or_build('tree', build)
+        second = cache.get_or_build('tree', build)
+
+        assert build.calls == 1
+        assert first is second
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['rebuilds'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_generation_bump_invalidates(self):
+        cache = OrgTreeCache()
+        build = Builder()
+
+        cache.get_or_build('tree', build)
+        bump_data_generation("test")
+        cache.get_or_build('tree', build)
+
+        assert build.calls == 2
+
+    def test_ttl_expiry(self):
+        cache = OrgTreeCache(ttl_seconds=10)
+        build = Builder()
+
+        with patch('app.services.orgchart_cache.time.monotonic', return_value=100.0):
+            cache.get_or_build('tree', build)
+        with patch('app.services.orgchart_cache.time.monotonic', return_value=105.0):
+            cache.get_or_build('tree', build)
+        assert build.calls == 1
+
+        with patch('app.services.orgchart_cache.time.monotonic', return_value=111.0):
+            cache.get_or_build('tree', build)
+        assert build.calls == 2
+
+    def test_lru_eviction(self):
+        cache = OrgTreeCache(max_entries=2)
+        builds = {key: Builder() for key in ('a', 'b', 'c')}
+
+        cache.get_or_build('a', builds['a'])
+        cache.get_or_build('b', builds['b'])
+        cache.get_or_build('a', builds['a'])  # 'b' is now least recently used
+        cache.get_or_build('c', builds['c'])
+        cache.get_or_build('a', builds['a'])
+        cache.get_or_build('b', builds['b'])
+
+        assert builds['a'].calls == 1
+        assert builds['b'].calls == 2
+        assert cache.get_stats()['evictions'] == 2
+        assert cache.get_stats()['entries'] == 2
+
+    def test_disabled_always_builds(self):
+        cache = OrgTreeCache(enabled=False)
+        build = Builder()
+
+        cache.get_or_build('tree', build)
+        cache.get_or_build('tree', build)
+
+        assert build.calls == 2
+        assert cache.get_stats()['entries'] == 0
+
+    def test_snapshot_is_read_only(self):
+        snapshot = freeze([{'id': 1, 'children': [{'id': 2, 'children': []}]}])
+
+        assert isinstance(snapshot, tuple)
+        assert isinstance(snapshot[0], FrozenDict)
+        with pytest.raises(TypeError):
+            snapshot[0]['id'] = 3
+        with pytest.raises(TypeError):
+            snapshot[0]['children'][0].update(id=4)
+
+        copy = snapshot[0].copy()
+        copy['id'] = 3
+        assert snapshot[0]['id'] == 1
+
+
+class TestOrgTreeCacheInvalidation:
+    """Test that service writes invalidate cached trees"""
+
+    def test_assignment_write_bumps_generation(self, mock_db_manager):
+        service = AssignmentService()
+        service.db_manager = mock_db_manager
+        generation = get_data_generation()
+
+        service.terminate_assignment(1)
+
+        assert get_data_generation() > generation
+
+    def test_unit_type_write_bumps_generation(self):
+        service = UnitTypeService()
+        generation = get_data_generation()
+
+        with patch('app.services.unit_type.DatabaseManager', return_value=MagicMock()), \
+             patch.object(service, 'get_by_id', return_value=None):
+            service.update(UnitType(id=1, name="Direzione", short_name="DIR"))
+
+        assert get_data_generation() > generation
+
+    def test_orgchart_service_serves_cached_tree(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        with patch('app.services.orgchart.get_db_manager', return_value=schema_db_manager), \
+             patch('app.services.orgchart.get_orgchart_cache', return_value=OrgTreeCache()):
+            service = OrgchartService()
+
+        first = service.get_complete_tree(show_persons=True)
+        schema_db_manager.queries.clear()
+        second = service.get_complete_tree(show_persons=True)
+
+        assert second == first
+        assert schema_db_manager.queries == []
+
+        bump_data_generation("test")
+        service.get_complete_tree(show_persons=True)
+        assert len(schema_db_manager.queries) == 2
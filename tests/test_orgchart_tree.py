@@ -0,0 +1,157 @@
+"""
+Tests for the bulk org tree builder used by OrgchartService.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.services.orgchart import OrgchartService
+from app.services.orgchart_cache import OrgTreeCache
+from app.services.orgchart_tree import OrgTreeBuilder
+from app.services.unit_closure import UnitClosure
+
+
+def populate_hierarchy(db, fan_out: int = 3):
+    """Create root 1 -> children, each with `fan_out` grandchildren, plus assignments"""
+    conn = db.conn
+    conn.execute("INSERT INTO unit_types (id, name, short_name) VALUES (1, 'Direzione', 'DIR')")
+    conn.execute("INSERT INTO job_titles (id, name) VALUES (1, 'Manager')")
+    conn.execute("INSERT INTO job_titles (id, name) VALUES (2, 'Analyst')")
+    conn.execute("INSERT INTO units (id, name, short_name, parent_unit_id) VALUES (1, 'Root', 'R', NULL)")
+    # Ids 2 and 10 exercise the textual path ordering ('1/10' < '1/2')
+    conn.execute("INSERT INTO units (id, name, short_name, parent_unit_id) VALUES (2, 'Two', 'T2', 1)")
+    conn.execute("INSERT INTO units (id, name, short_name, parent_unit_id) VALUES (10, 'Ten', 'T10', 1)")
+
+    next_id = 100
+    for parent_id in (2, 10):
+        for _ in range(fan_out):
+            conn.execute(
+                "INSERT INTO units (id, name, short_name, parent_unit_id) VALUES (?, ?, ?, ?)",
+                (next_id, f"Unit {next_id}", f"U{next_id}", parent_id)
+            )
+            next_id += 1
+
+    conn.execute("INSERT INTO persons (id, name, short_name) VALUES (1, 'Zeta', 'Z')")
+    conn.execute("INSERT INTO persons (id, name, short_name) VALUES (2, 'Alfa', 'A')")
+    assignments = [
+        (1, 1, 1, 1.0, 0, 1, 1),
+        (2, 1, 2, 0.5, 1, 0, 1),
+        (2, 2, 2, 0.5, 0, 0, 1),
+        (1, 2, 2, 1.0, 0, 0, 0),  # historical, must be ignored
+    ]
+    conn.executemany(
+        "INSERT INTO person_job_assignments "
+        "(person_id, unit_id, job_title_id, percentage, is_ad_interim, is_unit_boss, is_current) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        assignments
+    )
+    UnitClosure.rebuild(conn)
+    conn.commit()
+
+
+class TestOrgTreeBuilder:
+    """Test tree assembly from bulk queries"""
+
+    def test_complete_tree_shape(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        tree = OrgTreeBuilder(schema_db_manager).build_complete_tree(show_persons=True)
+
+        assert len(tree) == 1
+        root = tree[0]
+        assert set(root.keys()) == {
+            'id', 'name', 'short_name', 'unit_type_id', 'level',
+            'person_count', 'children_count', 'children', 'persons'
+        }
+        assert root['level'] == 0
+        assert root['children_count'] == 2
+        assert root['person_count'] == 2
+        assert [child['id'] for child in root['children']] == [10, 2]
+        assert all(child['level'] == 1 for child in root['children'])
+        assert all(grandchild['level'] == 2
+                   for child in root['children'] for grandchild in child['children'])
+
+    def test_persons_attached_and_sorted(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        root = OrgTreeBuilder(schema_db_manager).build_complete_tree(show_persons=True)[0]
+
+        assert [person['name'] for person in root['persons']] == ['Alfa', 'Zeta']
+        assert set(root['persons'][0].keys()) == {
+            'id', 'name', 'short_name', 'job_title_name',
+            'is_ad_interim', 'is_unit_boss', 'percentage'
+        }
+        unit_two = next(child for child in root['children'] if child['id'] == 2)
+        assert [person['id'] for person in unit_two['persons']] == [2]
+        assert unit_two['person_count'] == 1
+
+    def test_without_persons(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        builder = OrgTreeBuilder(schema_db_manager)
+        root = builder.build_complete_tree(show_persons=False)[0]
+
+        assert root['persons'] is None
+        assert root['person_count'] == 2
+        assert builder.last_query_count == 1
+
+    @pytest.mark.parametrize("fan_out", [1, 25, 200])
+    def test_query_count_is_constant(self, schema_db_manager, fan_out):
+        populate_hierarchy(schema_db_manager, fan_out=fan_out)
+        builder = OrgTreeBuilder(schema_db_manager)
+
+        builder.build_complete_tree(show_persons=True)
+        assert builder.last_query_count == 2
+
+        builder.build_subtree(10, show_persons=True)
+        assert builder.last_query_count == 2
+
+    def test_subtree(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        subtree = OrgTreeBuilder(schema_db_manager).build_subtree(10, show_persons=True)
+
+        assert len(subtree) == 1
+        assert subtree[0]['id'] == 10
+        assert subtree[0]['level'] == 0
+        assert [child['id'] for child in subtree[0]['children']] == [103, 104, 105]
+        assert all(child['level'] == 1 for child in subtree[0]['children'])
+
+    def test_subtree_missing_root(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        assert OrgTreeBuilder(schema_db_manager).build_subtree(9999) == []
+
+    def test_cycle_does_not_loop(self, schema_db_manager):
+        conn = schema_db_manager.conn
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (1, 'A', NULL)")
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (2, 'B', 1)")
+        conn.execute("UPDATE units SET parent_unit_id = 2 WHERE id = 1")
+        UnitClosure.rebuild(conn)
+        conn.commit()
+
+        subtree = OrgTreeBuilder(schema_db_manager).build_subtree(1, show_persons=False)
+        assert subtree[0]['children'][0]['id'] == 2
+        assert subtree[0]['children'][0]['children'] == []
+
+
+class TestOrgchartServiceTree:
+    """Test OrgchartService delegation to the tree builder"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self):
+        with patch('app.services.orgchart.get_orgchart_cache', return_value=OrgTreeCache()):
+            yield
+
+    def test_get_complete_tree_uses_builder(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager, fan_out=50)
+        with patch('app.services.orgchart.get_db_manager', return_value=schema_db_manager):
+            service = OrgchartService()
+
+        schema_db_manager.queries.clear()
+        tree = service.get_complete_tree(show_persons=True)
+
+        assert tree[0]['id'] == 1
+        assert len(schema_db_manager.queries) == 2
+
+    def test_get_subtree_error_returns_empty(self, schema_db_manager):
+        with patch('app.services.orgchart.get_db_manager', return_value=schema_db_manager):
+            service = OrgchartService()
+
+        with patch.object(service.tree_builder, 'build_subtree', side_effect=RuntimeError("boom")):
+            assert service.get_subtree(1) == []
@@ -480,6 +480,46 @@ class TestPerformanceLargeDatasets:
         assert processing_time < 60.0, f"Streaming processing too slow: {processing_time:.2f}s"
         assert peak_memory_increase < 300, f"Memory increase too high for streaming: {peak_memory_increase:.2f}MB"
     
+    def test_incremental_json_memory(self):
+        """Test that streaming JSON records keeps memory bounded by one record."""
+        import tracemalloc
+        from app.services.import_export_performance import PerformanceConfig, StreamingProcessor
+        
+        json_file = os.path.join(self.temp_dir, "incremental_test.json")
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({"metadata": {"export_timestamp": datetime.now().isoformat()},
+                       **self._generate_large_person_dataset(50000)}, f)
+        file_size_mb = os.path.getsize(json_file) / 1024 / 1024
+        
+        def traced_peak_mb(parse):
+            tracemalloc.start()
+            try:
+                start_time = time.time()
+                result = parse()
+                elapsed = time.time() - start_time
+                return result, tracemalloc.get_traced_memory()[1] / 1024 / 1024, elapsed
+            finally:
+                tracemalloc.stop()
+        
+        def load_whole_file():
+            with open(json_file, 'r', encoding='utf-8') as f:
+                return len(json.load(f)["persons"])
+        
+        streaming_processor = StreamingProcessor(PerformanceConfig())
+        
+        def stream_records():
+            return sum(1 for _ in streaming_processor.stream_json_records(json_file))
+        
+        loaded, load_peak_mb, load_time = traced_peak_mb(load_whole_file)
+        streamed, stream_peak_mb, stream_time = traced_peak_mb(stream_records)
+        
+        print(f"JSON file {file_size_mb:.1f}MB: json.load peak {load_peak_mb:.1f}MB in {load_time:.2f}s, "
+              f"incremental peak {stream_peak_mb:.1f}MB in {stream_time:.2f}s")
+        
+        assert streamed == loaded == 50000
+        assert stream_peak_mb < 2, f"Incremental reader peak too high: {stream_peak_mb:.1f}MB"
+        assert stream_peak_mb * 10 < load_peak_mb
+    
     def test_concurrent_processing_performance(self):
         """Test performance characteristics under concurrent load."""
         # Create multiple datasets for concurrent processing
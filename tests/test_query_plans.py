@@ -0,0 +1,149 @@
+"""
+EXPLAIN QUERY PLAN regression tests for the core index pack migration.
+
+Every query issued by the exercised OrgchartService, AssignmentService and
+BaseService methods is explained against the schema plus the migration, and
+any full scan of a core table fails the test. Whole-table reads that are
+full scans by design (listing every unit, counting rows) are allowed
+explicitly per call.
+"""
+
+import re
+from datetime import date
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from app.services.assignment import AssignmentService
+from app.services.orgchart import OrgchartService
+from app.services.orgchart_cache import OrgTreeCache
+from app.services.unit import UnitService
+from tests.test_orgchart_tree import populate_hierarchy
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "database" / "migrations" / "20261016_090000_core_index_pack.sql"
+)
+
+CORE_TABLES = {'units', 'persons', 'person_job_assignments', 'job_titles', 'unit_types'}
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SQL_KEYWORDS = {'on', 'where', 'left', 'inner', 'join', 'group', 'order', 'set', 'limit', 'using'}
+
+
+def table_aliases(query: str) -> dict:
+    """Map every name a core table is referenced by in the query to the table"""
+    aliases = {}
+    for table, alias in TABLE_REF.findall(query):
+        if table.lower() not in CORE_TABLES:
+            continue
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(conn, query: str) -> set:
+    """Core tables the query plan reads without any index"""
+    params = (1,) * query.count('?')
+    scanned = set()
+    aliases = table_aliases(query)
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params):
+        match = re.fullmatch(r'SCAN (\w+)', row['detail'])
+        if match and match.group(1) in aliases:
+            scanned.add(aliases[match.group(1)])
+    return scanned
+
+
+@pytest.fixture
+def indexed_db_manager(schema_db_manager):
+    """Core schema with the index pack migration applied"""
+    schema_db_manager.conn.executescript(MIGRATION_PATH.read_text(encoding="utf-8"))
+    populate_hierarchy(schema_db_manager)
+    return schema_db_manager
+
+
+@pytest.fixture
+def services(indexed_db_manager):
+    with patch('app.services.base.get_db_manager', return_value=indexed_db_manager), \
+         patch('app.services.orgchart.get_db_manager', return_value=indexed_db_manager), \
+         patch('app.services.orgchart.get_orgchart_cache', return_value=OrgTreeCache(enabled=False)):
+        yield {
+            'orgchart': OrgchartService(),
+            'assignment': AssignmentService(),
+            'unit': UnitService(),
+        }
+
+
+# (call, core tables it may read in full)
+SERVICE_CALLS = {
+    'orgchart.get_complete_tree': (lambda s: s['orgchart'].get_complete_tree(), {'units'}),
+    'orgchart.get_subtree': (lambda s: s['orgchart'].get_subtree(10), {'units'}),
+    'orgchart.get_organization_overview': (
+        lambda s: s['orgchart'].get_organization_overview(), {'units', 'persons', 'job_titles'}
+    ),
+    'orgchart.get_organization_metrics': (lambda s: s['orgchart'].get_organization_metrics(), set()),
+    'orgchart.get_unit_organizational_context': (
+        lambda s: s['orgchart'].get_unit_organizational_context(2), set()
+    ),
+    'orgchart.get_vacant_positions': (lambda s: s['orgchart'].get_vacant_positions(), {'units'}),
+    'orgchart.get_unit_path': (lambda s: s['orgchart'].get_unit_path(100), set()),
+    'orgchart.get_recent_organizational_changes': (
+        lambda s: s['orgchart'].get_recent_organizational_changes(), set()
+    ),
+    'assignment.get_by_id': (lambda s: s['assignment'].get_by_id(1), set()),
+    'assignment.get_current_assignments': (lambda s: s['assignment'].get_current_assignments(), set()),
+    'assignment.get_assignments_by_person': (lambda s: s['assignment'].get_assignments_by_person(1), set()),
+    'assignment.get_current_assignments_by_person': (
+        lambda s: s['assignment'].get_current_assignments_by_person(1), set()
+    ),
+    'assignment.get_assignments_by_unit': (lambda s: s['assignment'].get_assignments_by_unit(1), set()),
+    'assignment.get_current_assignments_by_unit': (
+        lambda s: s['assignment'].get_current_assignments_by_unit(1), set()
+    ),
+    'assignment.get_assignment_history': (lambda s: s['assignment'].get_assignment_history(1, 1, 1), set()),
+    'assignment.get_next_version': (lambda s: s['assignment']._get_next_version(1, 1, 1), set()),
+    'assignment.get_current_assignment': (lambda s: s['assignment']._get_current_assignment(1, 1, 1), set()),
+    'assignment.deactivate_previous': (
+        lambda s: s['assignment']._deactivate_previous_assignments(1, 1, 1, date.today()), set()
+    ),
+    'assignment.validate_assignment_rules': (
+        lambda s: s['assignment'].validate_assignment_rules(s['assignment'].get_by_id(1)), set()
+    ),
+    'assignment.terminate_assignment': (lambda s: s['assignment'].terminate_assignment(3), set()),
+    'unit.get_available_parents': (lambda s: s['unit'].get_available_parents(10), {'units'}),
+    'base.get_by_id': (lambda s: s['unit'].get_by_id(2), set()),
+    'base.exists': (lambda s: s['unit'].exists(2), set()),
+    'base.count': (lambda s: s['unit'].count(), set()),
+}
+
+
+class TestCoreIndexPack:
+    """Test that hot queries are served by indexes"""
+
+    @pytest.mark.parametrize("call_name", sorted(SERVICE_CALLS))
+    def test_no_full_table_scan(self, services, indexed_db_manager, call_name):
+        call, allowed_scans = SERVICE_CALLS[call_name]
+
+        indexed_db_manager.queries.clear()
+        call(services)
+        assert indexed_db_manager.queries, f"{call_name} issued no queries"
+
+        for query in indexed_db_manager.queries:
+            unexpected = full_scans(indexed_db_manager.conn, query) - allowed_scans
+            assert not unexpected, f"{call_name} scans {sorted(unexpected)}:\n{query}"
+
+    def test_scan_detected_without_migration(self, schema_db_manager):
+        query = "SELECT * FROM person_job_assignments pja WHERE pja.person_id = ? AND pja.is_current = 1"
+        assert full_scans(schema_db_manager.conn, query) == {'person_job_assignments'}
+
+    def test_migration_is_idempotent(self, indexed_db_manager):
+        indexed_db_manager.conn.executescript(MIGRATION_PATH.read_text(encoding="utf-8"))
+
+        indexes = {
+            row['name'] for row in indexed_db_manager.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+            )
+        }
+        assert {'idx_units_parent_unit_id', 'idx_pja_current_unit', 'idx_pja_person_unit_job_version'} <= indexes
@@ -0,0 +1,171 @@
+"""
+Tests for the per-statement query registry and the /health/queries endpoint.
+"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from app.database import AsyncDatabaseManager
+from app.query_registry import QueryRegistry, fingerprint
+
+
+@pytest.fixture
+def registry():
+    registry = QueryRegistry()
+    with patch('app.database.get_query_registry', return_value=registry), \
+         patch('app.routes.health.get_query_registry', return_value=registry):
+        yield registry
+
+
+class ItemRepository:
+    """Stand-in service issuing queries through DatabaseManager"""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def list_items(self):
+        return self.db_manager.fetch_all("SELECT * FROM items ORDER BY id")
+
+    def get_item(self, item_id):
+        return self.db_manager.fetch_one("SELECT * FROM items WHERE id = ?", (item_id,))
+
+
+def statement(snapshot, name):
+    return next(s for s in snapshot['statements'] if s['name'] == name)
+
+
+class TestQueryRegistry:
+    """Test fingerprinting, counters and histograms"""
+
+    def test_fingerprint_ignores_formatting(self):
+        assert fingerprint("Svc.m", "SELECT *\n   FROM items") == fingerprint("Svc.m", "SELECT * FROM items")
+        assert fingerprint("Svc.m", "SELECT * FROM items") != fingerprint("Svc.other", "SELECT * FROM items")
+
+    def test_records_by_calling_method(self, file_db_manager, registry):
+        repository = ItemRepository(file_db_manager)
+        for _ in range(3):
+            repository.list_items()
+        repository.get_item(2)
+        repository.get_item(99)
+
+        snapshot = registry.snapshot()
+        list_name = fingerprint("ItemRepository.list_items", "SELECT * FROM items ORDER BY id")
+        get_name = fingerprint("ItemRepository.get_item", "SELECT * FROM items WHERE id = ?")
+
+        assert statement(snapshot, list_name)['calls'] == 3
+        assert statement(snapshot, list_name)['rows'] == 9
+        assert statement(snapshot, get_name)['calls'] == 2
+        assert statement(snapshot, get_name)['rows'] == 1
+        assert statement(snapshot, get_name)['query'] == "SELECT * FROM items WHERE id = ?"
+
+    def test_names_owner_from_code_object(self, file_db_manager, registry):
+        class CachedRepository(ItemRepository):
+            pass
+
+        # Inherited methods are named after the class that defines them
+        CachedRepository(file_db_manager).list_items()
+        ItemRepository(file_db_manager).list_items()
+
+        [entry] = registry.snapshot()['statements']
+        assert entry['name'] == fingerprint("ItemRepository.list_items", "SELECT * FROM items ORDER BY id")
+        assert entry['calls'] == 2
+
+        with patch('app.query_registry._owner_names', {ItemRepository.list_items.__code__: 'Cached.owner'}):
+            ItemRepository(file_db_manager).list_items()
+        assert statement(registry.snapshot(), fingerprint("Cached.owner", "SELECT * FROM items ORDER BY id"))['calls'] == 1
+
+    def test_records_failures(self, file_db_manager, registry):
+        with pytest.raises(Exception):
+            file_db_manager.fetch_all("SELECT * FROM missing")
+
+        [entry] = [s for s in registry.snapshot()['statements'] if 'missing' in s['query']]
+        assert entry['errors'] == 1
+
+    def test_records_async_queries(self, file_db_manager, registry):
+        aio = AsyncDatabaseManager(file_db_manager, workers=2)
+
+        async def list_items_async():
+            return await aio.fetch_all("SELECT * FROM items")
+
+        try:
+            asyncio.run(list_items_async())
+        finally:
+            aio.close()
+
+        [entry] = registry.snapshot()['statements']
+        assert ".list_items_async#" in entry['name']
+        assert entry['rows'] == 3
+
+    def test_percentiles(self, registry):
+        for duration_ms in range(1, 101):
+            registry.record("Svc.m#1", "SELECT 1", float(duration_ms))
+
+        [entry] = registry.snapshot()['statements']
+        assert entry['calls'] == 100
+        assert entry['max_ms'] == 100.0
+        # Bucket upper bounds, at most 25% above the exact value
+        assert 50 <= entry['p50_ms'] <= 50 * 1.25
+        assert 95 <= entry['p95_ms'] <= 95 * 1.25
+        assert 99 <= entry['p99_ms'] <= 99 * 1.25
+
+    def test_merges_per_thread_stats(self, registry):
+        def work():
+            for _ in range(1000):
+                registry.record("Svc.m#1", "SELECT 1", 0.5, rows=1)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        [entry] = registry.snapshot()['statements']
+        assert entry['calls'] == 4000
+        assert entry['rows'] == 4000
+
+    def test_reset(self, registry):
+        registry.record("Svc.m#1", "SELECT 1", 1.0)
+        registry.reset()
+        assert registry.snapshot()['statements'] == []
+
+        registry.record("Svc.m#1", "SELECT 1", 1.0)
+        assert registry.snapshot()['statements'][0]['calls'] == 1
+
+    def test_slow_query_log(self, caplog):
+        registry = QueryRegistry(slow_query_threshold_ms=10)
+
+        with caplog.at_level(logging.WARNING, logger="app.query_registry"):
+            registry.record("Svc.fast#1", "SELECT 1", 5.0)
+            registry.record("Svc.slow#1", "SELECT 2", 15.0)
+
+        assert "Svc.slow#1" in caplog.text
+        assert "Svc.fast#1" not in caplog.text
+
+    def test_disabled(self, file_db_manager):
+        registry = QueryRegistry(enabled=False)
+        with patch('app.database.get_query_registry', return_value=registry):
+            ItemRepository(file_db_manager).list_items()
+
+        assert registry.snapshot()['statement_count'] == 0
+
+
+class TestQueryStatisticsEndpoint:
+    """Test GET /api/health/queries"""
+
+    def test_returns_statements(self, client, registry):
+        registry.record("Svc.a#1", "SELECT 1", 1.0)
+        registry.record("Svc.b#1", "SELECT 2", 9.0)
+
+        response = client.get("/api/health/queries", params={"order_by": "max_ms", "limit": 1})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['statement_count'] == 2
+        assert [s['name'] for s in data['statements']] == ["Svc.b#1"]
+
+    def test_rejects_unknown_order(self, client, registry):
+        assert client.get("/api/health/queries", params={"order_by": "query"}).status_code == 422
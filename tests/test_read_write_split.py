@@ -0,0 +1,192 @@
+"""
+Tests for read-only connections, the single writer and group commit.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.database import ReadOnlyViolationError, is_write_statement
+from app.models.assignment import Assignment
+from app.services.assignment import AssignmentService
+from app.services.audit_trail import AuditTrailManager, OperationType
+from tests.conftest import SchemaDatabaseManager
+from tests.test_orgchart_tree import populate_hierarchy
+
+
+def count_items(db_manager):
+    return db_manager.fetch_one("SELECT COUNT(*) AS n FROM items")['n']
+
+
+class TestStatementRouting:
+    """Test which statements need the writer"""
+
+    @pytest.mark.parametrize("query", [
+        "INSERT INTO items (name) VALUES (?)",
+        "  update items SET name = ?",
+        "-- comment\nDELETE FROM items",
+        "/* hint */ REPLACE INTO items VALUES (1, 'a')",
+        "PRAGMA foreign_keys = ON",
+        "WITH old AS (SELECT id FROM items) DELETE FROM items WHERE id IN old",
+        "CREATE INDEX idx ON items(name)",
+    ])
+    def test_write_statements(self, query):
+        assert is_write_statement(query)
+
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM items",
+        "WITH RECURSIVE t AS (SELECT 1) SELECT * FROM t",
+        "PRAGMA foreign_keys",
+        "SELECT updated_at, deleted FROM items",
+    ])
+    def test_read_statements(self, query):
+        assert not is_write_statement(query)
+
+
+class TestReadWriteSplit:
+    """Test read-only pool and single writer"""
+
+    def test_read_connections_are_read_only(self, file_db_manager):
+        with file_db_manager.get_read_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+    def test_reads_see_committed_writes(self, file_db_manager):
+        cursor = file_db_manager.execute_query("INSERT INTO items (name) VALUES (?)", ("d",))
+
+        assert cursor.lastrowid == 4
+        assert file_db_manager.fetch_one("SELECT name FROM items WHERE id = 4")['name'] == "d"
+
+    def test_concurrent_writes_are_group_committed(self, file_db_manager):
+        writers = 8
+        errors = []
+
+        def insert(index):
+            try:
+                file_db_manager.execute_query("INSERT INTO items (name) VALUES (?)", (f"item {index}",))
+            except Exception as e:
+                errors.append(e)
+
+        # Hold the writer so every insert queues up behind it
+        with file_db_manager.get_connection():
+            threads = [threading.Thread(target=insert, args=(i,)) for i in range(writers)]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while len(file_db_manager._write_queue) < writers and time.monotonic() < deadline:
+                time.sleep(0.01)
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert errors == []
+        assert count_items(file_db_manager) == 3 + writers
+        writer_stats = file_db_manager.get_pool_status()['writer']
+        assert writer_stats['max_batch'] == writers
+        assert writer_stats['grouped_statements'] == writers
+
+    def test_failed_statement_does_not_abort_its_batch(self, file_db_manager):
+        results = {}
+
+        def insert(key, name):
+            try:
+                file_db_manager.execute_query("INSERT INTO items (name) VALUES (?)", (name,))
+                results[key] = "ok"
+            except sqlite3.IntegrityError:
+                results[key] = "failed"
+
+        with file_db_manager.get_connection():
+            threads = [
+                threading.Thread(target=insert, args=("good", "fine")),
+                threading.Thread(target=insert, args=("bad", None)),  # NOT NULL violation
+            ]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while len(file_db_manager._write_queue) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == {"good": "ok", "bad": "failed"}
+        assert count_items(file_db_manager) == 4
+
+    def test_statements_inside_transaction_share_it(self, file_db_manager):
+        with file_db_manager.get_connection() as conn:
+            conn.execute("BEGIN")
+            file_db_manager.execute_query("INSERT INTO items (name) VALUES (?)", ("pending",))
+            # Read-your-writes inside the block
+            assert count_items(file_db_manager) == 4
+            conn.execute("ROLLBACK")
+
+        assert count_items(file_db_manager) == 3
+
+    def test_write_on_read_path_routed_to_writer(self, file_db_manager):
+        file_db_manager.fetch_all("DELETE FROM items WHERE id = ?", (1,))
+
+        assert count_items(file_db_manager) == 2
+
+    def test_strict_routing_rejects_write_on_read_path(self, file_db_manager):
+        file_db_manager.strict_routing = True
+
+        with pytest.raises(ReadOnlyViolationError):
+            file_db_manager.fetch_one("DELETE FROM items WHERE id = ?", (1,))
+        assert count_items(file_db_manager) == 3
+
+    def test_assignment_transaction_on_writer(self, file_db_manager):
+        with file_db_manager.get_connection() as conn:
+            conn.executescript(SchemaDatabaseManager.SCHEMA_PATH.read_text(encoding="utf-8"))
+            populate_hierarchy(SimpleNamespace(conn=conn))
+
+        service = AssignmentService()
+        service.db_manager = file_db_manager
+
+        created = service.create_assignment(Assignment(
+            person_id=1, unit_id=1, job_title_id=1, percentage=0.5,
+            is_current=True, valid_from=date.today()
+        ))
+
+        assert created.version == 2
+        current = file_db_manager.fetch_all(
+            "SELECT version FROM person_job_assignments "
+            "WHERE person_id = 1 AND unit_id = 1 AND job_title_id = 1 AND is_current = 1"
+        )
+        assert [row['version'] for row in current] == [2]
+
+    def test_audit_reads_do_not_wait_for_the_writer(self, file_db_manager):
+        with patch('app.services.audit_trail.get_db_manager', return_value=file_db_manager):
+            audit_manager = AuditTrailManager()
+        audit_manager.start_operation("operation", OperationType.IMPORT)
+        writer_held, release_writer = threading.Event(), threading.Event()
+
+        def hold_writer():
+            # Like an import between the commits of its batches
+            with file_db_manager.get_connection():
+                writer_held.set()
+                release_writer.wait(10)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            holder = executor.submit(hold_writer)
+            assert writer_held.wait(5)
+            try:
+                reads = executor.submit(lambda: (
+                    audit_manager.get_operation_history(),
+                    audit_manager.get_operation_details("operation"),
+                    audit_manager.get_data_changes_for_entity("persons"),
+                    audit_manager.count_data_changes(datetime.now() - timedelta(days=1), datetime.now()),
+                    file_db_manager.fetch_one("SELECT 1"),
+                ))
+                history, details, changes, counts, _ = reads.result(timeout=5)
+            finally:
+                release_writer.set()
+            holder.result()
+
+        assert [operation['operation_id'] for operation in history] == ["operation"]
+        assert details['operation_id'] == "operation"
+        assert changes == [] and counts == []
+        audit_manager.close()
@@ -0,0 +1,104 @@
+"""
+Tests for the existing-record index used by import conflict detection.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.models.import_export import ConflictResolutionStrategy
+from app.services.conflict_resolution import ConflictDetector, ConflictType
+from app.services.job_title import JobTitleService
+from app.services.record_index import ExistingRecordIndex
+from tests.test_bulk_import import job_title_records, process
+
+
+class TestExistingRecordIndex:
+    """Test keys, lookups and maintenance of the index"""
+
+    def test_find_on_rows_and_models(self):
+        rows = [{'id': 1, 'name': "Alfa", 'email': None}, {'id': 2, 'name': "Beta", 'email': "b@x.it"}]
+        index = ExistingRecordIndex([['name'], ['email']], rows)
+
+        assert index.find(['name'], {'name': "Beta"}) is rows[1]
+        assert index.find(('id',), {'id': 1}) is rows[0]
+        assert index.find(['email'], {'email': None}) is None
+        assert index.find(['name'], {}) is None
+
+        models = ExistingRecordIndex([['name']], [SimpleNamespace(id=5, name="Gamma")])
+        assert models.find(['name'], {'name': "Gamma"}).id == 5
+
+    def test_first_record_wins_and_combination_order(self):
+        first, second = {'id': 1, 'name': "Same", 'short_name': "S1"}, {'id': 2, 'name': "Same", 'short_name': "S2"}
+        index = ExistingRecordIndex([['name'], ['short_name']], [first, second])
+
+        assert index.find(['name'], {'name': "Same"}) is first
+        assert index.find_first({'name': "Other", 'short_name': "S2"}, [['name'], ['short_name']]) is second
+
+    def test_undeclared_combination_indexed_on_use(self):
+        rows = [{'id': 1, 'person_id': 1, 'unit_id': 2}, {'id': 2, 'person_id': 1, 'unit_id': 3}]
+        index = ExistingRecordIndex([], rows)
+
+        assert index.find(['person_id', 'unit_id'], {'person_id': 1, 'unit_id': 3}) is rows[1]
+
+    def test_add_and_replace(self):
+        index = ExistingRecordIndex([['name']])
+        old = SimpleNamespace(id=1, name="Old")
+        index.add(old)
+        new = SimpleNamespace(id=1, name="New")
+        index.replace(old, new)
+
+        assert index.find(['name'], {'name': "Old"}) is None
+        assert index.find(['name'], {'name': "New"}) is new
+        assert len(index) == 1
+
+    def test_unhashable_values_not_indexed(self):
+        index = ExistingRecordIndex([['aliases']], [{'id': 1, 'aliases': ["a", "b"]}])
+
+        assert index.find(['aliases'], {'aliases': ["a", "b"]}) is None
+
+
+class TestIndexedConflictDetection:
+    """Test that imports and conflict detection look records up in the index"""
+
+    def test_database_conflicts(self):
+        existing = [{'id': i, 'name': f"Job {i}", 'short_name': f"J{i}"} for i in range(1, 1001)]
+        records = [{'id': 1000, 'name': "New"}, {'name': "Job 7", 'short_name': "NEW"}, {'name': "Fresh"}]
+
+        with patch('app.services.conflict_resolution.get_db_manager'):
+            conflicts = ConflictDetector()._detect_database_conflicts("job_titles", records, existing)
+
+        assert [(c.conflict_type, c.line_number, c.existing_record['id']) for c in conflicts] == [
+            (ConflictType.DUPLICATE_PRIMARY_KEY, 1, 1000),
+            (ConflictType.DUPLICATE_UNIQUE_FIELD, 2, 7),
+        ]
+
+    def test_existing_records_loaded_once_per_import(self, import_service, schema_db_manager):
+        schema_db_manager.conn.executemany(
+            "INSERT INTO job_titles (name, short_name) VALUES (?, ?)",
+            [(f"Job {i}", f"J{i}") for i in range(1, 6)]
+        )
+        schema_db_manager.conn.commit()
+        records = job_title_records(10)
+
+        with patch.object(JobTitleService, 'get_all', autospec=True,
+                          side_effect=JobTitleService.get_all) as get_all:
+            result, _ = process(import_service, "job_titles", records,
+                                conflict_resolution=ConflictResolutionStrategy.SKIP)
+            # Rows created by the import are in the index for later batches
+            again, _ = process(import_service, "job_titles", records,
+                               conflict_resolution=ConflictResolutionStrategy.SKIP)
+
+        assert get_all.call_count == 1
+        assert (result.created_count, result.skipped_count) == (5, 5)
+        assert (again.created_count, again.skipped_count) == (0, 10)
+
+    def test_updated_record_reindexed(self, import_service, schema_db_manager):
+        schema_db_manager.conn.execute("INSERT INTO job_titles (name, short_name) VALUES ('Job 1', 'OLD')")
+        schema_db_manager.conn.commit()
+
+        process(import_service, "job_titles", job_title_records(1),
+                conflict_resolution=ConflictResolutionStrategy.UPDATE)
+        index = import_service._existing_record_indexes["job_titles"]
+
+        assert index.find(['short_name'], {'short_name': "OLD"}) is None
+        assert index.find(['short_name'], {'short_name': "J1"}).id == 1
@@ -3,9 +3,11 @@ Security feature tests for Organigramma Web App
 Tests for input validation, SQL injection prevention, XSS protection, and security headers
 """
 
+import time
+
 import pytest
 from fastapi.testclient import TestClient
-from app.security import InputValidator, SecurityValidationError, CSRFProtection
+from app.security import InputValidator, SecurityValidationError, CSRFProtection, SecureDatabaseOperations
 from app.middleware.security import SecurityMiddleware
 
 # We'll create the client in individual tests to avoid import issues
@@ -346,6 +348,93 @@ class TestDatabaseSecurity:
         assert 'active_connections' in pool_status
         assert 'max_connections' in pool_status
 
+class TestQueryValidationCache:
+    """Test cached query validation and the precompiled parameter matcher"""
+    
+    QUERY = (
+        "SELECT pja.*, p.name AS person_name, u.name AS unit_name, jt.name AS job_title_name "
+        "FROM person_job_assignments pja "
+        "JOIN persons p ON pja.person_id = p.id "
+        "JOIN units u ON pja.unit_id = u.id "
+        "JOIN job_titles jt ON pja.job_title_id = jt.id "
+        "WHERE pja.unit_id = ? AND pja.is_current = 1 "
+        "ORDER BY p.name"
+    )
+    
+    @staticmethod
+    def legacy_validate_query_safety(query):
+        """Previous uncached implementation, kept as the reference behaviour"""
+        query_upper = query.upper()
+        return not any(pattern in query_upper for pattern in ["' +", '" +', "CONCAT(", "||"])
+    
+    @staticmethod
+    def legacy_detect_sql_injection(value):
+        """Previous two-pass implementation, kept as the reference behaviour"""
+        if not value:
+            return False
+        if InputValidator.PATTERNS['sql_injection'].search(value):
+            return True
+        value_upper = value.upper()
+        return any(fragment.upper() in value_upper for fragment in InputValidator.SQL_INJECTION_FRAGMENTS)
+    
+    def test_same_results_as_uncached_checks(self):
+        queries = [
+            self.QUERY,
+            "SELECT name || ' ' || short_name FROM units",
+            "SELECT concat(name, short_name) FROM units",
+            "SELECT 'a' + name FROM units",
+            'SELECT "a" + name FROM units',
+            "PRAGMA foreign_keys",
+        ]
+        for query in queries:
+            assert SecureDatabaseOperations.validate_query_safety(query) == self.legacy_validate_query_safety(query)
+        
+        values = [
+            "Mario Rossi", "Unit Name", "", "Selectric", "drop-in", "O'Brien",
+            "'; drop table units; --", "' or 1=1", "' OR '1'='1", "union select *",
+            "comment /* here", "end */", "Update team", "EXECutive",
+        ]
+        for value in values:
+            assert InputValidator.detect_sql_injection(value) == self.legacy_detect_sql_injection(value), value
+    
+    def test_query_validated_once_per_text(self):
+        SecureDatabaseOperations.validate_query_safety.cache_clear()
+        
+        for _ in range(100):
+            assert SecureDatabaseOperations.validate_query_safety(self.QUERY)
+            assert not SecureDatabaseOperations.validate_query_safety("SELECT a || b FROM units")
+        
+        info = SecureDatabaseOperations.validate_query_safety.cache_info()
+        assert info.misses == 2
+        assert info.hits == 198
+    
+    def test_sanitize_params_rejects_injection(self):
+        assert SecureDatabaseOperations.sanitize_sql_params((1, "Mario Rossi", None)) == (1, "Mario Rossi", None)
+        
+        with pytest.raises(SecurityValidationError):
+            SecureDatabaseOperations.sanitize_sql_params((1, "x' OR 1=1"))
+    
+    def test_validation_overhead_bench(self):
+        """Cached validation must beat re-scanning the query text on every call"""
+        iterations = 20000
+        params = (42, "Mario Rossi", "Ufficio Acquisti", 100.0)
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            self.legacy_validate_query_safety(self.QUERY)
+            for param in params:
+                if isinstance(param, str):
+                    self.legacy_detect_sql_injection(param)
+        legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            SecureDatabaseOperations.validate_query_safety(self.QUERY)
+            SecureDatabaseOperations.sanitize_sql_params(params)
+        cached_time = time.perf_counter() - start
+        
+        assert cached_time < legacy_time, f"cached {cached_time:.3f}s vs legacy {legacy_time:.3f}s"
+
 # Integration tests
 class TestSecurityIntegration:
     """Integration tests for security features"""
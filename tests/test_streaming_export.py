@@ -0,0 +1,208 @@
+"""
+Tests for exports streamed from database cursors to files and downloads.
+"""
+
+import asyncio
+import csv
+import gc
+import io
+import json
+import zipfile
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db_executor import DatabaseBusyError
+from app.models.entity_mappings import get_entity_mapping
+from app.models.import_export import ExportOptions, FileFormat
+from app.routes import import_export as import_export_routes
+from app.services.job_title import JobTitleService
+from app.services.unit_type import UnitTypeService
+from app.services.json_processor import JSONProcessor
+from app.services.export_stream import StreamLimiter, encode_chunks
+
+
+def add_job_titles(db_manager, count):
+    db_manager.conn.executemany(
+        "INSERT INTO job_titles (name, short_name) VALUES (?, ?)",
+        [(f"Job {i}", f"J{i}") for i in range(1, count + 1)]
+    )
+    db_manager.conn.commit()
+
+
+def no_get_all(self, **kwargs):
+    raise AssertionError("exports must not load whole tables")
+
+
+def plain_unit_types():
+    # The unit type list query needs the themes migration, not under test here
+    return patch.object(UnitTypeService, 'get_list_query', return_value="SELECT * FROM unit_types")
+
+
+class TestRowIteration:
+    """Test cursor-backed iteration in DatabaseManager"""
+
+    def test_rows_fetched_in_batches(self, file_db_manager):
+        rows = file_db_manager.iter_rows("SELECT name FROM items ORDER BY id", batch_size=2)
+
+        assert [row['name'] for row in rows] == ["a", "b", "c"]
+
+    def test_connection_returned_when_iteration_stops(self, file_db_manager):
+        rows = file_db_manager.iter_rows("SELECT name FROM items ORDER BY id", batch_size=1)
+        assert next(rows)['name'] == "a"
+        assert file_db_manager.get_pool_status()['active_connections'] == 1
+
+        rows.close()
+
+        assert file_db_manager.get_pool_status()['active_connections'] == 0
+
+
+class TestStreamingWriters:
+    """Test that chunked writers produce the documents of the buffered ones"""
+
+    def test_json_chunks_match_generated_file(self, tmp_path):
+        processor = JSONProcessor()
+        data = {"job_titles": [{'id': 1, 'name': "Capo\nreparto", 'short_name': "CR"}], "persons": []}
+        output_path = tmp_path / "export.json"
+        processor.generate_json_file(data, str(output_path), include_metadata=False)
+
+        streamed = "".join(processor.iter_json_chunks(data.items(), include_metadata=False))
+
+        assert streamed == output_path.read_text(encoding="utf-8")
+
+    def test_json_metadata_written_last(self):
+        counts = {}
+        document = "".join(JSONProcessor().iter_json_chunks(
+            [("job_titles", iter([{'id': 1, 'name': "A"}, {'id': 2, 'name': "B"}]))], entity_counts=counts
+        ))
+
+        parsed = json.loads(document)
+        assert list(parsed) == ["job_titles", "metadata"]
+        assert parsed["metadata"]["entity_counts"] == counts == {"job_titles": 2}
+
+    def test_chunks_joined_to_chunk_size(self):
+        chunks = list(encode_chunks(("x" * 10 for _ in range(100)), chunk_size=256))
+
+        assert [len(chunk) for chunk in chunks] == [260, 260, 260, 220]
+
+
+class TestStreamingExport:
+    """Test exports reading tables through a cursor"""
+
+    def test_json_export_file(self, import_service, schema_db_manager, tmp_path):
+        add_job_titles(schema_db_manager, 25)
+
+        with patch.object(JobTitleService, 'get_all', no_get_all):
+            result = import_service.export_data_json(ExportOptions(
+                entity_types=["job_titles"], output_directory=str(tmp_path)
+            ))
+
+        assert result.success, result.errors
+        assert result.records_exported == {"job_titles": 25}
+        exported = json.loads(open(result.exported_files[0], encoding="utf-8").read())
+        assert [record['name'] for record in exported["job_titles"]][:2] == ["Job 1", "Job 10"]
+        assert exported["metadata"]["total_records"] == 25
+
+    def test_csv_export_files(self, import_service, schema_db_manager, tmp_path):
+        add_job_titles(schema_db_manager, 3)
+
+        with patch.object(JobTitleService, 'get_all', no_get_all), plain_unit_types():
+            result = import_service.export_data_csv(ExportOptions(
+                entity_types=["job_titles", "unit_types"], output_directory=str(tmp_path)
+            ))
+
+        assert result.success, result.errors
+        assert result.records_exported == {"unit_types": 0, "job_titles": 3}
+        job_titles = next(path for path in result.exported_files if path.endswith("job_titles.csv"))
+        with open(job_titles, encoding="utf-8", newline="") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        assert [row['short_name'] for row in rows] == ["J1", "J2", "J3"]
+
+    def test_csv_download_of_several_entities_is_a_zip(self, import_service, schema_db_manager):
+        add_job_titles(schema_db_manager, 3)
+
+        with plain_unit_types():
+            export = import_service.stream_export(
+                FileFormat.CSV, ExportOptions(entity_types=["job_titles", "unit_types"])
+            )
+            content = b"".join(export.chunks)
+
+        assert export.media_type == "application/zip" and export.filename.endswith(".zip")
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        assert sorted(archive.namelist()) == sorted([get_entity_mapping("unit_types").csv_filename,
+                                                     get_entity_mapping("job_titles").csv_filename])
+        assert archive.read(get_entity_mapping("job_titles").csv_filename).count(b"\r\n") == 4
+
+    def test_generate_route_streams_download(self, import_service, schema_db_manager):
+        add_job_titles(schema_db_manager, 5)
+        app = FastAPI()
+        app.include_router(import_export_routes.router, prefix="/import-export")
+        app.dependency_overrides[import_export_routes.validate_csrf_token_flexible] = lambda: True
+        app.dependency_overrides[import_export_routes.get_import_export_service] = lambda: import_service
+        security_service = Mock()
+        security_service.get_security_headers.return_value = {"X-Content-Type-Options": "nosniff"}
+
+        with patch.object(import_export_routes, 'get_import_export_security_service',
+                          return_value=security_service), \
+             patch.object(import_export_routes, 'log_security_event'):
+            response = TestClient(app).post("/import-export/export/generate", data={
+                'entity_types': "job_titles", 'export_format': "csv", 'stream': "true"
+            })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert len(response.text.splitlines()) == 6
+
+
+class TestStreamLimit:
+    """Test the bound on downloads holding read connections"""
+
+    OPTIONS = ExportOptions(entity_types=["job_titles"])
+
+    def test_slot_released_when_download_sent(self, import_service, schema_db_manager):
+        add_job_titles(schema_db_manager, 3)
+
+        with patch('app.services.export_stream._stream_limiter', StreamLimiter(1)):
+            export = import_service.stream_export(FileFormat.CSV, self.OPTIONS)
+            with pytest.raises(DatabaseBusyError):
+                import_service.stream_export(FileFormat.CSV, self.OPTIONS)
+
+            assert b"".join(export.chunks).count(b"\r\n") == 4
+            import_service.stream_export(FileFormat.CSV, self.OPTIONS)
+
+    def test_slot_released_when_download_dropped(self, import_service, schema_db_manager):
+        add_job_titles(schema_db_manager, 3)
+
+        with patch('app.services.export_stream._stream_limiter', StreamLimiter(1)):
+            export = import_service.stream_export(FileFormat.JSON, self.OPTIONS)
+            next(export.chunks)
+            del export
+            gc.collect()
+
+            export = import_service.stream_export(FileFormat.JSON, self.OPTIONS)
+            export.chunks.close()
+            import_service.stream_export(FileFormat.JSON, self.OPTIONS)
+
+    def test_route_gives_busy_error_when_limit_reached(self, import_service):
+        with patch('app.services.export_stream._stream_limiter', StreamLimiter(1)), \
+             patch.object(import_export_routes, 'get_import_export_security_service'), \
+             patch.object(import_export_routes, 'log_security_event'), \
+             patch.object(import_export_routes, 'get_client_ip'):
+            export = import_service.stream_export(FileFormat.CSV, self.OPTIONS)
+            # Left to the application's handler, which answers 503 with Retry-After
+            with pytest.raises(DatabaseBusyError):
+                asyncio.run(import_export_routes.generate_export(
+                    Mock(), "job_titles", export_format="csv", include_historical=True, date_from=None,
+                    date_to=None, stream=True, csrf_protection=True, import_export_service=import_service
+                ))
+            export.chunks.close()
+
+    def test_single_entity_without_service_is_empty(self, import_service):
+        with patch.object(import_service, '_get_service_for_entity', return_value=None):
+            export = import_service.stream_export(FileFormat.CSV, self.OPTIONS)
+
+        assert b"".join(export.chunks).count(b"\r\n") <= 1
@@ -0,0 +1,194 @@
+"""
+Tests for the unit_closure table and its maintenance by UnitService.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.models.unit import Unit
+from app.services.base import ServiceValidationException
+from app.services.orgchart import OrgchartService
+from app.services.orgchart_cache import OrgTreeCache
+from app.services.unit import UnitService
+from app.services.unit_closure import UnitClosure
+from tests.conftest import SchemaDatabaseManager
+from tests.test_orgchart_tree import populate_hierarchy
+
+
+def closure_rows(conn):
+    return {tuple(row) for row in conn.execute("SELECT ancestor_id, descendant_id, depth FROM unit_closure")}
+
+
+def expected_rows(conn):
+    return {tuple(row) for row in conn.execute(UnitClosure.EXPECTED_QUERY)}
+
+
+@pytest.fixture(autouse=True)
+def unit_types():
+    # The unit type check needs the themes migration, not under test here
+    with patch('app.services.unit.UnitTypeService') as service_class:
+        service_class.return_value.get_by_id.return_value = object()
+        yield
+
+
+@pytest.fixture
+def unit_service(schema_db_manager):
+    with patch('app.services.base.get_db_manager', return_value=schema_db_manager):
+        yield UnitService()
+
+
+class TestUnitClosure:
+    """Test rebuild, incremental maintenance and the consistency check"""
+
+    def test_rebuild(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager, fan_out=1)
+        rows = closure_rows(schema_db_manager.conn)
+
+        assert (1, 1, 0) in rows
+        assert (1, 100, 2) in rows
+        assert (2, 100, 1) in rows
+        assert (10, 100, 0) not in rows and (10, 100, 1) not in rows
+        # 5 units: self rows, 4 below the root, 2 grandchildren below their parents
+        assert len(rows) == 5 + 4 + 2
+
+    def test_rebuild_stops_on_cycle(self, schema_db_manager):
+        conn = schema_db_manager.conn
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (1, 'A', 2)")
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (2, 'B', 1)")
+
+        UnitClosure.rebuild(conn)
+
+        assert closure_rows(conn) == {(1, 1, 0), (2, 2, 0), (1, 2, 1), (2, 1, 1)}
+
+    def test_create_move_delete_keep_closure_consistent(self, unit_service, schema_db_manager):
+        conn = schema_db_manager.conn
+        root = unit_service.create(Unit(name="Root"))
+        left = unit_service.create(Unit(name="Left", parent_unit_id=root.id))
+        right = unit_service.create(Unit(name="Right", parent_unit_id=root.id))
+        leaf = unit_service.create(Unit(name="Leaf", parent_unit_id=left.id))
+        assert closure_rows(conn) == expected_rows(conn)
+        assert (root.id, leaf.id, 2) in closure_rows(conn)
+
+        # Move the Left subtree below Right
+        left.parent_unit_id = right.id
+        unit_service.update(left)
+        assert closure_rows(conn) == expected_rows(conn)
+        assert (right.id, leaf.id, 2) in closure_rows(conn)
+        assert (root.id, leaf.id, 3) in closure_rows(conn)
+
+        # Detach it into a separate root
+        left.parent_unit_id = None
+        unit_service.update(left)
+        assert closure_rows(conn) == expected_rows(conn)
+        assert not any(row[1] == leaf.id and row[0] in (root.id, right.id) for row in closure_rows(conn))
+
+        unit_service.delete(leaf.id)
+        assert closure_rows(conn) == expected_rows(conn)
+        assert not any(leaf.id in row[:2] for row in closure_rows(conn))
+
+    def test_move_below_own_descendant_rejected(self, unit_service):
+        root = unit_service.create(Unit(name="Root"))
+        child = unit_service.create(Unit(name="Child", parent_unit_id=root.id))
+
+        root.parent_unit_id = child.id
+        with pytest.raises(ServiceValidationException):
+            unit_service.update(root)
+
+    def test_children_stored_before_parent(self, schema_db_manager):
+        conn = schema_db_manager.conn
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (3, 'Leaf', 2)")
+        UnitClosure.add_unit(conn, 3, 2)
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (1, 'Root', NULL)")
+        UnitClosure.add_unit(conn, 1, None)
+        conn.execute("INSERT INTO units (id, name, parent_unit_id) VALUES (2, 'Middle', 1)")
+        UnitClosure.add_unit(conn, 2, 1)
+
+        assert closure_rows(conn) == expected_rows(conn)
+        assert (1, 3, 2) in closure_rows(conn)
+
+    def test_check_and_repair(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        conn = schema_db_manager.conn
+        closure = UnitClosure(schema_db_manager)
+        assert closure.check()['consistent']
+
+        conn.execute("DELETE FROM unit_closure WHERE descendant_id = 100")
+        conn.execute("INSERT INTO unit_closure VALUES (10, 101, 1)")
+        result = closure.check()
+        assert result == {'consistent': False, 'missing_rows': 3, 'unexpected_rows': 1, 'rebuilt': False}
+
+        result = closure.check(repair=True)
+        assert result['rebuilt']
+        assert closure.check()['consistent']
+
+    def test_with_database_manager(self, file_db_manager):
+        with file_db_manager.get_connection() as conn:
+            conn.executescript(SchemaDatabaseManager.SCHEMA_PATH.read_text(encoding="utf-8"))
+
+        with patch('app.services.base.get_db_manager', return_value=file_db_manager):
+            service = UnitService()
+        root = service.create(Unit(name="Root"))
+        child = service.create(Unit(name="Child", parent_unit_id=root.id))
+        other = service.create(Unit(name="Other"))
+        child.parent_unit_id = other.id
+        service.update(child)
+
+        assert service.closure.is_descendant(child.id, other.id)
+        assert not service.closure.is_descendant(child.id, root.id)
+        assert UnitClosure(file_db_manager).check()['consistent']
+
+
+class TestOrgchartQueriesOnClosure:
+    """Test the orgchart queries served by unit_closure"""
+
+    @pytest.fixture
+    def service(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager)
+        with patch('app.services.orgchart.get_db_manager', return_value=schema_db_manager), \
+             patch('app.services.orgchart.get_orgchart_cache', return_value=OrgTreeCache(enabled=False)):
+            yield OrgchartService()
+
+    def test_unit_path(self, service):
+        assert service.get_unit_path(100) == [{'id': 1, 'name': 'Root'}, {'id': 2, 'name': 'Two'}]
+        assert service.get_unit_path(1) == []
+
+    def test_hierarchy_matrix_levels(self, service, schema_db_manager):
+        # Theme columns joined by the matrix query come with the themes migration
+        schema_db_manager.conn.executescript("""
+            ALTER TABLE unit_types ADD COLUMN theme_id INTEGER;
+            CREATE TABLE unit_type_themes (id INTEGER PRIMARY KEY, icon_class TEXT, primary_color TEXT,
+                                           secondary_color TEXT, text_color TEXT, display_label TEXT);
+        """)
+        matrix = service.get_hierarchy_matrix()
+
+        assert sorted(matrix) == [0, 1, 2]
+        assert [unit['id'] for unit in matrix[0]] == [1]
+        assert len(matrix[2]) == 6
+
+    def test_organizational_depth(self, service):
+        assert service.get_organization_overview()['organizational_depth'] == 2
+
+    def test_subtree_loads_only_its_units(self, service, schema_db_manager):
+        schema_db_manager.queries.clear()
+        subtree = service.get_subtree(10, show_persons=True)
+
+        assert [child['id'] for child in subtree[0]['children']] == [103, 104, 105]
+        assert all('unit_closure' in query for query in schema_db_manager.queries)
+
+    def test_hierarchy_views(self, schema_db_manager):
+        populate_hierarchy(schema_db_manager, fan_out=1)
+        rows = schema_db_manager.conn.execute(
+            "SELECT id, level, path, short_path, full_path FROM units_hierarchy"
+        ).fetchall()
+
+        assert [tuple(row) for row in rows] == [
+            (1, 0, '1', 'R', 'Root'),
+            (10, 1, '1/10', 'R > T10', 'Root > Ten'),
+            (101, 2, '1/10/101', 'R > T10 > U101', 'Root > Ten > Unit 101'),
+            (2, 1, '1/2', 'R > T2', 'Root > Two'),
+            (100, 2, '1/2/100', 'R > T2 > U100', 'Root > Two > Unit 100'),
+        ]
+        tree = schema_db_manager.conn.execute("SELECT id, path, person_count FROM get_complete_tree").fetchall()
+        assert [row['path'] for row in tree] == [row[2] for row in rows]
@@ -297,6 +297,39 @@ class TestValidationFramework:
         assignment_specific_rules = [r for r in assignment_rules if r.applies_to_entities and 'assignments' in r.applies_to_entities]
         assert len(assignment_specific_rules) > 0
 
+    
+    @staticmethod
+    def _error_tuples(errors):
+        return [(e.field, e.message, e.value, e.error_type, e.line_number, e.entity_type) for e in errors]
+    
+    def test_columnar_batch_matches_row_validation(self):
+        """Test that columnar batch validation reports the same errors as validating each record."""
+        records = [
+            {'name': 'Unit', 'unit_type_id': '1', 'start_date': '2024-01-01', 'end_date': '2023-01-01'},
+            {'id': 'abc', 'unit_type_id': '1', 'start_date': '2024-01-01', 'end_date': '2023-01-01'},
+            {'name': '', 'unit_type_id': 'x', 'parent_unit_id': '', 'aliases': ['a']},
+            {'name': 'Unit', 'unit_type_id': '1', 'start_date': 'not a date'},
+            {'name': 'A' * 300, 'unit_type_id': '1', 'id': '5', 'parent_unit_id': '5'},
+        ]
+        
+        columnar = self.framework.validate_records_batch('units', records, start_line=2)
+        row_wise = self.framework.validate_records_batch('units', records, start_line=2, columnar=False)
+        
+        assert len(columnar) > 0
+        assert self._error_tuples(columnar) == self._error_tuples(row_wise)
+    
+    def test_columnar_batch_percentage_rule(self):
+        """Test that repeated values share validation but keep their own line numbers."""
+        records = [{'person_id': '1', 'unit_id': '1', 'job_title_id': '1', 'percentage': '150'} for _ in range(3)]
+        records.append({'person_id': '1', 'unit_id': '1', 'job_title_id': '1', 'percentage': '0.5'})
+        
+        errors = self.framework.validate_records_batch('assignments', records, start_line=10)
+        
+        assert self._error_tuples(errors) == self._error_tuples(
+            self.framework.validate_records_batch('assignments', records, start_line=10, columnar=False))
+        assert {10, 11, 12} <= {e.line_number for e in errors}
+        assert 13 not in {e.line_number for e in errors}
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file